@@ -32,12 +32,20 @@ def get_reddit_client() -> praw.Reddit | None:
         return None
     
     try:
+        # Optional endpoint overrides (local stand-ins for load testing)
+        overrides = {}
+        if settings.REDDIT_OAUTH_URL:
+            overrides["oauth_url"] = settings.REDDIT_OAUTH_URL
+        if settings.REDDIT_URL:
+            overrides["reddit_url"] = settings.REDDIT_URL
+        
         return praw.Reddit(
             client_id=client_id,
             client_secret=client_secret,
             username=username,
             password=password,
-            user_agent=user_agent
+            user_agent=user_agent,
+            **overrides
         )
     except Exception:
         return None
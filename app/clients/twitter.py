@@ -2,8 +2,35 @@
 Twitter API client configuration
 """
 import tweepy
+from requests.adapters import HTTPAdapter
 from app.config import settings
 
+TWITTER_HOSTS = ("https://api.twitter.com", "https://upload.twitter.com")
+
+
+class _RedirectAdapter(HTTPAdapter):
+    """Sends Twitter API requests to another base URL (local stand-ins)"""
+
+    def __init__(self, base_url: str, **kwargs):
+        super().__init__(**kwargs)
+        self.base_url = base_url.rstrip("/")
+
+    def send(self, request, **kwargs):
+        for host in TWITTER_HOSTS:
+            if request.url.startswith(host):
+                request.url = self.base_url + request.url[len(host):]
+                break
+        return super().send(request, **kwargs)
+
+
+def _apply_base_url(client):
+    """Route a tweepy client's session to TWITTER_API_BASE_URL if set"""
+    if settings.TWITTER_API_BASE_URL:
+        adapter = _RedirectAdapter(settings.TWITTER_API_BASE_URL)
+        for host in TWITTER_HOSTS:
+            client.session.mount(host, adapter)
+    return client
+
 def get_twitter_v1_client() -> tweepy.API | None:
     """
     Return Tweepy API v1.1 client for media upload.
@@ -35,7 +62,7 @@ def get_twitter_v1_client() -> tweepy.API | None:
         access_token,
         access_token_secret
     )
-    return tweepy.API(auth)
+    return _apply_base_url(tweepy.API(auth))
 
 
 def get_twitter_v2_client() -> tweepy.Client | None:
@@ -64,13 +91,13 @@ def get_twitter_v2_client() -> tweepy.Client | None:
         return None
     
     try:
-        return tweepy.Client(
+        return _apply_base_url(tweepy.Client(
             consumer_key=api_key,
             consumer_secret=api_secret,
             access_token=access_token,
             access_token_secret=access_token_secret,
             wait_on_rate_limit=True
-        )
+        ))
     except Exception:
         return None
 
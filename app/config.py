@@ -16,14 +16,85 @@ class Settings:
     PORT: int = int(os.getenv("PORT", 8000))
     HOST: str = os.getenv("HOST", "0.0.0.0")
     
+    # Logging
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    # "text" or "json" (one JSON object per line)
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text")
+    
     # Directories
     UPLOAD_DIR: Path = Path("uploads")
     SCHEDULED_POSTS_FILE: Path = Path("data/storage/scheduled_posts.json")
     
+    # Idempotent publishing: outcomes per (idempotency key, platform)
+    IDEMPOTENCY_DB_FILE: Path = Path(os.getenv("IDEMPOTENCY_DB_FILE", "data/storage/publish_records.db"))
+    # A pending attempt older than this is treated as crashed and may be retried
+    IDEMPOTENCY_LEASE_SECONDS: float = float(os.getenv("IDEMPOTENCY_LEASE_SECONDS", 300))
+    IDEMPOTENCY_RETENTION_DAYS: float = float(os.getenv("IDEMPOTENCY_RETENTION_DAYS", 7))
+    
+    # Publish outbox: /api/post answers 202 with a job id and workers publish in the background
+    # Per request with "Prefer: respond-async"; set PUBLISH_OUTBOX_DEFAULT=true for every immediate post
+    PUBLISH_OUTBOX_DEFAULT: bool = os.getenv("PUBLISH_OUTBOX_DEFAULT", "false").lower() == "true"
+    OUTBOX_DB_FILE: Path = Path(os.getenv("OUTBOX_DB_FILE", "data/storage/outbox.db"))
+    # Workers inside the API process; 0 = run `python outbox_worker.py` separately
+    OUTBOX_WORKERS: int = int(os.getenv("OUTBOX_WORKERS", 2))
+    OUTBOX_POLL_INTERVAL: float = float(os.getenv("OUTBOX_POLL_INTERVAL", 1))
+    # A running job older than this is treated as crashed and picked up again
+    OUTBOX_LEASE_SECONDS: float = float(os.getenv("OUTBOX_LEASE_SECONDS", 600))
+    OUTBOX_RETENTION_DAYS: float = float(os.getenv("OUTBOX_RETENTION_DAYS", 7))
+    
+    # AI usage accounting: tokens and images per caller and day (see /api/usage)
+    USAGE_DB_FILE: Path = Path(os.getenv("USAGE_DB_FILE", "data/storage/usage.db"))
+    USAGE_RETENTION_DAYS: float = float(os.getenv("USAGE_RETENTION_DAYS", 90))
+    # "key:team,..." - requests with X-API-Key are charged to the team, others to their IP
+    USAGE_API_KEYS: str = os.getenv("USAGE_API_KEYS", "")
+    # Daily quotas per caller (0 = unlimited); "team=tokens/images,..." overrides per caller
+    AI_DAILY_TOKEN_QUOTA: int = int(os.getenv("AI_DAILY_TOKEN_QUOTA", 0))
+    AI_DAILY_IMAGE_QUOTA: int = int(os.getenv("AI_DAILY_IMAGE_QUOTA", 0))
+    AI_TEAM_QUOTAS: str = os.getenv("AI_TEAM_QUOTAS", "")
+    
+    # Bulk generation (/api/generate-content/bulk): items per batch, generations at once
+    BULK_GENERATE_MAX_ITEMS: int = int(os.getenv("BULK_GENERATE_MAX_ITEMS", 50))
+    BULK_GENERATE_CONCURRENCY: int = int(os.getenv("BULK_GENERATE_CONCURRENCY", 4))
+    
+    # Offline batch generation (/api/generate-content/batch): captions go through the
+    # OpenAI Batch API (cheaper, done within 24h) and come back as scheduled posts
+    GENERATION_BATCH_DB_FILE: Path = Path(os.getenv("GENERATION_BATCH_DB_FILE", "data/storage/generation_batches.db"))
+    BATCH_GENERATE_MAX_ITEMS: int = int(os.getenv("BATCH_GENERATE_MAX_ITEMS", 500))
+    # How often the scheduler leader checks submitted batches (seconds)
+    BATCH_POLL_INTERVAL: float = float(os.getenv("BATCH_POLL_INTERVAL", 300))
+    
+    # Scheduler leadership: with several API workers (or API + standalone bot) only the
+    # process holding this lock runs scheduled jobs; the others take over if it exits
+    SCHEDULER_LOCK_FILE: Path = Path(os.getenv("SCHEDULER_LOCK_FILE", "data/storage/scheduler.lock"))
+    SCHEDULER_LEADER_RETRY_SECONDS: float = float(os.getenv("SCHEDULER_LEADER_RETRY_SECONDS", 10))
+    # How often the leader picks up posts scheduled through other processes (seconds)
+    SCHEDULER_SYNC_INTERVAL: float = float(os.getenv("SCHEDULER_SYNC_INTERVAL", 10))
+    
+    # Retry queue for platforms that failed when a scheduled post ran
+    # Attempts per platform, including the scheduled run; then the platform is dead-lettered
+    SCHEDULED_RETRY_MAX_ATTEMPTS: int = int(os.getenv("SCHEDULED_RETRY_MAX_ATTEMPTS", 5))
+    # Backoff doubles from the base delay up to the max (seconds); Retry-After and open breakers can push it later
+    SCHEDULED_RETRY_BASE_DELAY: float = float(os.getenv("SCHEDULED_RETRY_BASE_DELAY", 60))
+    SCHEDULED_RETRY_MAX_DELAY: float = float(os.getenv("SCHEDULED_RETRY_MAX_DELAY", 3600))
+    
     # File Constraints
     ALLOWED_EXTENSIONS: set = {"image/jpeg", "image/jpg", "image/png", "image/gif"}
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
     
+    # Rate limiting (disable only for local load tests)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "false"
+    # Where limit counters live, shared by all workers: sqlite:///path (one host),
+    # redis://host:6379 (several hosts, needs the redis package) or memory:// (per process)
+    RATE_LIMIT_STORAGE_URI: str = os.getenv("RATE_LIMIT_STORAGE_URI", "sqlite:///data/storage/rate_limits.db")
+    
+    # API endpoint overrides (point at local stand-ins for load testing, see benchmarks/)
+    GRAPH_API_BASE_URL: str = os.getenv("GRAPH_API_BASE_URL", "https://graph.facebook.com")
+    OPENAI_BASE_URL: str = os.getenv("OPENAI_BASE_URL")
+    TWITTER_API_BASE_URL: str = os.getenv("TWITTER_API_BASE_URL")
+    REDDIT_OAUTH_URL: str = os.getenv("REDDIT_OAUTH_URL")
+    REDDIT_URL: str = os.getenv("REDDIT_URL")
+    CLOUDINARY_UPLOAD_PREFIX: str = os.getenv("CLOUDINARY_UPLOAD_PREFIX")
+    
     # Facebook Configuration
     FACEBOOK_ACCESS_TOKEN: str = os.getenv("FACEBOOK_PAGE_ACCESS_TOKEN")
     FACEBOOK_PAGE_ID: str = os.getenv("FACEBOOK_PAGE_ID")
@@ -31,7 +102,7 @@ class Settings:
     
     @property
     def FACEBOOK_GRAPH_URL(self) -> str:
-        return f"https://graph.facebook.com/{self.FACEBOOK_API_VERSION}"
+        return f"{self.GRAPH_API_BASE_URL}/{self.FACEBOOK_API_VERSION}"
     
     # Instagram Configuration
     INSTAGRAM_ACCESS_TOKEN: str = os.getenv("INSTAGRAM_ACCESS_TOKEN")
@@ -40,7 +111,7 @@ class Settings:
     
     @property
     def INSTAGRAM_GRAPH_URL(self) -> str:
-        return f"https://graph.facebook.com/{self.INSTAGRAM_API_VERSION}"
+        return f"{self.GRAPH_API_BASE_URL}/{self.INSTAGRAM_API_VERSION}"
     
     # Cloudinary Configuration
     CLOUDINARY_CLOUD_NAME: str = os.getenv("CLOUDINARY_CLOUD_NAME")
@@ -76,6 +147,45 @@ class Settings:
     # Telegram Bot Configuration
     TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN")
     TELEGRAM_CHANNEL_ID: str = os.getenv("TELEGRAM_CHANNEL_ID")
+    
+    # Telegram Webhook Configuration (leave TELEGRAM_WEBHOOK_URL empty to use polling)
+    TELEGRAM_WEBHOOK_URL: str = os.getenv("TELEGRAM_WEBHOOK_URL")
+    # Secret Telegram sends back with every update (a random one is generated when empty)
+    TELEGRAM_WEBHOOK_SECRET: str = os.getenv("TELEGRAM_WEBHOOK_SECRET")
+    # Held by the one API process that serves the webhook (conversations live in its memory)
+    TELEGRAM_WEBHOOK_LOCK_FILE: Path = Path(os.getenv("TELEGRAM_WEBHOOK_LOCK_FILE", "data/storage/telegram_webhook.lock"))
+    
+    # Max updates processed at once across all users (each user's updates stay in order)
+    TELEGRAM_MAX_CONCURRENT_UPDATES: int = int(os.getenv("TELEGRAM_MAX_CONCURRENT_UPDATES", 16))
+    # Seconds between edits of a message showing streamed AI text (Telegram rate-limits edits)
+    TELEGRAM_STREAM_EDIT_INTERVAL: float = float(os.getenv("TELEGRAM_STREAM_EDIT_INTERVAL", 1.0))
+    
+    # Platform Token Verification
+    # Per-platform check timeout (seconds)
+    TOKEN_VERIFY_TIMEOUT: float = float(os.getenv("TOKEN_VERIFY_TIMEOUT", 5))
+    # Cached results are served fresh for this long, then refreshed in the background
+    TOKEN_STATUS_TTL: int = int(os.getenv("TOKEN_STATUS_TTL", 60))
+    # Results older than this are never served; the request waits for a new check
+    TOKEN_STATUS_MAX_STALE: int = int(os.getenv("TOKEN_STATUS_MAX_STALE", 900))
+    
+    # Readiness (/api/ready)
+    # Event-loop lag above this marks the server as not ready
+    READY_MAX_LOOP_LAG_MS: float = float(os.getenv("READY_MAX_LOOP_LAG_MS", 500))
+
+    # Circuit breakers (per platform / image provider)
+    # Consecutive failures that open a breaker; calls then fail fast for CIRCUIT_RESET_TIMEOUT seconds
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", 5))
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", 30))
+
+    # Admin endpoints (/api/admin/*) require X-Admin-Token; disabled when unset
+    ADMIN_TOKEN: str = os.getenv("ADMIN_TOKEN")
+
+    # Request profiling (span timelines, see /api/admin/traces)
+    # Fraction of requests profiled; requests with "X-Profile: 1" are always profiled
+    PROFILING_SAMPLE_RATE: float = float(os.getenv("PROFILING_SAMPLE_RATE", 0))
+    # Sampled requests slower than this are kept; header-requested traces are always kept
+    PROFILING_SLOW_MS: float = float(os.getenv("PROFILING_SLOW_MS", 1000))
+    PROFILING_MAX_TRACES: int = int(os.getenv("PROFILING_MAX_TRACES", 50))
 
 # Create settings instance
 settings = Settings()
@@ -91,4 +201,6 @@ if all([settings.CLOUDINARY_CLOUD_NAME, settings.CLOUDINARY_API_KEY, settings.CL
         api_secret=settings.CLOUDINARY_API_SECRET,
         secure=True
     )
+    if settings.CLOUDINARY_UPLOAD_PREFIX:
+        cloudinary.config(upload_prefix=settings.CLOUDINARY_UPLOAD_PREFIX)
 
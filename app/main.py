@@ -1,18 +1,33 @@
 """
 Main FastAPI application
 """
+import uuid
+import asyncio
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from slowapi import Limiter, _rate_limit_exceeded_handler
+from limits import parse
+from slowapi import _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
+from slowapi.wrappers import Limit
 from app.config import settings
-from app.routes import health, posts, scheduled, ai_content, enhance, credentials
+from app.routes import health, posts, scheduled, ai_content, enhance, credentials, telegram_webhook, metrics, admin
 from app.scheduler.scheduler import init_scheduler, restore_scheduled_jobs
+from app.utils.runtime import loop_lag_monitor
+from app.utils.log_config import setup_logging, shutdown_logging, request_id_var
+from app.utils.profiling import Trace, current_trace, should_profile, trace_store
+from app.utils.rate_limit import limiter, hit_limit
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+# Queue-based logging (the writer thread keeps log I/O off the event loop)
+setup_logging()
+
+# Limit for /api/post, checked before the upload is read
+POST_RATE_LIMIT = parse("30/minute")
+POST_LIMIT = Limit(
+    POST_RATE_LIMIT, get_remote_address, "api-post", per_method=False, methods=None,
+    error_message=None, exempt_when=None, cost=1, override_defaults=True
+)
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -29,14 +44,51 @@ app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 @app.middleware("http")
 async def rate_limit_middleware(request: Request, call_next):
     # Apply rate limiting to posting endpoints
-    if request.url.path == "/api/post":
-        try:
-            await limiter.check_request_limit(request, "30/minute")
-        except RateLimitExceeded:
-            return _rate_limit_exceeded_handler(request, RateLimitExceeded("30 per 1 minute"))
+    if limiter.enabled and request.method == "POST" and request.url.path == "/api/post":
+        identifiers = [get_remote_address(request), "api-post"]
+        # The storage may wait on a lock, so the hit runs off the event loop
+        retry_after = await asyncio.to_thread(hit_limit, POST_RATE_LIMIT, *identifiers)
+        if retry_after is not None:
+            request.state.view_rate_limit = (POST_RATE_LIMIT, identifiers)
+            response = _rate_limit_exceeded_handler(request, RateLimitExceeded(POST_LIMIT))
+            response.headers.setdefault("Retry-After", str(retry_after))
+            return response
     response = await call_next(request)
     return response
 
+# Opt-in profiling: span timeline for requests with "X-Profile: 1" or picked by sampling
+@app.middleware("http")
+async def profiling_middleware(request: Request, call_next):
+    reason = should_profile(request.headers.get("X-Profile"), settings.PROFILING_SAMPLE_RATE)
+    if reason is None:
+        return await call_next(request)
+    
+    trace = Trace(request_id_var.get(), request.method, request.url.path, reason)
+    token = current_trace.set(trace)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    finally:
+        current_trace.reset(token)
+        trace.finish(status_code)
+        if reason == "header" or trace.duration * 1000 >= settings.PROFILING_SLOW_MS:
+            trace_store.add(trace)
+    response.headers["X-Trace-ID"] = trace.trace_id
+    return response
+
+# Correlation id per request: taken from X-Request-ID or generated, echoed back
+@app.middleware("http")
+async def request_id_middleware(request: Request, call_next):
+    request_id = request.headers.get("X-Request-ID") or uuid.uuid4().hex[:12]
+    token = request_id_var.set(request_id)
+    try:
+        response = await call_next(request)
+    finally:
+        request_id_var.reset(token)
+    response.headers["X-Request-ID"] = request_id
+    return response
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -56,6 +108,9 @@ app.include_router(scheduled.router)
 app.include_router(ai_content.router)
 app.include_router(enhance.router)
 app.include_router(credentials.router)
+app.include_router(telegram_webhook.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 
 @app.on_event("startup")
@@ -64,9 +119,14 @@ async def startup_event():
     Initialize scheduler and restore jobs on startup
     """
     print("🚀 Starting Social Media AI Manager...")
+    loop_lag_monitor.start()
     init_scheduler()
     restore_scheduled_jobs()
     
+    # Publish outbox jobs (including ones left unfinished by the last run)
+    from app.services.outbox_service import outbox_workers
+    outbox_workers.start(settings.OUTBOX_WORKERS, settings.OUTBOX_POLL_INTERVAL)
+    
     # Auto-load credentials from environment variables on first startup
     from app.services.credentials_service import get_all_credentials, update_platform_credentials
     existing_creds = get_all_credentials()
@@ -133,7 +193,18 @@ async def startup_event():
     
     print(f"✅ Server is ready on http://localhost:{settings.PORT}")
     print("📱 All platforms configured")
-    print("💡 To start Telegram bot, run: python bot.py")
+    
+    # Webhook mode: serve the Telegram bot from this process instead of bot.py
+    if settings.TELEGRAM_WEBHOOK_URL and settings.TELEGRAM_BOT_TOKEN:
+        from app.services.telegram_bot_service import telegram_bot
+        # Refuses to start a second worker: updates must all reach the same process
+        telegram_bot.claim_webhook()
+        try:
+            await telegram_bot.start_webhook()
+        except Exception as e:
+            print(f"❌ Failed to start Telegram webhook: {e}")
+    else:
+        print("💡 To start Telegram bot, run: python bot.py")
 
 
 @app.on_event("shutdown")
@@ -141,9 +212,23 @@ async def shutdown_event():
     """
     Cleanup on shutdown
     """
-    from app.scheduler.scheduler import scheduler
+    from app.scheduler.scheduler import scheduler, shutdown_scheduler
+    
+    if settings.TELEGRAM_WEBHOOK_URL and settings.TELEGRAM_BOT_TOKEN:
+        from app.services.telegram_bot_service import telegram_bot
+        await telegram_bot.stop_bot()
     
     if scheduler.running:
-        scheduler.shutdown()
         print("👋 Scheduler shut down gracefully")
+    # Also hands leadership to a standby worker
+    shutdown_scheduler()
+    
+    from app.services.outbox_service import outbox_workers
+    await outbox_workers.stop()
+    
+    from app.services.ai_service import close_download_client
+    await close_download_client()
+    
+    await loop_lag_monitor.stop()
+    shutdown_logging()
 
@@ -1,7 +1,7 @@
 """
 API route handlers
 """
-from . import health, posts, scheduled, ai_content, enhance
+from . import health, posts, scheduled, ai_content, enhance, telegram_webhook, metrics, admin
 
-__all__ = ["health", "posts", "scheduled", "ai_content", "enhance"]
+__all__ = ["health", "posts", "scheduled", "ai_content", "enhance", "telegram_webhook", "metrics", "admin"]
 
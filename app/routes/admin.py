@@ -0,0 +1,99 @@
+"""
+Admin endpoints (profiling traces, AI usage, publish records)
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from pydantic import BaseModel
+from app.config import settings
+from app.utils.profiling import trace_store
+
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow the request only with the configured ADMIN_TOKEN"""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (set ADMIN_TOKEN)")
+    if x_admin_token != settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/traces")
+async def list_traces(limit: int = Query(20, ge=1, le=200)):
+    """
+    List recent profiled requests (newest first)
+
+    Sampled requests are kept when slower than PROFILING_SLOW_MS;
+    requests sent with "X-Profile: 1" are always kept.
+    """
+    return {"traces": [trace.summary() for trace in trace_store.recent(limit)]}
+
+
+@router.get("/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """
+    Get the span timeline of one profiled request
+    """
+    trace = trace_store.get(trace_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="Trace not found")
+    return trace.to_dict()
+
+
+@router.get("/usage")
+async def list_usage(days: int = Query(7, ge=1, le=366), caller: Optional[str] = None):
+    """
+    Daily AI usage rollups of every caller (or one), newest day first,
+    with each caller's current quotas
+    """
+    from app.services.usage_service import get_usage_store, quotas_for, summarize
+
+    since = (datetime.now(timezone.utc).date() - timedelta(days=days - 1)).isoformat()
+    rollups = await asyncio.to_thread(get_usage_store().rollups, since, caller)
+    for entry in rollups:
+        entry["totals"] = summarize(entry["usage"])
+    callers = {entry["caller"] for entry in rollups}
+    return {
+        "since": since,
+        "usage": rollups,
+        "quotas": {name: quotas_for(name) for name in sorted(callers)}
+    }
+
+
+class ResolvePublishRequest(BaseModel):
+    """What a check of the platform found"""
+    published: bool
+    result: Optional[dict] = None
+
+
+@router.get("/publish-records")
+async def list_unresolved_publishes():
+    """
+    Publishes whose outcome is unknown (the post was sent, then the attempt
+    timed out or was interrupted); they are not retried until resolved
+    """
+    from app.services.idempotency_service import get_store
+
+    records = await asyncio.to_thread(get_store().unresolved)
+    for record in records:
+        record["updated_at"] = datetime.fromtimestamp(record["updated_at"]).isoformat()
+    return {"records": records}
+
+
+@router.post("/publish-records/{key}/{platform}/resolve")
+async def resolve_publish(key: str, platform: str, body: ResolvePublishRequest):
+    """
+    Settle an unknown publish after checking the platform
+
+    "published": true records the post (optionally its "result", e.g. {"id": ...}),
+    so retries return it; false lets the next attempt publish again.
+    """
+    from app.services.idempotency_service import get_store
+
+    result = (body.result or {}) if body.published else None
+    if not await asyncio.to_thread(get_store().resolve, key, platform, result):
+        raise HTTPException(status_code=404, detail="No unresolved publish record for this key and platform")
+    return {"success": True, "key": key, "platform": platform, "published": body.published}
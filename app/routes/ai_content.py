@@ -1,10 +1,21 @@
 """
 AI content generation endpoints
 """
-from fastapi import APIRouter, HTTPException, Request
+import json
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, validator, Field
-from slowapi import Limiter
 from slowapi.util import get_remote_address
+from app.config import settings
+from app.utils.rate_limit import limiter
+from app.utils.sse import progress_events, SSE_HEADERS
+from app.services.usage_service import usage_caller, usage_caller_var, team_for_api_key, usage_report, ensure_quota
+from app.services.bulk_service import generate_bulk
+from app.services.batch_service import submit_batch, get_batch_store, job_status
 from app.services.ai_service import (
     generate_platform_content, 
     refine_content, 
@@ -12,8 +23,20 @@ from app.services.ai_service import (
     regenerate_image
 )
 
-router = APIRouter(prefix="/api", tags=["ai"])
-limiter = Limiter(key_func=get_remote_address)
+async def identify_caller(request: Request, x_api_key: Optional[str] = Header(None)) -> str:
+    """Charge the request's AI usage to the API key's team, or to the client IP"""
+    if x_api_key:
+        team = team_for_api_key(x_api_key)
+        if team is None:
+            raise HTTPException(status_code=401, detail="Unknown API key")
+        caller = team
+    else:
+        caller = f"ip:{get_remote_address(request)}"
+    usage_caller_var.set(caller)
+    return caller
+
+
+router = APIRouter(prefix="/api", tags=["ai"], dependencies=[Depends(identify_caller)])
 
 
 class GenerateRequest(BaseModel):
@@ -56,6 +79,80 @@ class GenerateRequest(BaseModel):
         return v
 
 
+class GenerateStreamRequest(GenerateRequest):
+    stream_tokens: bool = False  # Also send caption text as it is written ("caption_delta" events)
+
+
+class BulkGenerateRequest(BaseModel):
+    items: List[GenerateRequest]
+    
+    @validator('items')
+    def validate_items(cls, v):
+        if not v:
+            raise ValueError('At least one item is required')
+        if len(v) > settings.BULK_GENERATE_MAX_ITEMS:
+            raise ValueError(f'Too many items (maximum {settings.BULK_GENERATE_MAX_ITEMS})')
+        return v
+
+
+class BatchGenerateItem(BaseModel):
+    topic: str = Field(..., min_length=1, max_length=500)
+    tone: str = "casual"
+    platforms: List[str] = ["facebook", "instagram", "twitter", "reddit"]
+    scheduled_time: str  # ISO time the posts go out (right away if the batch finishes later)
+    image_path: str  # Image already under UPLOAD_DIR, e.g. an AI-generated image's local_path
+    
+    @validator('topic')
+    def validate_topic(cls, v):
+        if not v or not v.strip():
+            raise ValueError('Topic cannot be empty')
+        return ' '.join(v.split())
+    
+    @validator('tone')
+    def validate_tone(cls, v):
+        valid_tones = ['casual', 'professional', 'corporate', 'funny', 'inspirational', 'educational', 'storytelling', 'promotional']
+        if v not in valid_tones:
+            raise ValueError(f'Invalid tone. Must be one of: {", ".join(valid_tones)}')
+        return v
+    
+    @validator('platforms')
+    def validate_platforms(cls, v):
+        valid_platforms = ['facebook', 'instagram', 'twitter', 'reddit']
+        if not v:
+            raise ValueError('At least one platform is required')
+        invalid = [p for p in v if p not in valid_platforms]
+        if invalid:
+            raise ValueError(f'Invalid platform. Must be one of: {", ".join(valid_platforms)}')
+        return list(dict.fromkeys(v))
+    
+    @validator('scheduled_time')
+    def validate_scheduled_time(cls, v):
+        try:
+            datetime.fromisoformat(v.replace('Z', '+00:00'))
+        except ValueError:
+            raise ValueError('Invalid scheduled time (expected ISO 8601)')
+        return v
+    
+    @validator('image_path')
+    def validate_image_path(cls, v):
+        path = Path(v).resolve()
+        if not path.is_relative_to(settings.UPLOAD_DIR.resolve()) or not path.is_file():
+            raise ValueError('Image must be an existing file in the uploads directory')
+        return str(path)
+
+
+class BatchGenerateRequest(BaseModel):
+    items: List[BatchGenerateItem]
+    
+    @validator('items')
+    def validate_items(cls, v):
+        if not v:
+            raise ValueError('At least one item is required')
+        if len(v) > settings.BATCH_GENERATE_MAX_ITEMS:
+            raise ValueError(f'Too many items (maximum {settings.BATCH_GENERATE_MAX_ITEMS})')
+        return v
+
+
 class RegenerateRequest(BaseModel):
     topic: str = Field(..., min_length=1, max_length=500)
     platform: str
@@ -104,7 +201,7 @@ class RefineRequest(BaseModel):
 
 @router.post("/generate-content")
 @limiter.limit("10/minute")  # Max 10 AI generations per minute
-async def generate_content(request: GenerateRequest, http_request: Request):
+async def generate_content(payload: GenerateRequest, request: Request):
     """
     Generate platform-specific content for all social media platforms with optional image
     Automatically enhances user prompts for better results
@@ -112,14 +209,16 @@ async def generate_content(request: GenerateRequest, http_request: Request):
     """
     try:
         result = await generate_platform_content(
-            topic=request.topic,
-            tone=request.tone,
-            image_style=request.image_style,
-            generate_image=request.generate_image,
-            use_prompt_enhancer=request.use_prompt_enhancer,
-            image_provider=request.image_provider
+            topic=payload.topic,
+            tone=payload.tone,
+            image_style=payload.image_style,
+            generate_image=payload.generate_image,
+            use_prompt_enhancer=payload.use_prompt_enhancer,
+            image_provider=payload.image_provider
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -127,21 +226,139 @@ async def generate_content(request: GenerateRequest, http_request: Request):
         )
 
 
+async def _check_before_streaming(images: int = 0):
+    """Refuse a streamed request up front (with its HTTP status) rather than as an error event"""
+    if not settings.OPENAI_API_KEY:
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+    await ensure_quota(images=images)
+
+
+@router.post("/generate-content/stream")
+@limiter.limit("10/minute")  # Same budget as /generate-content
+async def generate_content_stream(payload: GenerateStreamRequest, request: Request, caller: str = Depends(identify_caller)):
+    """
+    Generate content like /generate-content, streamed as Server-Sent Events
+    
+    Events, each as soon as its phase finishes:
+    - enhanced: the enhanced prompts (when the prompt enhancer is used)
+    - caption_delta: {"platform", "delta"} caption text as it is written (with stream_tokens)
+    - caption: {"platform", "content", "success", ...} one per platform
+    - image: the generated image (when generate_image)
+    - done: the same result /generate-content returns
+    - error: {"status_code", "detail"} if generation failed
+    Rate limited: 10 requests per minute
+    """
+    await _check_before_streaming(images=1 if payload.generate_image else 0)
+    
+    async def run(report):
+        with usage_caller(caller):
+            return await generate_platform_content(
+                topic=payload.topic,
+                tone=payload.tone,
+                image_style=payload.image_style,
+                generate_image=payload.generate_image,
+                use_prompt_enhancer=payload.use_prompt_enhancer,
+                image_provider=payload.image_provider,
+                progress_callback=report,
+                stream_captions=payload.stream_tokens
+            )
+    
+    return StreamingResponse(progress_events(run), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.post("/generate-content/bulk")
+@limiter.limit("5/minute")  # Each batch runs up to BULK_GENERATE_MAX_ITEMS generations
+async def generate_content_bulk(payload: BulkGenerateRequest, request: Request, caller: str = Depends(identify_caller)):
+    """
+    Generate content for a batch of topics (campaigns)
+    
+    Streams newline-delimited JSON: one line per item as soon as it finishes
+    ({"index", "topic", "success", "result" | "error"}), in completion order,
+    then a summary line ({"done": true, "succeeded", "failed"}). Items run
+    BULK_GENERATE_CONCURRENCY at a time and share prompt enhancements.
+    Rate limited: 5 batches per minute
+    """
+    items = [item.dict() for item in payload.items]
+    
+    # Refuse the whole batch up front rather than streaming quota errors
+    await ensure_quota(images=sum(1 for item in items if item["generate_image"]))
+    
+    async def stream():
+        succeeded = failed = 0
+        with usage_caller(caller):
+            async for outcome in generate_bulk(items, settings.BULK_GENERATE_CONCURRENCY):
+                if outcome["success"]:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield json.dumps(outcome, default=str) + "\n"
+        yield json.dumps({"done": True, "total": len(items), "succeeded": succeeded, "failed": failed}) + "\n"
+    
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/generate-content/batch")
+@limiter.limit("5/minute")
+async def generate_content_batch(payload: BatchGenerateRequest, request: Request, caller: str = Depends(identify_caller)):
+    """
+    Submit a campaign's captions to the OpenAI Batch API (offline mode)
+    
+    Captions come back within 24 hours at the Batch API's lower price; the
+    scheduler then turns them into scheduled posts (one per item and platform,
+    with the item's image). Answers 202 with a status URL right away.
+    Rate limited: 5 batches per minute
+    """
+    if not settings.OPENAI_API_KEY:
+        raise HTTPException(status_code=500, detail="OpenAI API key not configured")
+    await ensure_quota()
+    
+    try:
+        job = await submit_batch([item.dict() for item in payload.items], caller)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to submit batch: {str(e)}")
+    
+    status_url = f"/api/generate-content/batch/{job['id']}"
+    return JSONResponse(
+        status_code=202,
+        content={"success": True, "status_url": status_url, **job_status(job)},
+        headers={"Location": status_url}
+    )
+
+
+@router.get("/generate-content/batch/{batch_id}")
+async def get_generation_batch(batch_id: str):
+    """
+    Get the status of an offline generation batch
+    
+    Status is "submitted" until the scheduler collects the batch, then
+    "completed" (with the scheduled posts) or "failed".
+    
+    Args:
+        batch_id: Batch id returned with the 202 response
+    """
+    job = await asyncio.to_thread(get_batch_store().get, batch_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Generation batch not found")
+    return job_status(job)
+
+
 @router.post("/regenerate-content")
 @limiter.limit("20/minute")  # More lenient for regeneration
-async def regenerate_content(request: RegenerateRequest, http_request: Request):
+async def regenerate_content(payload: RegenerateRequest, request: Request):
     """
     Regenerate content for a specific platform
     Rate limited: 20 requests per minute
     """
     try:
         result = await regenerate_platform_content(
-            topic=request.topic,
-            platform=request.platform,
-            tone=request.tone,
-            previous_content=request.previous_content
+            topic=payload.topic,
+            platform=payload.platform,
+            tone=payload.tone,
+            previous_content=payload.previous_content
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -149,21 +366,48 @@ async def regenerate_content(request: RegenerateRequest, http_request: Request):
         )
 
 
+@router.post("/regenerate-content/stream")
+@limiter.limit("20/minute")  # Same budget as /regenerate-content
+async def regenerate_content_stream(payload: RegenerateRequest, request: Request, caller: str = Depends(identify_caller)):
+    """
+    Regenerate content for a specific platform, streamed as Server-Sent Events
+    
+    "delta" events ({"delta"}) carry the text as it is written, then "done"
+    the same result /regenerate-content returns (or "error").
+    Rate limited: 20 requests per minute
+    """
+    await _check_before_streaming()
+    
+    async def run(report):
+        with usage_caller(caller):
+            return await regenerate_platform_content(
+                topic=payload.topic,
+                platform=payload.platform,
+                tone=payload.tone,
+                previous_content=payload.previous_content,
+                progress_callback=report
+            )
+    
+    return StreamingResponse(progress_events(run), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
 @router.post("/regenerate-image")
 @limiter.limit("15/minute")  # Image regeneration limit
-async def regenerate_image_endpoint(request: RegenerateImageRequest, http_request: Request):
+async def regenerate_image_endpoint(payload: RegenerateImageRequest, request: Request):
     """
     Regenerate a new image with selected provider (DALL-E 3 or Nano Banana)
     Rate limited: 15 requests per minute
     """
     try:
         result = await regenerate_image(
-            topic=request.topic,
-            tone=request.tone,
-            image_style=request.image_style,
-            image_provider=request.image_provider
+            topic=payload.topic,
+            tone=payload.tone,
+            image_style=payload.image_style,
+            image_provider=payload.image_provider
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -173,21 +417,55 @@ async def regenerate_image_endpoint(request: RegenerateImageRequest, http_reques
 
 @router.post("/refine-content")
 @limiter.limit("30/minute")  # More lenient for content refinement
-async def refine_post_content(request: RefineRequest, http_request: Request):
+async def refine_post_content(payload: RefineRequest, request: Request):
     """
     Refine existing content based on user instructions
     Rate limited: 30 requests per minute
     """
     try:
         result = await refine_content(
-            original_content=request.original_content,
-            platform=request.platform,
-            instructions=request.instructions
+            original_content=payload.original_content,
+            platform=payload.platform,
+            instructions=payload.instructions
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to refine content: {str(e)}"
         )
 
+
+@router.post("/refine-content/stream")
+@limiter.limit("30/minute")  # Same budget as /refine-content
+async def refine_post_content_stream(payload: RefineRequest, request: Request, caller: str = Depends(identify_caller)):
+    """
+    Refine existing content, streamed as Server-Sent Events
+    
+    "delta" events ({"delta"}) carry the text as it is written, then "done"
+    the same result /refine-content returns (or "error").
+    Rate limited: 30 requests per minute
+    """
+    await _check_before_streaming()
+    
+    async def run(report):
+        with usage_caller(caller):
+            return await refine_content(
+                original_content=payload.original_content,
+                platform=payload.platform,
+                instructions=payload.instructions,
+                progress_callback=report
+            )
+    
+    return StreamingResponse(progress_events(run), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get("/usage")
+async def get_usage(caller: str = Depends(identify_caller)):
+    """
+    Today's AI usage of the caller (tokens, images per provider) and what is
+    left of its daily quotas (null = unlimited)
+    """
+    return usage_report(caller)
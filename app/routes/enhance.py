@@ -1,11 +1,12 @@
 """
 Prompt enhancement endpoint
 """
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 from app.services.ai_service import enhance_user_prompt
+from app.routes.ai_content import identify_caller
 
-router = APIRouter(prefix="/api", tags=["enhance"])
+router = APIRouter(prefix="/api", tags=["enhance"], dependencies=[Depends(identify_caller)])
 
 
 class EnhancePromptRequest(BaseModel):
@@ -26,6 +27,8 @@ async def enhance_prompt(request: EnhancePromptRequest):
             image_style=request.image_style
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1,13 +1,15 @@
 """
 Health check and token verification endpoints
 """
+import os
+import asyncio
 from fastapi import APIRouter, HTTPException
 from fastapi.responses import JSONResponse
-import httpx
 from app.config import settings
 from app.clients.twitter import get_twitter_v1_client
-from app.clients.reddit import get_reddit_client
-from app.services.instagram_service import get_instagram_account_info
+from app.services.token_verification_service import token_status_cache
+from app.utils.runtime import loop_lag_monitor, executor_stats, outbound_snapshot
+from app.utils.circuit_breaker import breaker_states
 
 router = APIRouter(prefix="/api", tags=["health"])
 
@@ -16,105 +18,74 @@ router = APIRouter(prefix="/api", tags=["health"])
 async def health_check():
     """
     Health check endpoint
+    
+    Includes the state of each platform/provider circuit breaker
+    (closed, open or half_open).
     """
-    return {"status": "ok", "message": "Server is running"}
+    return {"status": "ok", "message": "Server is running", "circuit_breakers": breaker_states()}
 
 
-@router.get("/verify-token")
-async def verify_token():
+@router.get("/ready")
+async def readiness_check():
     """
-    Verify all platform token status
+    Readiness check for load balancers
+    
+    Reports event-loop lag, scheduler state, executor queues, outbound calls
+    and the last platform latencies. Reads only in-memory state, so it is
+    cheap to poll. Returns 503 when the server should not take traffic.
     """
-    facebook_status = {"valid": False, "pageInfo": None}
-    instagram_status = {"valid": False, "pageInfo": None}
-    twitter_status = {"valid": False, "pageInfo": None}
-    reddit_status = {"valid": False, "pageInfo": None}
+    from app.scheduler.scheduler import scheduler, job_executor, leadership
+    from app.services.credentials_service import get_credentials_file_path
     
-    async with httpx.AsyncClient() as client:
-        # Verify Facebook token
-        try:
-            fb_response = await client.get(
-                f"{settings.FACEBOOK_GRAPH_URL}/me",
-                params={"access_token": settings.FACEBOOK_ACCESS_TOKEN}
-            )
-            fb_response.raise_for_status()
-            fb_data = fb_response.json()
-            facebook_status = {
-                "valid": True,
-                "pageInfo": fb_data
-            }
-        except httpx.HTTPError as e:
-            print(f"Facebook token error: {e}")
-            facebook_status = {
-                "valid": False,
-                "error": str(e)
-            }
-        
-        # Verify Instagram configuration
-        try:
-            ig_account_id, username = await get_instagram_account_info()
-            instagram_status = {
-                "valid": True,
-                "pageInfo": {
-                    "id": ig_account_id,
-                    "username": username
-                }
-            }
-        except Exception as e:
-            print(f"Instagram configuration error: {e}")
-            instagram_status = {
-                "valid": False,
-                "error": str(e)
-            }
+    loop = asyncio.get_running_loop()
+    loop_stats = loop_lag_monitor.snapshot()
     
-    # Verify Twitter configuration
-    try:
-        twitter_client = get_twitter_v1_client()
-        if twitter_client:
-            user = twitter_client.verify_credentials()
-            twitter_status = {
-                "valid": True,
-                "pageInfo": {
-                    "id": user.id,
-                    "username": user.screen_name
-                }
-            }
-        else:
-            twitter_status = {"valid": False, "error": "Credentials not configured"}
-    except Exception as e:
-        print(f"Twitter configuration error: {e}")
-        twitter_status = {
-            "valid": False,
-            "error": str(e)
-        }
+    scheduler_running = scheduler.running
+    scheduler_stats = {
+        "running": scheduler_running,
+        "pending_jobs": len(scheduler.get_jobs()) if scheduler_running else 0,
+        **leadership.snapshot(),
+        "executor": executor_stats(getattr(job_executor, "_pool", None))
+    }
     
-    # Verify Reddit configuration
-    try:
-        reddit_client = get_reddit_client()
-        if reddit_client:
-            user = reddit_client.user.me()
-            reddit_status = {
-                "valid": True,
-                "pageInfo": {
-                    "name": user.name,
-                    "id": user.id
-                }
-            }
-        else:
-            reddit_status = {"valid": False, "error": "Credentials not configured"}
-    except Exception as e:
-        print(f"Reddit configuration error: {e}")
-        reddit_status = {
-            "valid": False,
-            "error": str(e)
-        }
+    # Missing is fine (env credentials are used), unreadable is not
+    credentials_path = get_credentials_file_path()
+    credentials_ok = not os.path.exists(credentials_path) or os.access(credentials_path, os.R_OK)
+    
+    problems = []
+    # A standby worker doesn't run jobs by design (another process leads)
+    if not scheduler_running and not leadership.standby:
+        problems.append("scheduler not running")
+    if loop_stats["lag_ms"] > settings.READY_MAX_LOOP_LAG_MS:
+        problems.append(f"event loop lag {loop_stats['lag_ms']}ms")
+    if not credentials_ok:
+        problems.append("credentials file unreadable")
     
-    return {
-        "facebook": facebook_status,
-        "instagram": instagram_status,
-        "twitter": twitter_status,
-        "reddit": reddit_status
+    body = {
+        "status": "ready" if not problems else "not_ready",
+        "problems": problems,
+        "event_loop": loop_stats,
+        "scheduler": scheduler_stats,
+        "executors": {
+            # asyncio.to_thread pool used for tweepy/praw/Cloudinary calls
+            "default": executor_stats(getattr(loop, "_default_executor", None))
+        },
+        "outbound": outbound_snapshot(),
+        "credentials": {"readable": credentials_ok}
     }
+    return JSONResponse(status_code=200 if not problems else 503, content=body)
+
+
+@router.get("/verify-token")
+async def verify_token(refresh: bool = False):
+    """
+    Verify all platform token status
+    
+    Platforms are checked concurrently and the result is cached; stale
+    results are served immediately while a refresh runs in the background.
+    Pass ?refresh=true to wait for a new check.
+    """
+    return await token_status_cache.get(force_refresh=refresh)
 
 
 @router.get("/verify-twitter")
@@ -129,7 +100,7 @@ async def verify_twitter():
             "error": "Twitter credentials not configured"
         })
     try:
-        user = api_v1.verify_credentials()
+        user = await asyncio.to_thread(api_v1.verify_credentials)
         if user is None:
             return {"valid": False, "error": "verify_credentials returned None"}
         return {"valid": True, "user": {"id": str(user.id), "name": user.name, "screen_name": user.screen_name}}
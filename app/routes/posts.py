@@ -3,24 +3,48 @@ Posts API endpoints
 """
 import os
 import json
+import asyncio
+import logging
 import uuid
 import aiofiles
 from datetime import datetime
 from pathlib import Path
-from fastapi import APIRouter, File, UploadFile, Form, HTTPException, Request
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from typing import Optional
+from fastapi import APIRouter, File, UploadFile, Form, Header, HTTPException, Request
+from fastapi.responses import JSONResponse
 from apscheduler.triggers.date import DateTrigger
 from app.config import settings
-from app.services.facebook_service import post_photo_to_facebook
-from app.services.instagram_service import post_photo_to_instagram
-from app.services.twitter_service import post_photo_to_twitter
-from app.services.reddit_service import post_photo_to_reddit
+from app.services.publish_service import publish_post, summarize_results
+from app.services.outbox_service import get_outbox, outbox_workers, job_status
 from app.scheduler.scheduler import scheduler, execute_scheduled_post
-from app.scheduler.storage import load_scheduled_posts, save_scheduled_posts
+from app.scheduler.storage import load_scheduled_posts, add_scheduled_post_once
+from app.utils.profiling import span
+from app.services.idempotency_service import idempotency_key
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["posts"])
-limiter = Limiter(key_func=get_remote_address)
+
+
+def _already_scheduled(post: dict) -> dict:
+    """Response for a scheduling request whose key already created a post"""
+    return {
+        "success": True,
+        "message": "Post already scheduled with this idempotency key",
+        "scheduled": True,
+        "post_id": post["id"],
+        "scheduled_time": post["scheduled_time"]
+    }
+
+
+def _job_accepted(job: dict) -> JSONResponse:
+    """202 response for a publish job in the outbox"""
+    status_url = f"/api/post/jobs/{job['id']}"
+    return JSONResponse(
+        status_code=202,
+        content={"success": True, "queued": True, "status_url": status_url, **job_status(job)},
+        headers={"Location": status_url}
+    )
 
 
 @router.post("/post")
@@ -28,12 +52,28 @@ async def create_post(
     photo: UploadFile = File(...),
     caption: str = Form(""),
     platforms: str = Form(None),
-    scheduled_time: str = Form(None)
+    scheduled_time: str = Form(None),
+    idempotency_key_field: str = Form(None, alias="idempotency_key"),
+    idempotency_key_header: Optional[str] = Header(None, alias="Idempotency-Key"),
+    prefer: Optional[str] = Header(None)
 ):
     """
     Post a photo with caption to selected platforms (immediately or scheduled)
     Rate limited: 30 requests per minute (applied at app level)
+    
+    Send an idempotency key (Idempotency-Key header or idempotency_key field)
+    to make retries safe: a platform that already accepted the post is not
+    posted to again and its stored result is returned, and a scheduled post
+    is created only once per key.
+    
+    Send "Prefer: respond-async" (or set PUBLISH_OUTBOX_DEFAULT) to publish
+    through the outbox: the job is stored and 202 is returned at once with a
+    job id; GET /api/post/jobs/{job_id} returns the results when done.
     """
+    client_key = idempotency_key_header or idempotency_key_field
+    use_outbox = not scheduled_time and (
+        settings.PUBLISH_OUTBOX_DEFAULT or "respond-async" in (prefer or "").lower()
+    )
     # Validate file type
     if photo.content_type not in settings.ALLOWED_EXTENSIONS:
         raise HTTPException(
@@ -49,17 +89,32 @@ async def create_post(
             detail="File too large. Maximum size is 10MB."
         )
     
+    # A retried scheduling request returns the post created by the first one
+    if scheduled_time and client_key:
+        existing = next((p for p in load_scheduled_posts() if p.get("idempotency_key") == client_key), None)
+        if existing:
+            return _already_scheduled(existing)
+    
+    # A retried outbox request returns the job created by the first one
+    if use_outbox and client_key:
+        existing = await asyncio.to_thread(get_outbox().get_by_key, client_key)
+        if existing:
+            return _job_accepted(existing)
+    
     # Save file temporarily
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"{timestamp}_{photo.filename}"
+    # Unique per upload: outbox jobs keep their image until published
+    filename = f"{timestamp}_{uuid.uuid4().hex[:8]}_{photo.filename}"
     file_path = settings.UPLOAD_DIR / filename
     
     try:
         # Write file
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(contents)
+        with span("upload.write", bytes=len(contents)):
+            async with aiofiles.open(file_path, 'wb') as f:
+                await f.write(contents)
         
-        print(f"Processing upload: {{'filename': '{filename}', 'caption': '{caption}'}}")
+        logger.info("Processing upload %s", filename)
+        logger.debug("Upload caption: %.80s", caption)
         
         # Parse platforms selection
         selected = {"facebook": True, "instagram": True, "twitter": True, "reddit": True}
@@ -86,12 +141,15 @@ async def create_post(
                     "platforms": selected,
                     "scheduled_time": scheduled_time,
                     "created_at": datetime.now().isoformat(),
-                    "status": "scheduled"  # Track status
+                    "status": "scheduled",  # Track status
+                    "idempotency_key": client_key
                 }
                 
-                posts = load_scheduled_posts()
-                posts.append(scheduled_post)
-                save_scheduled_posts(posts)
+                # Checked again under the storage lock: a concurrent retry may have won
+                stored = add_scheduled_post_once(scheduled_post, client_key)
+                if stored["id"] != post_id:
+                    os.remove(file_path)
+                    return _already_scheduled(stored)
                 
                 # Schedule the job
                 scheduler.add_job(
@@ -102,7 +160,7 @@ async def create_post(
                     replace_existing=True
                 )
                 
-                print(f"📅 Post scheduled for {schedule_dt}")
+                logger.info("📅 Post %s scheduled for %s", post_id, schedule_dt)
                 
                 return {
                     "success": True,
@@ -118,110 +176,34 @@ async def create_post(
                     os.remove(file_path)
                 raise HTTPException(status_code=400, detail=f"Failed to schedule post: {str(e)}")
 
-        # Execute immediate posting
-        results = {
-            "facebook": {"success": False, "error": None},
-            "instagram": {"success": False, "error": None},
-            "twitter": {"success": False, "error": None},
-            "reddit": {"success": False, "error": None}
-        }
-        
-        # Post to Facebook
-        if selected.get("facebook"):
-            try:
-                fb_result = await post_photo_to_facebook(str(file_path), caption)
-                results["facebook"] = {
-                    "success": True,
-                    "postId": fb_result.get("id"),
-                    "postLink": f"https://www.facebook.com/{fb_result.get('post_id')}" if fb_result.get('post_id') else None
-                }
-                print("✅ Posted to Facebook successfully")
-            except Exception as fb_error:
-                results["facebook"] = {
-                    "success": False,
-                    "error": str(fb_error)
-                }
-                print(f"❌ Facebook posting failed: {fb_error}")
+        # Outbox mode: persist the job and let the workers publish it
+        if use_outbox:
+            payload = {"image_path": str(file_path), "caption": caption, "platforms": selected}
+            job = await asyncio.to_thread(get_outbox().enqueue, payload, client_key)
+            if job["payload"]["image_path"] != payload["image_path"]:
+                # A concurrent request with the same key queued its job first
+                os.remove(file_path)
+                return _job_accepted(job)
+            outbox_workers.notify()
+            logger.info("📥 Queued outbox job %s", job["id"])
+            return _job_accepted(job)
         
-        # Post to Instagram
-        if selected.get("instagram"):
-            try:
-                ig_result = await post_photo_to_instagram(str(file_path), caption)
-                results["instagram"] = {
-                    "success": True,
-                    "postId": ig_result.get("id")
-                }
-                print("✅ Posted to Instagram successfully")
-            except Exception as ig_error:
-                results["instagram"] = {
-                    "success": False,
-                    "error": str(ig_error)
-                }
-                print(f"❌ Instagram posting failed: {ig_error}")
-
-        # Post to Twitter
-        if selected.get("twitter"):
-            try:
-                tw_result = await post_photo_to_twitter(str(file_path), caption)
-                results["twitter"] = {
-                    "success": True,
-                    "postId": tw_result.get("id")
-                }
-                print("✅ Posted photo to Twitter successfully")
-            except Exception as tw_error:
-                results["twitter"] = {
-                    "success": False,
-                    "error": str(tw_error)
-                }
-                print(f"❌ Twitter photo posting failed: {tw_error}")
-
-        # Post to Reddit
-        if selected.get("reddit"):
-            try:
-                rd_result = await post_photo_to_reddit(str(file_path), caption)
-                results["reddit"] = {
-                    "success": True,
-                    "postId": rd_result.get("id"),
-                    "postUrl": rd_result.get("url")
-                }
-                print("✅ Posted photo to Reddit successfully")
-            except Exception as rd_error:
-                results["reddit"] = {
-                    "success": False,
-                    "error": str(rd_error)
-                }
-                print(f"❌ Reddit photo posting failed: {rd_error}")
+        # Execute immediate posting
+        # Without a client key, retries inside this request still share one key
+        with idempotency_key(client_key or uuid.uuid4().hex):
+            results = await publish_post(str(file_path), caption, selected)
         
         # Clean up uploaded file
         os.remove(file_path)
         
-        # Determine overall success
-        fb_success = results["facebook"]["success"]
-        ig_success = results["instagram"]["success"]
-        tw_success = results["twitter"]["success"]
-        rd_success = results["reddit"]["success"]
-        
-        successes = []
-        if fb_success: successes.append("Facebook")
-        if ig_success: successes.append("Instagram")
-        if tw_success: successes.append("Twitter")
-        if rd_success: successes.append("Reddit")
-        
-        if len(successes) == 4:
-            message = "🎉 Photo posted successfully to all platforms!"
-        elif len(successes) > 0:
-            message = f"🎉 Posted to {', '.join(successes)}. Others failed."
-        else:
+        summary = summarize_results(results)
+        if not summary["success"]:
             raise HTTPException(
                 status_code=500,
                 detail="Failed to post to any platform"
             )
         
-        return {
-            "success": fb_success or ig_success or tw_success or rd_success,
-            "message": message,
-            "results": results
-        }
+        return summary
         
     except HTTPException:
         if file_path.exists():
@@ -231,9 +213,26 @@ async def create_post(
         if file_path.exists():
             os.remove(file_path)
         
-        print(f"Error in /api/post: {e}")
+        logger.exception("Error in /api/post: %s", e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to post: {str(e)}"
         )
 
+
+
+@router.get("/post/jobs/{job_id}")
+async def get_post_job(job_id: str):
+    """
+    Get the status of an outbox publish job
+    
+    Status is "queued", "running", "done" or "failed"; finished jobs carry
+    the same result /api/post returns for immediate posts.
+    
+    Args:
+        job_id: Job id returned with the 202 response
+    """
+    job = await asyncio.to_thread(get_outbox().get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Publish job not found")
+    return job_status(job)
@@ -3,8 +3,8 @@ Scheduled posts API endpoints
 """
 import os
 from fastapi import APIRouter, HTTPException
-from app.scheduler.storage import load_scheduled_posts, save_scheduled_posts
-from app.scheduler.scheduler import scheduler
+from app.scheduler.storage import load_scheduled_posts, remove_scheduled_post
+from app.scheduler.scheduler import scheduler, requeue_scheduled_post, cancel_retry
 
 router = APIRouter(prefix="/api", tags=["scheduled"])
 
@@ -13,6 +13,10 @@ router = APIRouter(prefix="/api", tags=["scheduled"])
 async def get_scheduled_posts():
     """
     Get all scheduled posts
+    
+    Posts whose platforms failed carry a "retry" object: state ("scheduled",
+    "dead_letter" or "done"), attempts, pending_platforms, dead_platforms,
+    next_attempt_at and the last error per platform.
     """
     posts = load_scheduled_posts()
     return {"scheduled_posts": posts}
@@ -33,10 +37,10 @@ async def delete_scheduled_post(post_id: str):
             print(f"✅ Removed job {post_id} from scheduler")
         except Exception as e:
             print(f"Job {post_id} not found in scheduler: {e}")
+        cancel_retry(post_id)
         
-        # Load posts and remove the one with matching ID
-        posts = load_scheduled_posts()
-        post_to_delete = next((p for p in posts if p["id"] == post_id), None)
+        # Remove the post from storage
+        post_to_delete = remove_scheduled_post(post_id)
         
         if not post_to_delete:
             raise HTTPException(status_code=404, detail="Scheduled post not found")
@@ -46,10 +50,6 @@ async def delete_scheduled_post(post_id: str):
             os.remove(post_to_delete["image_path"])
             print(f"✅ Deleted image file: {post_to_delete['image_path']}")
         
-        # Remove from posts list
-        posts = [p for p in posts if p["id"] != post_id]
-        save_scheduled_posts(posts)
-        
         print(f"✅ Deleted scheduled post: {post_id}")
         
         return {"success": True, "message": "Scheduled post deleted successfully"}
@@ -59,3 +59,23 @@ async def delete_scheduled_post(post_id: str):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to delete scheduled post: {str(e)}")
 
+
+
+@router.post("/scheduled-posts/{post_id}/retry")
+async def retry_scheduled_post(post_id: str):
+    """
+    Retry the failed platforms of a scheduled post now
+    
+    Only platforms that failed are posted to again; dead-lettered platforms
+    get a fresh set of attempts.
+    
+    Args:
+        post_id: ID of the scheduled post
+    """
+    try:
+        post = requeue_scheduled_post(post_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if post is None:
+        raise HTTPException(status_code=404, detail="Scheduled post not found")
+    return {"success": True, "post_id": post_id, "retry": post["retry"]}
@@ -0,0 +1,39 @@
+"""
+Telegram webhook endpoint (used when TELEGRAM_WEBHOOK_URL is configured)
+"""
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Header, HTTPException, Request
+
+router = APIRouter(prefix="/api", tags=["telegram"])
+
+
+@router.post("/telegram/webhook")
+async def telegram_webhook(
+    request: Request,
+    x_telegram_bot_api_secret_token: Optional[str] = Header(None)
+):
+    """
+    Receive an update pushed by Telegram and queue it for the bot
+    
+    Responds as soon as the update is queued so Telegram is never held
+    open while a handler (e.g. AI generation) runs.
+    """
+    # Lazy import so the API does not load the bot unless webhook mode is used
+    from app.services.telegram_bot_service import telegram_bot
+    
+    if not telegram_bot.webhook_active:
+        raise HTTPException(status_code=503, detail="Telegram webhook mode is not enabled")
+    
+    # The secret registered with set_webhook (configured or generated at startup)
+    secret = telegram_bot.webhook_secret
+    if not secret or not hmac.compare_digest((x_telegram_bot_api_secret_token or "").encode(), secret.encode()):
+        raise HTTPException(status_code=403, detail="Invalid webhook secret token")
+    
+    try:
+        data = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    
+    update = await telegram_bot.process_webhook_update(data)
+    return {"ok": True, "update_id": update.update_id if update else None}
@@ -0,0 +1,107 @@
+"""
+Scheduler leadership
+Every API worker, the standalone bot and the API itself may start the
+scheduler; an exclusive lock on a shared file decides which one process runs
+jobs. The OS drops the lock when the leader exits (even on a crash), and a
+standby process takes over at its next attempt.
+"""
+import os
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, every process leads (single-process setups only)
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerLeadership:
+    """
+    Exclusive file lock held by the process that runs scheduled jobs
+    """
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = Path(lock_path)
+        self.is_leader = False
+        # True once this process tried and lost; it then keeps retrying in the background
+        self.standby = False
+        self._file = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def try_acquire(self) -> bool:
+        """
+        Take the lock if no other process holds it
+
+        Returns:
+            bool: True if this process is (now) the leader
+        """
+        if self.is_leader:
+            return True
+        if fcntl is None:
+            logger.warning("⚠️ File locks unavailable; this process runs scheduled jobs unconditionally")
+            self.is_leader = True
+            return True
+
+        self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.lock_path, "a+")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            self.standby = True
+            return False
+
+        # Record who leads, for operators looking at the lock file
+        lock_file.seek(0)
+        lock_file.truncate()
+        lock_file.write(f"{os.getpid()}\n")
+        lock_file.flush()
+        self._file = lock_file
+        self.is_leader = True
+        self.standby = False
+        return True
+
+    def wait_for_leadership(self, on_acquired: Callable[[], None], interval: float):
+        """
+        Keep trying to take the lock in a background thread
+
+        Args:
+            on_acquired: Called once (from the thread) when this process becomes leader
+            interval: Seconds between attempts
+        """
+        if self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(interval):
+                if self.try_acquire():
+                    logger.info("👑 Took over scheduler leadership (pid %d)", os.getpid())
+                    try:
+                        on_acquired()
+                    except Exception as e:
+                        logger.exception("❌ Failed to start scheduler after taking leadership: %s", e)
+                    return
+
+        self._thread = threading.Thread(target=run, name="scheduler-leadership", daemon=True)
+        self._thread.start()
+
+    def release(self):
+        """Give up leadership (on shutdown) and stop waiting for it"""
+        self._stop.set()
+        if self._file is not None:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self.is_leader = False
+
+    def snapshot(self) -> dict:
+        return {
+            "role": "leader" if self.is_leader else ("standby" if self.standby else "none"),
+            "lock_file": str(self.lock_path)
+        }
@@ -3,24 +3,109 @@ APScheduler configuration and scheduled post execution
 """
 import os
 import asyncio
-from datetime import datetime
+import logging
+from datetime import datetime, timedelta
+from typing import Optional
 from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.events import EVENT_JOB_SUBMITTED
 from apscheduler.triggers.date import DateTrigger
-from app.scheduler.storage import load_scheduled_posts, save_scheduled_posts
+from apscheduler.jobstores.base import JobLookupError
+from app.config import settings
+from app.scheduler.storage import load_scheduled_posts, modify_scheduled_posts, update_scheduled_post
+from app.scheduler.leader import SchedulerLeadership
 from app.services.facebook_service import post_photo_to_facebook
 from app.services.instagram_service import post_photo_to_instagram
 from app.services.twitter_service import post_photo_to_twitter
 from app.services.reddit_service import post_photo_to_reddit
+from app.services.idempotency_service import idempotency_key, PublishInProgress
+from app.utils.circuit_breaker import CircuitOpenError
+from app.utils.errors import is_retryable, retry_after
+from app.utils.metrics import SCHEDULER_LAG_SECONDS
+from app.utils.log_config import request_id_var
+
+logger = logging.getLogger(__name__)
+
+# Job executor (kept as a module attribute so readiness can report its queue)
+job_executor = ThreadPoolExecutor(max_workers=10)
 
 # Global scheduler instance
-scheduler = BackgroundScheduler()
+scheduler = BackgroundScheduler(executors={"default": job_executor})
 
 
-def init_scheduler():
-    """Initialize and start the background scheduler"""
+def _record_scheduler_lag(event):
+    """Record how late a job was handed to the executor"""
+    for run_time in event.scheduled_run_times:
+        now = datetime.now(run_time.tzinfo)
+        SCHEDULER_LAG_SECONDS.observe(max(0.0, (now - run_time).total_seconds()))
+
+
+scheduler.add_listener(_record_scheduler_lag, EVENT_JOB_SUBMITTED)
+
+
+# Only the process holding this lock runs jobs (API workers, standalone bot)
+leadership = SchedulerLeadership(settings.SCHEDULER_LOCK_FILE)
+
+# Leader-only job that picks up posts scheduled by other processes
+SYNC_JOB_ID = "scheduler:sync-storage"
+
+# Leader-only job that collects finished OpenAI caption batches
+BATCH_POLL_JOB_ID = "scheduler:poll-generation-batches"
+
+
+# Posts this process is publishing right now (a "publishing" post not in here was orphaned)
+_active_posts = set()
+
+
+def _start_leading():
+    """Start running jobs in this process"""
     if not scheduler.running:
         scheduler.start()
-        print("✅ Scheduler initialized and started")
+    scheduler.add_job(
+        func=sync_jobs_from_storage,
+        trigger="interval",
+        seconds=settings.SCHEDULER_SYNC_INTERVAL,
+        id=SYNC_JOB_ID,
+        replace_existing=True
+    )
+    scheduler.add_job(
+        func=poll_generation_batches,
+        trigger="interval",
+        seconds=settings.BATCH_POLL_INTERVAL,
+        id=BATCH_POLL_JOB_ID,
+        replace_existing=True
+    )
+
+
+def _take_over():
+    """A standby process became leader: run what the old leader left behind"""
+    _start_leading()
+    restore_scheduled_jobs()
+
+
+def init_scheduler():
+    """
+    Initialize and start the background scheduler if this process wins
+    leadership; otherwise stand by and take over when the leader exits
+    """
+    if scheduler.running:
+        return
+    if leadership.try_acquire():
+        _start_leading()
+        logger.info("✅ Scheduler initialized and started (leader, pid %d)", os.getpid())
+    else:
+        logger.info(
+            "⏸️ Another process runs scheduled jobs (%s); standing by (pid %d)",
+            settings.SCHEDULER_LOCK_FILE, os.getpid()
+        )
+        leadership.wait_for_leadership(_take_over, settings.SCHEDULER_LEADER_RETRY_SECONDS)
+
+
+def shutdown_scheduler():
+    """Stop running jobs and hand leadership to a standby process"""
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+    leadership.release()
 
 
 def run_async_in_thread(coro):
@@ -46,6 +131,186 @@ def run_async_in_thread(coro):
         pass
 
 
+# Display names of the platforms a scheduled post can go to
+PLATFORM_NAMES = {
+    "facebook": "Facebook",
+    "instagram": "Instagram",
+    "twitter": "Twitter",
+    "reddit": "Reddit"
+}
+
+
+def _publisher(platform: str):
+    """Publish function of a platform (looked up per call so tests can patch it)"""
+    return {
+        "facebook": post_photo_to_facebook,
+        "instagram": post_photo_to_instagram,
+        "twitter": post_photo_to_twitter,
+        "reddit": post_photo_to_reddit
+    }[platform]
+
+
+def _retry_job_id(post_id: str) -> str:
+    return f"{post_id}:retry"
+
+
+async def _publish_to_platforms(post_id: str, image_path: str, caption: str, platforms: list) -> dict:
+    """
+    Post to the given platforms, one after another
+    
+    Args:
+        post_id: Scheduled post ID (idempotency key, so a re-run never posts twice)
+        image_path: Path to the image file
+        caption: Post caption
+        platforms: Platform keys to post to
+        
+    Returns:
+        dict: platform -> {"success": True, "postId": ...} or {"success": False, "error": ..., "exception": ...}
+    """
+    outcomes = {}
+    with idempotency_key(post_id):
+        for platform in platforms:
+            name = PLATFORM_NAMES[platform]
+            try:
+                result = await _publisher(platform)(image_path, caption)
+                outcomes[platform] = {"success": True, "postId": result.get("id")}
+                logger.info("✅ Posted to %s", name)
+            except Exception as e:
+                outcomes[platform] = {"success": False, "error": str(e), "exception": e}
+                logger.warning("❌ %s failed: %s", name, e)
+    return outcomes
+
+
+def _retry_delay(attempt: int, errors: list) -> float:
+    """
+    Backoff before the next attempt: exponential, but never sooner than a
+    platform's Retry-After or an open circuit breaker allows
+    
+    Args:
+        attempt: Number of attempts made so far (1 after the scheduled run)
+        errors: Exceptions of the platforms that will be retried
+    """
+    delay = min(settings.SCHEDULED_RETRY_MAX_DELAY, settings.SCHEDULED_RETRY_BASE_DELAY * 2 ** (attempt - 1))
+    for error in errors:
+        wait = retry_after(error)
+        if wait is not None:
+            delay = max(delay, wait)
+    return delay
+
+
+def _should_retry(error: Exception) -> bool:
+    """
+    Transient failures, open circuit breakers and publishes still held by an
+    earlier (e.g. crashed) attempt are worth another attempt later
+    """
+    return isinstance(error, (CircuitOpenError, PublishInProgress)) or is_retryable(error)
+
+
+def _record_attempt(post: dict, outcomes: dict) -> None:
+    """
+    Merge one attempt's outcomes into a post record and plan the next attempt
+    
+    Platforms that succeed are never attempted again. Failed platforms are
+    retried with backoff while the error is transient and attempts remain;
+    the rest end up in the dead-letter list (see retry state "dead_letter").
+    
+    Args:
+        post: Scheduled post record (changed in place)
+        outcomes: Result of _publish_to_platforms
+    """
+    now = datetime.now()
+    results = post.setdefault("results", {})
+    retry_state = post.get("retry") or {"attempts": 0, "dead_platforms": [], "errors": {}}
+    retry_state["attempts"] += 1
+    
+    pending, pending_errors = [], []
+    for platform, outcome in outcomes.items():
+        error = outcome.pop("exception", None)
+        results[platform] = outcome
+        if outcome["success"]:
+            retry_state["errors"].pop(platform, None)
+            continue
+        retry_state["errors"][platform] = outcome["error"]
+        if _should_retry(error) and retry_state["attempts"] < settings.SCHEDULED_RETRY_MAX_ATTEMPTS:
+            pending.append(platform)
+            pending_errors.append(error)
+        elif platform not in retry_state["dead_platforms"]:
+            retry_state["dead_platforms"].append(platform)
+    
+    selected = [p for p, enabled in post["platforms"].items() if enabled]
+    failed = [p for p in selected if not results.get(p, {}).get("success")]
+    post["status"] = "posted"
+    post.setdefault("posted_at", now.isoformat())
+    post["posted_to"] = len(selected) - len(failed)
+    post["failed_platforms"] = [PLATFORM_NAMES.get(p, p) for p in failed]
+    
+    if not failed:
+        if post.get("retry"):
+            post["retry"] = {**retry_state, "state": "done", "pending_platforms": [], "next_attempt_at": None}
+        return
+    
+    retry_state["pending_platforms"] = pending
+    if pending:
+        retry_state["state"] = "scheduled"
+        next_attempt = now + timedelta(seconds=_retry_delay(retry_state["attempts"], pending_errors))
+        retry_state["next_attempt_at"] = next_attempt.isoformat()
+    else:
+        retry_state["state"] = "dead_letter"
+        retry_state["next_attempt_at"] = None
+    post["retry"] = retry_state
+
+
+def _schedule_retry(post: dict) -> None:
+    """Add (or replace) the retry job of a post whose retry state is scheduled"""
+    retry_state = post.get("retry") or {}
+    if retry_state.get("state") != "scheduled":
+        return
+    run_at = max(datetime.fromisoformat(retry_state["next_attempt_at"]), datetime.now())
+    scheduler.add_job(
+        func=retry_scheduled_post,
+        trigger=DateTrigger(run_date=run_at),
+        args=[post["id"]],
+        id=_retry_job_id(post["id"]),
+        replace_existing=True
+    )
+    logger.info(
+        "🔁 Retrying %s of post %s at %s (attempt %d/%d)",
+        ", ".join(retry_state["pending_platforms"]), post["id"], run_at,
+        retry_state["attempts"] + 1, settings.SCHEDULED_RETRY_MAX_ATTEMPTS
+    )
+
+
+async def _run_attempt(post_id: str, image_path: str, caption: str, platforms: list):
+    """Post to `platforms`, store the outcome and schedule a retry if needed"""
+    outcomes = await _publish_to_platforms(post_id, image_path, caption, platforms)
+    post = update_scheduled_post(post_id, lambda p: _record_attempt(p, outcomes))
+    if post is None:
+        logger.warning("⚠️ Scheduled post %s was deleted while posting", post_id)
+        return
+    
+    logger.info(
+        "✅ Scheduled post %s done: %d platform(s) succeeded, failed: %s",
+        post_id, post["posted_to"], ", ".join(post["failed_platforms"]) or "none"
+    )
+    retry_state = post.get("retry") or {}
+    if retry_state.get("state") == "dead_letter":
+        logger.error(
+            "☠️ Giving up on %s for post %s: %s",
+            ", ".join(retry_state["dead_platforms"]), post_id, retry_state["errors"]
+        )
+    _schedule_retry(post)
+
+
+class _AlreadyHandled(Exception):
+    """The post isn't waiting to be published any more (its status is the message)"""
+
+
+def _claim_for_publishing(post: dict):
+    if post.get("status", "scheduled") != "scheduled":
+        raise _AlreadyHandled(post.get("status"))
+    post["status"] = "publishing"
+
+
 async def execute_scheduled_post_async(post_id: str, image_path: str, caption: str, platforms: dict):
     """
     Execute a scheduled post (async version)
@@ -56,97 +321,86 @@ async def execute_scheduled_post_async(post_id: str, image_path: str, caption: s
         caption: Post caption
         platforms: Dict of selected platforms
     """
+    # Correlate every log line of this run with the post
+    request_id_var.set(f"post-{post_id[:8]}")
     try:
-        print(f"\n{'='*60}")
-        print(f"EXECUTING SCHEDULED POST: {post_id}")
-        print(f"Time: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"Caption: {caption[:50]}...")
-        print(f"{'='*60}\n")
-        
-        results = {
-            "facebook": {"success": False, "error": None},
-            "instagram": {"success": False, "error": None},
-            "twitter": {"success": False, "error": None},
-            "reddit": {"success": False, "error": None}
-        }
-        
-        success_count = 0
-        failed_platforms = []
+        logger.info("Executing scheduled post %s", post_id)
+        logger.debug("Caption: %.50s", caption)
         
-        # Post to selected platforms
-        if platforms.get("facebook"):
-            try:
-                fb_result = await post_photo_to_facebook(image_path, caption)
-                results["facebook"] = {"success": True, "postId": fb_result.get("id")}
-                success_count += 1
-                print("✅ SUCCESS: Posted to Facebook")
-            except Exception as e:
-                results["facebook"] = {"success": False, "error": str(e)}
-                failed_platforms.append("Facebook")
-                print(f"❌ FAILED: Facebook - {e}")
-        
-        if platforms.get("instagram"):
-            try:
-                ig_result = await post_photo_to_instagram(image_path, caption)
-                results["instagram"] = {"success": True, "postId": ig_result.get("id")}
-                success_count += 1
-                print("✅ SUCCESS: Posted to Instagram")
-            except Exception as e:
-                results["instagram"] = {"success": False, "error": str(e)}
-                failed_platforms.append("Instagram")
-                print(f"❌ FAILED: Instagram - {e}")
+        # Claim the post, so a job added twice (e.g. by the storage sync) runs once
+        try:
+            post = update_scheduled_post(post_id, _claim_for_publishing)
+        except _AlreadyHandled as e:
+            logger.info("Scheduled post %s is already %s, skipping", post_id, e)
+            return
+        if post is None:
+            logger.warning("⚠️ Scheduled post %s no longer exists, skipping", post_id)
+            return
         
-        if platforms.get("twitter"):
-            try:
-                tw_result = await post_photo_to_twitter(image_path, caption)
-                results["twitter"] = {"success": True, "postId": tw_result.get("id")}
-                success_count += 1
-                print("✅ SUCCESS: Posted to Twitter")
-            except Exception as e:
-                results["twitter"] = {"success": False, "error": str(e)}
-                failed_platforms.append("Twitter")
-                print(f"❌ FAILED: Twitter - {e}")
+        selected = [p for p in PLATFORM_NAMES if platforms.get(p)]
+        _active_posts.add(post_id)
+        try:
+            await _run_attempt(post_id, image_path, caption, selected)
+        finally:
+            _active_posts.discard(post_id)
         
-        if platforms.get("reddit"):
-            try:
-                rd_result = await post_photo_to_reddit(image_path, caption)
-                results["reddit"] = {"success": True, "postId": rd_result.get("id")}
-                success_count += 1
-                print("✅ SUCCESS: Posted to Reddit")
-            except Exception as e:
-                results["reddit"] = {"success": False, "error": str(e)}
-                failed_platforms.append("Reddit")
-                print(f"❌ FAILED: Reddit - {e}")
+    except Exception as e:
+        logger.exception("❌ Error executing scheduled post %s: %s", post_id, e)
+
+
+async def resume_scheduled_post_async(post_id: str):
+    """
+    Finish a post left in "publishing" by a run that died (e.g. the old leader crashed)
+    
+    Runs under the post's idempotency key: platforms that already accepted it
+    return their stored result, and one interrupted mid-request is reported
+    as unknown instead of being posted to again.
+    
+    Args:
+        post_id: Unique identifier for the scheduled post
+    """
+    request_id_var.set(f"post-{post_id[:8]}")
+    try:
+        post = next((p for p in load_scheduled_posts() if p["id"] == post_id), None)
+        if post is None or post.get("status") != "publishing" or post_id in _active_posts:
+            return
         
-        # Summary
-        print(f"\n{'='*60}")
-        print(f"SCHEDULED POST EXECUTION SUMMARY")
-        print(f"Post ID: {post_id}")
-        print(f"Success: {success_count} platforms")
-        if failed_platforms:
-            print(f"Failed: {', '.join(failed_platforms)}")
-        print(f"{'='*60}\n")
+        results = post.get("results") or {}
+        remaining = [
+            p for p in PLATFORM_NAMES
+            if post["platforms"].get(p) and not results.get(p, {}).get("success")
+        ]
+        logger.info("▶️ Resuming interrupted post %s on %s", post_id, ", ".join(remaining) or "no platforms")
+        _active_posts.add(post_id)
+        try:
+            await _run_attempt(post_id, post["image_path"], post["caption"], remaining)
+        finally:
+            _active_posts.discard(post_id)
         
-        # Mark post as posted instead of deleting
-        posts = load_scheduled_posts()
-        for post in posts:
-            if post["id"] == post_id:
-                post["status"] = "posted"
-                post["posted_at"] = datetime.now().isoformat()
-                post["posted_to"] = success_count
-                post["failed_platforms"] = failed_platforms
-                break
-        save_scheduled_posts(posts)
+    except Exception as e:
+        logger.exception("❌ Error resuming scheduled post %s: %s", post_id, e)
+
+
+async def retry_scheduled_post_async(post_id: str):
+    """
+    Re-attempt the failed platforms of a scheduled post (async version)
+    
+    Args:
+        post_id: Unique identifier for the scheduled post
+    """
+    request_id_var.set(f"post-{post_id[:8]}")
+    try:
+        post = next((p for p in load_scheduled_posts() if p["id"] == post_id), None)
+        retry_state = (post or {}).get("retry") or {}
+        if retry_state.get("state") != "scheduled" or not retry_state.get("pending_platforms"):
+            logger.info("Nothing to retry for scheduled post %s", post_id)
+            return
         
-        print(f"✅ COMPLETED: Scheduled post {post_id} executed successfully")
-        print(f"   Posted to {success_count} platform(s)")
-        if failed_platforms:
-            print(f"   Failed: {', '.join(failed_platforms)}")
-        print(f"   Status updated to 'posted' in calendar")
-        print(f"\n")
+        logger.info("🔁 Retrying post %s on %s", post_id, ", ".join(retry_state["pending_platforms"]))
+        await _run_attempt(post_id, post["image_path"], post["caption"], retry_state["pending_platforms"])
         
     except Exception as e:
-        print(f"\n❌ CRITICAL ERROR executing scheduled post {post_id}: {e}\n")
+        logger.exception("❌ Error retrying scheduled post %s: %s", post_id, e)
 
 
 def execute_scheduled_post(post_id: str, image_path: str, caption: str, platforms: dict):
@@ -162,38 +416,211 @@ def execute_scheduled_post(post_id: str, image_path: str, caption: str, platform
     run_async_in_thread(execute_scheduled_post_async(post_id, image_path, caption, platforms))
 
 
-def restore_scheduled_jobs():
+def retry_scheduled_post(post_id: str):
+    """
+    Synchronous wrapper for retrying the failed platforms of a scheduled post
+    
+    Args:
+        post_id: Unique identifier for the scheduled post
+    """
+    run_async_in_thread(retry_scheduled_post_async(post_id))
+
+
+def resume_scheduled_post(post_id: str):
+    """
+    Synchronous wrapper for resuming an interrupted scheduled post
+    
+    Args:
+        post_id: Unique identifier for the scheduled post
+    """
+    run_async_in_thread(resume_scheduled_post_async(post_id))
+
+
+def requeue_scheduled_post(post_id: str) -> Optional[dict]:
+    """
+    Move the dead-lettered platforms of a post back into the retry queue
+    
+    Args:
+        post_id: Unique identifier for the scheduled post
+        
+    Returns:
+        dict: The updated post, or None if it doesn't exist
+        
+    Raises:
+        ValueError: The post has no failed platforms to retry
+    """
+    def requeue(post: dict):
+        retry_state = post.get("retry") or {}
+        platforms = retry_state.get("pending_platforms", []) + retry_state.get("dead_platforms", [])
+        if not platforms:
+            raise ValueError("Post has no failed platforms to retry")
+        # A manual requeue gets a fresh set of attempts
+        retry_state.update(
+            state="scheduled",
+            attempts=0,
+            pending_platforms=platforms,
+            dead_platforms=[],
+            next_attempt_at=datetime.now().isoformat()
+        )
+        post["retry"] = retry_state
+    
+    post = update_scheduled_post(post_id, requeue)
+    if post is not None:
+        _schedule_retry(post)
+    return post
+
+
+def cancel_retry(post_id: str):
+    """Remove the pending retry job of a post, if any"""
+    try:
+        scheduler.remove_job(_retry_job_id(post_id))
+    except JobLookupError:
+        pass
+
+
+def _local_time(value: str) -> datetime:
+    """Parse a stored ISO time as naive local time (like datetime.now())"""
+    parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def schedule_post_job(post: dict) -> datetime:
+    """
+    Add the job that publishes a stored post (overdue posts run right away)
+    
+    Args:
+        post: Scheduled post record
+    
+    Returns:
+        datetime: When the job runs
+    """
+    run_at = max(_local_time(post["scheduled_time"]), datetime.now())
+    scheduler.add_job(
+        func=execute_scheduled_post,
+        trigger=DateTrigger(run_date=run_at),
+        args=[post["id"], post["image_path"], post["caption"], post["platforms"]],
+        id=post["id"],
+        replace_existing=True
+    )
+    return run_at
+
+
+def schedule_resume_job(post: dict) -> None:
+    """Add the job that finishes a post left in "publishing" (runs right away)"""
+    scheduler.add_job(
+        func=resume_scheduled_post,
+        trigger=DateTrigger(run_date=datetime.now()),
+        args=[post["id"]],
+        id=post["id"],
+        replace_existing=True
+    )
+
+
+def sync_jobs_from_storage():
     """
-    Restore scheduled jobs from storage on server startup
+    Reconcile the leader's jobs with storage (runs every SCHEDULER_SYNC_INTERVAL)
+    
+    Posts scheduled or deleted through another process (a standby API worker,
+    the bot) only reach storage; this adds their jobs here and drops jobs of
+    posts that no longer exist. Posts left in "publishing" by a run that
+    died are resumed.
     """
     posts = load_scheduled_posts()
-    current_time = datetime.now()
+    job_ids = {job.id for job in scheduler.get_jobs()}
     
     for post in posts:
         try:
-            schedule_dt = datetime.fromisoformat(post["scheduled_time"].replace('Z', '+00:00'))
-            
-            # Only reschedule if the time is in the future
-            if schedule_dt > current_time:
-                scheduler.add_job(
-                    func=execute_scheduled_post,
-                    trigger=DateTrigger(run_date=schedule_dt),
-                    args=[post["id"], post["image_path"], post["caption"], post["platforms"]],
-                    id=post["id"],
-                    replace_existing=True
-                )
-                print(f"✅ Restored scheduled post {post['id']} for {schedule_dt}")
-            else:
-                # Remove expired scheduled posts
-                if os.path.exists(post["image_path"]):
-                    os.remove(post["image_path"])
-                print(f"⚠️ Removed expired scheduled post {post['id']}")
+            if post.get("status") == "scheduled" and post["id"] not in job_ids:
+                run_at = schedule_post_job(post)
+                logger.info("📥 Picked up scheduled post %s for %s", post["id"], run_at)
+            elif post.get("status") == "publishing" and post["id"] not in job_ids and post["id"] not in _active_posts:
+                schedule_resume_job(post)
+                logger.info("▶️ Picked up interrupted post %s", post["id"])
+            elif (post.get("retry") or {}).get("state") == "scheduled" and _retry_job_id(post["id"]) not in job_ids:
+                _schedule_retry(post)
         except Exception as e:
-            print(f"❌ Failed to restore scheduled post {post.get('id')}: {e}")
-    
-    # Clean up expired posts
-    posts = [p for p in posts if datetime.fromisoformat(p["scheduled_time"].replace('Z', '+00:00')) > current_time]
-    save_scheduled_posts(posts)
+            logger.error("❌ Failed to sync scheduled post %s: %s", post.get("id"), e)
     
-    print(f"✅ Restored {len(posts)} scheduled posts")
+    post_ids = {post["id"] for post in posts}
+    for job_id in job_ids - {SYNC_JOB_ID, BATCH_POLL_JOB_ID}:
+        post_id = job_id[:-len(":retry")] if job_id.endswith(":retry") else job_id
+        if post_id not in post_ids:
+            try:
+                scheduler.remove_job(job_id)
+                logger.info("🗑️ Dropped job %s of deleted post", job_id)
+            except JobLookupError:
+                pass
+
+
+def poll_generation_batches():
+    """Collect finished caption batches and schedule their posts (runs every BATCH_POLL_INTERVAL)"""
+    from app.services.batch_service import poll_batches
+    try:
+        run_async_in_thread(poll_batches())
+    except Exception as e:
+        logger.error("❌ Failed to poll generation batches: %s", e)
+
 
+def _in_retry_queue(post: dict) -> bool:
+    """Posts with platforms still to retry, or given up on, are kept across restarts"""
+    return (post.get("retry") or {}).get("state") in ("scheduled", "dead_letter")
+
+
+def _finished(post: dict) -> bool:
+    """Published (or given up on) and due in the past: only kept until the next restore"""
+    if post.get("status", "scheduled") in ("scheduled", "publishing") or _in_retry_queue(post):
+        return False
+    return _local_time(post["scheduled_time"]) <= datetime.now()
+
+
+def restore_scheduled_jobs():
+    """
+    Restore scheduled jobs (and pending platform retries) from storage on server startup
+    
+    Posts that came due while no leader ran are published right away, and
+    posts a dead leader left in "publishing" are resumed under their
+    idempotency key. Finished posts in the past are removed with their image.
+    
+    Only the leader restores (and cleans up); a standby process does it when
+    it takes over.
+    """
+    if leadership.standby:
+        logger.info("⏸️ Standby process, leaving scheduled jobs to the leader")
+        return
+    
+    removed = []
+    
+    def drop_finished(posts: list) -> list:
+        kept = []
+        for post in posts:
+            try:
+                finished = _finished(post)
+            except Exception as e:
+                logger.error("❌ Failed to restore scheduled post %s: %s", post.get("id"), e)
+                finished = False
+            (removed if finished else kept).append(post)
+        return kept
+    
+    posts = modify_scheduled_posts(drop_finished)
+    
+    for post in removed:
+        if os.path.exists(post["image_path"]):
+            os.remove(post["image_path"])
+        logger.info("🧹 Removed finished scheduled post %s", post["id"])
+    
+    for post in posts:
+        try:
+            status = post.get("status", "scheduled")
+            if _in_retry_queue(post):
+                # Overdue retries run right away
+                _schedule_retry(post)
+            elif status == "scheduled":
+                run_at = schedule_post_job(post)
+                logger.info("✅ Restored scheduled post %s for %s", post["id"], run_at)
+            elif status == "publishing":
+                schedule_resume_job(post)
+                logger.info("▶️ Resuming interrupted post %s", post["id"])
+        except Exception as e:
+            logger.error("❌ Failed to restore scheduled post %s: %s", post.get("id"), e)
+    
+    logger.info("✅ Restored %d scheduled posts", len(posts))
@@ -1,9 +1,54 @@
 """
 Storage management for scheduled posts
+API workers, the bot and the scheduler leader all change the same JSON file,
+so every read-modify-write cycle holds a lock shared by threads and processes.
 """
+import os
 import json
+import threading
+from contextlib import contextmanager
+from typing import Callable, Iterator, List, Optional
 from app.config import settings
 
+try:
+    import fcntl
+except ImportError:  # Windows: no flock, the thread lock only covers one process
+    fcntl = None
+
+# Serialises read-modify-write cycles within this process (API requests, bot and scheduler threads)
+_storage_lock = threading.RLock()
+# Nesting depth per thread, so only the outermost cycle takes the file lock
+_lock_depth = threading.local()
+
+
+@contextmanager
+def storage_lock() -> Iterator[None]:
+    """
+    Hold the scheduled posts lock (reentrant)
+
+    Takes the thread lock and an exclusive flock on "<posts file>.lock", the
+    latter shared by every process using the file.
+    """
+    with _storage_lock:
+        depth = getattr(_lock_depth, "value", 0)
+        if depth or fcntl is None:
+            _lock_depth.value = depth + 1
+            try:
+                yield
+            finally:
+                _lock_depth.value = depth
+            return
+
+        settings.SCHEDULED_POSTS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(f"{settings.SCHEDULED_POSTS_FILE}.lock", "a") as lock_file:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            _lock_depth.value = 1
+            try:
+                yield
+            finally:
+                _lock_depth.value = 0
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
 
 def load_scheduled_posts() -> list:
     """
@@ -46,8 +91,102 @@ def save_scheduled_posts(posts: list) -> None:
         posts: List of scheduled posts to save
     """
     try:
-        with open(settings.SCHEDULED_POSTS_FILE, 'w') as f:
+        # Write a temp file and swap it in, so readers never see a half-written file
+        tmp_path = f"{settings.SCHEDULED_POSTS_FILE}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
             json.dump(posts, f, indent=2)
+        os.replace(tmp_path, settings.SCHEDULED_POSTS_FILE)
     except Exception as e:
         print(f"Error saving scheduled posts: {e}")
 
+
+def add_scheduled_post(post: dict) -> None:
+    """
+    Append a scheduled post
+    
+    Args:
+        post: Scheduled post record
+    """
+    with storage_lock():
+        posts = load_scheduled_posts()
+        posts.append(post)
+        save_scheduled_posts(posts)
+
+
+def add_scheduled_post_once(post: dict, idempotency_key: Optional[str]) -> dict:
+    """
+    Append a scheduled post unless one was already created with this key
+
+    Args:
+        post: Scheduled post record
+        idempotency_key: Client key (None always adds the post)
+
+    Returns:
+        dict: `post`, or the post created earlier with the same key
+    """
+    with storage_lock():
+        posts = load_scheduled_posts()
+        if idempotency_key:
+            existing = next((p for p in posts if p.get("idempotency_key") == idempotency_key), None)
+            if existing is not None:
+                return existing
+        posts.append(post)
+        save_scheduled_posts(posts)
+        return post
+
+
+def remove_scheduled_post(post_id: str) -> Optional[dict]:
+    """
+    Remove a scheduled post
+
+    Args:
+        post_id: ID of the scheduled post
+
+    Returns:
+        dict: The removed post, or None if it didn't exist
+    """
+    with storage_lock():
+        posts = load_scheduled_posts()
+        post = next((p for p in posts if p["id"] == post_id), None)
+        if post is not None:
+            save_scheduled_posts([p for p in posts if p["id"] != post_id])
+        return post
+
+
+def modify_scheduled_posts(change: Callable[[List[dict]], List[dict]]) -> List[dict]:
+    """
+    Change the list of scheduled posts and save it, under the storage lock
+
+    Args:
+        change: Called with the stored posts; returns the posts to keep
+            (records may be changed in place)
+
+    Returns:
+        list: The saved posts
+    """
+    with storage_lock():
+        posts = change(load_scheduled_posts())
+        save_scheduled_posts(posts)
+        return posts
+
+
+def update_scheduled_post(post_id: str, update: Callable[[dict], None]) -> Optional[dict]:
+    """
+    Modify one scheduled post in place and save it
+    
+    Args:
+        post_id: ID of the scheduled post
+        update: Called with the post record; changes it in place
+        
+    Returns:
+        dict: The updated post, or None if it no longer exists
+    """
+    with storage_lock():
+        posts = load_scheduled_posts()
+        post = next((p for p in posts if p["id"] == post_id), None)
+        if post is None:
+            return None
+        update(post)
+        save_scheduled_posts(posts)
+        return post
+
@@ -0,0 +1,318 @@
+"""
+Prompt template registry
+All tone, image style and platform tables used in AI prompts live here, and
+the static part of the enhancer and caption prompts is built once at import,
+per (tone, style) or (tone, platform). Those requests only append their
+variable part (the idea or topic) at the end, so requests with the same
+settings send an identical prefix, which OpenAI caches on its side (prompt
+caching applies to identical prefixes of 1024+ tokens, such as the prompt
+enhancer's). Regenerate and refine prompts are short and built per call.
+"""
+from typing import Dict, List, Tuple
+
+TONES = ("casual", "professional", "corporate", "funny", "inspirational", "educational", "storytelling", "promotional")
+IMAGE_STYLES = ("realistic", "minimal", "anime", "2d", "comics", "sketch", "vintage", "disney")
+PLATFORMS = ("facebook", "instagram", "twitter", "reddit")
+
+# ==================== TABLES ====================
+
+# Tone requirements given to the prompt enhancer
+TONE_GUIDELINES = {
+    "casual": "friendly, conversational, relatable language with warmth and approachability. Use everyday language, personal anecdotes, and create connection.",
+    "professional": "formal, authoritative, business-appropriate language with expertise and credibility. Use industry terminology, data-driven insights, and professional tone.",
+    "corporate": "ULTRA-MINIMAL text - only 1-2 sentences maximum. Think Apple/Tesla minimalism. Clean, simple, impactful language with NO fluff, NO hashtags, NO emojis. Pure sophistication.",
+    "funny": "hilarious, witty, entertaining language with humor and comedic timing. Use jokes, puns, pop culture references, and make people laugh out loud.",
+    "inspirational": "motivational, uplifting, empowering language with emotional depth. Use powerful quotes, success stories, and drive action through inspiration.",
+    "educational": "informative, teaching-focused, clear explanations with valuable insights. Use step-by-step guidance, facts, and help audience learn.",
+    "storytelling": "narrative-driven, emotional, engaging story structure with character and plot. Use story arcs, emotional hooks, and compelling narratives.",
+    "promotional": "persuasive, sales-focused, action-oriented language with urgency. Use strong CTAs, benefits-focused messaging, and create FOMO."
+}
+
+# Image style requirements given to the prompt enhancer
+IMAGE_STYLE_GUIDELINES = {
+    "realistic": "PHOTOREALISTIC style: Professional photography quality with real-world textures, natural lighting, authentic details, high-resolution clarity, lifelike colors, and camera-shot composition. Like a professional photographer's work.",
+    "minimal": "ULTRA-MINIMALIST style: Clean white/neutral backgrounds, single focal subject, MAXIMUM negative space, Apple-style simplicity, geometric precision, NO text overlays, NO clutter. Think Apple product ads - pure, clean, sophisticated.",
+    "anime": "JAPANESE ANIME style: Vibrant cel-shaded colors, manga-inspired character designs, dynamic action poses, expressive large eyes, clean outlined illustration, colorful backgrounds, Japanese animation aesthetic. Think Studio Ghibli or popular anime series.",
+    "2d": "FLAT 2D ILLUSTRATION style: Modern vector graphics, geometric shapes, flat colors without gradients, clean lines, contemporary graphic design, minimalist illustration approach. Think modern app design or infographics.",
+    "comics": "COMIC BOOK ART style: Bold black outlines, dynamic action panels, speech bubble aesthetic (no actual text), vibrant primary colors, dramatic shading, graphic novel atmosphere, superhero comic aesthetic.",
+    "sketch": "HAND-DRAWN SKETCH style: Pencil or charcoal sketch appearance, artistic linework, sketchy textures, visible pencil strokes, artistic imperfection, raw creative energy, hand-crafted feel.",
+    "vintage": "VINTAGE RETRO style: 1950s-1980s aesthetic, aged paper texture, retro color palette (muted oranges, browns, creams), classic poster design, nostalgic feel, old-school typography style, weathered look.",
+    "disney": "DISNEY PIXAR style: 3D animated cartoon aesthetic, whimsical character design, bright cheerful colors, rounded friendly shapes, Pixar-quality 3D rendering, family-friendly warm atmosphere."
+}
+
+# Tone instructions for platform captions
+TONE_INSTRUCTIONS = {
+    "casual": "Be conversational, friendly, and approachable like talking to a friend",
+    "professional": "Be formal, polished, and business-appropriate with expertise",
+    "corporate": "Be EXTREMELY brief and minimal. Use only 1-2 short sentences MAX. Clean, simple language. Think Apple or Tesla - minimal text, maximum impact. NO hashtags. NO emojis unless absolutely essential. Pure corporate minimalism.",
+    "funny": "Be hilarious, witty, and entertaining with humor that makes people laugh out loud",
+    "inspirational": "Be deeply motivational, uplifting, and empowering with powerful impact",
+    "educational": "Be informative, clear, and teaching-focused with valuable insights",
+    "storytelling": "Be narrative-driven, engaging, and emotionally compelling like a great story",
+    "promotional": "Be persuasive, sales-focused, and action-oriented with strong call-to-action"
+}
+
+# Tone descriptions added to image prompts
+IMAGE_TONE_STYLES = {
+    "casual": "friendly and approachable, warm and inviting atmosphere",
+    "professional": "sleek, corporate, and polished with sophisticated elegance",
+    "corporate": "ultra-clean, minimalist corporate aesthetic, extreme simplicity with maximum impact",
+    "funny": "hilarious, playful, vibrant and whimsical with comedic flair",
+    "inspirational": "motivational, uplifting, dramatic and empowering with cinematic quality",
+    "educational": "clear, informative, well-structured with visual learning elements",
+    "storytelling": "narrative-driven, emotional, engaging with story-like composition",
+    "promotional": "eye-catching, sales-focused, bold and attention-grabbing"
+}
+
+# Image style descriptions added to image prompts (DALL-E and Nano Banana)
+IMAGE_STYLE_PROMPTS = {
+    "realistic": "professional photography style, high quality, well-lit, sharp focus, beautiful composition, commercial photography aesthetic",
+    "minimal": "ultra-minimalist design, clean white space, single focal point, Apple-style simplicity, corporate clean aesthetic, NO text overlays, pure visual impact, negative space emphasis",
+    "anime": "Japanese anime art style, vibrant colors, cel-shaded illustration, manga-inspired",
+    "2d": "flat 2D vector illustration, modern graphic design, clean shapes",
+    "comics": "comic book art style, bold outlines, dynamic panels, graphic novel aesthetic",
+    "sketch": "hand-drawn pencil sketch, artistic linework, sketchy texture",
+    "vintage": "retro vintage style, nostalgic feel, classic poster design, aged aesthetic",
+    "disney": "Disney Pixar animation style, 3D cartoon, whimsical character design"
+}
+
+
+def caption_guidance(platform: str, tone: str) -> dict:
+    """Length, style and hashtag guidance of a platform caption (corporate captions are minimal)"""
+    corporate = tone == "corporate"
+    return {
+        "facebook": {
+            "max_length": 500 if not corporate else 150,
+            "style": "conversational and friendly, can be longer" if not corporate else "ultra-brief, minimal, clean",
+            "hashtags": "optional, 2-3 max" if not corporate else "NO hashtags"
+        },
+        "instagram": {
+            "max_length": 400 if not corporate else 100,
+            "style": "visual and engaging with emojis" if not corporate else "minimal caption, let image speak",
+            "hashtags": "5-10 relevant hashtags" if not corporate else "1-2 minimal hashtags max"
+        },
+        "twitter": {
+            "max_length": 260 if not corporate else 100,
+            "style": "concise and punchy" if not corporate else "extremely brief and impactful",
+            "hashtags": "1-3 hashtags" if not corporate else "NO hashtags"
+        },
+        "reddit": {
+            "max_length": 300 if not corporate else 150,
+            "style": "authentic and community-focused, no spam" if not corporate else "simple, direct, no fluff",
+            "hashtags": "avoid hashtags, focus on genuine content"
+        }
+    }[platform]
+
+
+# Guidance for regenerated captions (same for every tone)
+REGENERATE_GUIDANCE = {
+    "facebook": {"max_length": 500, "style": "conversational and friendly", "hashtags": "2-3 max"},
+    "instagram": {"max_length": 400, "style": "visual with emojis", "hashtags": "5-10 hashtags"},
+    "twitter": {"max_length": 260, "style": "concise and punchy", "hashtags": "1-3 hashtags"},
+    "reddit": {"max_length": 300, "style": "authentic, no spam", "hashtags": "avoid hashtags"}
+}
+
+# ==================== PROMPT ENHANCER ====================
+
+ENHANCER_SYSTEM_PROMPT = """You are a MASTER prompt engineer with 10+ years of experience in viral social media marketing and AI art generation. 
+
+Your expertise includes:
+- Creating prompts that generate 10x more engagement
+- Deep understanding of platform algorithms and audience psychology
+- Expert knowledge of DALL-E 3's capabilities and optimal prompt structure
+- Ability to transform vague ideas into crystal-clear, actionable instructions
+- Mastery of visual composition, lighting, color theory, and artistic styles
+
+Your prompts consistently produce professional-grade results that look like they were created by expert marketers and professional photographers/artists.
+
+You ALWAYS provide extremely detailed, specific prompts - never vague or generic."""
+
+_ENHANCER_TEMPLATE = """You are a MASTER prompt engineer specializing in viral social media content and stunning AI image generation. You transform basic ideas into professional, highly-detailed prompts.
+
+SELECTED TONE: {tone}
+TONE REQUIREMENTS: {tone_requirements}
+
+SELECTED IMAGE STYLE: {image_style}
+IMAGE STYLE REQUIREMENTS: {style_requirements}
+
+YOUR MISSION:
+Create TWO highly-detailed, professional prompts that will generate EXCEPTIONAL results:
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+1. CONTENT PROMPT (for social media text generation):
+Transform the basic idea into a RICH, DETAILED prompt that captures:
+   - Main message and key themes
+   - Specific emotions to evoke
+   - Target audience considerations
+   - Platform-specific best practices (Facebook: conversational; Instagram: visual focus; Twitter: concise; Reddit: authentic)
+   - Tone-specific requirements (see TONE REQUIREMENTS above)
+   - Engagement hooks and call-to-action approach
+   - Content structure and flow
+   
+Make it SPECIFIC and ACTIONABLE - not just "create a post about X" but "create a {tone} post that [specific detailed instructions]"
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+2. IMAGE PROMPT (for DALL-E 3 generation):
+Transform the basic idea into an EXTREMELY DETAILED visual description:
+   - Exact subject/scene description
+   - Precise composition and framing (rule of thirds, centered, asymmetric, etc.)
+   - Specific colors and color palette
+   - Detailed lighting description (natural light, studio lighting, golden hour, dramatic shadows, etc.)
+   - Exact mood and atmosphere
+   - Background and environmental details
+   - Style-specific elements (see IMAGE STYLE REQUIREMENTS above)
+   - Camera angle and perspective
+   - Textures and materials
+   - Any additional visual elements that enhance impact
+   
+Be HYPER-SPECIFIC about visual details. Instead of "a product", say "a sleek silver smartphone at 45-degree angle on white marble surface with soft shadows"
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+EXAMPLES OF QUALITY:
+
+BAD Content Prompt: "Create a post about coffee"
+GOOD Content Prompt: "Create a warm, inspirational post about the ritual of morning coffee that evokes comfort and motivation. Focus on the sensory experience - rich aroma, warming first sip, peaceful morning moment. Target busy professionals who rely on coffee to start their day. Include themes of self-care, daily rituals, and small pleasures. Encourage audience to share their own coffee moments."
+
+BAD Image Prompt: "Coffee cup"
+GOOD Image Prompt: "Close-up of a pristine white ceramic coffee cup filled with freshly brewed dark coffee, steam rising gracefully, placed on rustic wooden table with natural morning sunlight streaming from left creating soft highlights and long shadows, scattered coffee beans artistically arranged, blurred green plant in background, warm earth-tone color palette with cream and brown accents, shallow depth of field, professional food photography style, cozy intimate atmosphere"
+
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+Return ONLY valid JSON in this exact format:
+{{
+  "content_prompt": "your enhanced detailed content prompt here",
+  "image_prompt": "your enhanced detailed image prompt here"
+}}
+
+NO other text, NO explanations, ONLY the JSON.
+
+USER'S BASIC IDEA: """
+
+
+def _enhancer_prefix(tone: str, image_style: str) -> str:
+    return _ENHANCER_TEMPLATE.format(
+        tone=tone,
+        tone_requirements=TONE_GUIDELINES.get(tone, "engaging and authentic"),
+        image_style=image_style,
+        style_requirements=IMAGE_STYLE_GUIDELINES.get(image_style, "professional quality")
+    )
+
+
+ENHANCER_PREFIXES: Dict[Tuple[str, str], str] = {
+    (tone, style): _enhancer_prefix(tone, style) for tone in TONES for style in IMAGE_STYLES
+}
+
+
+def enhancer_messages(user_prompt: str, tone: str, image_style: str) -> List[dict]:
+    """Chat messages that turn a basic idea into content and image prompts"""
+    prefix = ENHANCER_PREFIXES.get((tone, image_style)) or _enhancer_prefix(tone, image_style)
+    return [
+        {"role": "system", "content": ENHANCER_SYSTEM_PROMPT},
+        {"role": "user", "content": f'{prefix}"{user_prompt}"'}
+    ]
+
+# ==================== CAPTIONS ====================
+
+
+def _caption_system_prompt(platform: str) -> str:
+    return (f"You are a professional social media content creator specializing in {platform}. "
+            f"Create engaging, authentic posts optimized for {platform}'s unique audience and format.")
+
+
+def _caption_prefix(tone: str, platform: str) -> str:
+    info = caption_guidance(platform, tone)
+    return f"""Create a {tone} social media post.
+
+Platform: {platform.upper()}
+Style: {info['style']}
+Max length: {info['max_length']} characters
+Hashtags: {info['hashtags']}
+
+TONE INSTRUCTION: {TONE_INSTRUCTIONS.get(tone, "Be engaging and authentic")}
+
+Requirements:
+- Make it HIGHLY engaging and scroll-stopping
+- Optimize for {platform}'s specific audience
+- Include appropriate emojis that enhance the message
+- Return ONLY the post text, nothing else
+
+Topic: """
+
+
+CAPTION_SYSTEM_PROMPTS: Dict[str, str] = {platform: _caption_system_prompt(platform) for platform in PLATFORMS}
+
+CAPTION_PREFIXES: Dict[Tuple[str, str], str] = {
+    (tone, platform): _caption_prefix(tone, platform) for tone in TONES for platform in PLATFORMS
+}
+
+
+def caption_messages(content_topic: str, platform: str, tone: str) -> List[dict]:
+    """Chat messages for one platform caption"""
+    prefix = CAPTION_PREFIXES.get((tone, platform)) or _caption_prefix(tone, platform)
+    return [
+        {"role": "system", "content": CAPTION_SYSTEM_PROMPTS[platform]},
+        {"role": "user", "content": f"{prefix}{content_topic}\n\nPost:"}
+    ]
+
+
+def regenerate_messages(topic: str, platform: str, tone: str, previous_content: str = "") -> List[dict]:
+    """Chat messages for a fresh alternative of one platform caption"""
+    info = REGENERATE_GUIDANCE.get(platform, REGENERATE_GUIDANCE["facebook"])
+    prompt = f"""Create a {tone} social media post about: {topic}
+
+Platform: {platform.upper()}
+Style: {info['style']}
+Max length: {info['max_length']} characters
+Hashtags: {info['hashtags']}
+
+IMPORTANT: Create a DIFFERENT version from this previous attempt:
+{previous_content if previous_content else "N/A"}
+
+Make it engaging and authentic. Return ONLY the post text:"""
+    return [
+        {
+            "role": "system",
+            "content": f"You are a professional social media content creator for {platform}. Create fresh, engaging alternatives."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+
+def refine_messages(original_content: str, platform: str, instructions: str) -> List[dict]:
+    """Chat messages that rewrite a post following the user's feedback"""
+    prompt = f"""Original post for {platform}:
+{original_content}
+
+User wants: {instructions}
+
+Rewrite the post incorporating the user's feedback. Keep it optimized for {platform}.
+Return only the revised post text:"""
+    return [
+        {
+            "role": "system",
+            "content": f"You are a helpful social media content editor. Refine posts based on user feedback while keeping them optimized for {platform}."
+        },
+        {
+            "role": "user",
+            "content": prompt
+        }
+    ]
+
+# ==================== IMAGES ====================
+
+IMAGE_STYLE_SUFFIXES: Dict[Tuple[str, str], str] = {
+    (tone, style): f"{IMAGE_STYLE_PROMPTS[style]}, {IMAGE_TONE_STYLES[tone]}" for tone in TONES for style in IMAGE_STYLES
+}
+
+
+def image_style_prompt(tone: str, image_style: str) -> str:
+    """Style and tone description added to image prompts"""
+    return IMAGE_STYLE_SUFFIXES.get((tone, image_style)) or (
+        f"{IMAGE_STYLE_PROMPTS.get(image_style, 'photorealistic')}, {IMAGE_TONE_STYLES.get(tone, 'clean and modern')}"
+    )
@@ -3,21 +3,122 @@ AI content generation service using OpenAI
 """
 import httpx
 import os
+import asyncio
+import logging
 import uuid
+import weakref
 from datetime import datetime
 from pathlib import Path
-from openai import OpenAI
+from openai import AsyncOpenAI
 from fastapi import HTTPException
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import retry, stop_after_attempt, wait_exponential
 from app.config import settings
+from app.utils.metrics import observe_openai, record_openai_usage
+from app.utils.profiling import span, profiled
+from app.utils.circuit_breaker import circuit_breaker
+from app.utils.errors import PlatformError, platform_error, is_retryable, retry_if_retryable
+from app.services.usage_service import ensure_quota, record_images, record_token_usage
+from app.services.ai import prompts
 
-# Initialize OpenAI client
-client = OpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
+logger = logging.getLogger(__name__)
+
+# Initialize OpenAI client (async so generations don't block the event loop)
+client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL) if settings.OPENAI_API_KEY else None
 
 # Directory for AI-generated images
 AI_IMAGES_DIR = Path("uploads/ai_generated")
 AI_IMAGES_DIR.mkdir(parents=True, exist_ok=True)
 
+# Keep-alive clients for downloading generated images, one per event loop
+# (the API and the bot run separate loops; a client can't cross loops)
+_download_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def get_download_client() -> httpx.AsyncClient:
+    """
+    Shared HTTP client for image downloads on the running loop
+    
+    Reusing connections to the image CDNs saves a TLS handshake per image,
+    which adds up when a batch generates many images.
+    """
+    loop = asyncio.get_running_loop()
+    http_client = _download_clients.get(loop)
+    if http_client is None or http_client.is_closed:
+        http_client = httpx.AsyncClient(
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+        )
+        _download_clients[loop] = http_client
+    return http_client
+
+
+async def close_download_client():
+    """Close the download client of the running loop (on shutdown)"""
+    http_client = _download_clients.pop(asyncio.get_running_loop(), None)
+    if http_client is not None:
+        await http_client.aclose()
+
+
+async def _emit_progress(progress_callback, event: str, data) -> None:
+    """
+    Report a generation progress event without ever failing the generation
+    
+    Args:
+        progress_callback: Optional async callable(event, data)
+        event: Event name ("enhanced", "caption", "caption_delta", "image" or "delta")
+        data: Event payload
+    """
+    if not progress_callback:
+        return
+    try:
+        await progress_callback(event, data)
+    except Exception as e:
+        logger.warning("⚠️ Progress callback error (%s): %s", event, e)
+
+
+async def stream_chat(request: dict, on_delta) -> str:
+    """
+    Run a chat completion as a token stream
+    
+    Token usage arrives with the stream's last chunk and is recorded like
+    that of a regular completion.
+    
+    Args:
+        request: Keyword arguments for client.chat.completions.create
+        on_delta: Async callable(text) called with each piece of text as it arrives
+        
+    Returns:
+        str: The complete text (stripped)
+    """
+    stream = await observe_openai("chat", client.chat.completions.create(
+        **request, stream=True, stream_options={"include_usage": True}
+    ))
+    parts = []
+    async for chunk in stream:
+        if chunk.usage:
+            record_openai_usage(chunk)
+            await record_token_usage(chunk)
+        if chunk.choices and chunk.choices[0].delta.content:
+            parts.append(chunk.choices[0].delta.content)
+            await on_delta(chunk.choices[0].delta.content)
+    return "".join(parts).strip()
+
+
+async def _complete_chat(request: dict, progress_callback=None) -> str:
+    """
+    Run a chat completion, streamed as "delta" progress events when a callback is given
+    
+    Returns:
+        str: The complete text (stripped)
+    """
+    if not progress_callback:
+        response = await observe_openai("chat", client.chat.completions.create(**request))
+        return response.choices[0].message.content.strip()
+    
+    async def on_delta(delta: str):
+        await _emit_progress(progress_callback, "delta", {"delta": delta})
+    return await stream_chat(request, on_delta)
+
 
 async def enhance_user_prompt(user_prompt: str, tone: str, image_style: str) -> dict:
     """
@@ -40,122 +141,15 @@ async def enhance_user_prompt(user_prompt: str, tone: str, image_style: str) ->
             "enhanced": False
         }
     
-    # Detailed tone guidelines for content
-    tone_guidelines = {
-        "casual": "friendly, conversational, relatable language with warmth and approachability. Use everyday language, personal anecdotes, and create connection.",
-        "professional": "formal, authoritative, business-appropriate language with expertise and credibility. Use industry terminology, data-driven insights, and professional tone.",
-        "corporate": "ULTRA-MINIMAL text - only 1-2 sentences maximum. Think Apple/Tesla minimalism. Clean, simple, impactful language with NO fluff, NO hashtags, NO emojis. Pure sophistication.",
-        "funny": "hilarious, witty, entertaining language with humor and comedic timing. Use jokes, puns, pop culture references, and make people laugh out loud.",
-        "inspirational": "motivational, uplifting, empowering language with emotional depth. Use powerful quotes, success stories, and drive action through inspiration.",
-        "educational": "informative, teaching-focused, clear explanations with valuable insights. Use step-by-step guidance, facts, and help audience learn.",
-        "storytelling": "narrative-driven, emotional, engaging story structure with character and plot. Use story arcs, emotional hooks, and compelling narratives.",
-        "promotional": "persuasive, sales-focused, action-oriented language with urgency. Use strong CTAs, benefits-focused messaging, and create FOMO."
-    }
-    
-    # Detailed image style guidelines for DALL-E
-    image_style_guidelines = {
-        "realistic": "PHOTOREALISTIC style: Professional photography quality with real-world textures, natural lighting, authentic details, high-resolution clarity, lifelike colors, and camera-shot composition. Like a professional photographer's work.",
-        "minimal": "ULTRA-MINIMALIST style: Clean white/neutral backgrounds, single focal subject, MAXIMUM negative space, Apple-style simplicity, geometric precision, NO text overlays, NO clutter. Think Apple product ads - pure, clean, sophisticated.",
-        "anime": "JAPANESE ANIME style: Vibrant cel-shaded colors, manga-inspired character designs, dynamic action poses, expressive large eyes, clean outlined illustration, colorful backgrounds, Japanese animation aesthetic. Think Studio Ghibli or popular anime series.",
-        "2d": "FLAT 2D ILLUSTRATION style: Modern vector graphics, geometric shapes, flat colors without gradients, clean lines, contemporary graphic design, minimalist illustration approach. Think modern app design or infographics.",
-        "comics": "COMIC BOOK ART style: Bold black outlines, dynamic action panels, speech bubble aesthetic (no actual text), vibrant primary colors, dramatic shading, graphic novel atmosphere, superhero comic aesthetic.",
-        "sketch": "HAND-DRAWN SKETCH style: Pencil or charcoal sketch appearance, artistic linework, sketchy textures, visible pencil strokes, artistic imperfection, raw creative energy, hand-crafted feel.",
-        "vintage": "VINTAGE RETRO style: 1950s-1980s aesthetic, aged paper texture, retro color palette (muted oranges, browns, creams), classic poster design, nostalgic feel, old-school typography style, weathered look.",
-        "disney": "DISNEY PIXAR style: 3D animated cartoon aesthetic, whimsical character design, bright cheerful colors, rounded friendly shapes, Pixar-quality 3D rendering, family-friendly warm atmosphere."
-    }
+    await ensure_quota()
     
     try:
-        # Create enhanced, detailed prompt
-        enhancement_prompt = f"""You are a MASTER prompt engineer specializing in viral social media content and stunning AI image generation. You transform basic ideas into professional, highly-detailed prompts.
-
-USER'S BASIC IDEA: "{user_prompt}"
-
-SELECTED TONE: {tone}
-TONE REQUIREMENTS: {tone_guidelines.get(tone, 'engaging and authentic')}
-
-SELECTED IMAGE STYLE: {image_style}
-IMAGE STYLE REQUIREMENTS: {image_style_guidelines.get(image_style, 'professional quality')}
-
-YOUR MISSION:
-Create TWO highly-detailed, professional prompts that will generate EXCEPTIONAL results:
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-1. CONTENT PROMPT (for social media text generation):
-Transform the basic idea into a RICH, DETAILED prompt that captures:
-   - Main message and key themes
-   - Specific emotions to evoke
-   - Target audience considerations
-   - Platform-specific best practices (Facebook: conversational; Instagram: visual focus; Twitter: concise; Reddit: authentic)
-   - Tone-specific requirements (see TONE REQUIREMENTS above)
-   - Engagement hooks and call-to-action approach
-   - Content structure and flow
-   
-Make it SPECIFIC and ACTIONABLE - not just "create a post about X" but "create a {tone} post that [specific detailed instructions]"
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-2. IMAGE PROMPT (for DALL-E 3 generation):
-Transform the basic idea into an EXTREMELY DETAILED visual description:
-   - Exact subject/scene description
-   - Precise composition and framing (rule of thirds, centered, asymmetric, etc.)
-   - Specific colors and color palette
-   - Detailed lighting description (natural light, studio lighting, golden hour, dramatic shadows, etc.)
-   - Exact mood and atmosphere
-   - Background and environmental details
-   - Style-specific elements (see IMAGE STYLE REQUIREMENTS above)
-   - Camera angle and perspective
-   - Textures and materials
-   - Any additional visual elements that enhance impact
-   
-Be HYPER-SPECIFIC about visual details. Instead of "a product", say "a sleek silver smartphone at 45-degree angle on white marble surface with soft shadows"
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-EXAMPLES OF QUALITY:
-
-BAD Content Prompt: "Create a post about coffee"
-GOOD Content Prompt: "Create a warm, inspirational post about the ritual of morning coffee that evokes comfort and motivation. Focus on the sensory experience - rich aroma, warming first sip, peaceful morning moment. Target busy professionals who rely on coffee to start their day. Include themes of self-care, daily rituals, and small pleasures. Encourage audience to share their own coffee moments."
-
-BAD Image Prompt: "Coffee cup"
-GOOD Image Prompt: "Close-up of a pristine white ceramic coffee cup filled with freshly brewed dark coffee, steam rising gracefully, placed on rustic wooden table with natural morning sunlight streaming from left creating soft highlights and long shadows, scattered coffee beans artistically arranged, blurred green plant in background, warm earth-tone color palette with cream and brown accents, shallow depth of field, professional food photography style, cozy intimate atmosphere"
-
-━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
-
-Return ONLY valid JSON in this exact format:
-{{
-  "content_prompt": "your enhanced detailed content prompt here",
-  "image_prompt": "your enhanced detailed image prompt here"
-}}
-
-NO other text, NO explanations, ONLY the JSON."""
-
-        response = client.chat.completions.create(
+        response = await observe_openai("chat", client.chat.completions.create(
             model=settings.OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are a MASTER prompt engineer with 10+ years of experience in viral social media marketing and AI art generation. 
-
-Your expertise includes:
-- Creating prompts that generate 10x more engagement
-- Deep understanding of platform algorithms and audience psychology
-- Expert knowledge of DALL-E 3's capabilities and optimal prompt structure
-- Ability to transform vague ideas into crystal-clear, actionable instructions
-- Mastery of visual composition, lighting, color theory, and artistic styles
-
-Your prompts consistently produce professional-grade results that look like they were created by expert marketers and professional photographers/artists.
-
-You ALWAYS provide extremely detailed, specific prompts - never vague or generic."""
-                },
-                {
-                    "role": "user",
-                    "content": enhancement_prompt
-                }
-            ],
+            messages=prompts.enhancer_messages(user_prompt, tone, image_style),
             temperature=0.8,  # Slightly higher for more creative enhancements
             max_tokens=800  # More tokens for detailed prompts
-        )
+        ))
         
         # Parse the JSON response
         import json
@@ -169,7 +163,7 @@ You ALWAYS provide extremely detailed, specific prompts - never vague or generic
         }
         
     except Exception as e:
-        print(f"Prompt enhancement error: {e}")
+        logger.error("Prompt enhancement error: %s", e)
         # Fallback to original prompt if enhancement fails
         return {
             "content_prompt": user_prompt,
@@ -183,9 +177,11 @@ You ALWAYS provide extremely detailed, specific prompts - never vague or generic
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((httpx.HTTPError, Exception)),
+    retry=retry_if_retryable,
     reraise=True
 )
+@circuit_breaker("dalle")
+@profiled("image.dalle")
 async def generate_image_with_dalle(prompt_style: str, topic: str, enhanced_image_prompt: str = None, content_context: str = None) -> dict:
     """
     Generate a high-quality social media image using DALL-E 3
@@ -200,10 +196,7 @@ async def generate_image_with_dalle(prompt_style: str, topic: str, enhanced_imag
         dict: Image URL and local path
     """
     if not client:
-        raise HTTPException(
-            status_code=500,
-            detail="OpenAI API key not configured"
-        )
+        raise PlatformError("OpenAI API key not configured")
     
     try:
         # Create a coordinated DALL-E prompt that matches the content
@@ -221,26 +214,28 @@ async def generate_image_with_dalle(prompt_style: str, topic: str, enhanced_imag
             image_prompt = f"Create a professional social media image about {topic}. {prompt_style}. High quality, visually appealing, suitable for social platforms."
 
         # Generate image with DALL-E 3
-        response = client.images.generate(
+        response = await observe_openai("image", client.images.generate(
             model="dall-e-3",
             prompt=image_prompt[:4000],  # DALL-E has prompt limit
             size="1024x1024",
             quality="standard",
             n=1
-        )
+        ))
+        await record_images("dalle", len(response.data))
         
         image_url = response.data[0].url
         
-        # Download and save the image locally
-        async with httpx.AsyncClient() as http_client:
-            img_response = await http_client.get(image_url)
+        # Download (over a pooled connection) and save the image locally
+        with span("image.download"):
+            img_response = await get_download_client().get(image_url)
             img_response.raise_for_status()
-            
-            # Save with unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"ai_generated_{timestamp}_{uuid.uuid4().hex[:8]}.png"
-            file_path = AI_IMAGES_DIR / filename
-            
+        
+        # Save with unique filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"ai_generated_{timestamp}_{uuid.uuid4().hex[:8]}.png"
+        file_path = AI_IMAGES_DIR / filename
+        
+        with span("image.write", bytes=len(img_response.content)):
             with open(file_path, "wb") as f:
                 f.write(img_response.content)
         
@@ -253,7 +248,10 @@ async def generate_image_with_dalle(prompt_style: str, topic: str, enhanced_imag
         }
         
     except Exception as e:
-        print(f"DALL-E generation error: {e}")
+        logger.error("DALL-E generation error: %s", e)
+        if is_retryable(e):
+            raise platform_error("DALL-E image generation failed", e) from e
+        # Permanent failures (e.g. content policy) are reported, not retried
         return {
             "success": False,
             "error": str(e),
@@ -265,9 +263,11 @@ async def generate_image_with_dalle(prompt_style: str, topic: str, enhanced_imag
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
-    retry=retry_if_exception_type((httpx.HTTPError, Exception)),
+    retry=retry_if_retryable,
     reraise=True
 )
+@circuit_breaker("fal")
+@profiled("image.fal")
 async def generate_image_with_fal(prompt_style: str, topic: str, enhanced_image_prompt: str = None, content_context: str = None) -> dict:
     """
     Generate image using Fal.ai Nano Banana - Ultra-fast, lightweight model
@@ -282,10 +282,7 @@ async def generate_image_with_fal(prompt_style: str, topic: str, enhanced_image_
         dict: Image URL and local path
     """
     if not settings.FAL_KEY:
-        raise HTTPException(
-            status_code=500,
-            detail="Fal.ai API key not configured. Add FAL_KEY to .env file"
-        )
+        raise PlatformError("Fal.ai API key not configured. Add FAL_KEY to .env file")
     
     try:
         import fal_client
@@ -313,39 +310,43 @@ async def generate_image_with_fal(prompt_style: str, topic: str, enhanced_image_
         else:
             image_prompt = f"Modern, eye-catching social media visual about {topic}. {prompt_style}. {base_quality}. Contemporary aesthetic, minimalist when appropriate. {no_text}"
         
-        print(f"🍌 Generating image with Nano Banana (Fal.ai)...")
+        logger.debug("🍌 Generating image with Nano Banana (Fal.ai)...")
         
         # Generate with Nano Banana
-        result = fal_client.subscribe(
-            "fal-ai/nano-banana",
-            arguments={
-                "prompt": image_prompt[:2000],
-                "image_size": "square_hd",
-                "num_inference_steps": 4,
-                "num_images": 1
-            }
-        )
+        with span("fal.generate"):
+            result = await fal_client.subscribe_async(
+                "fal-ai/nano-banana",
+                arguments={
+                    "prompt": image_prompt[:2000],
+                    "image_size": "square_hd",
+                    "num_inference_steps": 4,
+                    "num_images": 1
+                }
+            )
+        
+        await record_images("fal", len(result["images"]))
         
         # Get image URL
         image_url = result["images"][0]["url"]
         
-        print(f"✅ Nano Banana image generated: {image_url}")
+        logger.debug("✅ Nano Banana image generated: %s", image_url)
         
-        # Download and save locally
-        async with httpx.AsyncClient(timeout=30.0) as http_client:
-            img_response = await http_client.get(image_url)
+        # Download (over a pooled connection) and save locally
+        with span("image.download"):
+            img_response = await get_download_client().get(image_url)
             img_response.raise_for_status()
-            
-            # Save with unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = uuid.uuid4().hex[:8]
-            filename = f"ai_generated_{timestamp}_{unique_id}.png"
-            filepath = AI_IMAGES_DIR / filename
-            
+        
+        # Save with unique filename
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        unique_id = uuid.uuid4().hex[:8]
+        filename = f"ai_generated_{timestamp}_{unique_id}.png"
+        filepath = AI_IMAGES_DIR / filename
+        
+        with span("image.write", bytes=len(img_response.content)):
             with open(filepath, "wb") as f:
                 f.write(img_response.content)
         
-        print(f"💾 Image saved: {filepath}")
+        logger.debug("💾 Image saved: %s", filepath)
         
         return {
             "success": True,
@@ -358,14 +359,38 @@ async def generate_image_with_fal(prompt_style: str, topic: str, enhanced_image_
         }
         
     except Exception as e:
-        print(f"❌ Nano Banana error: {e}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"Nano Banana image generation failed: {str(e)}"
-        )
+        logger.error("❌ Nano Banana error: %s", e)
+        raise platform_error("Nano Banana image generation failed", e) from e
+
+
+# Platforms a caption is generated for
+CAPTION_PLATFORMS = ("facebook", "instagram", "twitter", "reddit")
+
+
+def caption_request(content_topic: str, platform: str, tone: str) -> dict:
+    """
+    Chat completion request for one platform caption
+    
+    Shared by live generation and the offline batch mode (batch_service),
+    so both write the same posts.
+    
+    Args:
+        content_topic: Topic (or enhanced content prompt)
+        platform: facebook, instagram, twitter or reddit
+        tone: Writing tone
+        
+    Returns:
+        dict: Keyword arguments for client.chat.completions.create
+    """
+    return {
+        "model": settings.OPENAI_MODEL,
+        "messages": prompts.caption_messages(content_topic, platform, tone),
+        "temperature": 0.8,
+        "max_tokens": 300
+    }
 
 
-async def generate_platform_content(topic: str, tone: str = "casual", image_style: str = "realistic", generate_image: bool = True, use_prompt_enhancer: bool = True, image_provider: str = "dalle") -> dict:
+async def generate_platform_content(topic: str, tone: str = "casual", image_style: str = "realistic", generate_image: bool = True, use_prompt_enhancer: bool = True, image_provider: str = "dalle", progress_callback=None, enhanced_prompts: dict = None, stream_captions: bool = False) -> dict:
     """
     Generate platform-specific content for all social media platforms
     
@@ -375,6 +400,12 @@ async def generate_platform_content(topic: str, tone: str = "casual", image_styl
         image_style: Visual style for DALL-E (realistic, anime, 2d, comics, sketch, vintage, disney, 3d)
         generate_image: Whether to generate an image
         use_prompt_enhancer: Whether to enhance the user's prompt first (default: True)
+        progress_callback: Optional async callable(event, data) notified as each phase
+            finishes: "enhanced" (prompts), "caption" (one per platform), "image"
+        enhanced_prompts: Result of enhance_user_prompt computed by the caller
+            (shared by bulk items with the same topic); skips the enhancement call
+        stream_captions: Stream caption tokens to progress_callback as
+            "caption_delta" events ({"platform", "delta"}) while they are written
         
     Returns:
         dict: Generated content for each platform
@@ -385,106 +416,52 @@ async def generate_platform_content(topic: str, tone: str = "casual", image_styl
             detail="OpenAI API key not configured"
         )
     
+    # Refuse before spending anything when the caller is out of quota
+    await ensure_quota(images=1 if generate_image else 0)
+    
     # Step 1: Enhance the user's prompt if enabled
-    enhanced_prompts = None
+    if not use_prompt_enhancer:
+        enhanced_prompts = None
+    elif enhanced_prompts is None:
+        with span("enhance"):
+            enhanced_prompts = await enhance_user_prompt(topic, tone, image_style)
     if use_prompt_enhancer:
-        enhanced_prompts = await enhance_user_prompt(topic, tone, image_style)
         content_topic = enhanced_prompts["content_prompt"]
         image_topic = enhanced_prompts["image_prompt"]
+        await _emit_progress(progress_callback, "enhanced", enhanced_prompts)
     else:
         content_topic = topic
         image_topic = topic
     
-    # Platform-specific prompts
-    platforms_info = {
-        "facebook": {
-            "max_length": 500 if tone != "corporate" else 150,
-            "style": "conversational and friendly, can be longer" if tone != "corporate" else "ultra-brief, minimal, clean",
-            "hashtags": "optional, 2-3 max" if tone != "corporate" else "NO hashtags"
-        },
-        "instagram": {
-            "max_length": 400 if tone != "corporate" else 100,
-            "style": "visual and engaging with emojis" if tone != "corporate" else "minimal caption, let image speak",
-            "hashtags": "5-10 relevant hashtags" if tone != "corporate" else "1-2 minimal hashtags max"
-        },
-        "twitter": {
-            "max_length": 260 if tone != "corporate" else 100,
-            "style": "concise and punchy" if tone != "corporate" else "extremely brief and impactful",
-            "hashtags": "1-3 hashtags" if tone != "corporate" else "NO hashtags"
-        },
-        "reddit": {
-            "max_length": 300 if tone != "corporate" else 150,
-            "style": "authentic and community-focused, no spam" if tone != "corporate" else "simple, direct, no fluff",
-            "hashtags": "avoid hashtags, focus on genuine content"
-        }
-    }
-    
     results = {}
     
     # STEP 1: Generate content FIRST for all platforms
-    # Enhanced tone descriptions for content
-    tone_instructions = {
-        "casual": "Be conversational, friendly, and approachable like talking to a friend",
-        "professional": "Be formal, polished, and business-appropriate with expertise",
-        "corporate": "Be EXTREMELY brief and minimal. Use only 1-2 short sentences MAX. Clean, simple language. Think Apple or Tesla - minimal text, maximum impact. NO hashtags. NO emojis unless absolutely essential. Pure corporate minimalism.",
-        "funny": "Be hilarious, witty, and entertaining with humor that makes people laugh out loud",
-        "inspirational": "Be deeply motivational, uplifting, and empowering with powerful impact",
-        "educational": "Be informative, clear, and teaching-focused with valuable insights",
-        "storytelling": "Be narrative-driven, engaging, and emotionally compelling like a great story",
-        "promotional": "Be persuasive, sales-focused, and action-oriented with strong call-to-action"
-    }
-    
-    tone_instruction = tone_instructions.get(tone, "Be engaging and authentic")
-    
-    for platform, info in platforms_info.items():
-        prompt = f"""Create a {tone} social media post about: {content_topic}
-
-Platform: {platform.upper()}
-Style: {info['style']}
-Max length: {info['max_length']} characters
-Hashtags: {info['hashtags']}
-
-TONE INSTRUCTION: {tone_instruction}
-
-Requirements:
-- Make it HIGHLY engaging and scroll-stopping
-- Optimize for {platform}'s specific audience
-- Include appropriate emojis that enhance the message
-- Return ONLY the post text, nothing else
-
-Post:"""
-
-        try:
-            response = client.chat.completions.create(
-                model=settings.OPENAI_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"You are a professional social media content creator specializing in {platform}. Create engaging, authentic posts optimized for {platform}'s unique audience and format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.8,
-                max_tokens=300
-            )
-            
-            generated_text = response.choices[0].message.content.strip()
+    for platform in CAPTION_PLATFORMS:
+        with span("caption", platform=platform):
+            try:
+                request = caption_request(content_topic, platform, tone)
+                if stream_captions and progress_callback:
+                    async def on_delta(delta: str, platform: str = platform):
+                        await _emit_progress(progress_callback, "caption_delta", {"platform": platform, "delta": delta})
+                    generated_text = await stream_chat(request, on_delta)
+                else:
+                    response = await observe_openai("chat", client.chat.completions.create(**request))
+                    generated_text = response.choices[0].message.content.strip()
             
-            results[platform] = {
-                "content": generated_text,
-                "success": True,
-                "character_count": len(generated_text)
-            }
+                results[platform] = {
+                    "content": generated_text,
+                    "success": True,
+                    "character_count": len(generated_text)
+                }
             
-        except Exception as e:
-            results[platform] = {
-                "content": "",
-                "success": False,
-                "error": str(e)
-            }
+            except Exception as e:
+                results[platform] = {
+                    "content": "",
+                    "success": False,
+                    "error": str(e)
+                }
+        
+        await _emit_progress(progress_callback, "caption", {"platform": platform, **results[platform]})
     
     # STEP 2: Generate image BASED ON the actual generated content
     # This ensures the image matches what the content is actually talking about
@@ -496,33 +473,7 @@ Post:"""
             # Use Facebook content as base since it's usually the most detailed
             content_summary = results["facebook"]["content"][:300]
         
-        # Enhanced tone descriptions for image
-        tone_styles = {
-            "casual": "friendly and approachable, warm and inviting atmosphere",
-            "professional": "sleek, corporate, and polished with sophisticated elegance",
-            "corporate": "ultra-clean, minimalist corporate aesthetic, extreme simplicity with maximum impact",
-            "funny": "hilarious, playful, vibrant and whimsical with comedic flair",
-            "inspirational": "motivational, uplifting, dramatic and empowering with cinematic quality",
-            "educational": "clear, informative, well-structured with visual learning elements",
-            "storytelling": "narrative-driven, emotional, engaging with story-like composition",
-            "promotional": "eye-catching, sales-focused, bold and attention-grabbing"
-        }
-        
-        # Image style mappings for DALL-E
-        style_prompts = {
-            "realistic": "professional photography style, high quality, well-lit, sharp focus, beautiful composition, commercial photography aesthetic",
-            "minimal": "ultra-minimalist design, clean white space, single focal point, Apple-style simplicity, corporate clean aesthetic, NO text overlays, pure visual impact, negative space emphasis",
-            "anime": "Japanese anime art style, vibrant colors, cel-shaded illustration, manga-inspired",
-            "2d": "flat 2D vector illustration, modern graphic design, clean shapes",
-            "comics": "comic book art style, bold outlines, dynamic panels, graphic novel aesthetic",
-            "sketch": "hand-drawn pencil sketch, artistic linework, sketchy texture",
-            "vintage": "retro vintage style, nostalgic feel, classic poster design, aged aesthetic",
-            "disney": "Disney Pixar animation style, 3D cartoon, whimsical character design"
-        }
-        
-        tone_desc = tone_styles.get(tone, "clean and modern")
-        style_desc = style_prompts.get(image_style, "photorealistic")
-        combined_prompt = f"{style_desc}, {tone_desc}"
+        combined_prompt = prompts.image_style_prompt(tone, image_style)
         
         # Create a coordinated image prompt that matches the content
         # If we have enhanced prompts, use them; otherwise use the topic + content summary
@@ -541,7 +492,7 @@ Post:"""
         
         try:
             if image_provider == "nano-banana":
-                print("🍌 Using Nano Banana (Fal.ai) for ultra-fast image generation...")
+                logger.debug("🍌 Using Nano Banana (Fal.ai) for image generation")
                 image_data = await generate_image_with_fal(
                     combined_prompt, 
                     topic,
@@ -549,7 +500,7 @@ Post:"""
                     content_context=content_summary
                 )
             else:
-                print("🎨 Using DALL-E 3 for image generation...")
+                logger.debug("🎨 Using DALL-E 3 for image generation")
                 image_data = await generate_image_with_dalle(
                     combined_prompt, 
                     topic,
@@ -558,11 +509,11 @@ Post:"""
                 )
         except Exception as primary_error:
             # Fallback to alternative provider
-            print(f"⚠️ {primary_provider} failed: {primary_error}. Trying fallback provider...")
+            logger.warning("⚠️ %s failed: %s. Trying fallback provider...", primary_provider, primary_error)
             
             try:
                 if fallback_provider == "nano-banana":
-                    print("🍌 Fallback: Using Nano Banana...")
+                    logger.debug("🍌 Fallback: Using Nano Banana")
                     image_data = await generate_image_with_fal(
                         combined_prompt, 
                         topic,
@@ -570,20 +521,22 @@ Post:"""
                         content_context=content_summary
                     )
                 else:
-                    print("🎨 Fallback: Using DALL-E 3...")
+                    logger.debug("🎨 Fallback: Using DALL-E 3")
                     image_data = await generate_image_with_dalle(
                         combined_prompt, 
                         topic,
                         enhanced_image_prompt=coordinated_image_prompt,
                         content_context=content_summary
                     )
-                print(f"✅ Successfully generated with fallback provider: {fallback_provider}")
+                logger.info("✅ Generated with fallback provider: %s", fallback_provider)
             except Exception as fallback_error:
-                print(f"❌ Both providers failed. Primary: {primary_error}, Fallback: {fallback_error}")
+                logger.error("❌ Both providers failed. Primary: %s, Fallback: %s", primary_error, fallback_error)
                 raise HTTPException(
                     status_code=500,
                     detail=f"Image generation failed with both providers. Primary ({primary_provider}): {str(primary_error)}, Fallback ({fallback_provider}): {str(fallback_error)}"
                 )
+        
+        await _emit_progress(progress_callback, "image", image_data)
     
     return {
         "success": True,
@@ -608,33 +561,9 @@ async def regenerate_image(topic: str, tone: str = "casual", image_style: str =
     Returns:
         dict: New image data
     """
-    # Enhanced tone descriptions
-    tone_styles = {
-        "casual": "friendly and approachable, warm and inviting atmosphere",
-        "professional": "sleek, corporate, and polished with sophisticated elegance",
-        "corporate": "ultra-clean, minimalist corporate aesthetic, extreme simplicity with maximum impact",
-        "funny": "hilarious, playful, vibrant and whimsical with comedic flair",
-        "inspirational": "motivational, uplifting, dramatic and empowering with cinematic quality",
-        "educational": "clear, informative, well-structured with visual learning elements",
-        "storytelling": "narrative-driven, emotional, engaging with story-like composition",
-        "promotional": "eye-catching, sales-focused, bold and attention-grabbing"
-    }
-    
-    # Image style mappings for DALL-E
-    style_prompts = {
-        "realistic": "professional photography style, high quality, well-lit, sharp focus, beautiful composition, commercial photography aesthetic",
-        "minimal": "ultra-minimalist design, clean white space, single focal point, Apple-style simplicity, corporate clean aesthetic, NO text overlays, pure visual impact, negative space emphasis",
-        "anime": "Japanese anime art style, vibrant colors, cel-shaded illustration, manga-inspired",
-        "2d": "flat 2D vector illustration, modern graphic design, clean shapes",
-        "comics": "comic book art style, bold outlines, dynamic panels, graphic novel aesthetic",
-        "sketch": "hand-drawn pencil sketch, artistic linework, sketchy texture",
-        "vintage": "retro vintage style, nostalgic feel, classic poster design, aged aesthetic",
-        "disney": "Disney Pixar animation style, 3D cartoon, whimsical character design"
-    }
+    combined_prompt = prompts.image_style_prompt(tone, image_style)
     
-    tone_desc = tone_styles.get(tone, "clean and modern")
-    style_desc = style_prompts.get(image_style, "photorealistic")
-    combined_prompt = f"{style_desc}, {tone_desc}"
+    await ensure_quota(images=1)
     
     # Choose provider based on user selection with fallback
     primary_provider = image_provider
@@ -642,21 +571,21 @@ async def regenerate_image(topic: str, tone: str = "casual", image_style: str =
     
     try:
         if image_provider == "nano-banana":
-            print(f"🍌 Regenerating image with Nano Banana...")
+            logger.debug("🍌 Regenerating image with Nano Banana")
             return await generate_image_with_fal(combined_prompt, topic)
         else:
-            print(f"🎨 Regenerating image with DALL-E 3...")
+            logger.debug("🎨 Regenerating image with DALL-E 3")
             return await generate_image_with_dalle(combined_prompt, topic)
     except Exception as primary_error:
         # Fallback to alternative provider
-        print(f"⚠️ {primary_provider} failed during regeneration. Trying {fallback_provider}...")
+        logger.warning("⚠️ %s failed during regeneration. Trying %s...", primary_provider, fallback_provider)
         
         try:
             if fallback_provider == "nano-banana":
-                print(f"🍌 Fallback: Regenerating with Nano Banana...")
+                logger.debug("🍌 Fallback: Regenerating with Nano Banana")
                 return await generate_image_with_fal(combined_prompt, topic)
             else:
-                print(f"🎨 Fallback: Regenerating with DALL-E 3...")
+                logger.debug("🎨 Fallback: Regenerating with DALL-E 3")
                 return await generate_image_with_dalle(combined_prompt, topic)
         except Exception as fallback_error:
             raise HTTPException(
@@ -665,7 +594,7 @@ async def regenerate_image(topic: str, tone: str = "casual", image_style: str =
             )
 
 
-async def regenerate_platform_content(topic: str, platform: str, tone: str = "casual", previous_content: str = "") -> dict:
+async def regenerate_platform_content(topic: str, platform: str, tone: str = "casual", previous_content: str = "", progress_callback=None) -> dict:
     """
     Regenerate content for a single platform
     
@@ -674,6 +603,8 @@ async def regenerate_platform_content(topic: str, platform: str, tone: str = "ca
         platform: Specific platform to regenerate
         tone: Writing tone
         previous_content: Previous content to avoid duplication
+        progress_callback: Optional async callable(event, data); when given the
+            text is streamed to it as "delta" events ({"delta"}) while it is written
         
     Returns:
         dict: New generated content for the platform
@@ -684,45 +615,17 @@ async def regenerate_platform_content(topic: str, platform: str, tone: str = "ca
             detail="OpenAI API key not configured"
         )
     
-    platforms_info = {
-        "facebook": {"max_length": 500, "style": "conversational and friendly", "hashtags": "2-3 max"},
-        "instagram": {"max_length": 400, "style": "visual with emojis", "hashtags": "5-10 hashtags"},
-        "twitter": {"max_length": 260, "style": "concise and punchy", "hashtags": "1-3 hashtags"},
-        "reddit": {"max_length": 300, "style": "authentic, no spam", "hashtags": "avoid hashtags"}
-    }
+    await ensure_quota()
     
-    info = platforms_info.get(platform, platforms_info["facebook"])
+    request = dict(
+        model=settings.OPENAI_MODEL,
+        messages=prompts.regenerate_messages(topic, platform, tone, previous_content),
+        temperature=0.9,  # Higher for more variety
+        max_tokens=300
+    )
     
-    prompt = f"""Create a {tone} social media post about: {topic}
-
-Platform: {platform.upper()}
-Style: {info['style']}
-Max length: {info['max_length']} characters
-Hashtags: {info['hashtags']}
-
-IMPORTANT: Create a DIFFERENT version from this previous attempt:
-{previous_content if previous_content else "N/A"}
-
-Make it engaging and authentic. Return ONLY the post text:"""
-
     try:
-        response = client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"You are a professional social media content creator for {platform}. Create fresh, engaging alternatives."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.9,  # Higher for more variety
-            max_tokens=300
-        )
-        
-        generated_text = response.choices[0].message.content.strip()
+        generated_text = await _complete_chat(request, progress_callback)
         
         return {
             "success": True,
@@ -738,7 +641,7 @@ Make it engaging and authentic. Return ONLY the post text:"""
         )
 
 
-async def refine_content(original_content: str, platform: str, instructions: str) -> dict:
+async def refine_content(original_content: str, platform: str, instructions: str, progress_callback=None) -> dict:
     """
     Refine existing content based on user instructions
     
@@ -746,6 +649,8 @@ async def refine_content(original_content: str, platform: str, instructions: str
         original_content: The current content
         platform: Target platform
         instructions: What to change
+        progress_callback: Optional async callable(event, data); when given the
+            text is streamed to it as "delta" events ({"delta"}) while it is written
         
     Returns:
         dict: Refined content
@@ -756,34 +661,19 @@ async def refine_content(original_content: str, platform: str, instructions: str
             detail="OpenAI API key not configured"
         )
     
-    prompt = f"""Original post for {platform}:
-{original_content}
-
-User wants: {instructions}
-
-Rewrite the post incorporating the user's feedback. Keep it optimized for {platform}.
-Return only the revised post text:"""
-
+    await ensure_quota()
+    
+    request = dict(
+        model=settings.OPENAI_MODEL,
+        messages=prompts.refine_messages(original_content, platform, instructions),
+        temperature=0.7,
+        max_tokens=300
+    )
+    
     try:
-        response = client.chat.completions.create(
-            model=settings.OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"You are a helpful social media content editor. Refine posts based on user feedback while keeping them optimized for {platform}."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            max_tokens=300
-        )
-        
         return {
             "success": True,
-            "content": response.choices[0].message.content.strip()
+            "content": await _complete_chat(request, progress_callback)
         }
         
     except Exception as e:
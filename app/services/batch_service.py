@@ -0,0 +1,447 @@
+"""
+Offline batch generation through the OpenAI Batch API
+Campaigns that do not need their captions right away can be generated at
+the Batch API's lower price: every (item, platform) caption request is
+written as one line of a JSONL file, uploaded and submitted as a batch.
+The scheduler leader polls submitted batches (every BATCH_POLL_INTERVAL)
+and, once a batch is done, fans its captions out into scheduled posts.
+
+The Batch API has no image endpoint, so items bring their image: a file
+already under UPLOAD_DIR (an AI-generated image's local_path, for example).
+Each post gets its own copy, since a post's image is removed when the post
+is published, expires or is deleted.
+
+Collection is crash-safe: a job is claimed ("collecting") before its results
+are fanned out, posts get ids derived from (job, item, platform) so a second
+collection skips the ones already created, and the batch's tokens are
+charged once, in the step that marks the job collected. A job left
+"collecting" by a crashed leader is picked up again after COLLECT_TIMEOUT.
+
+Batches are tracked in SQLite, so they survive restarts and can be
+submitted by any API worker while only the leader collects them.
+"""
+import json
+import time
+import uuid
+import shutil
+import asyncio
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from openai import AsyncOpenAI
+from app.config import settings
+from app.services.ai_service import caption_request
+from app.services.usage_service import get_usage_store, PROMPT_TOKENS, COMPLETION_TOKENS
+from app.utils.sqlite_store import SQLiteStore, shared_store
+
+logger = logging.getLogger(__name__)
+
+SUBMITTED = "submitted"
+COLLECTING = "collecting"
+COMPLETED = "completed"
+FAILED = "failed"
+
+# Batch API states after which the batch will not change any more
+FINAL_BATCH_STATES = ("completed", "failed", "expired", "cancelled")
+
+CHAT_ENDPOINT = "/v1/chat/completions"
+
+# Seconds after which a job still "collecting" is considered abandoned
+COLLECT_TIMEOUT = 600
+
+
+class BatchStore(SQLiteStore):
+    """SQLite-backed generation batches"""
+
+    SCHEMA = (
+        """
+            CREATE TABLE IF NOT EXISTS generation_batches (
+                id TEXT PRIMARY KEY,
+                openai_batch_id TEXT NOT NULL,
+                caller TEXT NOT NULL,
+                status TEXT NOT NULL,
+                batch_status TEXT,
+                items TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """,
+        "CREATE INDEX IF NOT EXISTS generation_batches_status ON generation_batches (status)",
+    )
+
+    def __init__(self, path: Path, retention_days: float = 30):
+        super().__init__(path, retention_days)
+
+    def add(self, openai_batch_id: str, caller: str, items: List[dict]) -> dict:
+        """
+        Track a submitted batch
+
+        Args:
+            openai_batch_id: Id returned by the Batch API
+            caller: Who the batch's tokens are charged to
+            items: The batch's items (topic, tone, platforms, scheduled_time, image_path)
+
+        Returns:
+            dict: The job (see get)
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO generation_batches (id, openai_batch_id, caller, status, items, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (job_id, openai_batch_id, caller, SUBMITTED, json.dumps(items), now, now))
+        return self.get(job_id)
+
+    def pending(self) -> List[dict]:
+        """Jobs whose batch has not been collected yet (or whose collection was abandoned), oldest first"""
+        with self._connect() as conn:
+            rows = conn.execute("""
+                SELECT * FROM generation_batches
+                WHERE status = ? OR (status = ? AND updated_at < ?)
+                ORDER BY created_at
+            """, (SUBMITTED, COLLECTING, time.time() - COLLECT_TIMEOUT)).fetchall()
+        return [self._job(row) for row in rows]
+
+    def claim(self, job_id: str, batch_status: str) -> bool:
+        """
+        Take a finished batch's job for collection
+
+        Returns:
+            bool: False when another poller is collecting (or collected) the job
+        """
+        now = time.time()
+        with self._connect() as conn:
+            claimed = conn.execute("""
+                UPDATE generation_batches SET status = ?, batch_status = ?, updated_at = ?
+                WHERE id = ? AND (status = ? OR (status = ? AND updated_at < ?))
+            """, (COLLECTING, batch_status, now, job_id, SUBMITTED, COLLECTING, now - COLLECT_TIMEOUT)).rowcount
+        return claimed == 1
+
+    def release(self, job_id: str):
+        """Hand a job back to the next poll after its collection failed"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE generation_batches SET status = ?, updated_at = ? WHERE id = ? AND status = ?",
+                (SUBMITTED, time.time(), job_id, COLLECTING)
+            )
+
+    def complete(self, job_id: str, status: str, result: dict = None, error: str = None,
+                 usage: Tuple[str, Dict[str, int]] = None) -> bool:
+        """
+        Record the outcome of a collected job and charge its tokens
+
+        The usage lands in the usage store under a charge id of the job, inside
+        the transaction that marks the job collected: if either write is lost,
+        the job is collected again and the charge is not repeated.
+
+        Args:
+            job_id: Job being collected
+            status: COMPLETED or FAILED
+            result: Outcome of the fan out
+            error: Why the job failed
+            usage: (caller, metrics) to charge
+
+        Returns:
+            bool: False when the job was not being collected any more
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                updated = conn.execute("""
+                    UPDATE generation_batches SET status = ?, result = ?, error = ?, updated_at = ?
+                    WHERE id = ? AND status = ?
+                """, (status, json.dumps(result) if result is not None else None, error, time.time(),
+                      job_id, COLLECTING)).rowcount
+                if updated and usage is not None:
+                    caller, metrics = usage
+                    get_usage_store().add(caller, metrics, charge_id=f"batch:{job_id}")
+                conn.execute("COMMIT")
+                return updated == 1
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def update(self, job_id: str, batch_status: str, status: str = SUBMITTED, result: dict = None, error: str = None):
+        """Record the Batch API state of a job and, once collected, its outcome"""
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE generation_batches SET status = ?, batch_status = ?, result = ?, error = ?, updated_at = ?
+                WHERE id = ?
+            """, (status, batch_status, json.dumps(result) if result is not None else None, error, time.time(), job_id))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Get a job by id"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM generation_batches WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row is not None else None
+
+    def prune(self):
+        """Drop collected jobs older than the retention period"""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM generation_batches WHERE status IN (?, ?) AND updated_at < ?",
+                (COMPLETED, FAILED, time.time() - self.retention_seconds)
+            )
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["items"] = json.loads(job["items"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+@shared_store
+def get_batch_store() -> BatchStore:
+    """Get the shared batch store (created on first use)"""
+    return BatchStore(settings.GENERATION_BATCH_DB_FILE)
+
+
+def _batch_client() -> AsyncOpenAI:
+    """
+    OpenAI client for one submit or poll
+
+    Polls run on the scheduler's thread loops, so they cannot share the
+    module-level client of the API's event loop.
+    """
+    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+
+
+def job_status(job: dict) -> dict:
+    """
+    Public view of a job (for the status endpoint)
+
+    Args:
+        job: Job from the store
+
+    Returns:
+        dict: Id, status, Batch API state, timestamps and, once collected, the posts
+    """
+    return {
+        "batch_id": job["id"],
+        "status": job["status"],
+        "batch_status": job["batch_status"],
+        "items": len(job["items"]),
+        "captions": sum(len(item["platforms"]) for item in job["items"]),
+        "created_at": datetime.fromtimestamp(job["created_at"]).isoformat(),
+        "updated_at": datetime.fromtimestamp(job["updated_at"]).isoformat(),
+        "result": job["result"],
+        "error": job["error"]
+    }
+
+
+def build_batch_file(items: List[dict]) -> bytes:
+    """
+    JSONL input of a batch: one caption request per (item, platform)
+
+    Each line's custom_id is "<item index>:<platform>", which is how the
+    results are matched back to items.
+    """
+    lines = []
+    for index, item in enumerate(items):
+        for platform in item["platforms"]:
+            lines.append(json.dumps({
+                "custom_id": f"{index}:{platform}",
+                "method": "POST",
+                "url": CHAT_ENDPOINT,
+                "body": caption_request(item["topic"], platform, item["tone"])
+            }))
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def submit_batch(items: List[dict], caller: str) -> dict:
+    """
+    Upload the caption requests of a campaign and submit them as one batch
+
+    Args:
+        items: Dicts with topic, tone, platforms, scheduled_time and image_path
+        caller: Who the batch's tokens are charged to
+
+    Returns:
+        dict: The job (see BatchStore.get)
+    """
+    async with _batch_client() as openai_client:
+        input_file = await openai_client.files.create(
+            file=("captions.jsonl", build_batch_file(items)), purpose="batch"
+        )
+        batch = await openai_client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=CHAT_ENDPOINT,
+            completion_window="24h",
+            metadata={"source": "generate-content/batch"}
+        )
+    job = await asyncio.to_thread(get_batch_store().add, batch.id, caller, items)
+    logger.info("📦 Submitted caption batch %s (%s) with %d item(s)", job["id"], batch.id, len(items))
+    return job
+
+
+def parse_batch_output(text: str) -> Dict[str, dict]:
+    """
+    Results of a batch output (or error) file by custom_id
+
+    Returns:
+        dict: custom_id -> {"content", "usage"} or {"error"}
+    """
+    results = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        response = entry.get("response") or {}
+        body = response.get("body") or {}
+        if entry.get("error") or response.get("status_code") != 200:
+            error = entry.get("error") or body.get("error") or {}
+            results[entry["custom_id"]] = {"error": error.get("message") or f"HTTP {response.get('status_code')}"}
+            continue
+        results[entry["custom_id"]] = {
+            "content": body["choices"][0]["message"]["content"].strip(),
+            "usage": body.get("usage") or {}
+        }
+    return results
+
+
+def _post_id(job_id: str, index: int, platform: str) -> str:
+    """Id of the post of an (item, platform), the same on every collection"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, f"{job_id}:{index}:{platform}"))
+
+
+def _copy_image(image_path: str, job_id: str, index: int, platform: str) -> str:
+    """A post's own copy of an item's image (overwritten if a collection is repeated)"""
+    source = Path(image_path)
+    copy = settings.UPLOAD_DIR / f"batch_{job_id}_{index}_{platform}{source.suffix}"
+    shutil.copyfile(source, copy)
+    return str(copy)
+
+
+def fan_out(job: dict, results: Dict[str, dict]) -> dict:
+    """
+    Turn the captions of a finished batch into scheduled posts
+
+    Posts go to storage and, in the scheduler leader, get their publish job
+    right away (posts whose time already passed are published now). Posts
+    an earlier, interrupted collection already created are kept as they are.
+
+    Args:
+        job: Job from the store
+        results: parse_batch_output of the batch's files
+
+    Returns:
+        dict: {"posts": [{"post_id", "item", "platform", "scheduled_time"}], "failed": [...]}
+    """
+    from app.scheduler.scheduler import schedule_post_job, leadership
+    from app.scheduler.storage import add_scheduled_post, load_scheduled_posts, storage_lock
+
+    posts, failed = [], []
+    for index, item in enumerate(job["items"]):
+        for platform in item["platforms"]:
+            result = results.get(f"{index}:{platform}") or {"error": "No result in the batch output"}
+            if "error" in result or not result["content"]:
+                failed.append({"item": index, "platform": platform, "error": result.get("error", "Empty caption")})
+                continue
+            post_id = _post_id(job["id"], index, platform)
+            try:
+                with storage_lock():
+                    created = not any(p.get("id") == post_id for p in load_scheduled_posts())
+                    if created:
+                        post = {
+                            "id": post_id,
+                            "caption": result["content"],
+                            "image_path": _copy_image(item["image_path"], job["id"], index, platform),
+                            "platforms": {platform: True},
+                            "scheduled_time": item["scheduled_time"],
+                            "created_at": datetime.now().isoformat(),
+                            "status": "scheduled",
+                            "generation_batch": job["id"]
+                        }
+                        add_scheduled_post(post)
+                if created and not leadership.standby:
+                    schedule_post_job(post)
+            except Exception as e:
+                logger.error("❌ Failed to schedule batch %s item %d (%s): %s", job["id"], index, platform, e)
+                failed.append({"item": index, "platform": platform, "error": str(e)})
+                continue
+            posts.append({"post_id": post_id, "item": index, "platform": platform,
+                          "scheduled_time": item["scheduled_time"]})
+    return {"posts": posts, "failed": failed}
+
+
+async def collect_batch(job: dict, openai_client: AsyncOpenAI) -> bool:
+    """
+    Check one job's batch; collect it if the Batch API is done with it
+
+    Returns:
+        bool: True once collected, False while the batch still runs (or
+            another poller collects it)
+    """
+    store = get_batch_store()
+    batch = await openai_client.batches.retrieve(job["openai_batch_id"])
+    if batch.status not in FINAL_BATCH_STATES:
+        await asyncio.to_thread(store.update, job["id"], batch.status)
+        return False
+
+    if not await asyncio.to_thread(store.claim, job["id"], batch.status):
+        return False
+    try:
+        return await _collect(store, job, batch, openai_client)
+    except BaseException:
+        await asyncio.shield(asyncio.to_thread(store.release, job["id"]))
+        raise
+
+
+async def _collect(store: BatchStore, job: dict, batch, openai_client: AsyncOpenAI) -> bool:
+    """Fan out the results of a claimed job's finished batch"""
+    results = {}
+    for file_id in (batch.output_file_id, batch.error_file_id):
+        if file_id:
+            content = await openai_client.files.content(file_id)
+            results.update(parse_batch_output(content.text))
+
+    if not results:
+        error = "; ".join(e.message for e in (batch.errors.data if batch.errors else []) if e.message)
+        await asyncio.to_thread(store.complete, job["id"], FAILED, None, error or f"Batch {batch.status}")
+        logger.error("❌ Caption batch %s %s without results", job["id"], batch.status)
+        return True
+
+    outcome = await asyncio.to_thread(fan_out, job, results)
+    status = COMPLETED if outcome["posts"] else FAILED
+    # Batch tokens are charged to whoever submitted the batch
+    usage = {
+        PROMPT_TOKENS: sum(r["usage"].get(PROMPT_TOKENS, 0) for r in results.values() if "usage" in r),
+        COMPLETION_TOKENS: sum(r["usage"].get(COMPLETION_TOKENS, 0) for r in results.values() if "usage" in r)
+    }
+    await asyncio.to_thread(store.complete, job["id"], status, outcome, None, (job["caller"], usage))
+    logger.info(
+        "✅ Caption batch %s collected: %d post(s) scheduled, %d failed",
+        job["id"], len(outcome["posts"]), len(outcome["failed"])
+    )
+    return True
+
+
+async def poll_batches() -> int:
+    """
+    Collect every submitted batch that finished (scheduler leader job)
+
+    Returns:
+        int: Jobs collected in this round
+    """
+    store = get_batch_store()
+    jobs = await asyncio.to_thread(store.pending)
+    if not jobs:
+        return 0
+
+    collected = 0
+    async with _batch_client() as openai_client:
+        for job in jobs:
+            try:
+                if await collect_batch(job, openai_client):
+                    collected += 1
+            except Exception as e:
+                # Transient errors: the job goes back to submitted and is checked next round
+                logger.error("❌ Failed to check caption batch %s: %s", job["id"], e)
+    return collected
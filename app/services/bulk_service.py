@@ -0,0 +1,94 @@
+"""
+Bulk content generation for campaign batches
+Items run through a bounded pipeline (at most `concurrency` generations at
+once) and results are yielded as each item finishes, in completion order.
+Items with the same topic, tone and style share one prompt enhancement, and
+all items share the module-level OpenAI client and the pooled image
+download client.
+"""
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Tuple
+from fastapi import HTTPException
+from app.services.ai_service import enhance_user_prompt, generate_platform_content
+
+logger = logging.getLogger(__name__)
+
+
+class _EnhancementCache:
+    """
+    Prompt enhancements of one batch, computed once per (topic, tone, style)
+
+    Concurrent items with the same key await the same task.
+    """
+
+    def __init__(self):
+        self._tasks: Dict[Tuple[str, str, str], asyncio.Task] = {}
+
+    async def get(self, topic: str, tone: str, image_style: str) -> dict:
+        key = (topic, tone, image_style)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.create_task(enhance_user_prompt(topic, tone, image_style))
+            self._tasks[key] = task
+        # shield: one item being cancelled must not cancel the others' enhancement
+        return await asyncio.shield(task)
+
+    def cancel(self):
+        for task in self._tasks.values():
+            task.cancel()
+
+
+async def _generate_item(index: int, item: dict, enhancements: _EnhancementCache) -> dict:
+    """Generate one item; failures are reported in the result, not raised"""
+    try:
+        enhanced_prompts = None
+        if item.get("use_prompt_enhancer", True):
+            enhanced_prompts = await enhancements.get(item["topic"], item["tone"], item["image_style"])
+        result = await generate_platform_content(
+            topic=item["topic"],
+            tone=item["tone"],
+            image_style=item["image_style"],
+            generate_image=item.get("generate_image", True),
+            use_prompt_enhancer=item.get("use_prompt_enhancer", True),
+            image_provider=item.get("image_provider", "dalle"),
+            enhanced_prompts=enhanced_prompts
+        )
+        return {"index": index, "topic": item["topic"], "success": True, "result": result}
+    except HTTPException as e:
+        return {"index": index, "topic": item["topic"], "success": False, "status_code": e.status_code, "error": e.detail}
+    except Exception as e:
+        logger.error("❌ Bulk item %d (%s) failed: %s", index, item["topic"], e)
+        return {"index": index, "topic": item["topic"], "success": False, "status_code": 500, "error": str(e)}
+
+
+async def generate_bulk(items: List[dict], concurrency: int = 4) -> AsyncIterator[dict]:
+    """
+    Generate content for many items, yielding each result as it finishes
+
+    Stopping the iteration early (e.g. the client disconnected) cancels the
+    items still running or waiting.
+
+    Args:
+        items: GenerateRequest-like dicts (topic, tone, image_style, ...)
+        concurrency: Most items generated at once
+
+    Yields:
+        dict: {"index", "topic", "success", "result"} or {..., "status_code", "error"}
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    enhancements = _EnhancementCache()
+
+    async def run(index: int, item: dict) -> dict:
+        async with semaphore:
+            return await _generate_item(index, item, enhancements)
+
+    tasks = [asyncio.create_task(run(index, item)) for index, item in enumerate(items)]
+    logger.info("📦 Bulk generation of %d item(s), %d at a time", len(items), concurrency)
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield await finished
+    finally:
+        for task in tasks:
+            task.cancel()
+        enhancements.cancel()
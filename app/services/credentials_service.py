@@ -31,6 +31,10 @@ def save_credentials(credentials: Dict) -> bool:
     try:
         with open(file_path, 'w') as f:
             json.dump(credentials, f, indent=2)
+        
+        # Cached token checks no longer reflect the stored credentials
+        from app.services.token_verification_service import token_status_cache
+        token_status_cache.invalidate()
         return True
     except Exception as e:
         print(f"Error saving credentials: {e}")
@@ -1,11 +1,16 @@
 """
 Facebook posting service
 """
-import os
 import httpx
 from fastapi import HTTPException
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.config import settings
+from app.utils.media import ImageSource, open_image, image_name
+from app.utils.runtime import track_outbound
+from app.utils.circuit_breaker import circuit_breaker
+from app.utils.errors import PlatformError, is_retryable, retry_if_retryable
+from app.services.idempotency_service import idempotent, sending
+from app.utils.metrics import observe_publish
 
 
 async def get_facebook_page_id() -> str:
@@ -34,20 +39,27 @@ async def get_facebook_page_id() -> str:
             return data["id"]
         except httpx.HTTPError as e:
             print(f"Error fetching page ID: {e}")
+            if is_retryable(e):
+                raise PlatformError(f"Facebook is unreachable: {e}", retryable=True) from e
             raise HTTPException(status_code=401, detail="Invalid Facebook token")
 
 
+@idempotent("facebook")
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_retryable,
     reraise=True
 )
-async def post_photo_to_facebook(image_path: str, caption: str) -> dict:
+@circuit_breaker("facebook")
+@track_outbound("facebook", "publish")
+@observe_publish("facebook")
+async def post_photo_to_facebook(image_path: ImageSource, caption: str) -> dict:
     """
     Post a photo with caption to Facebook Page
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, or an in-memory ImageBuffer
         caption: Caption text for the post
         
     Returns:
@@ -67,21 +79,22 @@ async def post_photo_to_facebook(image_path: str, caption: str) -> dict:
         page_id = await get_facebook_page_id()
         
         async with httpx.AsyncClient(timeout=30.0) as client:
-            with open(image_path, "rb") as image_file:
+            with open_image(image_path) as image_file:
                 files = {
-                    "source": (os.path.basename(image_path), image_file, "image/jpeg")
+                    "source": (image_name(image_path), image_file, "image/jpeg")
                 }
                 data = {
                     "message": caption,
                     "access_token": access_token
                 }
                 
-                response = await client.post(
-                    f"{settings.FACEBOOK_GRAPH_URL}/{page_id}/photos",
-                    files=files,
-                    data=data
-                )
-                response.raise_for_status()
+                async with sending():
+                    response = await client.post(
+                        f"{settings.FACEBOOK_GRAPH_URL}/{page_id}/photos",
+                        files=files,
+                        data=data
+                    )
+                    response.raise_for_status()
                 result = response.json()
                 
                 # Add post URL
@@ -95,9 +108,9 @@ async def post_photo_to_facebook(image_path: str, caption: str) -> dict:
         print(f"Error posting to Facebook: {e}")
         if hasattr(e, 'response') and e.response is not None:
             error_detail = e.response.json() if e.response.text else str(e)
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to post to Facebook: {error_detail}"
-            )
-        raise HTTPException(status_code=500, detail=f"Failed to post to Facebook: {str(e)}")
+            raise PlatformError(
+                f"Failed to post to Facebook: {error_detail}",
+                retryable=is_retryable(e)
+            ) from e
+        raise PlatformError(f"Failed to post to Facebook: {str(e)}", retryable=is_retryable(e)) from e
 
@@ -0,0 +1,379 @@
+"""
+Idempotent publishing
+Outcomes of publish calls are recorded durably per (idempotency key, platform)
+in SQLite, shared by the API, the scheduler and the bot process. A repeated
+publish with the same key returns the stored result instead of posting again,
+and intermediate steps (uploaded media, Instagram containers) are kept as
+checkpoints so a retry resumes instead of re-uploading.
+
+The request that creates the post runs inside `sending()`. If it times out,
+is cancelled or the process dies while it is in flight, the platform may
+have posted anyway: the record becomes "unknown" and is neither retried nor
+published again until someone checks the platform and resolves it
+(IdempotencyStore.resolve, POST /api/admin/publish-records/.../resolve).
+
+Callers set the key around a publish:
+
+    with idempotency_key(post_id):
+        await post_photo_to_facebook(image, caption)
+"""
+import json
+import time
+import asyncio
+import logging
+import functools
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+from app.utils.errors import PlatformError, may_have_been_sent
+from app.utils.sqlite_store import SQLiteStore, shared_store
+
+logger = logging.getLogger(__name__)
+
+# Idempotency key of the publish in progress (None = not idempotent)
+publish_key_var: ContextVar[Optional[str]] = ContextVar("publish_key", default=None)
+# (key, platform, checkpoints) of the platform publish running in this context
+_current_publish: ContextVar[Optional[tuple]] = ContextVar("current_publish", default=None)
+
+# Record statuses
+PENDING = "pending"
+SUCCESS = "success"
+FAILED = "failed"
+UNKNOWN = "unknown"
+
+# Checkpoint set while the request that creates the post is in flight
+SENDING_CHECKPOINT = "sending"
+
+
+class PublishInProgress(Exception):
+    """Another attempt with the same key is publishing to this platform right now"""
+
+    def __init__(self, key: str, platform: str):
+        super().__init__(f"A publish to {platform} with idempotency key '{key}' is already in progress")
+        self.key = key
+        self.platform = platform
+
+
+class PublishOutcomeUnknown(PlatformError):
+    """
+    An earlier attempt may have posted: it failed or was interrupted after
+    sending the post. Not retryable; resolve the record after checking.
+    """
+
+    def __init__(self, key: Optional[str], platform: Optional[str], reason: str = None):
+        if key:
+            detail = f"{platform} may already have published the post with idempotency key '{key}'"
+        else:
+            detail = "The post may already have been published"
+        if reason:
+            detail += f" ({reason})"
+        if key:
+            detail += "; check the platform and resolve the publish record"
+        super().__init__(detail, retryable=False, status_code=409)
+        self.key = key
+        self.platform = platform
+
+
+class IdempotencyStore(SQLiteStore):
+    """SQLite-backed publish records"""
+
+    SCHEMA = (
+        """
+            CREATE TABLE IF NOT EXISTS publish_records (
+                key TEXT NOT NULL,
+                platform TEXT NOT NULL,
+                status TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                checkpoints TEXT NOT NULL DEFAULT '{}',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (key, platform)
+            )
+        """,
+    )
+
+    def __init__(self, path: Path, lease_seconds: float = 300, retention_days: float = 7):
+        self.lease_seconds = lease_seconds
+        super().__init__(path, retention_days)
+
+    def claim(self, key: str, platform: str) -> dict:
+        """
+        Start a publish attempt, or find that it already happened
+
+        Args:
+            key: Idempotency key
+            platform: Platform name
+
+        Returns:
+            dict: {"status": "success", "result": ...} for a finished publish,
+                  otherwise {"status": "pending", "checkpoints": {...}} (claimed)
+
+        Raises:
+            PublishInProgress: Another attempt holds an unexpired claim
+            PublishOutcomeUnknown: An earlier attempt may have posted
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT * FROM publish_records WHERE key = ? AND platform = ?", (key, platform)
+                ).fetchone()
+
+                if row is not None and row["status"] == SUCCESS:
+                    conn.execute("COMMIT")
+                    return {"status": SUCCESS, "result": json.loads(row["result"])}
+                if row is not None and row["status"] == UNKNOWN:
+                    conn.execute("COMMIT")
+                    raise PublishOutcomeUnknown(key, platform, row["error"])
+                checkpoints = json.loads(row["checkpoints"]) if row is not None else {}
+                if row is not None and row["status"] == PENDING:
+                    if now - row["updated_at"] < self.lease_seconds:
+                        raise PublishInProgress(key, platform)
+                    if checkpoints.get(SENDING_CHECKPOINT):
+                        # The attempt died while its post was in flight
+                        error = "the attempt stopped while sending"
+                        conn.execute(
+                            "UPDATE publish_records SET status = ?, error = ?, updated_at = ? WHERE key = ? AND platform = ?",
+                            (UNKNOWN, error, now, key, platform)
+                        )
+                        conn.execute("COMMIT")
+                        raise PublishOutcomeUnknown(key, platform, error)
+
+                conn.execute("""
+                    INSERT INTO publish_records (key, platform, status, checkpoints, attempts, updated_at)
+                    VALUES (?, ?, ?, ?, 1, ?)
+                    ON CONFLICT (key, platform) DO UPDATE SET
+                        status = excluded.status, error = NULL, attempts = attempts + 1, updated_at = excluded.updated_at
+                """, (key, platform, PENDING, json.dumps(checkpoints), now))
+                conn.execute("COMMIT")
+                return {"status": PENDING, "checkpoints": checkpoints}
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def complete(self, key: str, platform: str, result: Any):
+        """Record a successful publish"""
+        self._update(key, platform, status=SUCCESS, result=json.dumps(result, default=str))
+
+    def fail(self, key: str, platform: str, error: str):
+        """Record a failed attempt (the next attempt may publish again)"""
+        self._update(key, platform, status=FAILED, error=error)
+
+    def mark_unknown(self, key: str, platform: str, error: str):
+        """Record an attempt that may have posted (no attempt publishes until it is resolved)"""
+        self._update(key, platform, status=UNKNOWN, error=error)
+
+    def resolve(self, key: str, platform: str, result: Any = None) -> bool:
+        """
+        Settle an unknown outcome after checking the platform
+
+        Args:
+            key: Idempotency key
+            platform: Platform name
+            result: The post found on the platform (recorded as the publish
+                result), or None when it wasn't posted (the next attempt
+                publishes again)
+
+        Returns:
+            bool: False if there was no unknown record to resolve
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT checkpoints FROM publish_records WHERE key = ? AND platform = ? AND status = ?",
+                    (key, platform, UNKNOWN)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return False
+                checkpoints = json.loads(row["checkpoints"])
+                checkpoints.pop(SENDING_CHECKPOINT, None)
+                if result is not None:
+                    status, error, stored = SUCCESS, None, json.dumps(result, default=str)
+                else:
+                    status, error, stored = FAILED, "not published (resolved)", None
+                conn.execute("""
+                    UPDATE publish_records SET status = ?, error = ?, result = ?, checkpoints = ?, updated_at = ?
+                    WHERE key = ? AND platform = ?
+                """, (status, error, stored, json.dumps(checkpoints), time.time(), key, platform))
+                conn.execute("COMMIT")
+                return True
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def unresolved(self) -> List[dict]:
+        """Records with an unknown outcome, oldest first"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT key, platform, error, attempts, updated_at FROM publish_records WHERE status = ? ORDER BY updated_at",
+                (UNKNOWN,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def checkpoint(self, key: str, platform: str, checkpoints: Dict[str, Any]):
+        """Persist intermediate results of the current attempt"""
+        self._update(key, platform, checkpoints=json.dumps(checkpoints, default=str))
+
+    def _update(self, key: str, platform: str, **fields):
+        fields["updated_at"] = time.time()
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(
+                f"UPDATE publish_records SET {assignments} WHERE key = ? AND platform = ?",
+                (*fields.values(), key, platform)
+            )
+
+    def get(self, key: str, platform: str) -> Optional[dict]:
+        """Get the stored record (for inspection/tests)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM publish_records WHERE key = ? AND platform = ?", (key, platform)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(row)
+        record["result"] = json.loads(record["result"]) if record["result"] else None
+        record["checkpoints"] = json.loads(record["checkpoints"])
+        return record
+
+    def prune(self):
+        """Drop records older than the retention period (unknown outcomes are kept until resolved)"""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM publish_records WHERE status != ? AND updated_at < ?",
+                (UNKNOWN, time.time() - self.retention_seconds)
+            )
+
+
+@shared_store
+def get_store() -> IdempotencyStore:
+    """Get the shared store (created on first use)"""
+    from app.config import settings
+    return IdempotencyStore(
+        settings.IDEMPOTENCY_DB_FILE,
+        lease_seconds=settings.IDEMPOTENCY_LEASE_SECONDS,
+        retention_days=settings.IDEMPOTENCY_RETENTION_DAYS
+    )
+
+
+@contextmanager
+def idempotency_key(key: Optional[str]) -> Iterator[None]:
+    """
+    Make platform publishes inside the block idempotent under `key`
+
+    Args:
+        key: Idempotency key (post id, client key, ...); None disables it
+    """
+    token = publish_key_var.set(key)
+    try:
+        yield
+    finally:
+        publish_key_var.reset(token)
+
+
+def idempotent(platform: str):
+    """
+    Decorator for async publish functions: at most one successful publish per
+    (idempotency key, platform). Apply outermost so retries share checkpoints.
+
+    Args:
+        platform: Platform name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            key = publish_key_var.get()
+            if not key:
+                return await func(*args, **kwargs)
+
+            store = get_store()
+            record = await asyncio.to_thread(store.claim, key, platform)
+            if record["status"] == SUCCESS:
+                logger.info("↩️ %s already published for key %s, returning stored result", platform, key)
+                return record["result"]
+
+            checkpoints = record["checkpoints"]
+            token = _current_publish.set((key, platform, checkpoints))
+            try:
+                result = await func(*args, **kwargs)
+            except BaseException as e:
+                error = str(e) or type(e).__name__
+                if checkpoints.get(SENDING_CHECKPOINT):
+                    # Failed or interrupted after the post went out: don't publish again blindly
+                    logger.error("❓ %s outcome unknown for key %s: %s", platform, key, error)
+                    await asyncio.shield(asyncio.to_thread(store.mark_unknown, key, platform, error))
+                else:
+                    await asyncio.shield(asyncio.to_thread(store.fail, key, platform, error))
+                raise
+            finally:
+                _current_publish.reset(token)
+            await asyncio.to_thread(store.complete, key, platform, result)
+            return result
+        return wrapper
+    return decorator
+
+
+@asynccontextmanager
+async def sending() -> AsyncIterator[None]:
+    """
+    Wrap the request that creates the post (the step that isn't safe to repeat)
+
+    A rejection (an error response, a failed connect) leaves the publish
+    retryable. A failure that may have reached the platform (read timeout,
+    dropped connection) raises PublishOutcomeUnknown, which is never retried;
+    under an idempotency key the record becomes "unknown", as it does when
+    the attempt is cancelled or fails later on.
+    """
+    current = _current_publish.get()
+    if current is not None:
+        await save_checkpoint(SENDING_CHECKPOINT, True)
+    try:
+        yield
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        if may_have_been_sent(e):
+            key, platform = current[:2] if current else (None, None)
+            raise PublishOutcomeUnknown(key, platform, str(e) or type(e).__name__) from e
+        if current is not None:
+            # Rejected: nothing was posted, a retry may send again
+            current[2].pop(SENDING_CHECKPOINT, None)
+            await asyncio.to_thread(get_store().checkpoint, current[0], current[1], dict(current[2]))
+        raise
+
+
+def get_checkpoint(name: str) -> Any:
+    """
+    Get an intermediate result saved by an earlier attempt of this publish
+
+    Args:
+        name: Checkpoint name (e.g. "media_id")
+
+    Returns:
+        The saved value, or None (also when the publish isn't idempotent)
+    """
+    current = _current_publish.get()
+    return current[2].get(name) if current else None
+
+
+async def save_checkpoint(name: str, value: Any):
+    """
+    Save an intermediate result so a retry can skip the step
+
+    Args:
+        name: Checkpoint name
+        value: JSON-serialisable value
+    """
+    current = _current_publish.get()
+    if current is None:
+        return
+    key, platform, checkpoints = current
+    checkpoints[name] = value
+    await asyncio.to_thread(get_store().checkpoint, key, platform, dict(checkpoints))
@@ -7,6 +7,13 @@ import cloudinary.uploader
 from fastapi import HTTPException
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.config import settings
+from app.utils.media import ImageSource, open_image
+from app.utils.runtime import track_outbound
+from app.utils.circuit_breaker import circuit_breaker
+from app.utils.errors import PlatformError, platform_error, is_retryable_status, retry_if_retryable
+from app.services.idempotency_service import idempotent, get_checkpoint, save_checkpoint, sending
+from app.utils.metrics import observe_publish, INSTAGRAM_POLL_ITERATIONS
+from app.utils.profiling import span
 
 
 async def get_instagram_account_info() -> tuple:
@@ -44,17 +51,22 @@ async def get_instagram_account_info() -> tuple:
             return account_id, "Instagram"
 
 
+@idempotent("instagram")
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_retryable,
     reraise=True
 )
-async def post_photo_to_instagram(image_path: str, caption: str) -> dict:
+@circuit_breaker("instagram")
+@track_outbound("instagram", "publish")
+@observe_publish("instagram")
+async def post_photo_to_instagram(image_path: ImageSource, caption: str) -> dict:
     """
     Post a photo with caption to Instagram using Cloudinary for hosting
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, or an in-memory ImageBuffer
         caption: Caption text for the post
         
     Returns:
@@ -70,75 +82,97 @@ async def post_photo_to_instagram(image_path: str, caption: str) -> dict:
         access_token = credentials.get("access_token") if credentials else settings.INSTAGRAM_ACCESS_TOKEN
         
         if not ig_account_id:
-            raise Exception("Instagram Account ID not configured")
+            raise PlatformError("Instagram Account ID not configured")
         if not access_token:
-            raise Exception("Instagram Access Token not configured")
+            raise PlatformError("Instagram Access Token not configured")
 
         # Upload to Cloudinary to get a permanent HTTPS URL
         if not all([settings.CLOUDINARY_CLOUD_NAME, settings.CLOUDINARY_API_KEY, settings.CLOUDINARY_API_SECRET]):
-            raise Exception("Cloudinary is not configured. Please set CLOUDINARY_* env vars.")
+            raise PlatformError("Cloudinary is not configured. Please set CLOUDINARY_* env vars.")
 
-        upload_result = cloudinary.uploader.upload(
-            image_path,
-            folder=settings.CLOUDINARY_FOLDER,
-            overwrite=True,
-            resource_type="image"
-        )
-        public_image_url = upload_result.get("secure_url")
+        # A retry of an idempotent publish reuses the image uploaded by the earlier attempt
+        public_image_url = get_checkpoint("image_url")
         if not public_image_url:
-            raise Exception("Failed to obtain secure_url from Cloudinary upload")
+            # Cloudinary accepts a file object, so buffers upload straight from memory
+            with open_image(image_path) as upload_source, span("instagram.cloudinary_upload"):
+                upload_result = await asyncio.to_thread(
+                    cloudinary.uploader.upload,
+                    upload_source,
+                    folder=settings.CLOUDINARY_FOLDER,
+                    overwrite=True,
+                    resource_type="image"
+                )
+            public_image_url = upload_result.get("secure_url")
+            if not public_image_url:
+                raise Exception("Failed to obtain secure_url from Cloudinary upload")
+            await save_checkpoint("image_url", public_image_url)
 
         async with httpx.AsyncClient(timeout=60.0) as client:
-            # Create media container with image_url
-            container_response = await client.post(
-                f"{settings.INSTAGRAM_GRAPH_URL}/{ig_account_id}/media",
-                data={
-                    "image_url": public_image_url,
-                    "caption": caption,
-                    "access_token": access_token
-                }
-            )
+            # Create media container with image_url (or reuse the one from an earlier attempt)
+            container_id = get_checkpoint("container_id")
+            if not container_id:
+                with span("instagram.create_container"):
+                    container_response = await client.post(
+                        f"{settings.INSTAGRAM_GRAPH_URL}/{ig_account_id}/media",
+                        data={
+                            "image_url": public_image_url,
+                            "caption": caption,
+                            "access_token": access_token
+                        }
+                    )
 
-            if container_response.status_code != 200:
-                error_data = container_response.json() if container_response.text else {}
-                print(f"Instagram container creation failed: {error_data}")
-                raise Exception(f"Failed to create media container: {error_data}")
+                if container_response.status_code != 200:
+                    error_data = container_response.json() if container_response.text else {}
+                    print(f"Instagram container creation failed: {error_data}")
+                    raise PlatformError(
+                        f"Failed to create media container: {error_data}",
+                        retryable=is_retryable_status(container_response.status_code)
+                    )
 
-            container_data = container_response.json()
-            container_id = container_data.get("id")
-            if not container_id:
-                raise Exception("No container ID returned from Instagram")
+                container_data = container_response.json()
+                container_id = container_data.get("id")
+                if not container_id:
+                    raise Exception("No container ID returned from Instagram")
+                await save_checkpoint("container_id", container_id)
 
             # Poll container status until FINISHED (or fail after timeout)
-            for _ in range(20):  # ~20 seconds max wait
-                status_resp = await client.get(
-                    f"{settings.INSTAGRAM_GRAPH_URL}/{container_id}",
-                    params={
-                        "fields": "status_code",
-                        "access_token": access_token
-                    }
-                )
-                status_resp.raise_for_status()
-                status = status_resp.json().get("status_code")
-                if status == "FINISHED":
-                    break
-                elif status in ("ERROR", "FAILED"):
-                    raise Exception(f"Instagram media processing failed: {status}")
-                await asyncio.sleep(1)
+            with span("instagram.poll"):
+                for poll_count in range(1, 21):  # ~20 seconds max wait
+                    status_resp = await client.get(
+                        f"{settings.INSTAGRAM_GRAPH_URL}/{container_id}",
+                        params={
+                            "fields": "status_code",
+                            "access_token": access_token
+                        }
+                    )
+                    status_resp.raise_for_status()
+                    status = status_resp.json().get("status_code")
+                    if status == "FINISHED":
+                        INSTAGRAM_POLL_ITERATIONS.observe(poll_count)
+                        break
+                    elif status in ("ERROR", "FAILED"):
+                        # Instagram rejected the image itself; uploading it again won't help
+                        raise PlatformError(f"Instagram media processing failed: {status}")
+                    await asyncio.sleep(1)
 
             # Publish the container
-            publish_response = await client.post(
-                f"{settings.INSTAGRAM_GRAPH_URL}/{ig_account_id}/media_publish",
-                data={
-                    "creation_id": container_id,
-                    "access_token": access_token
-                }
-            )
+            async with sending():
+                with span("instagram.publish"):
+                    publish_response = await client.post(
+                        f"{settings.INSTAGRAM_GRAPH_URL}/{ig_account_id}/media_publish",
+                        data={
+                            "creation_id": container_id,
+                            "access_token": access_token
+                        }
+                    )
 
-            if publish_response.status_code != 200:
-                error_data = publish_response.json() if publish_response.text else {}
-                print(f"Instagram publish failed: {error_data}")
-                raise Exception(f"Failed to publish media: {error_data}")
+                if publish_response.status_code != 200:
+                    error_data = publish_response.json() if publish_response.text else {}
+                    print(f"Instagram publish failed: {error_data}")
+                    raise PlatformError(
+                        f"Failed to publish media: {error_data}",
+                        retryable=is_retryable_status(publish_response.status_code)
+                    )
 
             result = publish_response.json()
             
@@ -153,5 +187,5 @@ async def post_photo_to_instagram(image_path: str, caption: str) -> dict:
     except Exception as e:
         error_msg = str(e)
         print(f"Instagram posting error: {error_msg}")
-        raise HTTPException(status_code=500, detail=f"Instagram posting failed: {error_msg}")
+        raise platform_error("Instagram posting failed", e) from e
 
@@ -0,0 +1,290 @@
+"""
+Publish outbox
+/api/post can persist a publish job and answer 202 right away; outbox workers
+(in the API process or a separate `python outbox_worker.py`) pick jobs up and
+publish them. Jobs live in SQLite, so they survive client disconnects and
+restarts: a job whose worker died is picked up again once its lease expires,
+and one interrupted by a shutdown is queued again right away. The job's
+idempotency key keeps platforms that already accepted the post from being
+posted to twice, and a platform that was interrupted mid-request is left
+for an admin to resolve instead of being posted to again.
+"""
+import os
+import json
+import time
+import uuid
+import asyncio
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+from app.utils.sqlite_store import SQLiteStore, shared_store
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class OutboxStore(SQLiteStore):
+    """SQLite-backed publish jobs"""
+
+    SCHEMA = (
+        """
+            CREATE TABLE IF NOT EXISTS outbox_jobs (
+                id TEXT PRIMARY KEY,
+                idempotency_key TEXT NOT NULL UNIQUE,
+                status TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_until REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """,
+        "CREATE INDEX IF NOT EXISTS outbox_jobs_status ON outbox_jobs (status, created_at)",
+    )
+
+    def __init__(self, path: Path, lease_seconds: float = 600, retention_days: float = 7):
+        self.lease_seconds = lease_seconds
+        super().__init__(path, retention_days)
+
+    def enqueue(self, payload: dict, idempotency_key: str = None) -> dict:
+        """
+        Add a publish job, or find the one already created with this key
+
+        Args:
+            payload: {"image_path", "caption", "platforms"}
+            idempotency_key: Client key; a new job gets its id as key
+
+        Returns:
+            dict: The job (see get)
+        """
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("""
+                INSERT INTO outbox_jobs (id, idempotency_key, status, payload, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT (idempotency_key) DO NOTHING
+            """, (job_id, idempotency_key or job_id, QUEUED, json.dumps(payload), now, now))
+            row = conn.execute(
+                "SELECT * FROM outbox_jobs WHERE idempotency_key = ?", (idempotency_key or job_id,)
+            ).fetchone()
+        return self._job(row)
+
+    def claim(self) -> Optional[dict]:
+        """
+        Take the oldest queued job (or one whose worker's lease ran out)
+
+        Returns:
+            dict: The claimed job, or None when there is nothing to do
+        """
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute("""
+                    SELECT * FROM outbox_jobs
+                    WHERE status = ? OR (status = ? AND lease_until < ?)
+                    ORDER BY created_at LIMIT 1
+                """, (QUEUED, RUNNING, now)).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                conn.execute("""
+                    UPDATE outbox_jobs SET status = ?, attempts = attempts + 1, lease_until = ?, updated_at = ?
+                    WHERE id = ?
+                """, (RUNNING, now + self.lease_seconds, now, row["id"]))
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        job = self._job(row)
+        job.update(status=RUNNING, attempts=job["attempts"] + 1)
+        return job
+
+    def release(self, job_id: str):
+        """Put an interrupted job back in the queue"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE outbox_jobs SET status = ?, lease_until = NULL, updated_at = ? WHERE id = ? AND status = ?",
+                (QUEUED, time.time(), job_id, RUNNING)
+            )
+
+    def finish(self, job_id: str, status: str, result: dict = None, error: str = None):
+        """Record the outcome of a job (DONE or FAILED)"""
+        with self._connect() as conn:
+            conn.execute("""
+                UPDATE outbox_jobs SET status = ?, result = ?, error = ?, lease_until = NULL, updated_at = ?
+                WHERE id = ?
+            """, (status, json.dumps(result, default=str) if result is not None else None, error, time.time(), job_id))
+
+    def get(self, job_id: str) -> Optional[dict]:
+        """Get a job by id"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM outbox_jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._job(row) if row is not None else None
+
+    def get_by_key(self, idempotency_key: str) -> Optional[dict]:
+        """Get the job created with an idempotency key"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM outbox_jobs WHERE idempotency_key = ?", (idempotency_key,)).fetchone()
+        return self._job(row) if row is not None else None
+
+    def pending_count(self) -> int:
+        """Jobs queued or being published"""
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT COUNT(*) FROM outbox_jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)
+            ).fetchone()[0]
+
+    def prune(self):
+        """Drop finished jobs older than the retention period"""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM outbox_jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (DONE, FAILED, time.time() - self.retention_seconds)
+            )
+
+    @staticmethod
+    def _job(row: sqlite3.Row) -> dict:
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+
+@shared_store
+def get_outbox() -> OutboxStore:
+    """Get the shared outbox (created on first use)"""
+    from app.config import settings
+    return OutboxStore(
+        settings.OUTBOX_DB_FILE,
+        lease_seconds=settings.OUTBOX_LEASE_SECONDS,
+        retention_days=settings.OUTBOX_RETENTION_DAYS
+    )
+
+
+def job_status(job: dict) -> dict:
+    """
+    Public view of a job (for the status endpoint)
+
+    Args:
+        job: Job from the store
+
+    Returns:
+        dict: Id, status, timestamps and, once finished, the publish result
+    """
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "attempts": job["attempts"],
+        "created_at": datetime.fromtimestamp(job["created_at"]).isoformat(),
+        "updated_at": datetime.fromtimestamp(job["updated_at"]).isoformat(),
+        "result": job["result"],
+        "error": job["error"]
+    }
+
+
+async def run_job(job: dict):
+    """
+    Publish one claimed job and record its outcome
+
+    Args:
+        job: Job returned by OutboxStore.claim
+    """
+    from app.services.idempotency_service import idempotency_key
+    from app.services.publish_service import publish_post, summarize_results
+    from app.utils.log_config import request_id_var
+
+    store = get_outbox()
+    payload = job["payload"]
+    request_id_var.set(f"job-{job['id'][:8]}")
+    logger.info("📤 Publishing outbox job %s (attempt %d)", job["id"], job["attempts"])
+    try:
+        with idempotency_key(job["idempotency_key"]):
+            results = await publish_post(payload["image_path"], payload["caption"], payload["platforms"])
+        summary = summarize_results(results)
+        status = DONE if summary["success"] else FAILED
+        await asyncio.to_thread(store.finish, job["id"], status, summary)
+        logger.info("✅ Outbox job %s %s: %s", job["id"], status, summary["message"])
+    except asyncio.CancelledError:
+        # Stopped (shutdown): the job runs again, its publish records decide what's left to do
+        logger.warning("⏸️ Outbox job %s interrupted, queued again", job["id"])
+        await asyncio.shield(asyncio.to_thread(store.release, job["id"]))
+        raise
+    except Exception as e:
+        logger.exception("❌ Outbox job %s failed: %s", job["id"], e)
+        await asyncio.to_thread(store.finish, job["id"], FAILED, None, str(e))
+
+    # The image is only needed until the job has an outcome
+    if os.path.exists(payload["image_path"]):
+        os.remove(payload["image_path"])
+
+
+class OutboxWorkers:
+    """
+    Background tasks that publish outbox jobs
+
+    Workers sleep until a job is enqueued in this process (notify) or the poll
+    interval passes (jobs enqueued by other processes, expired leases).
+    """
+
+    def __init__(self):
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def start(self, count: int, poll_interval: float = 1.0):
+        """Start `count` workers on the running loop"""
+        if self._tasks or count <= 0:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._work(poll_interval), name=f"outbox-worker-{i}")
+            for i in range(count)
+        ]
+        logger.info("✅ Started %d outbox worker(s)", count)
+
+    def notify(self):
+        """Wake the workers up (a job was just enqueued)"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self):
+        """Cancel the workers; an interrupted job goes back to the queue"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _work(self, poll_interval: float):
+        store = get_outbox()
+        while True:
+            # Cleared before looking, so a job enqueued meanwhile still wakes us
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(store.claim)
+            except Exception as e:
+                logger.error("❌ Outbox claim failed: %s", e)
+                job = None
+            if job is not None:
+                await run_job(job)
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+outbox_workers = OutboxWorkers()
@@ -0,0 +1,131 @@
+"""
+Publishing a photo post to the selected platforms
+Shared by immediate posts (/api/post) and the outbox workers.
+"""
+import logging
+from app.services.facebook_service import post_photo_to_facebook
+from app.services.instagram_service import post_photo_to_instagram
+from app.services.twitter_service import post_photo_to_twitter
+from app.services.reddit_service import post_photo_to_reddit
+
+logger = logging.getLogger(__name__)
+
+
+async def publish_post(image_path: str, caption: str, selected: dict) -> dict:
+    """
+    Post a photo with caption to the selected platforms
+
+    Run it inside idempotency_key(...) to make retries safe.
+
+    Args:
+        image_path: Path to the image file
+        caption: Post caption
+        selected: Dict of selected platforms ({"facebook": True, ...})
+
+    Returns:
+        dict: Per-platform results ({"success": ..., "postId"/"error": ...})
+    """
+    results = {
+        "facebook": {"success": False, "error": None},
+        "instagram": {"success": False, "error": None},
+        "twitter": {"success": False, "error": None},
+        "reddit": {"success": False, "error": None}
+    }
+
+    # Post to Facebook
+    if selected.get("facebook"):
+        try:
+            fb_result = await post_photo_to_facebook(image_path, caption)
+            results["facebook"] = {
+                "success": True,
+                "postId": fb_result.get("id"),
+                "postLink": f"https://www.facebook.com/{fb_result.get('post_id')}" if fb_result.get('post_id') else None
+            }
+            logger.info("✅ Posted to Facebook successfully")
+        except Exception as fb_error:
+            results["facebook"] = {
+                "success": False,
+                "error": str(fb_error)
+            }
+            logger.warning("❌ Facebook posting failed: %s", fb_error)
+
+    # Post to Instagram
+    if selected.get("instagram"):
+        try:
+            ig_result = await post_photo_to_instagram(image_path, caption)
+            results["instagram"] = {
+                "success": True,
+                "postId": ig_result.get("id")
+            }
+            logger.info("✅ Posted to Instagram successfully")
+        except Exception as ig_error:
+            results["instagram"] = {
+                "success": False,
+                "error": str(ig_error)
+            }
+            logger.warning("❌ Instagram posting failed: %s", ig_error)
+
+    # Post to Twitter
+    if selected.get("twitter"):
+        try:
+            tw_result = await post_photo_to_twitter(image_path, caption)
+            results["twitter"] = {
+                "success": True,
+                "postId": tw_result.get("id")
+            }
+            logger.info("✅ Posted photo to Twitter successfully")
+        except Exception as tw_error:
+            results["twitter"] = {
+                "success": False,
+                "error": str(tw_error)
+            }
+            logger.warning("❌ Twitter photo posting failed: %s", tw_error)
+
+    # Post to Reddit
+    if selected.get("reddit"):
+        try:
+            rd_result = await post_photo_to_reddit(image_path, caption)
+            results["reddit"] = {
+                "success": True,
+                "postId": rd_result.get("id"),
+                "postUrl": rd_result.get("url")
+            }
+            logger.info("✅ Posted photo to Reddit successfully")
+        except Exception as rd_error:
+            results["reddit"] = {
+                "success": False,
+                "error": str(rd_error)
+            }
+            logger.warning("❌ Reddit photo posting failed: %s", rd_error)
+
+    return results
+
+
+def summarize_results(results: dict) -> dict:
+    """
+    Overall outcome of a publish
+
+    Args:
+        results: Per-platform results from publish_post
+
+    Returns:
+        dict: {"success": bool, "message": str, "results": results}
+    """
+    successes = [
+        name for platform, name in
+        (("facebook", "Facebook"), ("instagram", "Instagram"), ("twitter", "Twitter"), ("reddit", "Reddit"))
+        if results[platform]["success"]
+    ]
+
+    if len(successes) == 4:
+        message = "🎉 Photo posted successfully to all platforms!"
+    elif len(successes) > 0:
+        message = f"🎉 Posted to {', '.join(successes)}. Others failed."
+    else:
+        message = "Failed to post to any platform"
+
+    return {
+        "success": len(successes) > 0,
+        "message": message,
+        "results": results
+    }
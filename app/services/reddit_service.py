@@ -1,23 +1,34 @@
 """
 Reddit posting service
 """
-from fastapi import HTTPException
+import asyncio
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.clients.reddit import get_reddit_client
 from app.config import settings
+from app.utils.media import ImageSource, image_as_file
+from app.utils.runtime import track_outbound
+from app.utils.circuit_breaker import circuit_breaker
+from app.utils.errors import PlatformError, platform_error, retry_if_retryable
+from app.services.idempotency_service import idempotent, sending
+from app.utils.metrics import observe_publish
 
 
+@idempotent("reddit")
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_retryable,
     reraise=True
 )
-async def post_photo_to_reddit(image_path: str, caption: str) -> dict:
+@circuit_breaker("reddit")
+@track_outbound("reddit", "publish")
+@observe_publish("reddit")
+async def post_photo_to_reddit(image_path: ImageSource, caption: str) -> dict:
     """
     Post a photo with title (caption) to Reddit subreddit
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, or an in-memory ImageBuffer
         caption: Post title (max 300 characters)
         
     Returns:
@@ -25,13 +36,17 @@ async def post_photo_to_reddit(image_path: str, caption: str) -> dict:
     """
     reddit = get_reddit_client()
     if reddit is None:
-        raise HTTPException(status_code=500, detail="Reddit credentials not configured")
+        raise PlatformError("Reddit credentials not configured")
 
     try:
         subreddit = reddit.subreddit(settings.REDDIT_SUBREDDIT)
         title = (caption or "Untitled post")[:300]
-        submission = subreddit.submit_image(title=title, image_path=image_path)
+        # praw only takes a path; buffers go through a short-lived temp file
+        with image_as_file(image_path) as path:
+            # praw is blocking, keep it off the event loop
+            async with sending():
+                submission = await asyncio.to_thread(subreddit.submit_image, title=title, image_path=path)
         return {"id": submission.id, "url": submission.url}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to post to Reddit: {str(e)}")
+        raise platform_error("Failed to post to Reddit", e) from e
 
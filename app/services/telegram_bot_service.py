@@ -4,10 +4,14 @@ Complete feature parity with web frontend - ENHANCED UX WITH BACK BUTTONS
 """
 import os
 import uuid
+import secrets
 import asyncio
+import logging
 from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import (
     Application,
     CommandHandler,
@@ -20,15 +24,24 @@ from telegram.ext import (
 import httpx
 from fastapi import HTTPException
 from app.config import settings
-from app.services.ai_service import generate_platform_content, regenerate_platform_content
+from app.services.ai_service import generate_platform_content, regenerate_platform_content, refine_content
 from app.services.facebook_service import post_photo_to_facebook
 from app.services.instagram_service import post_photo_to_instagram
 from app.services.twitter_service import post_photo_to_twitter
 from app.services.reddit_service import post_photo_to_reddit
-from app.scheduler.storage import load_scheduled_posts, save_scheduled_posts
+from app.services.idempotency_service import idempotency_key
+from app.services.usage_service import usage_caller
+from app.scheduler.storage import load_scheduled_posts, add_scheduled_post
 from app.scheduler.scheduler import scheduler, execute_scheduled_post
 from apscheduler.triggers.date import DateTrigger
 from app.services.telegram_auth import telegram_auth, require_login, require_login_callback
+from app.telegram.update_processor import PerUserUpdateProcessor
+from app.telegram.utils.photo_cache import photo_cache
+from app.telegram.utils.formatters import format_retry_status
+from app.telegram.utils.streaming import ThrottledMessageEditor
+from app.utils.media import ImageBuffer
+
+logger = logging.getLogger(__name__)
 
 # Conversation states
 (MENU, GENERATE_TOPIC, GENERATE_TONE, GENERATE_PROVIDER, GENERATE_STYLE, 
@@ -45,6 +58,10 @@ class TelegramBotService:
     
     def __init__(self):
         self.application = None
+        self.webhook_active = False
+        self.webhook_secret = None
+        self._webhook_lock = None
+        self.generation_jobs = {}  # user_id -> running background generation task
     
     # ==================== COMMAND HANDLERS ====================
     
@@ -111,7 +128,7 @@ class TelegramBotService:
         login_id = update.message.text.strip()
         context.user_data['login_id'] = login_id
         
-        print(f"🔐 Login ID received from user {user.id}: {login_id}")
+        logger.debug("🔐 Login ID received from user %s", user.id)
         
         await update.message.reply_text(
             "🔑 *Password Required*\n\n"
@@ -126,9 +143,7 @@ class TelegramBotService:
         password = update.message.text.strip()
         login_id = context.user_data.get('login_id', '')
         
-        print(f"🔑 Password received from user {user.id}")
-        print(f"   Login ID: {login_id}")
-        print(f"   Attempting verification...")
+        logger.debug("🔑 Password received from user %s", user.id)
         
         # Delete the password message for security
         try:
@@ -137,7 +152,7 @@ class TelegramBotService:
             pass
         
         if telegram_auth.verify_login(user.id, login_id, password):
-            print(f"✅ Login successful for user {user.id}")
+            logger.info("✅ Login successful for user %s", user.id)
             await update.message.reply_text(
                 "✅ *Login Successful!*\n\n"
                 f"Welcome, {user.first_name}!\n\n"
@@ -147,7 +162,7 @@ class TelegramBotService:
             context.user_data.clear()
             return ConversationHandler.END
         else:
-            print(f"❌ Login failed for user {user.id}")
+            logger.warning("❌ Login failed for user %s", user.id)
             await update.message.reply_text(
                 "❌ *Login Failed*\n\n"
                 "Invalid Login ID or Password.\n\n"
@@ -324,6 +339,7 @@ class TelegramBotService:
                     message += f"\n*{idx}.* 📅 {date_str} | ⏰ {time_str}\n"
                     message += f"📱 {plat_str}\n"
                     message += f"{status_icon} Status: *{status_text}*\n"
+                    message += format_retry_status(post)
                     message += f"💬 _{caption}_\n"
             
             # Summary
@@ -341,7 +357,7 @@ class TelegramBotService:
             except Exception as e:
                 # Message unchanged or other minor error - ignore
                 if "not modified" not in str(e):
-                    print(f"⚠️  Schedule view update error: {e}")
+                    logger.warning("⚠️  Schedule view update error: %s", e)
             
             return MENU
         
@@ -573,99 +589,133 @@ class TelegramBotService:
             parse_mode='Markdown'
         )
         
-        # Small delay for user to see the summary
-        await asyncio.sleep(0.5)
+        # Run the generation in the background so the handler returns immediately;
+        # results are pushed to the chat as each phase finishes
+        self._start_generation_job(update, context, session, provider, loading_msg)
+        return APPROVE_PLATFORMS
+    
+    def _start_generation_job(self, update: Update, context: ContextTypes.DEFAULT_TYPE, session: dict, provider: str, status_message, regenerated: bool = False):
+        """Start a background generation job for the user, replacing any running one"""
+        user_id = update.effective_user.id
         
-        try:
-            # Update: Step 1 - Generating content
-            await loading_msg.edit_text(
-                f"⚡ *Generating...*\n\n"
-                f"[▓▓░░░░░░░░] 20%\n"
-                f"📝 Creating content...",
+        previous_job = self.generation_jobs.pop(user_id, None)
+        if previous_job and not previous_job.done():
+            previous_job.cancel()
+        
+        session["generating"] = True
+        job = context.application.create_task(
+            self._run_generation_job(
+                context.bot,
+                update.effective_chat.id,
+                user_id,
+                session,
+                provider,
+                status_message,
+                regenerated
+            ),
+            update=update
+        )
+        self.generation_jobs[user_id] = job
+    
+    @staticmethod
+    def _progress_bar(done: int, total: int) -> str:
+        """Render a 10-step progress bar"""
+        filled = int(10 * done / total) if total else 10
+        return f"[{'▓' * filled}{'░' * (10 - filled)}] {int(100 * done / total) if total else 100}%"
+    
+    async def _send_platform_content(self, bot, chat_id: int, platform: str, content: str):
+        """Send one platform's content, split to fit Telegram's 4096 char limit"""
+        platform_message = f"*{platform.upper()}:*\n\n{content}"
+        
+        if len(platform_message) > 4000:
+            chunks = [platform_message[i:i+4000] for i in range(0, len(platform_message), 4000)]
+            for i, chunk in enumerate(chunks):
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=chunk if i == 0 else f"_(continued)_\n{chunk}",
+                    parse_mode='Markdown'
+                )
+        else:
+            await bot.send_message(
+                chat_id=chat_id,
+                text=platform_message,
                 parse_mode='Markdown'
             )
+    
+    async def _run_generation_job(self, bot, chat_id: int, user_id: int, session: dict, provider: str, status_message, regenerated: bool = False):
+        """
+        Generate content + image in the background, pushing results as they arrive
+        
+        Progress is driven by real events from generate_platform_content:
+        each platform caption is sent as soon as it is written, the image
+        as soon as it is downloaded.
+        """
+        provider_name = "Nano Banana" if provider == "nano-banana" else "DALL-E 3"
+        total_steps = 5  # 4 captions + image
+        state = {"done": 0, "header_sent": False}
+        
+        async def update_status(step_text: str):
+            try:
+                await status_message.edit_text(
+                    f"⚡ *{'Regenerating' if regenerated else 'Generating'}...*\n\n"
+                    f"{self._progress_bar(state['done'], total_steps)}\n"
+                    f"{step_text}",
+                    parse_mode='Markdown'
+                )
+            except Exception as e:
+                # Message unchanged or deleted - progress is best effort
+                if "not modified" not in str(e):
+                    logger.debug("⚠️  Progress update error: %s", e)
+        
+        async def on_progress(event: str, data):
+            if event == "caption":
+                state["done"] += 1
+                if data.get("success"):
+                    if not state["header_sent"]:
+                        await bot.send_message(
+                            chat_id=chat_id,
+                            text="📝 *Regenerated Content:*" if regenerated else
+                                 "📝 *Generated Content:*\n\nReview the content for each platform below:",
+                            parse_mode='Markdown'
+                        )
+                        state["header_sent"] = True
+                    await self._send_platform_content(bot, chat_id, data["platform"], data["content"])
+                step = "🎨 Creating image..." if state["done"] == 4 else "📝 Writing captions..."
+                await update_status(f"✅ {data['platform'].title()} caption done\n{step}")
             
-            # Generate content using existing service
-            result = await generate_platform_content(
-                topic=session["topic"],
-                tone=session["tone"],
-                image_style=session["image_style"],
-                generate_image=True,
-                use_prompt_enhancer=False,
-                image_provider=provider
-            )
+            elif event == "image":
+                state["done"] += 1
+                if data and data.get("success"):
+                    await self._send_generated_image(bot, chat_id, session, data, provider_name, regenerated)
+                await update_status("✅ Image done")
+        
+        try:
+            await update_status("📝 Writing captions...")
             
-            # Update: Complete
-            await loading_msg.edit_text(
-                f"✅ *Generation Complete!*\n\n"
-                f"[▓▓▓▓▓▓▓▓▓▓] 100%\n"
-                f"Sending results...",
-                parse_mode='Markdown'
-            )
-            await asyncio.sleep(0.3)
+            with usage_caller(f"telegram:{user_id}"):
+                result = await generate_platform_content(
+                    topic=session["topic"],
+                    tone=session["tone"],
+                    image_style=session["image_style"],
+                    generate_image=True,
+                    use_prompt_enhancer=False,
+                    image_provider=provider,
+                    progress_callback=on_progress
+                )
             
-            # Store generated content in session
+            # Store generated content in session (approvals reset since everything is new)
             session["generated"] = result
             session["approved_platforms"] = []
             session["image_approved"] = False
             
-            # Send generated image
-            if result["image"]["success"]:
-                # Download and send image
-                async with httpx.AsyncClient() as client:
-                    img_response = await client.get(result["image"]["image_url"])
-                    img_path = Path(f"uploads/telegram_temp_{uuid.uuid4().hex[:8]}.png")
-                    
-                    with open(img_path, "wb") as f:
-                        f.write(img_response.content)
-                    
-                    session["temp_image_path"] = str(img_path)
-                    
-                    # Send photo with approval buttons
-                    keyboard = [
-                        [InlineKeyboardButton("✅ Approve Image", callback_data="img_approve"),
-                         InlineKeyboardButton("🔄 Regenerate", callback_data="img_regenerate")],
-                        [InlineKeyboardButton("« Back to Style", callback_data="back_provider")]
-                    ]
-                    reply_markup = InlineKeyboardMarkup(keyboard)
-                    
-                    with open(img_path, "rb") as photo:
-                        await context.bot.send_photo(
-                            chat_id=update.effective_chat.id,
-                            photo=photo,
-                            caption="🎨 *AI-Generated Image*\n\nDo you approve this image?",
-                            reply_markup=reply_markup,
-                            parse_mode='Markdown'
-                        )
-            
-            # Send full content for each platform (separately if needed for long content)
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text="📝 *Generated Content:*\n\nReview the content for each platform below:",
-                parse_mode='Markdown'
-            )
-            
-            # Send each platform's content separately to avoid message length limits
-            for platform, data in result["platforms"].items():
-                if data["success"]:
-                    platform_message = f"*{platform.upper()}:*\n\n{data['content']}"
-                    
-                    # Telegram has 4096 char limit per message
-                    if len(platform_message) > 4000:
-                        # Split into chunks if too long
-                        chunks = [platform_message[i:i+4000] for i in range(0, len(platform_message), 4000)]
-                        for i, chunk in enumerate(chunks):
-                            await context.bot.send_message(
-                                chat_id=update.effective_chat.id,
-                                text=chunk if i == 0 else f"_(continued)_\n{chunk}",
-                                parse_mode='Markdown'
-                            )
-                    else:
-                        await context.bot.send_message(
-                            chat_id=update.effective_chat.id,
-                            text=platform_message,
-                            parse_mode='Markdown'
-                        )
+            try:
+                await status_message.edit_text(
+                    f"✅ *{'Regeneration' if regenerated else 'Generation'} Complete!*\n\n"
+                    f"{self._progress_bar(total_steps, total_steps)}",
+                    parse_mode='Markdown'
+                )
+            except Exception:
+                pass
             
             # Platform approval buttons with edit option
             keyboard = [
@@ -679,31 +729,115 @@ class TelegramBotService:
             ]
             reply_markup = InlineKeyboardMarkup(keyboard)
             
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id,
+            await bot.send_message(
+                chat_id=chat_id,
                 text="📱 *Select platforms to approve:*\n(Tap to approve, then Continue)\n\n"
                      "💡 Use 'Edit Caption' to modify content",
                 reply_markup=reply_markup
             )
             
-            return APPROVE_PLATFORMS
-            
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            await context.bot.send_message(
-                chat_id=update.effective_chat.id,
-                text=f"❌ Error generating content:\n{str(e)}\n\nUse /start to try again."
+            await bot.send_message(
+                chat_id=chat_id,
+                text=f"❌ {'Regeneration failed' if regenerated else 'Error generating content'}:\n{str(e)}\n\nUse /start to try again."
             )
             user_sessions.pop(user_id, None)
-            return ConversationHandler.END
+        finally:
+            # A replacement job owns the session flag once this one is superseded
+            if self.generation_jobs.get(user_id) is asyncio.current_task():
+                self.generation_jobs.pop(user_id, None)
+                session["generating"] = False
+    
+    async def _send_generated_image(self, bot, chat_id: int, session: dict, image_data: dict, provider_name: str, regenerated: bool = False):
+        """Download the generated image and send it with approval buttons"""
+        # Delete the previous temp image when regenerating
+        if "temp_image_path" in session and os.path.exists(session["temp_image_path"]):
+            os.remove(session["temp_image_path"])
+            photo_cache.discard(session["temp_image_path"])
+        
+        async with httpx.AsyncClient() as client:
+            img_response = await client.get(image_data["image_url"])
+            img_path = Path(f"uploads/telegram_temp_{uuid.uuid4().hex[:8]}.png")
+            
+            with open(img_path, "wb") as f:
+                f.write(img_response.content)
+        
+        session["temp_image_path"] = str(img_path)
+        
+        # Send photo with approval buttons
+        keyboard = [
+            [InlineKeyboardButton("✅ Approve Image", callback_data="img_approve"),
+             InlineKeyboardButton("🔄 Regenerate", callback_data="img_regenerate")],
+            [InlineKeyboardButton("« Back to Menu", callback_data="back_menu")] if regenerated else
+            [InlineKeyboardButton("« Back to Style", callback_data="back_provider")]
+        ]
+        reply_markup = InlineKeyboardMarkup(keyboard)
+        
+        caption = (f"🔄 *Regenerated Image ({provider_name})*\n\nDo you approve this image?" if regenerated
+                   else "🎨 *AI-Generated Image*\n\nDo you approve this image?")
+        
+        await self._send_session_photo(bot, chat_id, str(img_path), caption, reply_markup)
+    
+    async def _send_session_photo(self, bot, chat_id: int, image_path: str, caption: str, reply_markup=None):
+        """
+        Send an image, reusing Telegram's file_id when it was sent before
+        
+        The first send uploads the file and caches the returned file_id;
+        later sends of the same path only pass the file_id.
+        
+        Args:
+            bot: Telegram bot instance
+            chat_id: Chat to send to
+            image_path: Local path of the image
+            caption: Photo caption (Markdown)
+            reply_markup: Optional inline keyboard
+            
+        Returns:
+            The sent message
+        """
+        file_id = photo_cache.get(image_path)
+        if file_id:
+            try:
+                return await bot.send_photo(
+                    chat_id=chat_id,
+                    photo=file_id,
+                    caption=caption,
+                    reply_markup=reply_markup,
+                    parse_mode='Markdown'
+                )
+            except BadRequest as e:
+                # Stale or foreign file_id - fall back to uploading
+                logger.warning("⚠️ Cached file_id rejected, re-uploading: %s", e)
+                photo_cache.discard(image_path)
+        
+        with open(image_path, "rb") as photo:
+            message = await bot.send_photo(
+                chat_id=chat_id,
+                photo=photo,
+                caption=caption,
+                reply_markup=reply_markup,
+                parse_mode='Markdown'
+            )
+        
+        if message and message.photo:
+            photo_cache.put(image_path, message.photo[-1].file_id)
+        return message
     
     async def image_approval_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle image approval/rejection/regeneration"""
         query = update.callback_query
-        await query.answer()
         
         user_id = update.effective_user.id
         session = user_sessions.get(user_id, {})
         
+        if session.get("generating"):
+            await query.answer("⏳ Still generating, please wait...")
+            return APPROVE_PLATFORMS
+        
+        await query.answer()
+        
         if query.data == "img_approve":
             session["image_approved"] = True
             await query.edit_message_caption(
@@ -742,11 +876,17 @@ class TelegramBotService:
     async def platform_approval_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle platform selection and publishing options"""
         query = update.callback_query
-        await query.answer()
         
         user_id = update.effective_user.id
         session = user_sessions.get(user_id, {})
         
+        # Content isn't in the session until the background generation finishes
+        if session.get("generating"):
+            await query.answer("⏳ Still generating, please wait...")
+            return APPROVE_PLATFORMS
+        
+        await query.answer()
+        
         # Handle provider choice during regeneration
         if query.data.startswith("regen_provider_"):
             provider = query.data.replace("regen_provider_", "")
@@ -755,110 +895,15 @@ class TelegramBotService:
             provider_name = "Nano Banana" if provider == "nano-banana" else "DALL-E 3"
             wait_time = "2-5 seconds" if provider == "nano-banana" else "10-20 seconds"
             
-            await context.bot.send_message(
+            status_message = await context.bot.send_message(
                 chat_id=update.effective_chat.id,
                 text=f"⚡ *Regenerating with {provider_name}...*\n\n_Please wait {wait_time}..._",
                 parse_mode='Markdown'
             )
             
-            try:
-                # Regenerate EVERYTHING (content + image)
-                result = await generate_platform_content(
-                    topic=session["topic"],
-                    tone=session["tone"],
-                    image_style=session["image_style"],
-                    generate_image=True,
-                    use_prompt_enhancer=False,
-                    image_provider=provider
-                )
-                
-                # Reset approvals since everything is new
-                session["generated"] = result
-                session["approved_platforms"] = []
-                session["image_approved"] = False
-                
-                # Delete old temp image
-                if "temp_image_path" in session and os.path.exists(session["temp_image_path"]):
-                    os.remove(session["temp_image_path"])
-                
-                # Send new image
-                if result["image"]["success"]:
-                    async with httpx.AsyncClient() as client:
-                        img_response = await client.get(result["image"]["image_url"])
-                        img_path = Path(f"uploads/telegram_temp_{uuid.uuid4().hex[:8]}.png")
-                        
-                        with open(img_path, "wb") as f:
-                            f.write(img_response.content)
-                        
-                        session["temp_image_path"] = str(img_path)
-                        
-                        keyboard = [
-                            [InlineKeyboardButton("✅ Approve Image", callback_data="img_approve"),
-                             InlineKeyboardButton("🔄 Regenerate", callback_data="img_regenerate")],
-                            [InlineKeyboardButton("« Back to Menu", callback_data="back_menu")]
-                        ]
-                        reply_markup = InlineKeyboardMarkup(keyboard)
-                        
-                        with open(img_path, "rb") as photo:
-                            await context.bot.send_photo(
-                                chat_id=update.effective_chat.id,
-                                photo=photo,
-                                caption=f"🔄 *Regenerated Image ({provider_name})*\n\nDo you approve this image?",
-                                reply_markup=reply_markup,
-                                parse_mode='Markdown'
-                            )
-                
-                # Send regenerated content
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text="📝 *Regenerated Content:*",
-                    parse_mode='Markdown'
-                )
-                
-                for platform, data in result["platforms"].items():
-                    if data["success"]:
-                        platform_message = f"*{platform.upper()}:*\n\n{data['content']}"
-                        
-                        if len(platform_message) > 4000:
-                            chunks = [platform_message[i:i+4000] for i in range(0, len(platform_message), 4000)]
-                            for i, chunk in enumerate(chunks):
-                                await context.bot.send_message(
-                                    chat_id=update.effective_chat.id,
-                                    text=chunk if i == 0 else f"_(continued)_\n{chunk}",
-                                    parse_mode='Markdown'
-                                )
-                        else:
-                            await context.bot.send_message(
-                                chat_id=update.effective_chat.id,
-                                text=platform_message,
-                                parse_mode='Markdown'
-                            )
-                
-                # Platform approval buttons
-                keyboard = [
-                    [InlineKeyboardButton("✅ Facebook", callback_data="plat_approve_facebook"),
-                     InlineKeyboardButton("✅ Instagram", callback_data="plat_approve_instagram")],
-                    [InlineKeyboardButton("✅ Twitter", callback_data="plat_approve_twitter"),
-                     InlineKeyboardButton("✅ Reddit", callback_data="plat_approve_reddit")],
-                    [InlineKeyboardButton("🚀 Continue to Publish", callback_data="plat_done")],
-                    [InlineKeyboardButton("« Back to Menu", callback_data="back_menu")]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text="📱 *Select platforms to approve:*\n(Tap to approve, then Continue)",
-                    reply_markup=reply_markup
-                )
-                
-                return APPROVE_PLATFORMS
-                
-            except Exception as e:
-                await context.bot.send_message(
-                    chat_id=update.effective_chat.id,
-                    text=f"❌ Regeneration failed:\n{str(e)}\n\nUse /start to try again."
-                )
-                return ConversationHandler.END
+            # Regenerate EVERYTHING (content + image) in the background
+            self._start_generation_job(update, context, session, provider, status_message, regenerated=True)
+            return APPROVE_PLATFORMS
         
         # Handle platform approval toggling
         if query.data.startswith("plat_approve_"):
@@ -971,99 +1016,101 @@ class TelegramBotService:
             
             # Publish to approved platforms
             results = {}
-            for idx, platform in enumerate(session["approved_platforms"], 1):
-                # Show progress
-                await query.edit_message_text(
-                    f"🚀 *Publishing...*\n\n"
-                    f"[{'▓' * idx}{'░' * (platforms_count - idx)}] {idx}/{platforms_count}\n"
-                    f"📤 Posting to {platform.title()}...",
-                    parse_mode='Markdown'
-                )
-                try:
-                    image_path = session.get("temp_image_path")
-                    content_data = session["generated"]["platforms"][platform]
-                    caption = content_data["content"]
+            # One key per session: re-running the publish never posts twice to a platform
+            with idempotency_key(session.setdefault("publish_key", uuid.uuid4().hex)):
+                for idx, platform in enumerate(session["approved_platforms"], 1):
+                    # Show progress
+                    await query.edit_message_text(
+                        f"🚀 *Publishing...*\n\n"
+                        f"[{'▓' * idx}{'░' * (platforms_count - idx)}] {idx}/{platforms_count}\n"
+                        f"📤 Posting to {platform.title()}...",
+                        parse_mode='Markdown'
+                    )
+                    try:
+                        image_path = session.get("temp_image_path")
+                        content_data = session["generated"]["platforms"][platform]
+                        caption = content_data["content"]
                     
-                    print(f"🔄 Publishing AI content to {platform}...")
+                        logger.debug("🔄 Publishing AI content to %s...", platform)
                     
-                    # Call platform services with timeout and standardize response
-                    if platform == "facebook" and image_path:
-                        api_result = await asyncio.wait_for(
-                            post_photo_to_facebook(image_path, caption),
-                            timeout=30.0
-                        )
-                        if api_result and ("id" in api_result or "post_id" in api_result):
-                            post_url = api_result.get("url", "")
-                            results[platform] = {
-                                "success": True, 
-                                "message": "Posted successfully!",
-                                "url": post_url,
-                                "id": api_result.get("id") or api_result.get("post_id")
-                            }
-                        else:
-                            results[platform] = {"success": False, "message": str(api_result)}
+                        # Call platform services with timeout and standardize response
+                        if platform == "facebook" and image_path:
+                            api_result = await asyncio.wait_for(
+                                post_photo_to_facebook(image_path, caption),
+                                timeout=30.0
+                            )
+                            if api_result and ("id" in api_result or "post_id" in api_result):
+                                post_url = api_result.get("url", "")
+                                results[platform] = {
+                                    "success": True, 
+                                    "message": "Posted successfully!",
+                                    "url": post_url,
+                                    "id": api_result.get("id") or api_result.get("post_id")
+                                }
+                            else:
+                                results[platform] = {"success": False, "message": str(api_result)}
                     
-                    elif platform == "instagram" and image_path:
-                        api_result = await asyncio.wait_for(
-                            post_photo_to_instagram(image_path, caption),
-                            timeout=30.0
-                        )
-                        if api_result and "id" in api_result:
-                            results[platform] = {
-                                "success": True, 
-                                "message": "Posted successfully!",
-                                "info": api_result.get("info", f"Media ID: {api_result.get('id')}"),
-                                "id": api_result.get("id")
-                            }
-                        else:
-                            results[platform] = {"success": False, "message": str(api_result)}
+                        elif platform == "instagram" and image_path:
+                            api_result = await asyncio.wait_for(
+                                post_photo_to_instagram(image_path, caption),
+                                timeout=30.0
+                            )
+                            if api_result and "id" in api_result:
+                                results[platform] = {
+                                    "success": True, 
+                                    "message": "Posted successfully!",
+                                    "info": api_result.get("info", f"Media ID: {api_result.get('id')}"),
+                                    "id": api_result.get("id")
+                                }
+                            else:
+                                results[platform] = {"success": False, "message": str(api_result)}
                     
-                    elif platform == "twitter" and image_path:
-                        api_result = await asyncio.wait_for(
-                            post_photo_to_twitter(image_path, caption),
-                            timeout=30.0
-                        )
-                        if api_result and "id" in api_result:
-                            tweet_url = api_result.get("url", "")
-                            results[platform] = {
-                                "success": True, 
-                                "message": "Posted successfully!",
-                                "url": tweet_url,
-                                "id": api_result.get("id")
-                            }
-                        else:
-                            results[platform] = {"success": False, "message": str(api_result)}
+                        elif platform == "twitter" and image_path:
+                            api_result = await asyncio.wait_for(
+                                post_photo_to_twitter(image_path, caption),
+                                timeout=30.0
+                            )
+                            if api_result and "id" in api_result:
+                                tweet_url = api_result.get("url", "")
+                                results[platform] = {
+                                    "success": True, 
+                                    "message": "Posted successfully!",
+                                    "url": tweet_url,
+                                    "id": api_result.get("id")
+                                }
+                            else:
+                                results[platform] = {"success": False, "message": str(api_result)}
                     
-                    elif platform == "reddit" and image_path:
-                        api_result = await asyncio.wait_for(
-                            post_photo_to_reddit(image_path, caption),
-                            timeout=30.0
-                        )
-                        if api_result and ("id" in api_result or "url" in api_result):
-                            reddit_url = api_result.get("url", "")
-                            results[platform] = {
-                                "success": True, 
-                                "message": "Posted successfully!",
-                                "url": reddit_url,
-                                "id": api_result.get("id")
-                            }
-                        else:
-                            results[platform] = {"success": False, "message": str(api_result)}
+                        elif platform == "reddit" and image_path:
+                            api_result = await asyncio.wait_for(
+                                post_photo_to_reddit(image_path, caption),
+                                timeout=30.0
+                            )
+                            if api_result and ("id" in api_result or "url" in api_result):
+                                reddit_url = api_result.get("url", "")
+                                results[platform] = {
+                                    "success": True, 
+                                    "message": "Posted successfully!",
+                                    "url": reddit_url,
+                                    "id": api_result.get("id")
+                                }
+                            else:
+                                results[platform] = {"success": False, "message": str(api_result)}
                     
-                    else:
-                        results[platform] = {"success": False, "message": "Missing image"}
+                        else:
+                            results[platform] = {"success": False, "message": "Missing image"}
                     
-                    print(f"✅ {platform} result: {results[platform]}")
+                        logger.info("✅ %s result: %s", platform, results[platform])
                         
-                except asyncio.TimeoutError:
-                    print(f"⏱️ {platform} timeout!")
-                    results[platform] = {"success": False, "message": "Request timeout (30s)"}
-                except HTTPException as e:
-                    print(f"❌ {platform} HTTP error: {e.detail}")
-                    results[platform] = {"success": False, "message": e.detail}
-                except Exception as e:
-                    print(f"❌ {platform} error: {str(e)}")
-                    results[platform] = {"success": False, "message": str(e)}
+                    except asyncio.TimeoutError:
+                        logger.warning("⏱️ %s timeout!", platform)
+                        results[platform] = {"success": False, "message": "Request timeout (30s)"}
+                    except HTTPException as e:
+                        logger.warning("❌ %s HTTP error: %s", platform, e.detail)
+                        results[platform] = {"success": False, "message": e.detail}
+                    except Exception as e:
+                        logger.warning("❌ %s error: %s", platform, str(e))
+                        results[platform] = {"success": False, "message": str(e)}
             
             # Send results with clickable links
             message = "📊 *Publishing Results:*\n\n"
@@ -1097,6 +1144,7 @@ class TelegramBotService:
             # Clean up temp file
             if "temp_image_path" in session and os.path.exists(session["temp_image_path"]):
                 os.remove(session["temp_image_path"])
+                photo_cache.discard(session["temp_image_path"])
             
             keyboard = [[InlineKeyboardButton("« Back to Menu", callback_data="back_menu")]]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -1182,7 +1230,8 @@ class TelegramBotService:
         await query.edit_message_text(
             f"✏️ *Edit {platform.upper()} Caption*\n\n"
             f"*Current caption:*\n{current_caption[:500]}...\n\n"
-            f"Send your edited caption below:",
+            f"Send your edited caption below, or start with `ai:` to have AI rewrite it "
+            f"(e.g. `ai: shorter, more emojis`):",
             parse_mode='Markdown'
         )
         
@@ -1196,6 +1245,16 @@ class TelegramBotService:
         platform = session.get("editing_platform")
         new_caption = update.message.text
         
+        # "ai: <instructions>" - AI rewrites the caption, streamed into one message
+        if platform and new_caption.lower().startswith("ai:") and platform in session["generated"]["platforms"]:
+            new_caption = await self._refine_caption_streamed(
+                update, user_id, platform,
+                session["generated"]["platforms"][platform]["content"],
+                new_caption[3:].strip()
+            )
+            if new_caption is None:
+                return EDIT_CAPTION
+        
         # Update the caption
         if platform and platform in session["generated"]["platforms"]:
             session["generated"]["platforms"][platform]["content"] = new_caption
@@ -1226,6 +1285,30 @@ class TelegramBotService:
             )
             return ConversationHandler.END
     
+    async def _refine_caption_streamed(self, update: Update, user_id: int, platform: str, caption: str, instructions: str):
+        """
+        Rewrite a caption with AI, showing the text in one message as it is written
+        
+        Returns:
+            str: The refined caption, or None if refining failed (the user was told)
+        """
+        if not instructions:
+            await update.message.reply_text("❌ Tell the AI what to change, e.g. `ai: shorter`", parse_mode='Markdown')
+            return None
+        
+        message = await update.message.reply_text("✨ Rewriting...")
+        editor = ThrottledMessageEditor(message, settings.TELEGRAM_STREAM_EDIT_INTERVAL)
+        try:
+            with usage_caller(f"telegram:{user_id}"):
+                result = await refine_content(caption, platform, instructions, progress_callback=editor.on_progress)
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            await editor.finish(f"❌ Couldn't rewrite the caption: {detail}\n\nSend a caption or try `ai:` again.")
+            return None
+        
+        await editor.finish(result["content"])
+        return result["content"]
+    
     async def edit_done_handler(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Finish editing and return to platform approval"""
         query = update.callback_query
@@ -1304,32 +1387,26 @@ class TelegramBotService:
         # Get the largest photo
         photo = update.message.photo[-1]
         
-        # Download the photo
+        # Download the photo into memory (written to disk only if scheduled)
         try:
             file = await photo.get_file()
             
-            # Save to uploads directory with absolute path
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             unique_id = uuid.uuid4().hex[:8]
             filename = f"telegram_manual_{timestamp}_{unique_id}.jpg"
             
-            # Get absolute path to uploads directory
-            uploads_dir = Path("uploads")
-            uploads_dir.mkdir(exist_ok=True)
-            filepath = uploads_dir / filename
-            
-            await file.download_to_drive(str(filepath))
+            data = await file.download_as_bytearray()
             
             # Verify file was downloaded
-            if not filepath.exists():
+            if not data:
                 raise Exception("Failed to download image")
             
-            print(f"✅ Image saved: {filepath}")
+            image = ImageBuffer(data, filename=filename)
+            logger.debug("✅ Image received: %s", image)
             
-            # Store in session with absolute path
             user_sessions[user_id] = {
                 "mode": "manual",
-                "image_path": str(filepath.absolute()),
+                "image": image,
                 "filename": filename
             }
             
@@ -1370,10 +1447,10 @@ class TelegramBotService:
         session["caption"] = caption
         
         # Debug: Print session data
-        print(f"📝 Caption set for user {user_id}")
-        print(f"   Image path: {session.get('image_path')}")
-        print(f"   Caption: {caption[:50]}")
-        print(f"   Mode: {session.get('mode')}")
+        logger.debug("📝 Caption set for user %s", user_id)
+        logger.debug("Image: %s", session.get('image'))
+        logger.debug("Caption: %s", caption[:50])
+        logger.debug("Mode: %s", session.get('mode'))
         
         # Show platform selection
         keyboard = [
@@ -1505,104 +1582,106 @@ class TelegramBotService:
             
             # Publish to selected platforms
             results = {}
-            image_path = session.get("image_path")
+            image = session.get("image")
             caption = session.get("caption", "")
             
             # Debug logging
-            print(f"📤 Publishing manual post...")
-            print(f"   Image path: {image_path}")
-            print(f"   Caption: {caption[:50] if caption else 'None'}")
-            print(f"   Platforms: {session['selected_platforms']}")
-            
-            for idx, platform in enumerate(session["selected_platforms"], 1):
-                # Show progress
-                await query.edit_message_text(
-                    f"🚀 *Publishing...*\n\n"
-                    f"[{'▓' * idx}{'░' * (platforms_count - idx)}] {idx}/{platforms_count}\n"
-                    f"📤 Posting to {platform.title()}...",
-                    parse_mode='Markdown'
-                )
-                try:
-                    print(f"🔄 Publishing to {platform}...")
+            logger.info("📤 Publishing manual post...")
+            logger.debug("Image: %s", image)
+            logger.debug("Caption: %s", caption[:50] if caption else 'None')
+            logger.debug("Platforms: %s", session['selected_platforms'])
+            
+            # One key per session: re-running the publish never posts twice to a platform
+            with idempotency_key(session.setdefault("publish_key", uuid.uuid4().hex)):
+                for idx, platform in enumerate(session["selected_platforms"], 1):
+                    # Show progress
+                    await query.edit_message_text(
+                        f"🚀 *Publishing...*\n\n"
+                        f"[{'▓' * idx}{'░' * (platforms_count - idx)}] {idx}/{platforms_count}\n"
+                        f"📤 Posting to {platform.title()}...",
+                        parse_mode='Markdown'
+                    )
+                    try:
+                        logger.debug("🔄 Publishing to %s...", platform)
                     
-                    # Call platform services with timeout
-                    if platform == "facebook":
-                        api_result = await asyncio.wait_for(
-                            post_photo_to_facebook(image_path, caption),
-                            timeout=30.0
-                        )
-                        if api_result and ("id" in api_result or "post_id" in api_result):
-                            post_url = api_result.get("url", "")
-                            results[platform] = {
-                                "success": True, 
-                                "message": "Posted successfully!",
-                                "url": post_url,
-                                "id": api_result.get("id") or api_result.get("post_id")
-                            }
-                        else:
-                            results[platform] = {"success": False, "message": str(api_result)}
+                        # Call platform services with timeout
+                        if platform == "facebook":
+                            api_result = await asyncio.wait_for(
+                                post_photo_to_facebook(image, caption),
+                                timeout=30.0
+                            )
+                            if api_result and ("id" in api_result or "post_id" in api_result):
+                                post_url = api_result.get("url", "")
+                                results[platform] = {
+                                    "success": True, 
+                                    "message": "Posted successfully!",
+                                    "url": post_url,
+                                    "id": api_result.get("id") or api_result.get("post_id")
+                                }
+                            else:
+                                results[platform] = {"success": False, "message": str(api_result)}
                     
-                    elif platform == "instagram":
-                        api_result = await asyncio.wait_for(
-                            post_photo_to_instagram(image_path, caption),
-                            timeout=30.0
-                        )
-                        if api_result and "id" in api_result:
-                            results[platform] = {
-                                "success": True, 
-                                "message": "Posted successfully!",
-                                "info": api_result.get("info", f"Media ID: {api_result.get('id')}"),
-                                "id": api_result.get("id")
-                            }
-                        else:
-                            results[platform] = {"success": False, "message": str(api_result)}
+                        elif platform == "instagram":
+                            api_result = await asyncio.wait_for(
+                                post_photo_to_instagram(image, caption),
+                                timeout=30.0
+                            )
+                            if api_result and "id" in api_result:
+                                results[platform] = {
+                                    "success": True, 
+                                    "message": "Posted successfully!",
+                                    "info": api_result.get("info", f"Media ID: {api_result.get('id')}"),
+                                    "id": api_result.get("id")
+                                }
+                            else:
+                                results[platform] = {"success": False, "message": str(api_result)}
                     
-                    elif platform == "twitter":
-                        api_result = await asyncio.wait_for(
-                            post_photo_to_twitter(image_path, caption),
-                            timeout=30.0
-                        )
-                        if api_result and "id" in api_result:
-                            tweet_url = api_result.get("url", "")
-                            results[platform] = {
-                                "success": True, 
-                                "message": "Posted successfully!",
-                                "url": tweet_url,
-                                "id": api_result.get("id")
-                            }
-                        else:
-                            results[platform] = {"success": False, "message": str(api_result)}
+                        elif platform == "twitter":
+                            api_result = await asyncio.wait_for(
+                                post_photo_to_twitter(image, caption),
+                                timeout=30.0
+                            )
+                            if api_result and "id" in api_result:
+                                tweet_url = api_result.get("url", "")
+                                results[platform] = {
+                                    "success": True, 
+                                    "message": "Posted successfully!",
+                                    "url": tweet_url,
+                                    "id": api_result.get("id")
+                                }
+                            else:
+                                results[platform] = {"success": False, "message": str(api_result)}
                     
-                    elif platform == "reddit":
-                        api_result = await asyncio.wait_for(
-                            post_photo_to_reddit(image_path, caption),
-                            timeout=30.0
-                        )
-                        if api_result and ("id" in api_result or "url" in api_result):
-                            reddit_url = api_result.get("url", "")
-                            results[platform] = {
-                                "success": True, 
-                                "message": "Posted successfully!",
-                                "url": reddit_url,
-                                "id": api_result.get("id")
-                            }
-                        else:
-                            results[platform] = {"success": False, "message": str(api_result)}
+                        elif platform == "reddit":
+                            api_result = await asyncio.wait_for(
+                                post_photo_to_reddit(image, caption),
+                                timeout=30.0
+                            )
+                            if api_result and ("id" in api_result or "url" in api_result):
+                                reddit_url = api_result.get("url", "")
+                                results[platform] = {
+                                    "success": True, 
+                                    "message": "Posted successfully!",
+                                    "url": reddit_url,
+                                    "id": api_result.get("id")
+                                }
+                            else:
+                                results[platform] = {"success": False, "message": str(api_result)}
                     
-                    else:
-                        results[platform] = {"success": False, "message": "Platform not supported"}
+                        else:
+                            results[platform] = {"success": False, "message": "Platform not supported"}
                     
-                    print(f"✅ {platform} result: {results[platform]}")
+                        logger.info("✅ %s result: %s", platform, results[platform])
                         
-                except asyncio.TimeoutError:
-                    print(f"⏱️ {platform} timeout!")
-                    results[platform] = {"success": False, "message": "Request timeout (30s)"}
-                except HTTPException as e:
-                    print(f"❌ {platform} HTTP error: {e.detail}")
-                    results[platform] = {"success": False, "message": e.detail}
-                except Exception as e:
-                    print(f"❌ {platform} error: {str(e)}")
-                    results[platform] = {"success": False, "message": str(e)}
+                    except asyncio.TimeoutError:
+                        logger.warning("⏱️ %s timeout!", platform)
+                        results[platform] = {"success": False, "message": "Request timeout (30s)"}
+                    except HTTPException as e:
+                        logger.warning("❌ %s HTTP error: %s", platform, e.detail)
+                        results[platform] = {"success": False, "message": e.detail}
+                    except Exception as e:
+                        logger.warning("❌ %s error: %s", platform, str(e))
+                        results[platform] = {"success": False, "message": str(e)}
             
             # Send results with clickable links
             message = "📊 *Publishing Results:*\n\n"
@@ -1633,12 +1712,8 @@ class TelegramBotService:
                 
                 message += "\n"
             
-            # Clean up temp file
-            if session.get("image_path") and os.path.exists(session["image_path"]):
-                try:
-                    os.remove(session["image_path"])
-                except:
-                    pass
+            # Release the in-memory image
+            session.pop("image", None)
             
             keyboard = [[InlineKeyboardButton("« Back to Menu", callback_data="back_menu")]]
             reply_markup = InlineKeyboardMarkup(keyboard)
@@ -1827,7 +1902,9 @@ class TelegramBotService:
             # Manual post
             platforms_dict = {p: True for p in session["selected_platforms"]}
             caption = session.get("caption", "")[:100]
-            image_path = session.get("image_path", "")
+            # The scheduler runs from disk, so this is where the buffer is written out
+            image = session.get("image")
+            image_path = image.spill_to_disk() if image else ""
         else:
             # AI generated post
             platforms_dict = {p: True for p in session["approved_platforms"]}
@@ -1845,9 +1922,7 @@ class TelegramBotService:
         }
         
         # Save to storage
-        posts = load_scheduled_posts()
-        posts.append(post_data)
-        save_scheduled_posts(posts)
+        add_scheduled_post(post_data)
         
         # Schedule with APScheduler
         scheduler.add_job(
@@ -1908,6 +1983,11 @@ class TelegramBotService:
         user_id = update.effective_user.id
         user_sessions.pop(user_id, None)
         
+        # Stop any generation still running in the background
+        job = self.generation_jobs.pop(user_id, None)
+        if job and not job.done():
+            job.cancel()
+        
         await update.message.reply_text(
             "❌ Operation cancelled. Use /start to begin again.",
             parse_mode='Markdown'
@@ -1916,15 +1996,20 @@ class TelegramBotService:
     
     # ==================== BOT LIFECYCLE ====================
     
-    async def start_bot(self, shutdown_event=None):
-        """Initialize and start the bot
+    def build_application(self, webhook: bool = False) -> Application:
+        """Create the Application and register all conversation handlers
         
         Args:
-            shutdown_event: Optional asyncio.Event to signal shutdown
+            webhook: Build without an Updater (updates are pushed in via process_webhook_update)
         """
-        print("🤖 Initializing Telegram Bot...")
-        
-        self.application = Application.builder().token(settings.TELEGRAM_BOT_TOKEN).build()
+        builder = (
+            Application.builder()
+            .token(settings.TELEGRAM_BOT_TOKEN)
+            .concurrent_updates(PerUserUpdateProcessor(settings.TELEGRAM_MAX_CONCURRENT_UPDATES))
+        )
+        if webhook:
+            builder = builder.updater(None)
+        application = builder.build()
         
         # Login conversation handler
         login_handler = ConversationHandler(
@@ -1988,8 +2073,20 @@ class TelegramBotService:
             allow_reentry=True
         )
         
-        self.application.add_handler(login_handler)
-        self.application.add_handler(conv_handler)
+        application.add_handler(login_handler)
+        application.add_handler(conv_handler)
+        
+        return application
+    
+    async def start_bot(self, shutdown_event=None):
+        """Initialize and start the bot in long-polling mode
+        
+        Args:
+            shutdown_event: Optional asyncio.Event to signal shutdown
+        """
+        print("🤖 Initializing Telegram Bot...")
+        
+        self.application = self.build_application()
         
         print("✅ Telegram Bot ready!")
         print(f"🔐 Login ID: {telegram_auth.login_id}")
@@ -2012,19 +2109,104 @@ class TelegramBotService:
         except (KeyboardInterrupt, asyncio.CancelledError):
             print("\n🛑 Shutdown signal received...")
     
+    def claim_webhook(self):
+        """Make this process the only one serving the webhook
+        
+        Conversation state and user sessions live in memory, so every update
+        has to reach the same process: webhook mode needs a single API worker.
+        The lock is released by the OS when the process exits.
+        
+        Raises:
+            RuntimeError: Another process already serves the webhook
+        """
+        try:
+            import fcntl
+        except ImportError:  # Windows: single-process setups only
+            return
+        if self._webhook_lock is not None:
+            return
+        
+        lock_path = Path(settings.TELEGRAM_WEBHOOK_LOCK_FILE)
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(lock_path, "a+")
+        try:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            raise RuntimeError(
+                "Telegram webhook mode needs a single API worker: another process already serves "
+                "the webhook (run uvicorn without --workers, or use polling with bot.py)"
+            )
+        self._webhook_lock = lock_file
+    
+    async def start_webhook(self, webhook_url: str = None, secret_token: str = None):
+        """Initialize the bot in webhook mode inside the running FastAPI event loop
+        
+        Telegram pushes updates to the API's /api/telegram/webhook endpoint, which
+        hands them to process_webhook_update - no polling loop or separate process.
+        
+        Args:
+            webhook_url: Public HTTPS URL of the webhook endpoint (defaults to settings)
+            secret_token: Secret Telegram echoes back in X-Telegram-Bot-Api-Secret-Token
+        """
+        webhook_url = webhook_url or settings.TELEGRAM_WEBHOOK_URL
+        # Without a secret anyone could post forged updates as a logged-in user
+        secret_token = secret_token or settings.TELEGRAM_WEBHOOK_SECRET or secrets.token_urlsafe(32)
+        
+        print("🤖 Initializing Telegram Bot (webhook mode)...")
+        
+        self.application = self.build_application(webhook=True)
+        await self.application.initialize()
+        await self.application.start()
+        await self.application.bot.set_webhook(
+            url=webhook_url,
+            secret_token=secret_token,
+            allowed_updates=Update.ALL_TYPES
+        )
+        self.webhook_secret = secret_token
+        self.webhook_active = True
+        
+        print(f"✅ Telegram webhook registered: {webhook_url}")
+    
+    async def process_webhook_update(self, data: dict) -> Optional[Update]:
+        """Decode an update pushed to the webhook and queue it for processing
+        
+        A body that is not a valid update is logged and dropped: answering
+        with an error would only make Telegram redeliver it.
+        
+        Args:
+            data: JSON body of the webhook request
+            
+        Returns:
+            Update: The decoded update (None if the body was dropped)
+        """
+        try:
+            update = Update.de_json(data, self.application.bot)
+        except Exception as e:
+            logger.warning("⚠️ Dropping malformed webhook update: %s", e)
+            return None
+        if update is None:
+            return None
+        await self.application.update_queue.put(update)
+        return update
+    
     async def stop_bot(self):
         """Gracefully stop the bot"""
         if self.application:
             try:
-                print("⏹️  Stopping updater...")
-                await self.application.updater.stop()
-                print("⏹️  Stopping application...")
-                await self.application.stop()
+                if self.application.updater and self.application.updater.running:
+                    print("⏹️  Stopping updater...")
+                    await self.application.updater.stop()
+                if self.application.running:
+                    print("⏹️  Stopping application...")
+                    await self.application.stop()
                 print("⏹️  Shutting down...")
                 await self.application.shutdown()
                 print("✅ Bot stopped cleanly")
             except Exception as e:
                 print(f"⚠️  Shutdown warning: {e}")
+            finally:
+                self.webhook_active = False
 
 
 # Global instance
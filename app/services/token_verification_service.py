@@ -0,0 +1,192 @@
+"""
+Platform token verification service
+Checks all platforms concurrently and caches the result so the dashboard
+can be answered instantly
+"""
+import time
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Optional
+import httpx
+from app.config import settings
+from app.clients.twitter import get_twitter_v1_client
+from app.clients.reddit import get_reddit_client
+from app.services.instagram_service import get_instagram_account_info
+from app.utils.runtime import record_latency
+
+logger = logging.getLogger(__name__)
+
+PLATFORMS = ("facebook", "instagram", "twitter", "reddit")
+
+
+async def check_facebook() -> dict:
+    """Verify the Facebook page token"""
+    async with httpx.AsyncClient() as client:
+        try:
+            fb_response = await client.get(
+                f"{settings.FACEBOOK_GRAPH_URL}/me",
+                params={"access_token": settings.FACEBOOK_ACCESS_TOKEN}
+            )
+            fb_response.raise_for_status()
+            return {"valid": True, "pageInfo": fb_response.json()}
+        except httpx.HTTPError as e:
+            logger.error("Facebook token error: %s", e)
+            return {"valid": False, "error": str(e)}
+
+
+async def check_instagram() -> dict:
+    """Verify the Instagram configuration"""
+    try:
+        ig_account_id, username = await get_instagram_account_info()
+        return {
+            "valid": True,
+            "pageInfo": {
+                "id": ig_account_id,
+                "username": username
+            }
+        }
+    except Exception as e:
+        logger.error("Instagram configuration error: %s", e)
+        return {"valid": False, "error": str(e)}
+
+
+async def check_twitter() -> dict:
+    """Verify the Twitter credentials"""
+    try:
+        twitter_client = get_twitter_v1_client()
+        if not twitter_client:
+            return {"valid": False, "error": "Credentials not configured"}
+        # tweepy is blocking, keep it off the event loop
+        user = await asyncio.to_thread(twitter_client.verify_credentials)
+        return {
+            "valid": True,
+            "pageInfo": {
+                "id": user.id,
+                "username": user.screen_name
+            }
+        }
+    except Exception as e:
+        logger.error("Twitter configuration error: %s", e)
+        return {"valid": False, "error": str(e)}
+
+
+async def check_reddit() -> dict:
+    """Verify the Reddit credentials"""
+    try:
+        reddit_client = get_reddit_client()
+        if not reddit_client:
+            return {"valid": False, "error": "Credentials not configured"}
+
+        def fetch_me():
+            # praw is lazy: reading the attributes is what hits the API
+            user = reddit_client.user.me()
+            return {"name": user.name, "id": user.id}
+
+        return {"valid": True, "pageInfo": await asyncio.to_thread(fetch_me)}
+    except Exception as e:
+        logger.error("Reddit configuration error: %s", e)
+        return {"valid": False, "error": str(e)}
+
+
+CHECKS: Dict[str, Callable[[], Awaitable[dict]]] = {
+    "facebook": check_facebook,
+    "instagram": check_instagram,
+    "twitter": check_twitter,
+    "reddit": check_reddit,
+}
+
+
+async def _run_check(platform: str, timeout: float) -> dict:
+    """Run one platform check with a timeout, recording its latency"""
+    start = time.perf_counter()
+    try:
+        return await asyncio.wait_for(CHECKS[platform](), timeout=timeout)
+    except asyncio.TimeoutError:
+        logger.warning("⚠️ %s token check timed out after %ss", platform.title(), timeout)
+        return {"valid": False, "error": f"Verification timed out after {timeout}s"}
+    except Exception as e:
+        return {"valid": False, "error": str(e)}
+    finally:
+        record_latency(platform, "verify", time.perf_counter() - start)
+
+
+async def verify_all_tokens(timeout: Optional[float] = None) -> Dict[str, dict]:
+    """
+    Verify all platform tokens concurrently
+
+    Args:
+        timeout: Per-platform timeout in seconds (defaults to TOKEN_VERIFY_TIMEOUT)
+
+    Returns:
+        dict: Status per platform ({"valid": bool, "pageInfo"/"error": ...})
+    """
+    timeout = timeout or settings.TOKEN_VERIFY_TIMEOUT
+    results = await asyncio.gather(*(_run_check(p, timeout) for p in PLATFORMS))
+    return dict(zip(PLATFORMS, results))
+
+
+class TokenStatusCache:
+    """
+    Caches the last verification result (stale-while-revalidate)
+
+    Fresh results are returned as is. Results past the TTL are returned
+    immediately while one background refresh runs. With no usable result
+    the caller waits for the (shared) refresh. A refresh that started before
+    an invalidation does not store its result.
+    """
+
+    def __init__(self):
+        self.result: Optional[Dict[str, dict]] = None
+        self.checked_at: float = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        # Bumped by invalidate, so older refreshes know their result is outdated
+        self._generation = 0
+
+    def age(self) -> Optional[float]:
+        """Seconds since the cached result was taken"""
+        if self.result is None:
+            return None
+        return time.time() - self.checked_at
+
+    def invalidate(self):
+        """Drop the cached result (e.g. after credentials change)"""
+        self._generation += 1
+        self._refresh_task = None
+        self.result = None
+        self.checked_at = 0.0
+
+    async def _refresh(self, generation: int) -> Dict[str, dict]:
+        result = await verify_all_tokens()
+        if generation == self._generation:
+            self.result = result
+            self.checked_at = time.time()
+        return result
+
+    def _ensure_refresh(self) -> asyncio.Task:
+        """Start a refresh unless one is already running"""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._refresh(self._generation))
+        return self._refresh_task
+
+    async def get(self, force_refresh: bool = False) -> Dict[str, dict]:
+        """
+        Get platform token status
+
+        Args:
+            force_refresh: Skip the cache and wait for a new check
+
+        Returns:
+            dict: Status per platform
+        """
+        age = self.age()
+        if force_refresh or age is None or age > settings.TOKEN_STATUS_MAX_STALE:
+            return await asyncio.shield(self._ensure_refresh())
+
+        if age > settings.TOKEN_STATUS_TTL:
+            self._ensure_refresh()
+
+        return self.result
+
+
+# Global instance
+token_status_cache = TokenStatusCache()
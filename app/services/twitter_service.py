@@ -1,22 +1,33 @@
 """
 Twitter posting service
 """
-from fastapi import HTTPException
+import asyncio
 from tenacity import retry, stop_after_attempt, wait_exponential
 from app.clients.twitter import get_twitter_v1_client, get_twitter_v2_client
+from app.utils.media import ImageSource, ImageBuffer, open_image
+from app.utils.runtime import track_outbound
+from app.utils.circuit_breaker import circuit_breaker
+from app.utils.errors import PlatformError, platform_error, retry_if_retryable
+from app.services.idempotency_service import idempotent, get_checkpoint, save_checkpoint, sending
+from app.utils.metrics import observe_publish
 
 
+@idempotent("twitter")
 @retry(
     stop=stop_after_attempt(3),
     wait=wait_exponential(multiplier=1, min=2, max=10),
+    retry=retry_if_retryable,
     reraise=True
 )
-async def post_photo_to_twitter(image_path: str, caption: str) -> dict:
+@circuit_breaker("twitter")
+@track_outbound("twitter", "publish")
+@observe_publish("twitter")
+async def post_photo_to_twitter(image_path: ImageSource, caption: str) -> dict:
     """
     Post a photo with caption to Twitter using v1.1 upload + v2 create_tweet
     
     Args:
-        image_path: Path to the image file
+        image_path: Path to the image file, or an in-memory ImageBuffer
         caption: Tweet text (max 280 characters)
         
     Returns:
@@ -24,20 +35,29 @@ async def post_photo_to_twitter(image_path: str, caption: str) -> dict:
     """
     api_v1 = get_twitter_v1_client()
     if api_v1 is None:
-        raise HTTPException(status_code=500, detail="Twitter v1.1 client not configured for media upload")
+        raise PlatformError("Twitter v1.1 client not configured for media upload")
 
     client_v2 = get_twitter_v2_client()
     if client_v2 is None:
-        raise HTTPException(status_code=500, detail="Twitter v2 client not configured for create_tweet")
+        raise PlatformError("Twitter v2 client not configured for create_tweet")
 
     try:
-        # Upload media using v1.1 API
-        media = api_v1.media_upload(filename=image_path)
-        media_id = media.media_id_string
+        # Upload media using v1.1 API (tweepy is blocking, keep it off the event loop);
+        # a retry of an idempotent publish reuses the media uploaded by the earlier attempt
+        media_id = get_checkpoint("media_id")
+        if not media_id:
+            if isinstance(image_path, ImageBuffer):
+                with open_image(image_path) as stream:
+                    media = await asyncio.to_thread(api_v1.media_upload, filename=image_path.filename, file=stream)
+            else:
+                media = await asyncio.to_thread(api_v1.media_upload, filename=image_path)
+            media_id = media.media_id_string
+            await save_checkpoint("media_id", media_id)
         
         # Create tweet with media using v2 API
         text = (caption or "")[:280]
-        resp = client_v2.create_tweet(text=text, media_ids=[media_id])
+        async with sending():
+            resp = await asyncio.to_thread(client_v2.create_tweet, text=text, media_ids=[media_id])
         
         tweet_id = None
         if resp and hasattr(resp, "data") and resp.data:
@@ -45,9 +65,11 @@ async def post_photo_to_twitter(image_path: str, caption: str) -> dict:
         
         return {"id": tweet_id}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to post photo to Twitter: {str(e)}")
+        raise platform_error("Failed to post photo to Twitter", e) from e
 
 
+@track_outbound("twitter", "publish")
+@observe_publish("twitter")
 async def post_text_to_twitter(caption: str) -> dict:
     """
     Post a text-only tweet (no media) using Twitter API v2
@@ -60,11 +82,11 @@ async def post_text_to_twitter(caption: str) -> dict:
     """
     client_v2 = get_twitter_v2_client()
     if client_v2 is None:
-        raise HTTPException(status_code=500, detail="Twitter credentials not configured for v2")
+        raise PlatformError("Twitter credentials not configured for v2")
 
     try:
         text = (caption or "")[:280]
-        resp = client_v2.create_tweet(text=text)
+        resp = await asyncio.to_thread(client_v2.create_tweet, text=text)
         
         tweet_id = None
         if resp and hasattr(resp, "data") and resp.data:
@@ -72,5 +94,5 @@ async def post_text_to_twitter(caption: str) -> dict:
         
         return {"id": tweet_id}
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to post text to Twitter (v2): {str(e)}")
+        raise platform_error("Failed to post text to Twitter (v2)", e) from e
 
@@ -0,0 +1,289 @@
+"""
+AI usage accounting and daily quotas
+OpenAI tokens (from each response's `usage`) and generated images are
+counted per caller and UTC day in SQLite, one row per (caller, day, metric),
+shared by all workers and the bot. Daily quotas are checked before the
+expensive calls are made.
+
+Callers are identified per request (X-API-Key mapped to a team through
+USAGE_API_KEYS, else the client IP) or by the bot (telegram:<user id>):
+
+    with usage_caller("telegram:42"):
+        await generate_platform_content(...)
+
+Quotas are soft: concurrent requests of one caller that pass the check
+together can all complete and go slightly over.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, List, Optional
+from app.utils.errors import PlatformError
+from app.utils.sqlite_store import SQLiteStore, shared_store
+
+logger = logging.getLogger(__name__)
+
+# Who AI calls in this context are charged to
+usage_caller_var: ContextVar[str] = ContextVar("usage_caller", default="anonymous")
+
+PROMPT_TOKENS = "prompt_tokens"
+COMPLETION_TOKENS = "completion_tokens"
+# Images are counted per provider ("images.dalle", "images.fal"), prices differ
+IMAGES_PREFIX = "images."
+
+
+class QuotaExceededError(PlatformError):
+    """The caller used up a daily quota (not retryable until the next UTC day)"""
+
+    def __init__(self, caller: str, detail: str, retry_after: int):
+        super().__init__(detail, retryable=False, status_code=429)
+        self.caller = caller
+        self.headers = {"Retry-After": str(retry_after)}
+
+
+def _today() -> str:
+    return datetime.now(timezone.utc).date().isoformat()
+
+
+def _seconds_until_tomorrow() -> int:
+    now = datetime.now(timezone.utc)
+    tomorrow = datetime.combine(now.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+    return int((tomorrow - now).total_seconds()) + 1
+
+
+class UsageStore(SQLiteStore):
+    """SQLite-backed daily usage rollups"""
+
+    SCHEMA = (
+        """
+            CREATE TABLE IF NOT EXISTS usage_daily (
+                caller TEXT NOT NULL,
+                day TEXT NOT NULL,
+                metric TEXT NOT NULL,
+                value INTEGER NOT NULL,
+                PRIMARY KEY (caller, day, metric)
+            ) WITHOUT ROWID
+        """,
+        """
+            CREATE TABLE IF NOT EXISTS usage_charges (
+                id TEXT PRIMARY KEY,
+                day TEXT NOT NULL
+            )
+        """,
+    )
+
+    def __init__(self, path: Path, retention_days: float = 90):
+        super().__init__(path, retention_days)
+
+    def add(self, caller: str, metrics: Dict[str, int], day: str = None, charge_id: str = None):
+        """
+        Add to a caller's counters for a day
+
+        Args:
+            caller: Caller identity
+            metrics: Amounts by metric ({"prompt_tokens": 120, "images.dalle": 1})
+            day: UTC day (YYYY-MM-DD), today by default
+            charge_id: Charge the metrics only once per id (repeated calls are no-ops)
+        """
+        day = day or _today()
+        rows = [(caller, day, metric, int(value)) for metric, value in metrics.items() if value]
+        if not rows:
+            return
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if charge_id is not None:
+                    inserted = conn.execute(
+                        "INSERT OR IGNORE INTO usage_charges (id, day) VALUES (?, ?)", (charge_id, day)
+                    ).rowcount
+                    if not inserted:
+                        conn.execute("ROLLBACK")
+                        return
+                conn.executemany("""
+                    INSERT INTO usage_daily (caller, day, metric, value) VALUES (?, ?, ?, ?)
+                    ON CONFLICT (caller, day, metric) DO UPDATE SET value = value + excluded.value
+                """, rows)
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def totals(self, caller: str, day: str = None) -> Dict[str, int]:
+        """A caller's counters for one day (today by default)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT metric, value FROM usage_daily WHERE caller = ? AND day = ?", (caller, day or _today())
+            ).fetchall()
+        return dict(rows)
+
+    def rollups(self, since_day: str, caller: str = None) -> List[dict]:
+        """
+        Daily usage of every caller (or one) since a day
+
+        Returns:
+            list: [{"caller", "day", "usage": {metric: value}}], newest day first
+        """
+        query = "SELECT caller, day, metric, value FROM usage_daily WHERE day >= ?"
+        params = [since_day]
+        if caller:
+            query += " AND caller = ?"
+            params.append(caller)
+        with self._connect() as conn:
+            rows = conn.execute(query + " ORDER BY day DESC, caller", params).fetchall()
+
+        rollups: Dict[tuple, dict] = {}
+        for row_caller, day, metric, value in rows:
+            entry = rollups.setdefault((row_caller, day), {"caller": row_caller, "day": day, "usage": {}})
+            entry["usage"][metric] = value
+        return list(rollups.values())
+
+    def prune(self):
+        """Drop rollups older than the retention period"""
+        cutoff = (datetime.now(timezone.utc).date() - timedelta(days=self.retention_days)).isoformat()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM usage_daily WHERE day < ?", (cutoff,))
+            conn.execute("DELETE FROM usage_charges WHERE day < ?", (cutoff,))
+
+
+@shared_store
+def get_usage_store() -> UsageStore:
+    """Get the shared usage store (created on first use)"""
+    from app.config import settings
+    return UsageStore(settings.USAGE_DB_FILE, retention_days=settings.USAGE_RETENTION_DAYS)
+
+
+@contextmanager
+def usage_caller(caller: str):
+    """Charge AI usage inside the block to `caller`"""
+    token = usage_caller_var.set(caller)
+    try:
+        yield
+    finally:
+        usage_caller_var.reset(token)
+
+
+def _parse_pairs(value: Optional[str], separator: str) -> Dict[str, str]:
+    """'a:x,b:y' -> {"a": "x", "b": "y"} (split at the first separator)"""
+    pairs = {}
+    for item in (value or "").split(","):
+        key, sep, val = item.partition(separator)
+        if sep and key.strip():
+            pairs[key.strip()] = val.strip()
+    return pairs
+
+
+def team_for_api_key(api_key: str) -> Optional[str]:
+    """Team an API key belongs to (USAGE_API_KEYS="key:team,..."), None if unknown"""
+    from app.config import settings
+    return _parse_pairs(settings.USAGE_API_KEYS, ":").get(api_key)
+
+
+def quotas_for(caller: str) -> Dict[str, int]:
+    """
+    Daily quotas of a caller (0 = unlimited)
+
+    AI_TEAM_QUOTAS="team=tokens/images,..." overrides the AI_DAILY_* defaults.
+
+    Returns:
+        dict: {"tokens": int, "images": int}
+    """
+    from app.config import settings
+    quotas = {"tokens": settings.AI_DAILY_TOKEN_QUOTA, "images": settings.AI_DAILY_IMAGE_QUOTA}
+    override = _parse_pairs(settings.AI_TEAM_QUOTAS, "=").get(caller)
+    if override:
+        tokens, _, images = override.partition("/")
+        if tokens.strip():
+            quotas["tokens"] = int(tokens)
+        if images.strip():
+            quotas["images"] = int(images)
+    return quotas
+
+
+def summarize(totals: Dict[str, int]) -> Dict[str, int]:
+    """Token and image totals from a caller's counters"""
+    return {
+        "tokens": totals.get(PROMPT_TOKENS, 0) + totals.get(COMPLETION_TOKENS, 0),
+        "images": sum(value for metric, value in totals.items() if metric.startswith(IMAGES_PREFIX))
+    }
+
+
+def usage_report(caller: str) -> dict:
+    """
+    Today's usage of a caller against its quotas (for /api/usage)
+
+    Returns:
+        dict: caller, day, counters, used/quota/remaining tokens and images
+    """
+    totals = get_usage_store().totals(caller)
+    used = summarize(totals)
+    quotas = quotas_for(caller)
+    return {
+        "caller": caller,
+        "day": _today(),
+        "usage": totals,
+        "used": used,
+        "quota": quotas,
+        "remaining": {
+            kind: (max(0, quotas[kind] - used[kind]) if quotas[kind] else None)
+            for kind in ("tokens", "images")
+        }
+    }
+
+
+async def ensure_quota(images: int = 0):
+    """
+    Refuse the call when the current caller is out of quota
+
+    Args:
+        images: Images the call is about to generate
+
+    Raises:
+        QuotaExceededError: Token quota used up, or not enough image quota left
+    """
+    caller = usage_caller_var.get()
+    quotas = quotas_for(caller)
+    if not quotas["tokens"] and not (images and quotas["images"]):
+        return
+
+    used = summarize(await asyncio.to_thread(get_usage_store().totals, caller))
+    if quotas["tokens"] and used["tokens"] >= quotas["tokens"]:
+        logger.warning("🚫 %s is out of its daily token quota (%d)", caller, quotas["tokens"])
+        raise QuotaExceededError(
+            caller, f"Daily AI token quota of {quotas['tokens']} used up", _seconds_until_tomorrow()
+        )
+    if images and quotas["images"] and used["images"] + images > quotas["images"]:
+        logger.warning("🚫 %s is out of its daily image quota (%d)", caller, quotas["images"])
+        raise QuotaExceededError(
+            caller, f"Daily AI image quota of {quotas['images']} used up", _seconds_until_tomorrow()
+        )
+
+
+async def record_usage(metrics: Dict[str, int]):
+    """Charge usage to the current caller (never fails the AI call)"""
+    caller = usage_caller_var.get()
+    try:
+        await asyncio.to_thread(get_usage_store().add, caller, metrics)
+    except Exception as e:
+        logger.error("❌ Failed to record AI usage of %s: %s", caller, e)
+
+
+async def record_token_usage(response):
+    """Charge the tokens of an OpenAI response (if it reports usage)"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    metrics = {}
+    for name in (PROMPT_TOKENS, COMPLETION_TOKENS):
+        value = getattr(usage, name, None)
+        if isinstance(value, int):
+            metrics[name] = value
+    await record_usage(metrics)
+
+
+async def record_images(provider: str, count: int = 1):
+    """Charge generated images of a provider ("dalle", "fal")"""
+    await record_usage({f"{IMAGES_PREFIX}{provider}": count})
@@ -0,0 +1,105 @@
+"""
+Update processor for the Telegram bot
+Processes updates from different users concurrently while keeping
+each user's own updates in order
+"""
+import sys
+import time
+import asyncio
+from typing import Any, Awaitable, Dict, Optional
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+from app.utils.metrics import TELEGRAM_UPDATE_SECONDS
+from app.utils.log_config import request_id_var
+
+
+class PerUserUpdateProcessor(BaseUpdateProcessor):
+    """
+    Serializes updates per user, runs different users concurrently
+
+    ConversationHandler state and the bot's user_sessions are per user, so two
+    updates from the same user must never interleave. Updates from different
+    users are independent and share the max_concurrent_updates cap.
+
+    Each user's updates are chained: an update waits for the one before it
+    and only then takes a global slot, so a user's backlog never holds slots
+    other users could run in. The cap is kept by this class's own semaphore;
+    PTB's (taken before do_process_update, so it would also count the waiting
+    updates) is left unbounded.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        if max_concurrent_updates < 1:
+            raise ValueError("`max_concurrent_updates` must be a positive integer!")
+        super().__init__(sys.maxsize)
+        self._slots = asyncio.BoundedSemaphore(max_concurrent_updates)
+        # Last update of each user, done once it (and everything before it) ran
+        self._tails: Dict[int, asyncio.Future] = {}
+
+    @staticmethod
+    def _get_key(update: object) -> Optional[int]:
+        """Get the key updates are serialized on (user, falling back to chat)"""
+        if not isinstance(update, Update):
+            return None
+        if update.effective_user:
+            return update.effective_user.id
+        if update.effective_chat:
+            return update.effective_chat.id
+        return None
+
+    @staticmethod
+    def _get_kind(update: object) -> str:
+        """Label for the update type (message, callback_query, ...)"""
+        if isinstance(update, Update):
+            if update.callback_query:
+                return "callback_query"
+            if update.message:
+                return "command" if (update.message.text or "").startswith("/") else "message"
+        return "other"
+
+    async def _run_handler(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Await the handler coroutine, recording how long it ran"""
+        # Correlate log lines (and background jobs started here) with the update
+        if isinstance(update, Update):
+            request_id_var.set(f"tg-{update.update_id}")
+        start = time.perf_counter()
+        try:
+            await coroutine
+        finally:
+            TELEGRAM_UPDATE_SECONDS.observe(time.perf_counter() - start, kind=self._get_kind(update))
+
+    def _finish(self, key: int, done: asyncio.Future):
+        """Mark an update (and all of the user's earlier ones) done"""
+        done.set_result(None)
+        if self._tails.get(key) is done:
+            # Drop idle users so the table doesn't grow unbounded
+            del self._tails[key]
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        """Wait for the user's previous update, then run this one in a global slot"""
+        key = self._get_key(update)
+        if key is None:
+            async with self._slots:
+                await self._run_handler(update, coroutine)
+            return
+
+        previous = self._tails.get(key)
+        done = asyncio.get_running_loop().create_future()
+        self._tails[key] = done
+        try:
+            if previous is not None:
+                await asyncio.shield(previous)
+            async with self._slots:
+                await self._run_handler(update, coroutine)
+        finally:
+            if previous is not None and not previous.done():
+                # Cancelled while queued: the user's next update still waits for the previous one
+                previous.add_done_callback(lambda _: self._finish(key, done))
+            else:
+                self._finish(key, done)
+
+    async def initialize(self) -> None:
+        """Nothing to set up"""
+
+    async def shutdown(self) -> None:
+        """Nothing to tear down"""
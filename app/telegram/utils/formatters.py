@@ -92,6 +92,17 @@ def format_schedule_post(post: dict, index: int, now: datetime) -> str:
     )
 
 
+def format_retry_status(post: dict) -> str:
+    """Format the retry state of a post's failed platforms (empty when nothing failed)"""
+    retry = post.get('retry') or {}
+    if retry.get('state') == 'scheduled':
+        next_attempt = datetime.fromisoformat(retry['next_attempt_at']).strftime('%H:%M')
+        return f"🔁 Retrying {format_platforms_list(retry['pending_platforms'])} at {next_attempt}\n"
+    if retry.get('state') == 'dead_letter':
+        return f"⛔ Gave up on {format_platforms_list(retry['dead_platforms'])}\n"
+    return ""
+
+
 def format_posted_post(post: dict, index: int) -> str:
     """Format a posted post for display"""
     posted_time = datetime.fromisoformat(post.get('posted_at', post['scheduled_time']))
@@ -122,6 +133,7 @@ def format_posted_post(post: dict, index: int) -> str:
         f"\n*{index}.* 📅 {date_str} | ⏰ {time_str}\n"
         f"📱 {plat_str}\n"
         f"{status_icon} Status: *{status_text}*\n"
+        f"{format_retry_status(post)}"
         f"💬 _{caption}_\n"
     )
 
@@ -0,0 +1,41 @@
+"""
+Telegram file_id cache
+Remembers the file_id Telegram returns for an uploaded image so the bot can
+show the same image again without re-uploading the bytes
+"""
+from collections import OrderedDict
+from typing import Optional
+
+
+class PhotoCache:
+    """Small LRU mapping image path -> Telegram file_id"""
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+
+    def get(self, image_path: str) -> Optional[str]:
+        """Get the cached file_id for an image path"""
+        file_id = self._entries.get(image_path)
+        if file_id is not None:
+            self._entries.move_to_end(image_path)
+        return file_id
+
+    def put(self, image_path: str, file_id: str):
+        """Remember the file_id for an image path"""
+        self._entries[image_path] = file_id
+        self._entries.move_to_end(image_path)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, image_path: Optional[str]):
+        """Forget an image path (e.g. after the file is deleted)"""
+        if image_path:
+            self._entries.pop(image_path, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global instance
+photo_cache = PhotoCache()
@@ -0,0 +1,51 @@
+"""
+Streamed text in one Telegram message
+Telegram rate-limits message edits, so streamed AI text is shown by editing
+a single message at most once per interval, with the full text at the end.
+"""
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Telegram's message text limit
+MAX_MESSAGE_LENGTH = 4096
+
+# Shown after the text while it is still being written
+CURSOR = " ▌"
+
+
+class ThrottledMessageEditor:
+    """Edits one message with growing text, at most once per `interval` seconds"""
+
+    def __init__(self, message, interval: float = 1.0):
+        self.message = message
+        self.interval = interval
+        self.text = ""
+        self._shown = None
+        self._last_edit = 0.0
+
+    async def on_progress(self, event: str, data):
+        """Progress callback for refine_content / regenerate_platform_content"""
+        if event != "delta":
+            return
+        self.text += data["delta"]
+        if time.monotonic() - self._last_edit >= self.interval:
+            await self._show(self.text + CURSOR)
+
+    async def finish(self, text: str = None):
+        """Show the final text (without the cursor)"""
+        await self._show(text if text is not None else self.text)
+
+    async def _show(self, text: str):
+        text = text[:MAX_MESSAGE_LENGTH]
+        if not text.strip() or text == self._shown:
+            return
+        self._last_edit = time.monotonic()
+        try:
+            await self.message.edit_text(text)
+            self._shown = text
+        except Exception as e:
+            # Best effort: the next edit (or the final one) shows the text
+            if "not modified" not in str(e):
+                logger.debug("⚠️  Streamed edit failed: %s", e)
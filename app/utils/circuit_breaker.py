@@ -0,0 +1,189 @@
+"""
+Circuit breakers for platform publishing and AI providers
+After repeated failures a breaker opens and calls fail immediately instead of
+paying the full retry schedule; after a cool-down one probe call is let
+through (half-open) and its outcome closes or re-opens the breaker.
+"""
+import time
+import logging
+import threading
+import functools
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a service whose breaker is open"""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"{name} is temporarily unavailable (circuit open, retry in {retry_after:.0f}s)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker
+
+    Thread-safe: scheduled posts run on worker threads with their own loops.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0, half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._probes = 0
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        Admit a call or fail fast
+
+        Raises:
+            CircuitOpenError: The breaker is open (or its probe slots are taken)
+        """
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                if remaining > 0:
+                    raise CircuitOpenError(self.name, remaining)
+                self.state = HALF_OPEN
+                self._probes = 0
+                logger.info("🔶 Circuit %s half-open, probing", self.name)
+            if self.state == HALF_OPEN:
+                if self._probes >= self.half_open_max_calls:
+                    raise CircuitOpenError(self.name, self.reset_timeout)
+                self._probes += 1
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("🟢 Circuit %s closed", self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self._probes = 0
+
+    def record_failure(self, error: str = None):
+        with self._lock:
+            self.failures += 1
+            self.last_error = error
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    logger.warning("🔴 Circuit %s open after %d failure(s): %s", self.name, self.failures, error)
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probes = 0
+
+    def release(self):
+        """Give back a probe slot of a call that ended without an outcome (cancelled)"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def reset(self):
+        """Close the breaker and forget failures"""
+        with self._lock:
+            self.state = CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.last_error = None
+            self._probes = 0
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            retry_after = None
+            if self.state == OPEN:
+                retry_after = round(max(0.0, self.opened_at + self.reset_timeout - time.monotonic()), 1)
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "retry_after_s": retry_after,
+                "last_error": self.last_error,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_registry_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get (or create) the breaker for a platform/provider"""
+    with _registry_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            from app.config import settings
+            breaker = _breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=settings.CIRCUIT_RESET_TIMEOUT
+            )
+        return breaker
+
+
+def reset_breakers():
+    """Close every breaker"""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    for breaker in breakers:
+        breaker.reset()
+
+
+def breaker_states() -> Dict[str, dict]:
+    """State of every breaker (for the health endpoint)"""
+    with _registry_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+
+def circuit_breaker(name: str, is_failure: Callable[[object], bool] = None):
+    """
+    Decorator for async service calls guarded by the breaker `name`
+
+    Put it inside @retry (which never retries CircuitOpenError), so an
+    open breaker also cuts the remaining retries short. Only retryable
+    errors count as failures: a rejected request or missing credentials
+    say nothing about the service being down.
+
+    Args:
+        name: Breaker name (platform or provider)
+        is_failure: Optional check for results that signal failure without
+            raising (e.g. {"success": False})
+    """
+    get_breaker(name)  # register now so health lists it before the first call
+
+    from app.utils.errors import is_retryable
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            breaker = get_breaker(name)
+            breaker.before_call()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception as e:
+                if is_retryable(e):
+                    breaker.record_failure(str(e)[:200])
+                else:
+                    breaker.release()
+                raise
+            except BaseException:
+                breaker.release()
+                raise
+            if is_failure is not None and is_failure(result):
+                error = result.get("error") if isinstance(result, dict) else None
+                breaker.record_failure(str(error)[:200] if error else "failed result")
+            else:
+                breaker.record_success()
+            return result
+        return wrapper
+    return decorator
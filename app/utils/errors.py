@@ -0,0 +1,261 @@
+"""
+Error classification for outbound calls (platforms and AI providers)
+Transient failures (timeouts, connection drops, 429, 5xx) are worth retrying;
+permanent ones (missing credentials, 4xx, content-policy rejections) are not,
+so retries and circuit breakers only act on the former. Anything else, such
+as a TypeError or KeyError from a bug, is permanent too.
+"""
+import time
+import asyncio
+from typing import Optional
+import httpx
+from fastapi import HTTPException
+from tenacity import retry_if_exception
+
+# Status codes that signal a temporary condition on the other side
+RETRYABLE_STATUS_CODES = {408, 425, 429}
+
+
+class PlatformError(HTTPException):
+    """
+    A failed platform/provider call, classified as retryable or permanent
+
+    Subclasses HTTPException so routes and the bot handle it as before.
+    """
+
+    def __init__(self, detail: str, retryable: bool = False, status_code: int = 500):
+        super().__init__(status_code=status_code, detail=detail)
+        self.retryable = retryable
+
+
+def is_retryable_status(status_code: Optional[int]) -> bool:
+    """Whether an HTTP status from an upstream API is worth retrying"""
+    if status_code is None:
+        return False
+    return status_code in RETRYABLE_STATUS_CODES or status_code >= 500
+
+
+def _classify(exc: BaseException) -> Optional[bool]:
+    """Classify a single exception; None when its type is unknown"""
+    from app.utils.circuit_breaker import CircuitOpenError
+
+    if isinstance(exc, PlatformError):
+        return exc.retryable
+    if isinstance(exc, CircuitOpenError):
+        return False
+    if isinstance(exc, HTTPException):
+        return is_retryable_status(exc.status_code)
+
+    if isinstance(exc, httpx.HTTPStatusError):
+        return is_retryable_status(exc.response.status_code)
+    if isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError, httpx.ProxyError)):
+        return True
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+
+    import openai
+    if isinstance(exc, openai.APIStatusError):
+        # A 429 for an exhausted quota won't clear up by retrying
+        if getattr(exc, "code", None) == "insufficient_quota":
+            return False
+        return is_retryable_status(exc.status_code)
+    if isinstance(exc, openai.APIConnectionError):  # includes APITimeoutError
+        return True
+
+    import tweepy
+    if isinstance(exc, tweepy.errors.HTTPException):
+        return is_retryable_status(exc.response.status_code)
+
+    import prawcore
+    if isinstance(exc, prawcore.exceptions.ResponseException):
+        return is_retryable_status(exc.response.status_code)
+    if isinstance(exc, prawcore.exceptions.RequestException):
+        return True
+
+    import praw.exceptions
+    if isinstance(exc, praw.exceptions.WebSocketException):
+        return True
+    if isinstance(exc, (praw.exceptions.RedditAPIException, praw.exceptions.ClientException)):
+        return False
+
+    import requests
+    if isinstance(exc, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+
+    import cloudinary.exceptions
+    if isinstance(exc, (cloudinary.exceptions.RateLimited, cloudinary.exceptions.GeneralError)):
+        return True
+    if isinstance(exc, cloudinary.exceptions.Error):
+        return False
+
+    from fal_client.client import FalClientHTTPError
+    if isinstance(exc, FalClientHTTPError):
+        return is_retryable_status(exc.status_code)
+
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """
+    Whether a failed call is worth retrying
+
+    Wrapper exceptions (e.g. tweepy's "Failed to send request") are classified
+    by their cause. Errors that aren't network, timeout or upstream status
+    errors (programming errors, bad input) are permanent: retrying them only
+    delays the failure.
+
+    Args:
+        exc: The exception raised by the call
+
+    Returns:
+        bool: True for transient failures, False for permanent ones
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        retryable = _classify(exc)
+        if retryable is not None:
+            return retryable
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _classify_sent(exc: BaseException) -> Optional[bool]:
+    """Whether a single exception means the request may have arrived; None when it doesn't tell"""
+    if isinstance(exc, PlatformError):
+        return None  # decided by its cause; one raised for a response is a rejection
+    if isinstance(exc, asyncio.CancelledError):
+        return True
+    if isinstance(exc, HTTPException):
+        return False
+
+    # Failures while connecting: nothing was sent
+    if isinstance(exc, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout, httpx.ProxyError)):
+        return False
+    if isinstance(exc, httpx.HTTPStatusError):
+        return False
+    if isinstance(exc, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError)):
+        return True
+    if isinstance(exc, ConnectionRefusedError):
+        return False
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return True
+
+    import openai
+    if isinstance(exc, openai.APIStatusError):
+        return False
+    if isinstance(exc, openai.APITimeoutError):
+        return True
+
+    import tweepy
+    if isinstance(exc, tweepy.errors.HTTPException):
+        return False
+
+    import prawcore
+    if isinstance(exc, prawcore.exceptions.ResponseException):
+        return False
+
+    import praw.exceptions
+    if isinstance(exc, praw.exceptions.WebSocketException):
+        return True  # the submission went through, only waiting for its URL failed
+    if isinstance(exc, (praw.exceptions.RedditAPIException, praw.exceptions.ClientException)):
+        return False
+
+    import requests
+    import urllib3
+    if isinstance(exc, requests.exceptions.ConnectTimeout):
+        return False
+    if isinstance(exc, requests.exceptions.ConnectionError):
+        reason = exc.args[0] if exc.args else None
+        if isinstance(reason, urllib3.exceptions.MaxRetryError):
+            reason = reason.reason
+        return not isinstance(reason, urllib3.exceptions.NewConnectionError)
+    if isinstance(exc, requests.exceptions.Timeout):
+        return True
+
+    return None
+
+
+def may_have_been_sent(exc: BaseException) -> bool:
+    """
+    Whether a failed call may still have been carried out by the other side
+
+    Read timeouts, connections dropped mid-request and cancellation leave the
+    outcome open: the request may have arrived and been processed. Errors
+    while connecting and answers from the other side (4xx/5xx) mean it
+    wasn't. Sending such a request again may repeat it.
+
+    Args:
+        exc: The exception raised by the call
+
+    Returns:
+        bool: True when the outcome is unknown
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        sent = _classify_sent(exc)
+        if sent is not None:
+            return sent
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _response_headers(exc: BaseException):
+    """Headers of the HTTP response an exception was raised for, if any"""
+    headers = getattr(exc, "response_headers", None)  # fal
+    if headers is None:
+        response = getattr(exc, "response", None)  # httpx, openai, tweepy, prawcore
+        headers = getattr(response, "headers", None)
+    return headers
+
+
+def retry_after(exc: BaseException) -> Optional[float]:
+    """
+    How long the other side asked us to wait before trying again
+
+    Reads open circuit breakers, Retry-After and Twitter's x-rate-limit-reset.
+
+    Args:
+        exc: The exception raised by the call
+
+    Returns:
+        float: Seconds to wait, or None when the error doesn't say
+    """
+    from app.utils.circuit_breaker import CircuitOpenError
+
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        if isinstance(exc, CircuitOpenError):
+            return exc.retry_after
+        headers = _response_headers(exc)
+        if headers:
+            try:
+                if headers.get("retry-after"):
+                    return max(0.0, float(headers["retry-after"]))
+                if headers.get("x-rate-limit-reset"):
+                    return max(0.0, float(headers["x-rate-limit-reset"]) - time.time())
+            except (TypeError, ValueError):
+                pass  # HTTP-date or garbage; fall back to our own backoff
+        exc = exc.__cause__ or exc.__context__
+    return None
+
+
+def platform_error(message: str, exc: BaseException, status_code: int = 500) -> PlatformError:
+    """
+    Wrap a failed call in a PlatformError that keeps its classification
+
+    Args:
+        message: Prefix for the error detail (e.g. "Failed to post to Reddit")
+        exc: The original exception
+
+    Returns:
+        PlatformError: Raise it `from exc`
+    """
+    reason = exc.detail if isinstance(exc, HTTPException) else exc
+    return PlatformError(f"{message}: {reason}", retryable=is_retryable(exc), status_code=status_code)
+
+
+# tenacity predicate: retry transient failures only
+retry_if_retryable = retry_if_exception(is_retryable)
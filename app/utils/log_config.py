@@ -0,0 +1,90 @@
+"""
+Logging configuration
+Records are handed to a queue on the calling thread and written to stdout by
+a background listener thread, so slow log files never block the event loop.
+Each record carries the correlation id of the request/job that produced it.
+"""
+import sys
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+from contextvars import ContextVar
+from typing import Optional
+
+# Correlation id of the current request, scheduled job or Telegram update
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+TEXT_FORMAT = "%(asctime)s %(levelname)-7s [%(request_id)s] %(name)s: %(message)s"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamp records with the current correlation id (runs on the caller's thread)"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None):
+    """
+    Configure queue-based logging for the process (idempotent)
+
+    Args:
+        level: Log level name (defaults to LOG_LEVEL)
+        fmt: "text" or "json" (defaults to LOG_FORMAT)
+    """
+    global _listener
+    from app.config import settings
+
+    level = (level or settings.LOG_LEVEL).upper()
+    fmt = fmt or settings.LOG_FORMAT
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    # httpx logs every request at INFO; keep that for DEBUG runs only
+    logging.getLogger("httpx").setLevel(logging.DEBUG if level == "DEBUG" else logging.WARNING)
+    if _listener is not None:
+        return
+
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if fmt == "json" else logging.Formatter(TEXT_FORMAT))
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(RequestIdFilter())
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,102 @@
+"""
+In-memory image handles
+Lets an image flow to the platform services as bytes, touching disk only
+when something needs a real path (scheduling, path-only SDKs)
+"""
+import io
+import os
+import uuid
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Union, BinaryIO
+
+
+class ImageBuffer:
+    """Image held in memory, with the metadata the upload APIs need"""
+
+    def __init__(self, data: bytes, filename: str = "image.jpg", content_type: str = "image/jpeg"):
+        self.data = bytes(data)
+        self.filename = filename
+        self.content_type = content_type
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    def open(self) -> io.BytesIO:
+        """Get a fresh readable file object over the bytes"""
+        stream = io.BytesIO(self.data)
+        stream.name = self.filename
+        return stream
+
+    def spill_to_disk(self, directory: str = "uploads") -> str:
+        """
+        Write the image to disk (e.g. for a scheduled post)
+
+        Args:
+            directory: Directory to write into
+
+        Returns:
+            str: Absolute path of the written file
+        """
+        folder = Path(directory)
+        folder.mkdir(exist_ok=True)
+        filepath = folder / self.filename
+        if filepath.exists():
+            filepath = folder / f"{uuid.uuid4().hex[:8]}_{self.filename}"
+        filepath.write_bytes(self.data)
+        return str(filepath.absolute())
+
+    def __repr__(self) -> str:
+        return f"ImageBuffer({self.filename!r}, {self.size} bytes)"
+
+
+# A platform service accepts either a file path or an in-memory buffer
+ImageSource = Union[str, ImageBuffer]
+
+
+def image_name(image: ImageSource) -> str:
+    """Get the file name to report to upload APIs"""
+    if isinstance(image, ImageBuffer):
+        return image.filename
+    return os.path.basename(image)
+
+
+@contextmanager
+def open_image(image: ImageSource) -> Iterator[BinaryIO]:
+    """Open an image source as a binary file object"""
+    if isinstance(image, ImageBuffer):
+        stream = image.open()
+        try:
+            yield stream
+        finally:
+            stream.close()
+    else:
+        with open(image, "rb") as f:
+            yield f
+
+
+@contextmanager
+def image_as_file(image: ImageSource) -> Iterator[str]:
+    """
+    Get a filesystem path for an image source
+
+    Paths are passed through; buffers are written to a temp file that is
+    removed afterwards. Only for SDKs that insist on a path.
+    """
+    if not isinstance(image, ImageBuffer):
+        yield image
+        return
+
+    suffix = Path(image.filename).suffix or ".jpg"
+    fd, temp_path = tempfile.mkstemp(suffix=suffix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(image.data)
+        yield temp_path
+    finally:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
@@ -0,0 +1,250 @@
+"""
+Prometheus-style metrics
+Small in-process registry (counters and histograms) rendered in the
+Prometheus text exposition format at /metrics
+"""
+import time
+import threading
+import functools
+from contextlib import contextmanager
+from typing import Awaitable, Dict, Iterator, List, Sequence, Tuple
+from app.utils.profiling import span
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Tuple[str, str] = None) -> str:
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"') for _, v in pairs)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base for labelled metrics; updates are guarded by a lock (scheduler threads write too)"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}" for key, value in items]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+        # key -> [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * len(self.buckets) + [0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels) -> Iterator[None]:
+        """Observe the duration of the with-block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        state = self._values.get(self._key(labels))
+        return state[-1] if state else 0
+
+    def _samples(self) -> List[str]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        lines = []
+        for key, state in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, state):
+                cumulative += bucket_count
+                le = ("le", _format_value(bound))
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(state[-2])}")
+            lines.append(f"{self.name}_count{labels} {state[-1]}")
+        return lines
+
+
+class Registry:
+    """Holds metrics and renders them for scraping"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+registry = Registry()
+
+
+# ==================== METRICS ====================
+
+OPENAI_REQUEST_SECONDS = registry.register(Histogram(
+    "openai_request_seconds", "OpenAI API call latency", ["operation", "outcome"]
+))
+OPENAI_TOKENS = registry.register(Counter(
+    "openai_tokens_total", "OpenAI tokens used", ["model", "type"]
+))
+PUBLISH_SECONDS = registry.register(Histogram(
+    "publish_seconds", "Per-platform publish latency", ["platform", "outcome"]
+))
+PUBLISH_TOTAL = registry.register(Counter(
+    "publish_total", "Per-platform publish attempts", ["platform", "outcome"]
+))
+INSTAGRAM_POLL_ITERATIONS = registry.register(Histogram(
+    "instagram_container_poll_iterations", "Status polls until an Instagram container finished",
+    [], buckets=(1, 2, 3, 5, 8, 13, 20)
+))
+SCHEDULER_LAG_SECONDS = registry.register(Histogram(
+    "scheduler_lag_seconds", "Delay between a job's scheduled and actual fire time",
+    [], buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0, 300.0)
+))
+TELEGRAM_UPDATE_SECONDS = registry.register(Histogram(
+    "telegram_update_seconds", "Telegram update handling duration", ["kind"]
+))
+
+
+# ==================== DECORATORS ====================
+
+def observe_publish(platform: str):
+    """
+    Decorator for async publish functions: latency and outcome per platform
+    (also a "publish.<platform>" span when the request is profiled)
+
+    Args:
+        platform: Platform label (facebook, instagram, ...)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            outcome = "error"
+            try:
+                with span(f"publish.{platform}"):
+                    result = await func(*args, **kwargs)
+                outcome = "success"
+                return result
+            finally:
+                PUBLISH_SECONDS.observe(time.perf_counter() - start, platform=platform, outcome=outcome)
+                PUBLISH_TOTAL.inc(platform=platform, outcome=outcome)
+        return wrapper
+    return decorator
+
+
+async def observe_openai(operation: str, request: Awaitable):
+    """
+    Await an OpenAI request, recording its latency, outcome and token usage
+    (also an "openai.<operation>" span when the request is profiled, and the
+    tokens charged to the current caller's AI usage)
+
+    Usage: response = await observe_openai("chat", client.chat.completions.create(...))
+
+    Args:
+        operation: Operation label (chat, image)
+        request: The pending OpenAI call
+
+    Returns:
+        The OpenAI response
+    """
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        with span(f"openai.{operation}"):
+            response = await request
+        outcome = "success"
+    finally:
+        OPENAI_REQUEST_SECONDS.observe(time.perf_counter() - start, operation=operation, outcome=outcome)
+    record_openai_usage(response)
+    from app.services.usage_service import record_token_usage
+    await record_token_usage(response)
+    return response
+
+
+def record_openai_usage(response) -> None:
+    """Count prompt/completion tokens from an OpenAI response (if it has usage)"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    model = getattr(response, "model", None)
+    if not isinstance(model, str):
+        model = "unknown"
+    for token_type in ("prompt_tokens", "completion_tokens"):
+        value = getattr(usage, token_type, None)
+        if isinstance(value, (int, float)) and value:
+            OPENAI_TOKENS.inc(value, model=model, type=token_type.replace("_tokens", ""))
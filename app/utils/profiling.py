@@ -0,0 +1,167 @@
+"""
+Request profiling
+Opt-in span timelines for individual requests. The profiling middleware
+starts a Trace; code on the hot path marks phases with span(...) and the
+finished trace is kept for /api/admin/traces. With no active trace, span()
+costs a context-variable lookup.
+"""
+import time
+import random
+import functools
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+# Trace of the request being profiled (None when not profiling)
+current_trace: ContextVar[Optional["Trace"]] = ContextVar("current_trace", default=None)
+# Nesting depth of the innermost open span
+_span_depth: ContextVar[int] = ContextVar("span_depth", default=0)
+
+
+class Trace:
+    """Span timeline of one request"""
+
+    def __init__(self, trace_id: str, method: str, path: str, reason: str):
+        self.trace_id = trace_id
+        self.method = method
+        self.path = path
+        self.reason = reason  # "header" or "sampled"
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.duration: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.spans: List[dict] = []
+        self._lock = threading.Lock()  # spans can close on worker threads
+
+    def offset(self) -> float:
+        return time.perf_counter() - self._start
+
+    def add_span(self, name: str, start: float, duration: float, depth: int, error: Optional[str], attrs: Dict):
+        with self._lock:
+            self.spans.append({
+                "name": name,
+                "start_ms": round(start * 1000, 2),
+                "duration_ms": round(duration * 1000, 2),
+                "depth": depth,
+                **({"error": error} if error else {}),
+                **({"attrs": attrs} if attrs else {}),
+            })
+
+    def finish(self, status_code: int):
+        self.duration = self.offset()
+        self.status_code = status_code
+
+    def summary(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "duration_ms": round((self.duration or 0) * 1000, 2),
+            "started_at": self.started_at,
+            "reason": self.reason,
+            "span_count": len(self.spans),
+        }
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda s: s["start_ms"])
+        return {**self.summary(), "spans": spans}
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator[None]:
+    """
+    Time a phase of the current request (no-op when it isn't profiled)
+
+    Args:
+        name: Span name, e.g. "openai.chat" or "instagram.poll"
+        **attrs: Small labels to keep with the span (no content or secrets)
+    """
+    trace = current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    depth = _span_depth.get()
+    token = _span_depth.set(depth + 1)
+    start = trace.offset()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _span_depth.reset(token)
+        trace.add_span(name, start, trace.offset() - start, depth, error, attrs)
+
+
+def profiled(name: str):
+    """
+    Decorator: run an async function inside span(name)
+
+    Args:
+        name: Span name
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+class TraceStore:
+    """Keeps the most recent finished traces worth looking at"""
+
+    def __init__(self, max_traces: int = 50):
+        self._traces: deque = deque(maxlen=max_traces)
+        self._lock = threading.Lock()
+
+    def add(self, trace: Trace):
+        with self._lock:
+            self._traces.append(trace)
+
+    def recent(self, limit: int = 20) -> List[Trace]:
+        """Newest first"""
+        with self._lock:
+            return list(reversed(self._traces))[:limit]
+
+    def get(self, trace_id: str) -> Optional[Trace]:
+        with self._lock:
+            return next((t for t in self._traces if t.trace_id == trace_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._traces.clear()
+
+
+def should_profile(header_value: Optional[str], sample_rate: float) -> Optional[str]:
+    """
+    Decide whether to profile a request
+
+    Args:
+        header_value: Value of the X-Profile header
+        sample_rate: Fraction of requests to sample
+
+    Returns:
+        "header", "sampled" or None
+    """
+    if header_value and header_value.lower() in ("1", "true", "yes"):
+        return "header"
+    if sample_rate > 0 and random.random() < sample_rate:
+        return "sampled"
+    return None
+
+
+def _create_store() -> TraceStore:
+    from app.config import settings
+    return TraceStore(settings.PROFILING_MAX_TRACES)
+
+
+# Global trace store
+trace_store = _create_store()
@@ -0,0 +1,150 @@
+"""
+Shared rate limiter
+One slowapi Limiter for the whole app, with counters in a storage every
+worker and process sees (RATE_LIMIT_STORAGE_URI), so "10/minute" is a global
+limit rather than one per uvicorn worker:
+
+- sqlite:///data/storage/rate_limits.db  single host, any number of workers (default)
+- redis://host:6379                      several hosts (needs `pip install redis`)
+- memory://                              per process (tests, single worker)
+"""
+import time
+import logging
+import sqlite3
+import itertools
+import threading
+from pathlib import Path
+from typing import Optional
+from limits import RateLimitItem
+from limits.storage import Storage
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteStorage(Storage):
+    """
+    Fixed-window counters in a SQLite file (registered as sqlite:///path)
+
+    Every hit is one autocommitted UPSERT, so there is no lock in Python and
+    the database write lock is held only for that statement. Each thread keeps
+    its own connection (WAL mode, so readers never wait for writers).
+    """
+
+    STORAGE_SCHEME = ["sqlite"]
+
+    # Expired counters are deleted every this many hits (per process)
+    PRUNE_EVERY = 1000
+
+    def __init__(self, uri: str, wrap_exceptions: bool = False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        # sqlite:///relative/path.db or sqlite:////absolute/path.db
+        self.path = Path(uri.split("://", 1)[1][1:])
+        self._local = threading.local()
+        self._hits = itertools.count(1)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limits (
+                    key TEXT PRIMARY KEY,
+                    count INTEGER NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._local.conn = conn
+        return conn
+
+    def incr(self, key: str, expiry: float, amount: int = 1) -> int:
+        now = time.time()
+        conn = self._conn()
+        # On the right-hand side of SET, count/expires_at are the stored values
+        rows = conn.execute("""
+            INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT (key) DO UPDATE SET
+                count = CASE WHEN expires_at <= ? THEN excluded.count ELSE count + excluded.count END,
+                expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END
+            RETURNING count
+        """, (key, amount, now + expiry, now, now)).fetchall()
+
+        if next(self._hits) % self.PRUNE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return rows[0][0]
+
+    def get(self, key: str) -> int:
+        row = self._conn().execute(
+            "SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key: str) -> float:
+        now = time.time()
+        row = self._conn().execute(
+            "SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?", (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self) -> bool:
+        try:
+            self._conn().execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self) -> int:
+        return self._conn().execute("DELETE FROM rate_limits").rowcount
+
+    def clear(self, key: str) -> None:
+        self._conn().execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+
+
+# The one limiter used by the app and every router; falls back to per-process
+# counters while a shared storage (e.g. Redis) is unreachable
+limiter = Limiter(
+    key_func=get_remote_address,
+    enabled=settings.RATE_LIMIT_ENABLED,
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,
+    in_memory_fallback_enabled=True
+)
+
+
+def _hit(item: RateLimitItem, identifiers: tuple) -> Optional[int]:
+    if limiter.limiter.hit(item, *identifiers):
+        return None
+    reset_at = limiter.limiter.get_window_stats(item, *identifiers)[0]
+    return max(1, int(reset_at - time.time()) + 1)
+
+
+def hit_limit(item: RateLimitItem, *identifiers: str) -> Optional[int]:
+    """
+    Count one hit outside the route decorators (blocking: run it in a thread)
+
+    Like the decorated endpoints, falls back to the in-memory counters when the
+    shared storage fails.
+
+    Args:
+        item: Limit to hit ("30/minute")
+        identifiers: What the counter is kept for (client, scope)
+
+    Returns:
+        int: Seconds until the window resets when the limit is exceeded, else None
+    """
+    try:
+        return _hit(item, identifiers)
+    except Exception as e:
+        if not limiter._in_memory_fallback_enabled or limiter._storage_dead:
+            raise
+        logger.warning("⚠️ Rate limit storage unreachable, falling back to in-memory counters: %s", e)
+        limiter._storage_dead = True
+        return _hit(item, identifiers)
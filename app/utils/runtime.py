@@ -0,0 +1,149 @@
+"""
+Runtime health signals
+Cheap, always-on measurements for the readiness endpoint: event-loop lag,
+executor queue depth and outbound call tracking per platform
+"""
+import time
+import asyncio
+import threading
+import functools
+from typing import Dict, Optional
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag by sleeping a fixed interval and timing the wakeup
+
+    A blocked loop wakes late; the overshoot is the lag.
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.lag: float = 0.0
+        self.max_lag: float = 0.0
+        self.last_tick: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start measuring on the running loop"""
+        if not self.running:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop measuring"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, loop.time() - start - self.interval)
+            self.max_lag = max(self.max_lag, self.lag)
+            self.last_tick = time.time()
+
+    def current_lag(self) -> float:
+        """
+        Lag including a tick that is overdue right now
+
+        If the loop is blocked the monitor can't report; the time since the
+        last expected tick is the lower bound of the lag.
+        """
+        if self.last_tick is None:
+            return self.lag
+        overdue = time.time() - self.last_tick - self.interval
+        return max(self.lag, overdue)
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self.running,
+            "lag_ms": round(self.current_lag() * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+        }
+
+
+def executor_stats(executor) -> Optional[dict]:
+    """
+    Get saturation of a concurrent.futures thread pool
+
+    Args:
+        executor: ThreadPoolExecutor (or None)
+
+    Returns:
+        dict with worker count and queued work, or None if not available
+    """
+    if executor is None:
+        return None
+    work_queue = getattr(executor, "_work_queue", None)
+    threads = getattr(executor, "_threads", None)
+    return {
+        "max_workers": getattr(executor, "_max_workers", None),
+        "threads": len(threads) if threads is not None else None,
+        "queued": work_queue.qsize() if work_queue is not None else None,
+    }
+
+
+# ==================== OUTBOUND CALL TRACKING ====================
+
+_outbound_lock = threading.Lock()
+# Platform calls currently in flight (publish runs on the API loop and scheduler threads)
+outbound_in_flight: Dict[str, int] = {}
+# Last observed latency per platform and operation, in seconds
+last_latency: Dict[str, Dict[str, float]] = {}
+
+
+def record_latency(platform: str, operation: str, seconds: float):
+    """Record the latency of a platform call"""
+    with _outbound_lock:
+        last_latency.setdefault(platform, {})[operation] = seconds
+
+
+def track_outbound(platform: str, operation: str):
+    """
+    Decorator for async platform calls: counts in-flight calls and records latency
+
+    Args:
+        platform: Platform name (facebook, instagram, ...)
+        operation: Operation name (publish, verify, ...)
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with _outbound_lock:
+                outbound_in_flight[platform] = outbound_in_flight.get(platform, 0) + 1
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                with _outbound_lock:
+                    outbound_in_flight[platform] -= 1
+                    last_latency.setdefault(platform, {})[operation] = elapsed
+        return wrapper
+    return decorator
+
+
+def outbound_snapshot() -> dict:
+    """Copy of in-flight counts and last latencies (ms)"""
+    with _outbound_lock:
+        return {
+            "in_flight": dict(outbound_in_flight),
+            "last_latency_ms": {
+                platform: {op: round(seconds * 1000, 1) for op, seconds in ops.items()}
+                for platform, ops in last_latency.items()
+            },
+        }
+
+
+# Global instance
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,86 @@
+"""
+SQLite store base
+The publish records, outbox, usage and generation batch stores keep their
+state in SQLite files shared by every worker process, the scheduler and
+the bot. This module holds what they have in common: one connection per
+call, schema creation and pruning at startup, and the lazily created
+module-level instance.
+"""
+import sqlite3
+import threading
+from contextlib import contextmanager
+from functools import update_wrapper
+from pathlib import Path
+from typing import Callable, Generic, Iterator, Optional, Tuple, TypeVar
+
+
+class SQLiteStore:
+    """
+    Base of the SQLite-backed stores
+
+    Each call opens its own connection, so a store is safe to use from the
+    event loop (via asyncio.to_thread), scheduler threads and other processes.
+    Subclasses list their CREATE statements in SCHEMA and override prune.
+    """
+
+    SCHEMA: Tuple[str, ...] = ()
+
+    def __init__(self, path: Path, retention_days: float):
+        self.path = Path(path)
+        self.retention_days = retention_days
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+        self.prune()
+
+    @property
+    def retention_seconds(self) -> float:
+        return self.retention_days * 86400
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def prune(self):
+        """Drop rows older than the retention period"""
+
+
+StoreT = TypeVar("StoreT", bound=SQLiteStore)
+
+
+class SharedStore(Generic[StoreT]):
+    """
+    A module's store, created on the first call of its getter
+
+    Created lazily so the settings (database path, leases) are read when the
+    store is first needed. reset() forgets it, e.g. after tests point the
+    settings at another file.
+    """
+
+    def __init__(self, factory: Callable[[], StoreT]):
+        self._factory = factory
+        self._store: Optional[StoreT] = None
+        self._lock = threading.Lock()
+        update_wrapper(self, factory)
+
+    def __call__(self) -> StoreT:
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = self._factory()
+        return self._store
+
+    def reset(self):
+        """Forget the store (the next call creates a new one)"""
+        self._store = None
+
+
+def shared_store(factory: Callable[[], StoreT]) -> SharedStore[StoreT]:
+    """Decorator turning a store factory into the module's shared store getter"""
+    return SharedStore(factory)
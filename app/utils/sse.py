@@ -0,0 +1,72 @@
+"""
+Server-Sent Events for streaming AI endpoints
+A generation runs in a background task and reports its phases through a
+progress callback; each report becomes one SSE event, so clients can show
+results as they arrive instead of waiting for the whole response.
+"""
+import json
+import asyncio
+import logging
+from typing import AsyncIterator, Awaitable, Callable
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+# Sent while nothing else is, so proxies don't close an idle stream (e.g. during image generation)
+KEEPALIVE_SECONDS = 15.0
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+ProgressCallback = Callable[[str, object], Awaitable[None]]
+
+
+def sse_event(event: str, data) -> str:
+    """Format one SSE event with a JSON payload"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def progress_events(run: Callable[[ProgressCallback], Awaitable], keepalive: float = KEEPALIVE_SECONDS) -> AsyncIterator[str]:
+    """
+    Run a generation and yield its progress as SSE events
+
+    Events are whatever `run` reports, then "done" with its result, or
+    "error" ({"status_code", "detail"}) if it raised. Closing the stream
+    (client disconnected) cancels the generation.
+
+    Args:
+        run: Async callable taking the progress callback (event, data)
+        keepalive: Seconds of silence before a keep-alive comment is sent
+
+    Yields:
+        str: Formatted SSE events
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def report(event: str, data):
+        await queue.put(sse_event(event, data))
+
+    async def runner():
+        try:
+            result = await run(report)
+            await queue.put(sse_event("done", result))
+        except HTTPException as e:
+            await queue.put(sse_event("error", {"status_code": e.status_code, "detail": e.detail}))
+        except Exception as e:
+            logger.error("❌ Streamed generation failed: %s", e)
+            await queue.put(sse_event("error", {"status_code": 500, "detail": str(e)}))
+        finally:
+            await queue.put(None)
+
+    task = asyncio.create_task(runner())
+    try:
+        while True:
+            try:
+                message = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if message is None:
+                break
+            yield message
+    finally:
+        task.cancel()
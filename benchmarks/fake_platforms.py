@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the platform APIs used by the app
+Serves fake Graph API (Facebook/Instagram), OpenAI (chat, images and the
+Batch API), Twitter, Reddit and Cloudinary endpoints on one port, with
+configurable latency, rate limits and failure rate, so the API can be
+load-tested offline.
+
+Point the app at it (see benchmarks/README.md):
+    GRAPH_API_BASE_URL=http://127.0.0.1:9100/graph
+    OPENAI_BASE_URL=http://127.0.0.1:9100/openai/v1
+    TWITTER_API_BASE_URL=http://127.0.0.1:9100/twitter
+    REDDIT_URL=http://127.0.0.1:9100/reddit
+    REDDIT_OAUTH_URL=http://127.0.0.1:9100
+    CLOUDINARY_UPLOAD_PREFIX=http://127.0.0.1:9100/cloudinary
+"""
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+PLATFORMS = ("graph", "openai", "twitter", "reddit", "cloudinary", "files")
+
+# 1x1 transparent PNG served as the "generated"/"uploaded" image
+FAKE_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d49484452000000010000000108060000001f15c489"
+    "0000000d4944415478da63f8ffff3f0005fe02fea7d6a5a60000000049454e44ae426082"
+)
+
+
+@dataclass
+class PlatformBehaviour:
+    """How one stand-in behaves"""
+    latency_ms: float = 100.0
+    jitter_ms: float = 20.0
+    error_rate: float = 0.0
+    rate_limit: float = 0.0  # requests/second, 0 = unlimited
+    _window_start: float = field(default=0.0, repr=False)
+    _window_count: int = field(default=0, repr=False)
+
+    def delay(self) -> float:
+        jitter = random.uniform(-self.jitter_ms, self.jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    def over_limit(self) -> bool:
+        """Fixed one-second window limiter"""
+        if not self.rate_limit:
+            return False
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count > self.rate_limit
+
+
+@dataclass
+class FakeConfig:
+    behaviours: Dict[str, PlatformBehaviour]
+    public_url: str = "http://127.0.0.1:9100"
+    ig_polls: int = 2  # status polls before an Instagram container is FINISHED
+    batch_polls: int = 2  # status polls before an OpenAI batch is completed
+
+
+def _chat_completion(body: dict) -> dict:
+    """Fake chat completion for a request body (prompt enhancer or caption)"""
+    system = " ".join(m.get("content", "") for m in body.get("messages", []) if m.get("role") == "system")
+    if "prompt engineer" in system:
+        content = json.dumps({
+            "content_prompt": "Enhanced content prompt from the fake server",
+            "image_prompt": "Enhanced image prompt from the fake server"
+        })
+    else:
+        content = "Fake generated post. Morning light, fresh ideas and a call to action! #fake #benchmark"
+    return {
+        "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o-mini"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop"
+        }],
+        "usage": {"prompt_tokens": 400, "completion_tokens": 120, "total_tokens": 520}
+    }
+
+
+async def _chat_completion_chunks(completion: dict, include_usage: bool):
+    """A completion streamed word by word as chat.completion.chunk events"""
+    base = {"id": completion["id"], "object": "chat.completion.chunk",
+            "created": completion["created"], "model": completion["model"]}
+    words = completion["choices"][0]["message"]["content"].split(" ")
+    for i, word in enumerate(words):
+        delta = {"content": word if i == 0 else f" {word}"}
+        if i == 0:
+            delta["role"] = "assistant"
+        yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': delta, 'finish_reason': None}]})}\n\n"
+        await asyncio.sleep(0)
+    yield f"data: {json.dumps({**base, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]})}\n\n"
+    if include_usage:
+        yield f"data: {json.dumps({**base, 'choices': [], 'usage': completion['usage']})}\n\n"
+    yield "data: [DONE]\n\n"
+
+
+def create_app(config: FakeConfig) -> FastAPI:
+    """Build the stand-in app"""
+    app = FastAPI(title="Fake platform APIs")
+    ids = itertools.count(1_000_000)
+    containers: Dict[str, int] = {}
+    files_store: Dict[str, bytes] = {}
+    batches: Dict[str, dict] = {}
+    stats = {name: {"requests": 0, "errors": 0, "rate_limited": 0} for name in PLATFORMS}
+
+    @app.middleware("http")
+    async def behaviour_middleware(request: Request, call_next):
+        platform = request.url.path.strip("/").split("/", 1)[0]
+        # prawcore drops the path of oauth_url, so Reddit API calls arrive at the root
+        if platform == "api":
+            platform = "reddit"
+        behaviour = config.behaviours.get(platform)
+        if behaviour is None:
+            return await call_next(request)
+
+        stats[platform]["requests"] += 1
+        if behaviour.over_limit():
+            stats[platform]["rate_limited"] += 1
+            return JSONResponse(status_code=429, headers={"Retry-After": "1"},
+                                content={"error": {"message": "Rate limit exceeded (fake)", "code": 4}})
+        await asyncio.sleep(behaviour.delay())
+        if behaviour.error_rate and random.random() < behaviour.error_rate:
+            stats[platform]["errors"] += 1
+            return JSONResponse(status_code=500, content={"error": {"message": "Injected failure (fake)"}})
+        return await call_next(request)
+
+    @app.get("/_stats")
+    async def get_stats():
+        return stats
+
+    # ---------- Graph API (Facebook + Instagram) ----------
+
+    @app.get("/graph/{version}/me")
+    async def graph_me():
+        return {"id": "100000000000001", "name": "Fake Page"}
+
+    @app.post("/graph/{version}/{page_id}/photos")
+    async def graph_photos(page_id: str):
+        post_id = next(ids)
+        return {"id": str(post_id), "post_id": f"{page_id}_{post_id}"}
+
+    @app.post("/graph/{version}/{account_id}/media")
+    async def graph_media(account_id: str):
+        container_id = str(next(ids))
+        containers[container_id] = 0
+        return {"id": container_id}
+
+    @app.post("/graph/{version}/{account_id}/media_publish")
+    async def graph_media_publish(account_id: str):
+        return {"id": str(next(ids))}
+
+    @app.get("/graph/{version}/{object_id}")
+    async def graph_object(object_id: str, fields: str = ""):
+        if "status_code" in fields:
+            containers[object_id] = containers.get(object_id, 0) + 1
+            status = "FINISHED" if containers[object_id] >= config.ig_polls else "IN_PROGRESS"
+            return {"id": object_id, "status_code": status}
+        return {"id": object_id, "username": "fake_instagram"}
+
+    # ---------- OpenAI ----------
+
+    @app.post("/openai/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        completion = _chat_completion(body)
+        if body.get("stream"):
+            return StreamingResponse(
+                _chat_completion_chunks(completion, (body.get("stream_options") or {}).get("include_usage", False)),
+                media_type="text/event-stream"
+            )
+        return completion
+
+    @app.post("/openai/v1/files")
+    async def upload_file(request: Request):
+        form = await request.form()
+        upload = form["file"]
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        files_store[file_id] = await upload.read()
+        return {
+            "id": file_id, "object": "file", "bytes": len(files_store[file_id]), "created_at": int(time.time()),
+            "filename": upload.filename, "purpose": form.get("purpose", "batch"), "status": "processed"
+        }
+
+    @app.get("/openai/v1/files/{file_id}/content")
+    async def file_content(file_id: str):
+        if file_id not in files_store:
+            return JSONResponse(status_code=404, content={"error": {"message": "No such file (fake)"}})
+        return Response(content=files_store[file_id], media_type="application/jsonl")
+
+    @app.post("/openai/v1/batches")
+    async def create_batch(request: Request):
+        body = await request.json()
+        if body.get("input_file_id") not in files_store:
+            return JSONResponse(status_code=400, content={"error": {"message": "Unknown input file (fake)"}})
+        batch_id = f"batch_{uuid.uuid4().hex[:12]}"
+        batches[batch_id] = {
+            "id": batch_id, "object": "batch", "endpoint": body.get("endpoint", "/v1/chat/completions"),
+            "input_file_id": body["input_file_id"], "completion_window": body.get("completion_window", "24h"),
+            "status": "validating", "created_at": int(time.time()), "output_file_id": None,
+            "error_file_id": None, "polls": 0
+        }
+        return {k: v for k, v in batches[batch_id].items() if k != "polls"}
+
+    @app.get("/openai/v1/batches/{batch_id}")
+    async def retrieve_batch(batch_id: str):
+        batch = batches.get(batch_id)
+        if batch is None:
+            return JSONResponse(status_code=404, content={"error": {"message": "No such batch (fake)"}})
+        batch["polls"] += 1
+        if batch["status"] != "completed":
+            if batch["polls"] < config.batch_polls:
+                batch["status"] = "in_progress"
+            else:
+                # run every request of the input file through the fake chat endpoint
+                lines = []
+                for line in files_store[batch["input_file_id"]].decode().splitlines():
+                    if not line.strip():
+                        continue
+                    request_line = json.loads(line)
+                    lines.append(json.dumps({
+                        "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                        "custom_id": request_line["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "request_id": uuid.uuid4().hex,
+                            "body": _chat_completion(request_line.get("body", {}))
+                        },
+                        "error": None
+                    }))
+                output_file_id = f"file-{uuid.uuid4().hex[:12]}"
+                files_store[output_file_id] = ("\n".join(lines) + "\n").encode()
+                batch.update(
+                    status="completed", output_file_id=output_file_id, completed_at=int(time.time()),
+                    request_counts={"total": len(lines), "completed": len(lines), "failed": 0}
+                )
+        return {k: v for k, v in batch.items() if k != "polls"}
+
+    @app.post("/openai/v1/images/generations")
+    async def image_generations():
+        return {
+            "created": int(time.time()),
+            "data": [{"url": f"{config.public_url}/files/fake.png", "revised_prompt": "fake"}]
+        }
+
+    # ---------- Twitter ----------
+
+    @app.get("/twitter/1.1/account/verify_credentials.json")
+    async def twitter_verify():
+        return {"id": 1, "id_str": "1", "name": "Fake", "screen_name": "fake_twitter"}
+
+    @app.post("/twitter/1.1/media/upload.json")
+    async def twitter_media_upload():
+        media_id = next(ids)
+        return {"media_id": media_id, "media_id_string": str(media_id), "size": len(FAKE_PNG)}
+
+    @app.post("/twitter/2/tweets")
+    async def twitter_create_tweet(request: Request):
+        body = await request.json()
+        return {"data": {"id": str(next(ids)), "text": body.get("text", "")}}
+
+    # ---------- Reddit ----------
+
+    @app.post("/reddit/api/v1/access_token")
+    async def reddit_token():
+        return {"access_token": "fake-token", "token_type": "bearer", "expires_in": 3600, "scope": "*"}
+
+    @app.get("/api/v1/me")
+    async def reddit_me():
+        return {"name": "fake_reddit", "id": "fake1"}
+
+    # ---------- Cloudinary ----------
+
+    @app.post("/cloudinary/v1_1/{cloud_name}/image/upload")
+    async def cloudinary_upload(cloud_name: str):
+        public_id = uuid.uuid4().hex[:12]
+        return {
+            "public_id": public_id,
+            "secure_url": f"{config.public_url}/files/{public_id}.png",
+            "url": f"{config.public_url}/files/{public_id}.png"
+        }
+
+    # ---------- Files (generated / hosted images) ----------
+
+    @app.get("/files/{name}")
+    async def files(name: str):
+        return Response(content=FAKE_PNG, media_type="image/png")
+
+    return app
+
+
+def parse_overrides(value: str) -> Dict[str, float]:
+    """Parse "graph=300,openai=1500" into a dict"""
+    result = {}
+    for item in filter(None, (value or "").split(",")):
+        name, _, number = item.partition("=")
+        if name not in PLATFORMS:
+            raise argparse.ArgumentTypeError(f"Unknown platform '{name}' (expected one of {', '.join(PLATFORMS)})")
+        result[name] = float(number)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run local stand-ins for the platform APIs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=100, help="Mean latency for every platform")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 500")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="Requests/second per platform before 429 (0 = off)")
+    parser.add_argument("--latency", type=parse_overrides, default={}, help="Per-platform latency, e.g. openai=1500,graph=300")
+    parser.add_argument("--errors", type=parse_overrides, default={}, help="Per-platform error rate, e.g. twitter=0.1")
+    parser.add_argument("--limits", type=parse_overrides, default={}, help="Per-platform rate limit, e.g. graph=20")
+    parser.add_argument("--ig-polls", type=int, default=2, help="Instagram status polls before FINISHED")
+    parser.add_argument("--batch-polls", type=int, default=2, help="OpenAI batch status polls before completed")
+    args = parser.parse_args()
+
+    behaviours = {}
+    for name in PLATFORMS:
+        behaviours[name] = PlatformBehaviour(
+            latency_ms=args.latency.get(name, 0 if name == "files" else args.latency_ms),
+            jitter_ms=0 if name == "files" else args.jitter_ms,
+            error_rate=args.errors.get(name, 0 if name == "files" else args.error_rate),
+            rate_limit=args.limits.get(name, 0 if name == "files" else args.rate_limit),
+        )
+
+    config = FakeConfig(
+        behaviours=behaviours,
+        public_url=f"http://{args.host}:{args.port}",
+        ig_polls=args.ig_polls,
+        batch_polls=args.batch_polls
+    )
+    print(f"🧪 Fake platform APIs on http://{args.host}:{args.port}")
+    for name, behaviour in behaviours.items():
+        print(f"   {name:<10} latency={behaviour.latency_ms:.0f}ms error_rate={behaviour.error_rate} rate_limit={behaviour.rate_limit or 'off'}")
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
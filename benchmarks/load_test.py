@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Load driver for the Social Media AI Manager API
+Drives /api/post, /api/generate-content or a burst of scheduled posts at a
+fixed concurrency and reports latency percentiles and throughput.
+
+Examples:
+    python benchmarks/load_test.py post --requests 200 --concurrency 20
+    python benchmarks/load_test.py generate --requests 50 --concurrency 10
+    python benchmarks/load_test.py schedule --requests 100 --delay 15
+"""
+import sys
+import json
+import time
+import asyncio
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Optional
+import httpx
+
+# JPEG-like bytes used as the upload for /api/post (the stand-ins never decode images)
+FAKE_JPEG = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c1912130f"
+    "141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432ffc0000b080001000101"
+    "011100ffc4001f0000010501010101010100000000000000000102030405060708090a0bffc400b5100002010303020403"
+    "050504040000017d01020300041105122131410613516107227114328191a1082342b1c11552d1f02433627282090a1617"
+    "18191a25262728292a3435363738393a434445464748494a535455565758595a636465666768696a737475767778797a83"
+    "8485868788898a92939495969798999aa2a3a4a5a6a7a8a9aab2b3b4b5b6b7b8b9bac2c3c4c5c6c7c8c9cad2d3d4d5d6d7"
+    "d8d9dae1e2e3e4e5e6e7e8e9eaf1f2f3f4f5f6f7f8f9faffda0008010100003f00fbd3ffd9"
+)
+
+
+class Result:
+    """Outcome of one request"""
+
+    __slots__ = ("latency", "status", "error")
+
+    def __init__(self, latency: float, status: Optional[int], error: Optional[str] = None):
+        self.latency = latency
+        self.status = status
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def report(title: str, results: List[Result], elapsed: float):
+    """Print latency percentiles, throughput and status breakdown"""
+    latencies = [r.latency for r in results]
+    ok = [r for r in results if r.ok]
+    statuses = Counter(str(r.status) if r.status is not None else f"error:{r.error}" for r in results)
+
+    print(f"\n📊 {title}")
+    print("-" * 60)
+    print(f"Requests:    {len(results)} ({len(ok)} ok, {len(results) - len(ok)} failed)")
+    print(f"Duration:    {elapsed:.2f}s")
+    print(f"Throughput:  {len(results) / elapsed:.2f} req/s ({len(ok) / elapsed:.2f} ok/s)")
+    if latencies:
+        print(f"Latency ms:  p50={percentile(latencies, 50) * 1000:.1f}  "
+              f"p95={percentile(latencies, 95) * 1000:.1f}  "
+              f"p99={percentile(latencies, 99) * 1000:.1f}  "
+              f"max={max(latencies) * 1000:.1f}")
+    print(f"Statuses:    {dict(statuses)}")
+
+
+async def run_load(total: int, concurrency: int, make_request) -> tuple:
+    """
+    Run `total` requests with at most `concurrency` in flight
+
+    Args:
+        total: Number of requests
+        concurrency: Requests in flight at once
+        make_request: async fn(index) -> httpx.Response
+
+    Returns:
+        (results, elapsed seconds)
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    results: List[Result] = []
+
+    async def one(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await make_request(index)
+                results.append(Result(time.perf_counter() - start, response.status_code))
+            except httpx.HTTPError as e:
+                results.append(Result(time.perf_counter() - start, None, type(e).__name__))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return results, time.perf_counter() - start
+
+
+def post_form(args, index: int, scheduled_time: Optional[str] = None) -> dict:
+    platforms = {p: p in args.platforms for p in ("facebook", "instagram", "twitter", "reddit")}
+    data = {"caption": f"Load test post #{index}", "platforms": json.dumps(platforms)}
+    if scheduled_time:
+        data["scheduled_time"] = scheduled_time
+    return data
+
+
+async def scenario_post(client: httpx.AsyncClient, args):
+    async def request(index):
+        return await client.post(
+            "/api/post",
+            data=post_form(args, index),
+            files={"photo": (f"load_{index}.jpg", FAKE_JPEG, "image/jpeg")}
+        )
+
+    results, elapsed = await run_load(args.requests, args.concurrency, request)
+    report(f"POST /api/post ({', '.join(args.platforms)})", results, elapsed)
+    return results
+
+
+async def scenario_generate(client: httpx.AsyncClient, args):
+    async def request(index):
+        return await client.post("/api/generate-content", json={
+            "topic": f"Load test topic {index}",
+            "tone": "casual",
+            "image_style": "realistic",
+            "generate_image": not args.no_image,
+            "image_provider": "dalle"
+        })
+
+    results, elapsed = await run_load(args.requests, args.concurrency, request)
+    report("POST /api/generate-content", results, elapsed)
+    return results
+
+
+async def scenario_schedule(client: httpx.AsyncClient, args):
+    """Schedule a burst of posts for the same moment and time how long they take to go out"""
+    fire_at = datetime.now() + timedelta(seconds=args.delay)
+    scheduled_time = fire_at.isoformat(timespec="seconds")
+
+    async def request(index):
+        return await client.post(
+            "/api/post",
+            data=post_form(args, index, scheduled_time),
+            files={"photo": (f"burst_{index}.jpg", FAKE_JPEG, "image/jpeg")}
+        )
+
+    results, elapsed = await run_load(args.requests, args.concurrency, request)
+    report(f"Scheduling {args.requests} posts for {scheduled_time}", results, elapsed)
+
+    post_ids = set()
+    # The API doesn't return ids in order of submission; collect them from the store instead
+    response = await client.get("/api/scheduled-posts")
+    for post in response.json().get("scheduled_posts", []):
+        if post.get("scheduled_time") == scheduled_time:
+            post_ids.add(post["id"])
+
+    print(f"\n⏳ Waiting for {len(post_ids)} posts to fire at {scheduled_time}...")
+    deadline = fire_at + timedelta(seconds=args.timeout)
+    completion_lags: List[float] = []
+    while post_ids and datetime.now() < deadline:
+        await asyncio.sleep(1)
+        response = await client.get("/api/scheduled-posts")
+        for post in response.json().get("scheduled_posts", []):
+            if post["id"] in post_ids and post.get("status") == "posted":
+                post_ids.discard(post["id"])
+                posted_at = datetime.fromisoformat(post["posted_at"])
+                completion_lags.append((posted_at - fire_at).total_seconds())
+
+    print("\n📊 Scheduled burst completion (fire time -> posted)")
+    print("-" * 60)
+    print(f"Completed:   {len(completion_lags)} / {len(completion_lags) + len(post_ids)}")
+    if completion_lags:
+        print(f"Lag s:       p50={percentile(completion_lags, 50):.2f}  "
+              f"p95={percentile(completion_lags, 95):.2f}  "
+              f"p99={percentile(completion_lags, 99):.2f}  "
+              f"max={max(completion_lags):.2f}")
+        burst_span = max(completion_lags)
+        print(f"Throughput:  {len(completion_lags) / burst_span:.2f} posts/s" if burst_span > 0 else "")
+    if post_ids:
+        print(f"⚠️  {len(post_ids)} posts had not completed after {args.timeout}s")
+    return results
+
+
+SCENARIOS = {
+    "post": scenario_post,
+    "generate": scenario_generate,
+    "schedule": scenario_schedule,
+}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the Social Media AI Manager API")
+    parser.add_argument("scenario", choices=SCENARIOS)
+    parser.add_argument("--target", default="http://127.0.0.1:8000", help="API base URL")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--platforms", type=lambda v: v.split(","), default=["facebook", "instagram", "twitter"],
+                        help="Comma-separated platforms for post scenarios")
+    parser.add_argument("--no-image", action="store_true", help="generate: skip image generation")
+    parser.add_argument("--delay", type=float, default=15, help="schedule: seconds until the burst fires")
+    parser.add_argument("--timeout", type=float, default=120, help="schedule: seconds to wait for completion")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None):
+    args = parse_args(argv)
+    print(f"🚀 {args.scenario}: {args.requests} requests, concurrency {args.concurrency} -> {args.target}")
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.target, timeout=300, limits=limits) as client:
+        results = await SCENARIOS[args.scenario](client, args)
+    return 0 if all(r.ok for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
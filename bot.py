@@ -14,6 +14,7 @@ sys.path.insert(0, str(project_root))
 
 from app.services.telegram_bot_service import telegram_bot
 from app.config import settings
+from app.utils.log_config import setup_logging
 
 # Shutdown flag
 shutdown_event = None
@@ -29,6 +30,9 @@ async def main():
     """Main entry point for the Telegram bot"""
     global shutdown_event
     
+    # Queue-based logging for the bot, services and scheduler
+    setup_logging()
+    
     print("=" * 60)
     print("🤖 Social Hub Telegram Bot")
     print("=" * 60)
@@ -40,6 +44,12 @@ async def main():
         print("Example: TELEGRAM_BOT_TOKEN=your_token_here")
         return
     
+    # Polling and webhook delivery are mutually exclusive in Telegram
+    if settings.TELEGRAM_WEBHOOK_URL:
+        print("ℹ️  TELEGRAM_WEBHOOK_URL is set - the bot is served by the API server (python run.py)")
+        print("   Unset TELEGRAM_WEBHOOK_URL to run the bot with long polling")
+        return
+    
     print(f"✅ Bot token configured")
     print(f"🔗 Backend API: http://localhost:{settings.PORT}")
     print("📱 Starting bot polling...")
@@ -2,6 +2,7 @@ import { useState, useEffect } from 'react'
 import { useNavigate } from 'react-router-dom'
 import { FacebookIcon, InstagramIcon, TwitterIcon, RedditIcon } from '../components/SocialIcons'
 import { useGeneratedContent } from '../context/GeneratedContentContext'
+import { readEventStream } from '../utils/eventStream'
 import './GeneratorPage.css'
 
 function GeneratorPage() {
@@ -80,7 +81,8 @@ function GeneratorPage() {
     setMessage(null)
 
     try {
-      const response = await fetch('/api/generate-content', {
+      // Streamed: captions show up while they are written, the image when it is ready
+      const response = await fetch('/api/generate-content/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json'
@@ -91,33 +93,60 @@ function GeneratorPage() {
           image_style: imageStyle,
           generate_image: true,
           use_prompt_enhancer: usePromptEnhancer,
-          image_provider: imageProvider
+          image_provider: imageProvider,
+          stream_tokens: true
         })
       })
 
-      const data = await response.json()
-
-      if (response.ok) {
-        setGeneratedContent(data.platforms)
-        setEditedContent(data.platforms)
-        setGeneratedImage(data.image)
-        setImageApprovalStatus(null)
-        setOriginalTopic(prompt)
-        setOriginalTone(tone)
-        setApprovalStatus({})
-        setEnhancedPrompts(data.enhanced_prompts)  // Store enhanced prompts if available
-        
-        // Save to context for persistence
-        saveGeneratedContent(data.platforms, data.image, prompt, tone, imageStyle)
-        
-        const enhancedMsg = data.enhanced_prompts?.enhanced 
-          ? 'Prompt enhanced & content generated!' 
-          : 'Content and image generated!';
-        setMessage({ type: 'success', text: enhancedMsg })
-        setTimeout(() => setMessage(null), 3000)
-      } else {
+      if (!response.ok) {
+        const data = await response.json()
         setMessage({ type: 'error', text: `${data.detail || 'Failed to generate content'}` })
+        return
       }
+
+      setGeneratedContent({})
+      setEditedContent({})
+      setGeneratedImage(null)
+      setImageApprovalStatus(null)
+      setApprovalStatus({})
+      setEnhancedPrompts(null)
+
+      await readEventStream(response, (event, data) => {
+        if (event === 'enhanced') {
+          setEnhancedPrompts(data)
+        } else if (event === 'caption_delta') {
+          const appendDelta = (prev) => ({
+            ...prev,
+            [data.platform]: { ...prev[data.platform], content: (prev[data.platform]?.content || '') + data.delta }
+          })
+          setGeneratedContent(appendDelta)
+          setEditedContent(appendDelta)
+        } else if (event === 'caption') {
+          const { platform, ...caption } = data
+          setGeneratedContent(prev => ({ ...prev, [platform]: caption }))
+          setEditedContent(prev => ({ ...prev, [platform]: caption }))
+        } else if (event === 'image') {
+          setGeneratedImage(data)
+        } else if (event === 'done') {
+          setGeneratedContent(data.platforms)
+          setEditedContent(data.platforms)
+          setGeneratedImage(data.image)
+          setOriginalTopic(prompt)
+          setOriginalTone(tone)
+          setEnhancedPrompts(data.enhanced_prompts)  // Store enhanced prompts if available
+          
+          // Save to context for persistence
+          saveGeneratedContent(data.platforms, data.image, prompt, tone, imageStyle)
+          
+          const enhancedMsg = data.enhanced_prompts?.enhanced 
+            ? 'Prompt enhanced & content generated!' 
+            : 'Content and image generated!';
+          setMessage({ type: 'success', text: enhancedMsg })
+          setTimeout(() => setMessage(null), 3000)
+        } else if (event === 'error') {
+          setMessage({ type: 'error', text: `${data.detail || 'Failed to generate content'}` })
+        }
+      })
     } catch (error) {
       setMessage({ type: 'error', text: `Error: ${error.message}` })
     } finally {
@@ -152,7 +181,8 @@ function GeneratorPage() {
     setApprovalStatus(prev => ({ ...prev, [platform]: null }))
 
     try {
-      const response = await fetch('/api/regenerate-content', {
+      // Streamed: the new text replaces the old one while it is written
+      const response = await fetch('/api/regenerate-content/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json'
@@ -165,22 +195,31 @@ function GeneratorPage() {
         })
       })
 
-      const data = await response.json()
-
-      if (response.ok) {
-        setEditedContent(prev => ({
-          ...prev,
-          [platform]: {
-            content: data.content,
-            success: true,
-            character_count: data.character_count
-          }
-        }))
-        setMessage({ type: 'success', text: `New ${platformNames[platform]} content generated!` })
-        setTimeout(() => setMessage(null), 2000)
-      } else {
+      if (!response.ok) {
         setMessage({ type: 'error', text: `Failed to regenerate` })
+        return
       }
+
+      let streamed = ''
+      await readEventStream(response, (event, data) => {
+        if (event === 'delta') {
+          streamed += data.delta
+          setEditedContent(prev => ({ ...prev, [platform]: { content: streamed, success: true } }))
+        } else if (event === 'done') {
+          setEditedContent(prev => ({
+            ...prev,
+            [platform]: {
+              content: data.content,
+              success: true,
+              character_count: data.character_count
+            }
+          }))
+          setMessage({ type: 'success', text: `New ${platformNames[platform]} content generated!` })
+          setTimeout(() => setMessage(null), 2000)
+        } else if (event === 'error') {
+          setMessage({ type: 'error', text: `Failed to regenerate` })
+        }
+      })
     } catch (error) {
       setMessage({ type: 'error', text: `Error: ${error.message}` })
     } finally {
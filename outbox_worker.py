@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Standalone outbox worker for Social Hub
+Publishes posts queued by /api/post (outbox mode) outside the API server.
+Run the API with OUTBOX_WORKERS=0 to keep publishing off the API tier.
+"""
+import asyncio
+import argparse
+import sys
+import signal
+from pathlib import Path
+
+# Add the project root to Python path
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from app.services.outbox_service import outbox_workers
+from app.config import settings
+from app.utils.log_config import setup_logging, shutdown_logging
+
+
+async def main(workers: int):
+    """Main entry point for the outbox worker"""
+    setup_logging()
+
+    print("=" * 60)
+    print("📤 Social Hub Outbox Worker")
+    print("=" * 60)
+    print(f"✅ Outbox: {settings.OUTBOX_DB_FILE}")
+    print(f"🔁 {workers} worker(s), polling every {settings.OUTBOX_POLL_INTERVAL}s")
+    print("-" * 60)
+
+    shutdown_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, shutdown_event.set)
+
+    outbox_workers.start(workers, settings.OUTBOX_POLL_INTERVAL)
+    try:
+        await shutdown_event.wait()
+        print("\n🛑 Shutdown initiated...")
+    finally:
+        # An interrupted job is picked up again once its lease expires
+        await outbox_workers.stop()
+        shutdown_logging()
+        print("✅ Shutdown complete")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Publish queued outbox jobs")
+    parser.add_argument("--workers", type=int, default=2, help="Jobs published at once (default: 2)")
+    args = parser.parse_args()
+    asyncio.run(main(args.workers))
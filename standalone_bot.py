@@ -15,6 +15,7 @@ sys.path.insert(0, str(project_root))
 from app.services.telegram_bot_service import telegram_bot
 from app.scheduler.scheduler import init_scheduler, restore_scheduled_jobs
 from app.config import settings
+from app.utils.log_config import setup_logging
 
 # Shutdown flag and loop reference
 shutdown_event = None
@@ -33,6 +34,9 @@ async def main():
     """Main entry point for the standalone Telegram bot"""
     global shutdown_event, event_loop
     
+    # Queue-based logging for the bot, services and scheduler
+    setup_logging()
+    
     # Get the running event loop for signal handler
     event_loop = asyncio.get_running_loop()
     
@@ -50,6 +54,12 @@ async def main():
         print()
         return
     
+    # Polling and webhook delivery are mutually exclusive in Telegram
+    if settings.TELEGRAM_WEBHOOK_URL:
+        print("ℹ️  TELEGRAM_WEBHOOK_URL is set - the bot is served by the API server (python run.py)")
+        print("   Unset TELEGRAM_WEBHOOK_URL to run the bot with long polling")
+        return
+    
     if not settings.OPENAI_API_KEY:
         print("⚠️  WARNING: OPENAI_API_KEY not found - AI features will be limited")
     
@@ -60,7 +70,11 @@ async def main():
     print("📅 Initializing scheduler...")
     try:
         init_scheduler()
-        print("✅ Scheduler started successfully")
+        from app.scheduler.scheduler import leadership
+        if leadership.standby:
+            print("⏸️  Scheduler on standby (another process runs scheduled posts)")
+        else:
+            print("✅ Scheduler started successfully")
     except Exception as e:
         print(f"❌ Failed to start scheduler: {e}")
         return
@@ -123,9 +137,10 @@ async def main():
         
         # Shutdown scheduler
         try:
-            from app.scheduler.scheduler import scheduler
-            if scheduler.running:
-                scheduler.shutdown(wait=False)
+            from app.scheduler.scheduler import scheduler, shutdown_scheduler
+            was_running = scheduler.running
+            shutdown_scheduler()
+            if was_running:
                 print("✅ Scheduler stopped")
         except:
             pass
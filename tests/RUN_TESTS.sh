@@ -39,6 +39,16 @@ case $MODE in
         echo "⚡ Running Quick Tests (no slow tests)..."
         pytest -m "not slow" tests/ -v --tb=short
         ;;
+    "benchmark")
+        echo "⏱️  Running Performance Regression Tests..."
+        pytest tests/performance/ --run-benchmarks -v --tb=short
+        ;;
+    "benchmark-baseline")
+        echo "📝 Recording New Performance Baseline..."
+        pytest tests/performance/ --update-benchmark-baseline -v --tb=short
+        echo ""
+        echo "✅ Baseline written to tests/performance/baseline.json"
+        ;;
     "failed")
         echo "🔄 Re-running Failed Tests..."
         pytest --lf -v --tb=short tests/
@@ -56,6 +66,8 @@ case $MODE in
         echo "  integration  - Run only integration tests"
         echo "  coverage     - Run with coverage report"
         echo "  quick        - Run without slow tests"
+        echo "  benchmark    - Run performance regression tests against the baseline"
+        echo "  benchmark-baseline - Record a new performance baseline"
         echo "  failed       - Re-run only failed tests"
         exit 1
         ;;
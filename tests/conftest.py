@@ -120,6 +120,57 @@ def setup_test_files(tmp_path, test_credentials, test_auth_data, test_scheduled_
     # Files will be automatically cleaned up since using tmp_path
 
 
+# SQLite stores every test gets its own files of: (settings path, module, store getter)
+ISOLATED_STORES = (
+    ("IDEMPOTENCY_DB_FILE", "app.services.idempotency_service", "get_store"),
+    ("OUTBOX_DB_FILE", "app.services.outbox_service", "get_outbox"),
+    ("USAGE_DB_FILE", "app.services.usage_service", "get_usage_store"),
+    ("GENERATION_BATCH_DB_FILE", "app.services.batch_service", "get_batch_store"),
+)
+
+
+@pytest.fixture(autouse=True)
+def isolated_stores(tmp_path):
+    """Keep publish records, outbox jobs, AI usage and generation batches of each test in its own SQLite files"""
+    import importlib
+    from contextlib import ExitStack
+    from app.config import settings
+    
+    getters = []
+    with ExitStack() as stack:
+        for setting, module, getter in ISOLATED_STORES:
+            stack.enter_context(patch.object(settings, setting, tmp_path / Path(getattr(settings, setting)).name))
+            getters.append(getattr(importlib.import_module(module), getter))
+        for getter in getters:
+            getter.reset()
+        try:
+            yield
+        finally:
+            for getter in getters:
+                getter.reset()
+
+
+@pytest.fixture(autouse=True)
+def isolated_rate_limits(tmp_path):
+    """Count rate limit hits of each test in its own SQLite file"""
+    from limits.strategies import FixedWindowRateLimiter
+    from app.utils.rate_limit import limiter, SQLiteStorage
+    
+    storage = SQLiteStorage(f"sqlite:///{tmp_path / 'rate_limits.db'}")
+    with patch.object(limiter, "_storage", storage), \
+         patch.object(limiter, "_limiter", FixedWindowRateLimiter(storage)):
+        yield
+
+
+@pytest.fixture(autouse=True)
+def closed_circuit_breakers():
+    """Start every test with all circuit breakers closed"""
+    from app.utils.circuit_breaker import reset_breakers
+    
+    reset_breakers()
+    yield
+
+
 @pytest.fixture
 def mock_openai_response():
     """Mock OpenAI API response"""
@@ -166,3 +217,26 @@ def sample_image_path(tmp_path):
     )
     return str(image_path)
 
+
+
+def pytest_addoption(parser):
+    """Command line switches for the benchmark tier (tests/performance)"""
+    group = parser.getgroup("benchmarks")
+    group.addoption(
+        "--run-benchmarks", action="store_true", default=False,
+        help="Run performance regression tests (marked 'benchmark')"
+    )
+    group.addoption(
+        "--update-benchmark-baseline", action="store_true", default=False,
+        help="Record measured benchmark timings as the new baseline"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip benchmark tests unless --run-benchmarks is given"""
+    if config.getoption("--run-benchmarks") or config.getoption("--update-benchmark-baseline"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark: use --run-benchmarks to run")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
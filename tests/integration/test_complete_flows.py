@@ -79,7 +79,7 @@ class TestCompleteManualPostFlow:
             # Step 1: Upload image
             mock_update.message.photo = [MagicMock()]
             mock_update.message.photo[-1].get_file = AsyncMock()
-            mock_update.message.photo[-1].get_file.return_value.download_to_drive = AsyncMock()
+            mock_update.message.photo[-1].get_file.return_value.download_as_bytearray = AsyncMock(return_value=bytearray(b"fake-jpeg"))
             mock_update.effective_user.id = 12345
             mock_update.message.reply_text = AsyncMock()
             
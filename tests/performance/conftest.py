@@ -0,0 +1,125 @@
+"""
+Fixtures for performance regression tests
+
+Each benchmark measures a hot path against mocked backends with injected
+latency and compares the best of a few runs with tests/performance/baseline.json.
+A run fails when it is slower than baseline * (1 + tolerance); CPU-bound
+benchmarks are noisier and can carry their own tolerance in "tolerances".
+
+Run:            pytest tests/performance --run-benchmarks
+Re-baseline:    pytest tests/performance --update-benchmark-baseline
+Tolerance:      BENCHMARK_TOLERANCE=0.5 (default from baseline.json)
+"""
+import os
+import json
+import time
+import asyncio
+import pytest
+from pathlib import Path
+from unittest.mock import MagicMock
+
+BASELINE_FILE = Path(__file__).parent / "baseline.json"
+
+# Latency injected into every mocked platform/OpenAI call
+BACKEND_LATENCY = 0.05
+
+
+def slow_backend(result=None, latency: float = BACKEND_LATENCY):
+    """
+    Async side effect that answers after `latency` seconds
+
+    Args:
+        result: Value (or callable(*args, **kwargs)) to return
+        latency: Seconds to wait
+    """
+    async def call(*args, **kwargs):
+        await asyncio.sleep(latency)
+        return result(*args, **kwargs) if callable(result) else result
+    return call
+
+
+def openai_completion(content: str):
+    """Minimal chat completion response object"""
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = content
+    response.usage = None
+    return response
+
+
+class BaselineRecorder:
+    """Compares timings with the stored baseline (or records new ones)"""
+
+    def __init__(self, update: bool):
+        self.update = update
+        self.data = json.loads(BASELINE_FILE.read_text()) if BASELINE_FILE.exists() else {"tolerance": 0.5, "benchmarks": {}}
+        self.tolerance = float(os.getenv("BENCHMARK_TOLERANCE", self.data.get("tolerance", 0.5)))
+        self.dirty = False
+
+    def check(self, name: str, seconds: float):
+        """
+        Assert `seconds` is within tolerance of the baseline for `name`
+
+        Args:
+            name: Benchmark key in baseline.json
+            seconds: Measured time
+        """
+        if self.update:
+            self.data["benchmarks"][name] = round(seconds, 4)
+            self.dirty = True
+            return
+
+        baseline = self.data["benchmarks"].get(name)
+        assert baseline is not None, f"No baseline for '{name}', run with --update-benchmark-baseline"
+        tolerance = max(self.tolerance, self.data.get("tolerances", {}).get(name, 0))
+        limit = baseline * (1 + tolerance)
+        print(f"\n⏱️  {name}: {seconds * 1000:.1f}ms (baseline {baseline * 1000:.1f}ms, limit {limit * 1000:.1f}ms)")
+        assert seconds <= limit, (
+            f"{name} regressed: {seconds * 1000:.1f}ms > {limit * 1000:.1f}ms "
+            f"(baseline {baseline * 1000:.1f}ms + {tolerance:.0%})"
+        )
+
+    def save(self):
+        if self.dirty:
+            self.data["benchmarks"] = dict(sorted(self.data["benchmarks"].items()))
+            BASELINE_FILE.write_text(json.dumps(self.data, indent=2) + "\n")
+
+
+@pytest.fixture(scope="session")
+def baseline(request):
+    """Session-wide baseline recorder"""
+    recorder = BaselineRecorder(update=request.config.getoption("--update-benchmark-baseline"))
+    yield recorder
+    recorder.save()
+
+
+def best_of(runs: int, func) -> float:
+    """
+    Run a sync callable `runs` times and return the fastest wall time
+
+    Args:
+        runs: Number of runs
+        func: Callable to time
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+async def best_of_async(runs: int, func) -> float:
+    """
+    Await `func()` `runs` times and return the fastest wall time
+
+    Args:
+        runs: Number of runs
+        func: Async callable to time
+    """
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
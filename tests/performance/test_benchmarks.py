@@ -0,0 +1,180 @@
+"""
+Performance regression tests for the generation, publishing, scheduling and storage hot paths
+"""
+import json
+import threading
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+from tests.performance.conftest import (
+    slow_backend, openai_completion, best_of, best_of_async
+)
+
+pytestmark = pytest.mark.benchmark
+
+PLATFORMS = ("facebook", "instagram", "twitter", "reddit")
+
+
+def _patch_publishers(module: str):
+    """Patch the four publish functions in `module` with slow fakes"""
+    patches = [
+        patch(f"{module}.post_photo_to_{platform}",
+              AsyncMock(side_effect=slow_backend({"id": f"{platform}_1", "post_id": "1_2"})))
+        for platform in PLATFORMS
+    ]
+    for p in patches:
+        p.start()
+    return patches
+
+
+class TestGenerationBenchmarks:
+    """AI generation wall time"""
+
+    @pytest.mark.asyncio
+    async def test_generate_platform_content(self, baseline):
+        """Enhancement, four captions and an image against slow OpenAI mocks"""
+        from app.services import ai_service
+
+        fake_client = MagicMock()
+        fake_client.chat.completions.create = MagicMock(side_effect=slow_backend(
+            lambda **kwargs: openai_completion(json.dumps({
+                "content_prompt": "Enhanced content prompt",
+                "image_prompt": "Enhanced image prompt"
+            }))
+        ))
+        image = {"success": True, "image_path": "uploads/ai_generated/fake.png", "provider": "dalle"}
+
+        with patch.object(ai_service, "client", fake_client), \
+             patch.object(ai_service, "generate_image_with_dalle", AsyncMock(side_effect=slow_backend(image))):
+            async def generate():
+                result = await ai_service.generate_platform_content(
+                    topic="Benchmark topic", tone="casual", image_style="realistic", generate_image=True
+                )
+                assert all(result["platforms"][p]["success"] for p in PLATFORMS)
+
+            seconds = await best_of_async(3, generate)
+
+        baseline.check("generate_platform_content", seconds)
+
+
+class TestPublishingBenchmarks:
+    """Publishing fan-out"""
+
+    @pytest.mark.asyncio
+    async def test_create_post_fan_out(self, baseline, tmp_path):
+        """POST /api/post to all four platforms against slow publish mocks"""
+        import httpx
+        from fastapi import FastAPI
+        from app.config import settings
+        from app.routes import posts
+
+        app = FastAPI()
+        app.include_router(posts.router)
+        patches = _patch_publishers("app.services.publish_service")
+        try:
+            with patch.object(settings, "UPLOAD_DIR", tmp_path):
+                transport = httpx.ASGITransport(app=app)
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    async def publish():
+                        response = await client.post(
+                            "/api/post",
+                            data={"caption": "Benchmark", "platforms": json.dumps({p: True for p in PLATFORMS})},
+                            files={"photo": ("bench.png", b"\x89PNG\r\n\x1a\n", "image/png")}
+                        )
+                        assert response.status_code == 200
+
+                    seconds = await best_of_async(3, publish)
+        finally:
+            for p in patches:
+                p.stop()
+
+        baseline.check("create_post_fan_out", seconds)
+
+
+class TestSchedulerBenchmarks:
+    """Scheduled post execution"""
+
+    def test_scheduler_burst(self, baseline, tmp_path):
+        """50 posts due at once, run by a scheduler configured like the app's"""
+        from datetime import datetime
+        from apscheduler.schedulers.background import BackgroundScheduler
+        from apscheduler.executors.pool import ThreadPoolExecutor
+        from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
+        from app.config import settings
+        from app.scheduler import scheduler as scheduler_module
+        from app.scheduler.storage import save_scheduled_posts
+
+        burst = 50
+        posts_file = tmp_path / "scheduled_posts.json"
+        done = threading.Semaphore(0)
+
+        with patch.object(settings, "SCHEDULED_POSTS_FILE", posts_file):
+            save_scheduled_posts([
+                {"id": f"bench-{i}", "caption": "Benchmark", "image_path": "bench.png",
+                 "platforms": {p: True for p in PLATFORMS}, "status": "scheduled"}
+                for i in range(burst)
+            ])
+            patches = _patch_publishers("app.scheduler.scheduler")
+            workers = scheduler_module.job_executor._pool._max_workers
+            burst_scheduler = BackgroundScheduler(executors={"default": ThreadPoolExecutor(max_workers=workers)})
+            burst_scheduler.add_listener(lambda event: done.release(), EVENT_JOB_EXECUTED | EVENT_JOB_ERROR)
+            burst_scheduler.start(paused=True)
+            try:
+                now = datetime.now()
+                for i in range(burst):
+                    burst_scheduler.add_job(
+                        scheduler_module.execute_scheduled_post, "date", run_date=now,
+                        args=[f"bench-{i}", "bench.png", "Benchmark", {p: True for p in PLATFORMS}],
+                        id=f"bench-{i}", misfire_grace_time=None
+                    )
+
+                def run_burst():
+                    burst_scheduler.resume()
+                    for _ in range(burst):
+                        assert done.acquire(timeout=60)
+
+                seconds = best_of(1, run_burst)
+            finally:
+                burst_scheduler.shutdown(wait=True)
+                for p in patches:
+                    p.stop()
+
+        baseline.check("scheduler_burst_50", seconds)
+
+
+class TestStorageBenchmarks:
+    """JSON-file storage lookups"""
+
+    def test_load_scheduled_posts_10k(self, baseline, tmp_path):
+        """Load a 10k-record scheduled posts file"""
+        from app.config import settings
+        from app.scheduler.storage import load_scheduled_posts
+
+        posts_file = tmp_path / "scheduled_posts.json"
+        posts_file.write_text(json.dumps([
+            {"id": f"post-{i}", "caption": "Benchmark caption " * 5, "image_path": f"uploads/{i}.png",
+             "platforms": {p: True for p in PLATFORMS}, "scheduled_time": "2030-01-01T12:00:00",
+             "created_at": "2029-12-31T12:00:00", "status": "scheduled"}
+            for i in range(10_000)
+        ], indent=2))
+
+        with patch.object(settings, "SCHEDULED_POSTS_FILE", posts_file):
+            assert len(load_scheduled_posts()) == 10_000
+            seconds = best_of(10, load_scheduled_posts)
+
+        baseline.check("load_scheduled_posts_10k", seconds)
+
+    def test_credentials_lookup(self, baseline, tmp_path, test_credentials):
+        """1000 platform credential lookups (one per publish)"""
+        from app.services import credentials_service
+
+        credentials_file = tmp_path / "user_credentials.json"
+        credentials_file.write_text(json.dumps(test_credentials, indent=2))
+
+        with patch.object(credentials_service, "get_credentials_file_path", return_value=str(credentials_file)):
+            def lookups():
+                for i in range(1000):
+                    assert credentials_service.get_platform_credentials(PLATFORMS[i % 4])
+
+            seconds = best_of(10, lookups)
+
+        baseline.check("credentials_lookup_1000", seconds)
@@ -0,0 +1,101 @@
+"""
+Unit tests for bulk content generation
+"""
+import json
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+
+def _item(topic: str, **overrides) -> dict:
+    return {"topic": topic, "tone": "casual", "image_style": "realistic", "generate_image": False,
+            "use_prompt_enhancer": True, "image_provider": "dalle", **overrides}
+
+
+class TestBulkPipeline:
+    """Test the bounded generation pipeline"""
+
+    @pytest.mark.asyncio
+    async def test_bounded_concurrency_and_shared_enhancement(self):
+        """At most `concurrency` items run at once; equal topics are enhanced once"""
+        from app.services import bulk_service
+
+        running = {"now": 0, "max": 0}
+
+        async def generate(**kwargs):
+            running["now"] += 1
+            running["max"] = max(running["max"], running["now"])
+            await asyncio.sleep(0.01)
+            running["now"] -= 1
+            return {"topic": kwargs["topic"], "enhanced_prompts": kwargs["enhanced_prompts"]}
+
+        enhance = AsyncMock(side_effect=lambda topic, tone, style: {"content_prompt": f"better {topic}"})
+        items = [_item("coffee"), _item("coffee"), _item("tea"), _item("juice", use_prompt_enhancer=False)]
+
+        with patch.object(bulk_service, "generate_platform_content", generate), \
+             patch.object(bulk_service, "enhance_user_prompt", enhance):
+            outcomes = [outcome async for outcome in bulk_service.generate_bulk(items, concurrency=2)]
+
+        assert sorted(outcome["index"] for outcome in outcomes) == [0, 1, 2, 3]
+        assert all(outcome["success"] for outcome in outcomes)
+        assert running["max"] == 2
+        assert enhance.await_count == 2
+        by_index = {outcome["index"]: outcome["result"] for outcome in outcomes}
+        assert by_index[1]["enhanced_prompts"] == {"content_prompt": "better coffee"}
+        assert by_index[3]["enhanced_prompts"] is None
+
+    @pytest.mark.asyncio
+    async def test_failed_item_does_not_stop_the_batch(self):
+        """An item error is reported with its status, the others still finish"""
+        from app.services import bulk_service
+
+        async def generate(**kwargs):
+            if kwargs["topic"] == "bad":
+                raise HTTPException(status_code=429, detail="Daily AI image quota of 1 used up")
+            return {"topic": kwargs["topic"]}
+
+        items = [_item("bad", use_prompt_enhancer=False), _item("good", use_prompt_enhancer=False)]
+        with patch.object(bulk_service, "generate_platform_content", generate):
+            outcomes = {o["topic"]: o async for o in bulk_service.generate_bulk(items)}
+
+        assert outcomes["bad"] == {
+            "index": 0, "topic": "bad", "success": False, "status_code": 429,
+            "error": "Daily AI image quota of 1 used up"
+        }
+        assert outcomes["good"]["success"] is True
+
+
+class TestBulkEndpoint:
+    """Test the NDJSON endpoint"""
+
+    def test_streams_item_lines_then_summary(self):
+        """One line per item, then the summary line"""
+        from app.main import app
+        from app.services import bulk_service
+
+        generate = AsyncMock(return_value={"success": True, "platforms": {}})
+        with patch.object(bulk_service, "generate_platform_content", generate):
+            response = TestClient(app).post("/api/generate-content/bulk", json={"items": [
+                {"topic": "coffee", "use_prompt_enhancer": False, "generate_image": False},
+                {"topic": "tea", "tone": "funny", "use_prompt_enhancer": False, "generate_image": False}
+            ]})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert {line["topic"] for line in lines[:2]} == {"coffee", "tea"}
+        assert lines[2] == {"done": True, "total": 2, "succeeded": 2, "failed": 0}
+
+    def test_rejects_too_many_items(self):
+        """Batches are capped at BULK_GENERATE_MAX_ITEMS"""
+        from app.config import settings
+        from app.main import app
+
+        with patch.object(settings, "BULK_GENERATE_MAX_ITEMS", 2):
+            response = TestClient(app).post(
+                "/api/generate-content/bulk", json={"items": [{"topic": f"t{i}"} for i in range(3)]}
+            )
+
+        assert response.status_code == 422
@@ -0,0 +1,104 @@
+"""
+Unit tests for circuit breakers
+"""
+import pytest
+from unittest.mock import AsyncMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class TestCircuitBreaker:
+    """Test breaker state transitions"""
+    
+    def test_opens_after_threshold_and_fails_fast(self):
+        """Consecutive failures open the breaker; calls are then refused"""
+        from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN
+        
+        breaker = CircuitBreaker("test-open", failure_threshold=3, reset_timeout=60)
+        for _ in range(3):
+            breaker.before_call()
+            breaker.record_failure("boom")
+        
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+    
+    def test_success_resets_failure_count(self):
+        """Only consecutive failures count"""
+        from app.utils.circuit_breaker import CircuitBreaker, CLOSED
+        
+        breaker = CircuitBreaker("test-reset", failure_threshold=2)
+        breaker.record_failure("boom")
+        breaker.record_success()
+        breaker.record_failure("boom")
+        
+        assert breaker.state == CLOSED
+    
+    def test_half_open_probe(self):
+        """After the cool-down one probe is admitted; its outcome decides the state"""
+        from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError, OPEN, HALF_OPEN, CLOSED
+        
+        breaker = CircuitBreaker("test-probe", failure_threshold=1, reset_timeout=0)
+        breaker.record_failure("boom")
+        
+        breaker.before_call()  # probe admitted
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()  # only one probe at a time
+        
+        breaker.record_failure("still down")
+        assert breaker.state == OPEN
+        
+        breaker.before_call()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+
+
+class TestCircuitBreakerDecorator:
+    """Test the decorator together with tenacity retries"""
+    
+    @pytest.mark.asyncio
+    async def test_open_breaker_stops_retries(self):
+        """Once open, the remaining retries are skipped"""
+        import httpx
+        from tenacity import retry, stop_after_attempt, retry_if_not_exception_type
+        from app.utils.circuit_breaker import circuit_breaker, get_breaker, CircuitOpenError
+        
+        get_breaker("test-retry").failure_threshold = 2
+        service = AsyncMock(side_effect=httpx.ConnectError("platform down"))
+        
+        @retry(stop=stop_after_attempt(5), retry=retry_if_not_exception_type(CircuitOpenError), reraise=True)
+        @circuit_breaker("test-retry")
+        async def publish():
+            return await service()
+        
+        with pytest.raises(CircuitOpenError):
+            await publish()
+        assert service.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_failed_result_counts_as_failure(self):
+        """Results flagged by is_failure trip the breaker without raising"""
+        from app.utils.circuit_breaker import circuit_breaker, get_breaker
+        
+        get_breaker("test-result").failure_threshold = 1
+        
+        @circuit_breaker("test-result", is_failure=lambda r: r.get("success") is False)
+        async def generate():
+            return {"success": False, "error": "content policy"}
+        
+        assert (await generate())["success"] is False
+        assert get_breaker("test-result").snapshot()["state"] == "open"
+        assert get_breaker("test-result").snapshot()["last_error"] == "content policy"
+    
+    def test_health_reports_breakers(self):
+        """The health endpoint lists platform and provider breakers"""
+        import app.services.facebook_service  # noqa: F401 (registers its breaker)
+        from app.routes import health
+        
+        api = FastAPI()
+        api.include_router(health.router)
+        response = TestClient(api).get("/api/health")
+        
+        assert response.status_code == 200
+        assert response.json()["circuit_breakers"]["facebook"]["state"] == "closed"
@@ -0,0 +1,157 @@
+"""
+Unit tests for retryable/permanent error classification
+"""
+import time
+import httpx
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+
+def _image():
+    from app.utils.media import ImageBuffer
+    return ImageBuffer(b"\xff\xd8fake-jpeg", filename="photo.jpg")
+
+
+def _status_error(status_code: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://graph.example/photos")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError(f"HTTP {status_code}", request=request, response=response)
+
+
+class TestClassification:
+    """Test is_retryable on the errors the services see"""
+
+    def test_http_statuses(self):
+        """429 and 5xx are transient, other 4xx are permanent"""
+        from app.utils.errors import is_retryable
+
+        assert is_retryable(_status_error(503))
+        assert is_retryable(_status_error(429))
+        assert not is_retryable(_status_error(400))
+        assert not is_retryable(_status_error(401))
+
+    def test_network_errors_are_retryable(self):
+        """Timeouts and dropped connections are retried"""
+        from app.utils.errors import is_retryable
+
+        assert is_retryable(httpx.ConnectTimeout("timed out"))
+        assert is_retryable(httpx.ConnectError("refused"))
+
+    def test_openai_errors(self):
+        """Content-policy rejections and exhausted quota are permanent"""
+        import openai
+        from app.utils.errors import is_retryable
+
+        request = httpx.Request("POST", "https://api.openai.com/v1/images/generations")
+
+        def api_error(cls, status_code, code=None):
+            response = httpx.Response(status_code, request=request)
+            return cls("error", response=response, body={"code": code} if code else None)
+
+        assert not is_retryable(api_error(openai.BadRequestError, 400, "content_policy_violation"))
+        assert not is_retryable(api_error(openai.RateLimitError, 429, "insufficient_quota"))
+        assert is_retryable(api_error(openai.RateLimitError, 429, "rate_limit_exceeded"))
+        assert is_retryable(api_error(openai.InternalServerError, 500))
+        assert is_retryable(openai.APITimeoutError(request=request))
+
+    def test_wrapped_errors_use_their_cause(self):
+        """A generic wrapper is classified by the error it was raised from"""
+        from app.utils.errors import is_retryable, platform_error
+
+        transient = RuntimeError("Failed to send request")
+        transient.__cause__ = httpx.ConnectError("connection reset")
+        rejected = RuntimeError("Failed to send request")
+        rejected.__cause__ = _status_error(401)
+
+        assert is_retryable(transient)
+        assert platform_error("Failed to post", transient).retryable
+        assert not is_retryable(rejected)
+
+    def test_circuit_open_and_config_errors_are_permanent(self):
+        """Open breakers and missing credentials are never retried"""
+        from app.utils.circuit_breaker import CircuitOpenError
+        from app.utils.errors import PlatformError, is_retryable
+
+        assert not is_retryable(CircuitOpenError("facebook", 30))
+        assert not is_retryable(PlatformError("Reddit credentials not configured"))
+
+    def test_programming_errors_are_permanent(self):
+        """Bugs and unclassified errors fail at once instead of being retried"""
+        from app.utils.errors import is_retryable
+
+        assert not is_retryable(TypeError("unexpected keyword argument"))
+        assert not is_retryable(KeyError("id"))
+        assert not is_retryable(AttributeError("'NoneType' object has no attribute 'id'"))
+        assert not is_retryable(RuntimeError("Failed to send request"))
+
+
+class TestServiceRetries:
+    """Permanent failures return at once, transient ones are retried"""
+
+    @pytest.mark.asyncio
+    async def test_missing_fal_key_fails_fast(self):
+        """A missing key used to be retried with exponential waits"""
+        from fastapi import HTTPException
+        from app.services import ai_service
+
+        with patch.object(ai_service.settings, "FAL_KEY", None):
+            started = time.perf_counter()
+            with pytest.raises(HTTPException) as exc_info:
+                await ai_service.generate_image_with_fal("style", "topic")
+
+        assert time.perf_counter() - started < 1
+        assert "FAL_KEY" in exc_info.value.detail
+
+    @pytest.mark.asyncio
+    async def test_content_policy_rejection_is_not_retried(self):
+        """DALL-E reports a rejected prompt after a single attempt"""
+        import openai
+        from app.services import ai_service
+
+        request = httpx.Request("POST", "https://api.openai.com/v1/images/generations")
+        rejected = openai.BadRequestError(
+            "content policy", response=httpx.Response(400, request=request), body=None
+        )
+        mock_client = MagicMock()
+        mock_client.images.generate = AsyncMock(side_effect=rejected)
+
+        with patch.object(ai_service, "client", mock_client):
+            result = await ai_service.generate_image_with_dalle("style", "topic")
+
+        assert result["success"] is False
+        assert mock_client.images.generate.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_permanent_platform_error_is_not_retried(self):
+        """A 400 from the Graph API is raised after one attempt"""
+        from fastapi import HTTPException
+        from app.services import facebook_service
+
+        post = AsyncMock(side_effect=_status_error(400))
+        with patch.object(facebook_service, "get_facebook_page_id", AsyncMock(return_value="123")), \
+             patch.object(facebook_service.settings, "FACEBOOK_ACCESS_TOKEN", "token"), \
+             patch("app.services.credentials_service.get_platform_credentials", return_value=None), \
+             patch("httpx.AsyncClient.post", post):
+            with pytest.raises(HTTPException):
+                await facebook_service.post_photo_to_facebook(_image(), "caption")
+
+        assert post.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_transient_platform_error_is_retried(self):
+        """A dropped connection is retried and the next attempt succeeds"""
+        from tenacity import wait_none
+        from app.services import reddit_service
+
+        submission = MagicMock(id="abc", url="https://reddit.com/abc")
+        reddit = MagicMock()
+        reddit.subreddit.return_value.submit_image.side_effect = [
+            httpx.ConnectError("connection reset"), submission
+        ]
+
+        with patch.object(reddit_service, "get_reddit_client", return_value=reddit), \
+             patch.object(reddit_service.post_photo_to_reddit.retry, "wait", wait_none()):
+            result = await reddit_service.post_photo_to_reddit(_image(), "caption")
+
+        assert result == {"id": "abc", "url": "https://reddit.com/abc"}
+        assert reddit.subreddit.return_value.submit_image.call_count == 2
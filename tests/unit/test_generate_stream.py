@@ -0,0 +1,118 @@
+"""
+Unit tests for Server-Sent Events generation
+"""
+import json
+import asyncio
+import pytest
+import httpx
+from unittest.mock import patch
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+
+def _events(text: str) -> list:
+    """(event, data) pairs of an SSE body, keep-alive comments skipped"""
+    events = []
+    for block in text.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if not line.startswith(":"))
+        if fields:
+            events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+class TestProgressEvents:
+    """Test turning progress reports into SSE events"""
+
+    @pytest.mark.asyncio
+    async def test_reports_then_done(self):
+        """Each report is an event as it happens; the result ends the stream"""
+        from app.utils.sse import progress_events
+
+        async def run(report):
+            await report("caption", {"platform": "twitter"})
+            return {"success": True}
+
+        events = _events("".join([message async for message in progress_events(run)]))
+
+        assert events == [("caption", {"platform": "twitter"}), ("done", {"success": True})]
+
+    @pytest.mark.asyncio
+    async def test_error_event_and_keepalive(self):
+        """A failure becomes an error event; silence is filled with keep-alive comments"""
+        from app.utils.sse import progress_events
+
+        async def run(report):
+            await asyncio.sleep(0.05)
+            raise HTTPException(status_code=429, detail="Daily AI token quota of 10 used up")
+
+        messages = [message async for message in progress_events(run, keepalive=0.01)]
+
+        assert ": keep-alive\n\n" in messages
+        assert _events("".join(messages))[-1] == (
+            "error", {"status_code": 429, "detail": "Daily AI token quota of 10 used up"}
+        )
+
+
+def _fake_openai():
+    """OpenAI client talking to the stand-in of benchmarks/fake_platforms.py"""
+    from openai import AsyncOpenAI
+    from benchmarks.fake_platforms import FakeConfig, create_app
+
+    return AsyncOpenAI(
+        api_key="test", base_url="http://fake/openai/v1", max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(FakeConfig(behaviours={}))))
+    )
+
+
+class TestGenerateStreamEndpoint:
+    """Test the streaming endpoints against the OpenAI stand-in"""
+
+    def test_streams_phases_and_caption_tokens(self):
+        """Enhanced prompts, caption deltas and captions arrive before the final result"""
+        from app.config import settings
+        from app.main import app
+        from app.services import ai_service
+        from app.services.usage_service import get_usage_store
+
+        fake_openai = _fake_openai()
+        with patch.object(settings, "OPENAI_API_KEY", "test"), \
+             patch.object(settings, "USAGE_API_KEYS", "key-1:marketing"), \
+             patch.object(ai_service, "client", fake_openai):
+            response = TestClient(app).post(
+                "/api/generate-content/stream",
+                json={"topic": "coffee", "generate_image": False, "stream_tokens": True},
+                headers={"X-API-Key": "key-1"}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = _events(response.text)
+        names = [name for name, _ in events]
+        assert names[0] == "enhanced" and names[-1] == "done"
+        assert names.count("caption") == 4
+
+        deltas = {}
+        for name, data in events:
+            if name == "caption_delta":
+                deltas[data["platform"]] = deltas.get(data["platform"], "") + data["delta"]
+        captions = {data["platform"]: data["content"] for name, data in events if name == "caption"}
+        assert deltas == captions
+        assert events[-1][1]["platforms"]["twitter"]["content"] == captions["twitter"]
+        # Streamed captions are charged like regular ones (enhancer + 4 captions)
+        assert get_usage_store().totals("marketing") == {"prompt_tokens": 2000, "completion_tokens": 600}
+
+    def test_refine_streams_deltas_then_result(self):
+        """The refined text arrives in pieces; "done" carries the same result as /refine-content"""
+        from app.config import settings
+        from app.main import app
+        from app.services import ai_service
+
+        with patch.object(settings, "OPENAI_API_KEY", "test"), patch.object(ai_service, "client", _fake_openai()):
+            response = TestClient(app).post("/api/refine-content/stream", json={
+                "original_content": "Hello", "platform": "twitter", "instructions": "Shorter"
+            })
+
+        events = _events(response.text)
+        deltas = [data["delta"] for name, data in events if name == "delta"]
+        assert len(deltas) > 1
+        assert events[-1] == ("done", {"success": True, "content": "".join(deltas)})
@@ -0,0 +1,162 @@
+"""
+Unit tests for offline batch generation (OpenAI Batch API)
+"""
+import json
+import pytest
+import httpx
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def batch_env(tmp_path):
+    """Uploads, scheduled posts and the Batch API stand-in of benchmarks/fake_platforms.py"""
+    from openai import AsyncOpenAI
+    from benchmarks.fake_platforms import FakeConfig, create_app
+    from app.config import settings
+    from app.services import batch_service
+    from app.scheduler import scheduler as scheduler_module
+
+    upload_dir = tmp_path / "uploads"
+    upload_dir.mkdir()
+    image = upload_dir / "campaign.png"
+    image.write_bytes(b"\x89PNG fake")
+    scheduled_file = tmp_path / "scheduled.json"
+    scheduled_file.write_text("[]")
+
+    fake = create_app(FakeConfig(behaviours={}, batch_polls=2))
+
+    def batch_client():
+        return AsyncOpenAI(
+            api_key="test", base_url="http://fake/openai/v1", max_retries=0,
+            http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=fake))
+        )
+
+    with patch.object(settings, "UPLOAD_DIR", upload_dir), \
+         patch.object(settings, "SCHEDULED_POSTS_FILE", scheduled_file), \
+         patch.object(settings, "OPENAI_API_KEY", "test"), \
+         patch.object(batch_service, "_batch_client", batch_client), \
+         patch.object(scheduler_module.scheduler, "add_job") as add_job:
+        yield {"image": str(image), "add_job": add_job}
+
+
+def _item(image: str, **overrides) -> dict:
+    return {"topic": "Coffee week", "tone": "casual", "platforms": ["twitter", "facebook"],
+            "scheduled_time": "2030-01-01T09:00:00", "image_path": image, **overrides}
+
+
+class TestGenerationBatch:
+    """Test submitting, polling and fanning out caption batches"""
+
+    def test_batch_file_has_one_request_per_platform(self):
+        """custom_id maps every line back to its item and platform"""
+        from app.services.batch_service import build_batch_file
+
+        lines = [json.loads(line) for line in build_batch_file([
+            {"topic": "Coffee", "tone": "casual", "platforms": ["twitter", "reddit"]},
+            {"topic": "Tea", "tone": "funny", "platforms": ["facebook"]}
+        ]).decode().splitlines()]
+
+        assert [line["custom_id"] for line in lines] == ["0:twitter", "0:reddit", "1:facebook"]
+        assert all(line["url"] == "/v1/chat/completions" for line in lines)
+        assert "Tea" in lines[2]["body"]["messages"][-1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_completed_batch_becomes_scheduled_posts(self, batch_env):
+        """Captions are fanned out into posts with their own image; tokens go to the submitter"""
+        from app.scheduler.storage import load_scheduled_posts
+        from app.services.batch_service import submit_batch, poll_batches, get_batch_store, COMPLETED
+        from app.services.usage_service import get_usage_store
+
+        job = await submit_batch([_item(batch_env["image"])], caller="marketing")
+
+        assert await poll_batches() == 0  # still in progress after the first poll
+        assert get_batch_store().get(job["id"])["batch_status"] == "in_progress"
+        assert await poll_batches() == 1
+
+        job = get_batch_store().get(job["id"])
+        assert job["status"] == COMPLETED
+        assert {post["platform"] for post in job["result"]["posts"]} == {"twitter", "facebook"}
+
+        posts = load_scheduled_posts()
+        assert len(posts) == 2
+        assert all(post["caption"].startswith("Fake generated post") for post in posts)
+        assert all(post["status"] == "scheduled" and post["generation_batch"] == job["id"] for post in posts)
+        assert len({post["image_path"] for post in posts} | {batch_env["image"]}) == 3
+        assert batch_env["add_job"].call_count == 2
+        assert get_usage_store().totals("marketing") == {"prompt_tokens": 800, "completion_tokens": 240}
+        assert await poll_batches() == 0
+
+    @pytest.mark.asyncio
+    async def test_interrupted_collection_does_not_repeat_posts_or_charges(self, batch_env):
+        """A collection that dies after the fan out is redone without duplicates"""
+        from app.scheduler.storage import load_scheduled_posts
+        from app.services import batch_service
+        from app.services.batch_service import submit_batch, poll_batches, get_batch_store, COMPLETED, SUBMITTED
+        from app.services.usage_service import get_usage_store
+
+        job = await submit_batch([_item(batch_env["image"])], caller="marketing")
+        await poll_batches()
+        with patch.object(batch_service.BatchStore, "complete", side_effect=RuntimeError("worker died")):
+            assert await poll_batches() == 0
+        assert get_batch_store().get(job["id"])["status"] == SUBMITTED
+        assert len(load_scheduled_posts()) == 2
+
+        # Usage charged but the job not marked collected: the charge is not repeated
+        get_usage_store().add("marketing", {"prompt_tokens": 800, "completion_tokens": 240},
+                              charge_id=f"batch:{job['id']}")
+        assert await poll_batches() == 1
+
+        job = get_batch_store().get(job["id"])
+        assert job["status"] == COMPLETED and len(job["result"]["posts"]) == 2
+        assert sorted(post["id"] for post in load_scheduled_posts()) == sorted(
+            post["post_id"] for post in job["result"]["posts"]
+        )
+        assert batch_env["add_job"].call_count == 2
+        assert get_usage_store().totals("marketing") == {"prompt_tokens": 800, "completion_tokens": 240}
+
+    @pytest.mark.asyncio
+    async def test_abandoned_collection_is_picked_up_again(self, batch_env):
+        """A job a crashed leader left "collecting" is claimed again after COLLECT_TIMEOUT"""
+        from app.services import batch_service
+        from app.services.batch_service import submit_batch, poll_batches, get_batch_store, COMPLETED
+
+        job = await submit_batch([_item(batch_env["image"])], caller="marketing")
+        await poll_batches()
+        assert get_batch_store().claim(job["id"], "completed")
+        assert not get_batch_store().claim(job["id"], "completed")
+        assert await poll_batches() == 0
+
+        with patch.object(batch_service, "COLLECT_TIMEOUT", -1):
+            assert await poll_batches() == 1
+        assert get_batch_store().get(job["id"])["status"] == COMPLETED
+
+
+class TestGenerationBatchEndpoint:
+    """Test the submit and status endpoints"""
+
+    def test_submit_returns_202_and_status(self, batch_env):
+        """The batch is accepted right away and can be followed at its status URL"""
+        from app.main import app
+
+        client = TestClient(app)
+        response = client.post("/api/generate-content/batch", json={"items": [_item(batch_env["image"])]})
+
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] == "submitted" and body["captions"] == 2
+        status = client.get(response.headers["Location"]).json()
+        assert status["batch_id"] == body["batch_id"]
+        assert client.get("/api/generate-content/batch/unknown").status_code == 404
+
+    def test_rejects_images_outside_uploads(self, batch_env, tmp_path):
+        """Items can only reference images already in the uploads directory"""
+        from app.main import app
+
+        outside = tmp_path / "secret.png"
+        outside.write_bytes(b"x")
+        response = TestClient(app).post(
+            "/api/generate-content/batch", json={"items": [_item(str(outside))]}
+        )
+
+        assert response.status_code == 422
@@ -0,0 +1,237 @@
+"""
+Unit tests for idempotent publishing
+"""
+import json
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class TestIdempotentPublish:
+    """Test the idempotent decorator and the SQLite store"""
+    
+    @pytest.mark.asyncio
+    async def test_repeat_returns_stored_result(self):
+        """A second publish with the same key must not post again"""
+        from app.services.idempotency_service import idempotent, idempotency_key
+        
+        publish = AsyncMock(return_value={"id": "fb_1"})
+        post = idempotent("facebook")(publish)
+        
+        with idempotency_key("post-1"):
+            first = await post("image.png", "caption")
+            second = await post("image.png", "caption")
+        
+        assert first == second == {"id": "fb_1"}
+        assert publish.await_count == 1
+    
+    @pytest.mark.asyncio
+    async def test_without_key_always_publishes(self):
+        """Publishes outside idempotency_key() are not recorded"""
+        from app.services.idempotency_service import idempotent
+        
+        publish = AsyncMock(return_value={"id": "fb_1"})
+        post = idempotent("facebook")(publish)
+        
+        await post("image.png", "caption")
+        await post("image.png", "caption")
+        
+        assert publish.await_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_failed_attempt_keeps_checkpoints(self):
+        """A retry after a failure publishes again but reuses saved steps"""
+        from app.services.idempotency_service import (
+            idempotent, idempotency_key, get_checkpoint, save_checkpoint, get_store
+        )
+        
+        uploads = []
+        
+        @idempotent("twitter")
+        async def post(fail: bool):
+            media_id = get_checkpoint("media_id")
+            if not media_id:
+                uploads.append(1)
+                media_id = "m-1"
+                await save_checkpoint("media_id", media_id)
+            if fail:
+                raise RuntimeError("timeout")
+            return {"id": "tw_1", "media": media_id}
+        
+        with idempotency_key("post-2"):
+            with pytest.raises(RuntimeError):
+                await post(fail=True)
+            assert get_store().get("post-2", "twitter")["status"] == "failed"
+            
+            result = await post(fail=False)
+        
+        assert result == {"id": "tw_1", "media": "m-1"}
+        assert len(uploads) == 1
+        record = get_store().get("post-2", "twitter")
+        assert record["status"] == "success"
+        assert record["attempts"] == 2
+    
+    def test_pending_claim_blocks_concurrent_attempt(self):
+        """An unexpired pending claim means another attempt is publishing"""
+        from app.services.idempotency_service import get_store, PublishInProgress
+        
+        store = get_store()
+        assert store.claim("post-3", "instagram")["status"] == "pending"
+        with pytest.raises(PublishInProgress):
+            store.claim("post-3", "instagram")
+    
+    def test_expired_claim_can_be_retaken(self, tmp_path):
+        """A claim older than the lease (crashed attempt) can be taken again"""
+        from app.services.idempotency_service import IdempotencyStore
+        
+        store = IdempotencyStore(tmp_path / "records.db", lease_seconds=0)
+        store.claim("post-4", "reddit")
+        assert store.claim("post-4", "reddit")["status"] == "pending"
+        assert store.get("post-4", "reddit")["attempts"] == 2
+
+
+
+def _publisher(*errors):
+    """Idempotent publish that raises `errors` (one per attempt) while sending, then posts"""
+    from tenacity import retry, stop_after_attempt
+    from app.services.idempotency_service import idempotent, sending
+    from app.utils.errors import retry_if_retryable
+
+    sent = []
+    remaining = list(errors)
+
+    @idempotent("facebook")
+    @retry(stop=stop_after_attempt(3), retry=retry_if_retryable, reraise=True)
+    async def post():
+        async with sending():
+            sent.append(1)
+            if remaining:
+                raise remaining.pop(0)
+        return {"id": "fb_1"}
+
+    return post, sent
+
+
+class TestUnknownOutcome:
+    """Test publishes that may have gone through despite failing"""
+
+    @pytest.mark.asyncio
+    async def test_read_timeout_is_not_retried_or_republished(self):
+        """A timeout after sending leaves the outcome unknown until resolved"""
+        import httpx
+        from app.services.idempotency_service import idempotency_key, get_store, PublishOutcomeUnknown
+
+        post, sent = _publisher(httpx.ReadTimeout("timed out"))
+        with idempotency_key("post-5"):
+            with pytest.raises(PublishOutcomeUnknown):
+                await post()
+            with pytest.raises(PublishOutcomeUnknown):
+                await post()
+
+        assert len(sent) == 1
+        assert get_store().get("post-5", "facebook")["status"] == "unknown"
+
+        # Checked: it wasn't posted, so the next attempt publishes
+        assert get_store().resolve("post-5", "facebook")
+        with idempotency_key("post-5"):
+            assert await post() == {"id": "fb_1"}
+        assert len(sent) == 2
+
+    @pytest.mark.asyncio
+    async def test_connect_errors_are_retried(self):
+        """Nothing reached the platform, so sending again is safe"""
+        import httpx
+        from app.services.idempotency_service import idempotency_key, get_store
+
+        post, sent = _publisher(httpx.ConnectError("refused"))
+        with idempotency_key("post-6"):
+            assert await post() == {"id": "fb_1"}
+
+        assert len(sent) == 2
+        assert get_store().get("post-6", "facebook")["status"] == "success"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_while_sending(self):
+        """An attempt cancelled mid-request (bot timeout, worker stop) is not published again"""
+        import asyncio
+        from app.services.idempotency_service import idempotency_key, get_store, PublishOutcomeUnknown
+
+        post, _ = _publisher(asyncio.CancelledError())
+        with idempotency_key("post-7"):
+            with pytest.raises(asyncio.CancelledError):
+                await post()
+            with pytest.raises(PublishOutcomeUnknown):
+                await post()
+
+        assert get_store().get("post-7", "facebook")["status"] == "unknown"
+
+    def test_crash_while_sending_becomes_unknown(self, tmp_path):
+        """An expired claim that was sending is not taken again"""
+        from app.services.idempotency_service import IdempotencyStore, PublishOutcomeUnknown
+
+        store = IdempotencyStore(tmp_path / "records.db", lease_seconds=0)
+        store.claim("post-8", "reddit")
+        store.checkpoint("post-8", "reddit", {"sending": True})
+
+        with pytest.raises(PublishOutcomeUnknown):
+            store.claim("post-8", "reddit")
+        assert store.unresolved()[0]["key"] == "post-8"
+        assert store.resolve("post-8", "reddit", {"id": "r_1"})
+        assert store.claim("post-8", "reddit") == {"status": "success", "result": {"id": "r_1"}}
+
+class TestPostEndpointIdempotency:
+    """Test Idempotency-Key handling in /api/post"""
+    
+    def test_scheduled_post_created_once_per_key(self, tmp_path):
+        """Retrying a scheduling request with the same key returns the first post"""
+        from app.config import settings
+        from app.routes import posts
+        
+        app = FastAPI()
+        app.include_router(posts.router)
+        client = TestClient(app)
+        
+        def schedule():
+            return client.post(
+                "/api/post",
+                data={"caption": "Hello", "scheduled_time": "2099-01-01T10:00:00",
+                      "platforms": json.dumps({"facebook": True})},
+                files={"photo": ("a.png", b"\x89PNG\r\n\x1a\n", "image/png")},
+                headers={"Idempotency-Key": "client-key-1"}
+            )
+        
+        with patch.object(settings, "SCHEDULED_POSTS_FILE", tmp_path / "scheduled.json"), \
+             patch.object(settings, "UPLOAD_DIR", tmp_path), \
+             patch.object(posts.scheduler, "add_job") as add_job:
+            first = schedule()
+            second = schedule()
+            stored = json.loads((tmp_path / "scheduled.json").read_text())
+        
+        assert first.status_code == second.status_code == 200
+        assert first.json()["post_id"] == second.json()["post_id"]
+        assert add_job.call_count == 1
+        assert len(stored) == 1
+
+    def test_concurrent_scheduling_requests_create_one_post(self, tmp_path):
+        """Two retries racing past the first lookup still end up with one post"""
+        import threading
+        from app.scheduler import storage
+
+        key = "client-key-2"
+        results = []
+
+        def add(post_id):
+            post = {"id": post_id, "idempotency_key": key, "scheduled_time": "2099-01-01T10:00:00"}
+            results.append(storage.add_scheduled_post_once(post, key)["id"])
+
+        with patch.object(storage.settings, "SCHEDULED_POSTS_FILE", tmp_path / "scheduled.json"):
+            threads = [threading.Thread(target=add, args=(f"post-{i}",)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            stored = storage.load_scheduled_posts()
+
+        assert len(stored) == 1
+        assert set(results) == {stored[0]["id"]}
@@ -0,0 +1,73 @@
+"""
+Unit tests for queue-based logging and correlation ids
+"""
+import json
+import queue
+import logging
+import logging.handlers
+from fastapi.testclient import TestClient
+
+
+class ListHandler(logging.Handler):
+    """Collects formatted records"""
+    
+    def __init__(self, formatter):
+        super().__init__()
+        self.setFormatter(formatter)
+        self.lines = []
+    
+    def emit(self, record):
+        self.lines.append(self.format(record))
+
+
+class TestQueueLogging:
+    """Test the queue handler / listener pipeline"""
+    
+    def test_records_carry_caller_request_id(self):
+        """The correlation id is taken on the caller's thread, not the writer's"""
+        from app.utils.log_config import RequestIdFilter, JsonFormatter, request_id_var
+        
+        log_queue = queue.SimpleQueue()
+        queue_handler = logging.handlers.QueueHandler(log_queue)
+        queue_handler.addFilter(RequestIdFilter())
+        output = ListHandler(JsonFormatter())
+        listener = logging.handlers.QueueListener(log_queue, output)
+        
+        logger = logging.getLogger("test.queue_logging")
+        logger.propagate = False
+        logger.addHandler(queue_handler)
+        listener.start()
+        try:
+            token = request_id_var.set("abc123")
+            logger.warning("publish %s failed", "facebook")
+            request_id_var.reset(token)
+        finally:
+            listener.stop()
+            logger.removeHandler(queue_handler)
+        
+        entry = json.loads(output.lines[0])
+        assert entry["request_id"] == "abc123"
+        assert entry["message"] == "publish facebook failed"
+        assert entry["level"] == "WARNING"
+
+
+class TestRequestIdMiddleware:
+    """Test correlation id propagation through HTTP requests"""
+    
+    def test_request_id_echoed(self):
+        """Incoming X-Request-ID should be used and returned"""
+        from app.main import app
+        
+        client = TestClient(app)
+        response = client.get("/api/health", headers={"X-Request-ID": "req-42"})
+        
+        assert response.headers["X-Request-ID"] == "req-42"
+    
+    def test_request_id_generated(self):
+        """Requests without an id should get one"""
+        from app.main import app
+        
+        client = TestClient(app)
+        response = client.get("/api/health")
+        
+        assert response.headers.get("X-Request-ID")
@@ -0,0 +1,87 @@
+"""
+Unit tests for the metrics registry and instrumentation
+"""
+import pytest
+from unittest.mock import MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+class TestRegistry:
+    """Test metric types and text rendering"""
+    
+    def test_histogram_renders_cumulative_buckets(self):
+        """Buckets should be cumulative with sum and count"""
+        from app.utils.metrics import Registry, Histogram
+        
+        registry = Registry()
+        hist = registry.register(Histogram("test_seconds", "Test", ["kind"], buckets=(0.1, 1.0)))
+        hist.observe(0.05, kind="a")
+        hist.observe(0.5, kind="a")
+        hist.observe(5, kind="a")
+        
+        text = registry.render()
+        assert '# TYPE test_seconds histogram' in text
+        assert 'test_seconds_bucket{kind="a",le="0.1"} 1' in text
+        assert 'test_seconds_bucket{kind="a",le="1.0"} 2' in text
+        assert 'test_seconds_bucket{kind="a",le="+Inf"} 3' in text
+        assert 'test_seconds_count{kind="a"} 3' in text
+    
+    def test_wrong_labels_rejected(self):
+        """Label names must match the metric definition"""
+        from app.utils.metrics import Counter
+        
+        counter = Counter("test_total", "Test", ["platform"])
+        with pytest.raises(ValueError):
+            counter.inc(kind="x")
+
+
+class TestInstrumentation:
+    """Test the service decorators"""
+    
+    @pytest.mark.asyncio
+    async def test_observe_publish_records_outcome(self):
+        """Failures and successes should be counted separately"""
+        from app.utils.metrics import observe_publish, PUBLISH_TOTAL
+        
+        @observe_publish("testplatform")
+        async def publish(fail):
+            if fail:
+                raise RuntimeError("boom")
+            return {"id": "1"}
+        
+        await publish(False)
+        with pytest.raises(RuntimeError):
+            await publish(True)
+        
+        assert PUBLISH_TOTAL.get(platform="testplatform", outcome="success") == 1
+        assert PUBLISH_TOTAL.get(platform="testplatform", outcome="error") == 1
+    
+    @pytest.mark.asyncio
+    async def test_observe_openai_counts_tokens(self):
+        """Token usage from the response should be counted per model"""
+        from app.utils.metrics import observe_openai, OPENAI_TOKENS
+        
+        response = MagicMock()
+        response.model = "test-model"
+        response.usage.prompt_tokens = 120
+        response.usage.completion_tokens = 30
+        
+        async def request():
+            return response
+        
+        assert await observe_openai("chat", request()) is response
+        assert OPENAI_TOKENS.get(model="test-model", type="prompt") == 120
+        assert OPENAI_TOKENS.get(model="test-model", type="completion") == 30
+    
+    def test_metrics_endpoint(self):
+        """/metrics should serve the Prometheus text format"""
+        from app.routes import metrics
+        
+        app = FastAPI()
+        app.include_router(metrics.router)
+        response = TestClient(app).get("/metrics")
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE publish_seconds histogram" in response.text
@@ -0,0 +1,178 @@
+"""
+Unit tests for the publish outbox (202 jobs, workers, status endpoint)
+"""
+import json
+import time
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+PNG = b"\x89PNG\r\n\x1a\n"
+
+
+@pytest.fixture
+def posts_client(tmp_path):
+    """Client for the posts router with uploads in a temp dir"""
+    from app.config import settings
+    from app.routes import posts
+
+    app = FastAPI()
+    app.include_router(posts.router)
+    with patch.object(settings, "UPLOAD_DIR", tmp_path):
+        yield TestClient(app)
+
+
+def _post(client, headers=None):
+    return client.post(
+        "/api/post",
+        data={"caption": "Hello", "platforms": json.dumps({"facebook": True, "reddit": True})},
+        files={"photo": ("a.png", PNG, "image/png")},
+        headers={"Prefer": "respond-async", **(headers or {})}
+    )
+
+
+class TestOutboxEndpoint:
+    """Test 202 responses and job status"""
+
+    def test_post_returns_202_without_publishing(self, posts_client, tmp_path):
+        """The job is stored and nothing is published inside the request"""
+        publish = AsyncMock()
+        with patch("app.routes.posts.publish_post", publish):
+            response = _post(posts_client)
+
+        assert response.status_code == 202
+        body = response.json()
+        assert body["status"] == "queued"
+        assert response.headers["Location"] == f"/api/post/jobs/{body['job_id']}"
+        publish.assert_not_awaited()
+
+        status = posts_client.get(body["status_url"])
+        assert status.status_code == 200
+        assert status.json()["status"] == "queued"
+        # The image is kept for the worker
+        assert len(list(tmp_path.glob("*_a.png"))) == 1
+
+    def test_same_idempotency_key_returns_same_job(self, posts_client):
+        """A retried request doesn't queue a second job"""
+        first = _post(posts_client, {"Idempotency-Key": "job-key-1"})
+        second = _post(posts_client, {"Idempotency-Key": "job-key-1"})
+
+        assert first.status_code == second.status_code == 202
+        assert first.json()["job_id"] == second.json()["job_id"]
+
+    def test_concurrent_request_with_same_key_drops_its_upload(self, posts_client, tmp_path):
+        """The request that loses the enqueue race returns the winner's job and removes its own image"""
+        from app.services.outbox_service import get_outbox
+
+        winner = get_outbox().enqueue(
+            {"image_path": str(tmp_path / "winner.png"), "caption": "Hello", "platforms": {}}, "job-key-2"
+        )
+        # Both requests looked the key up before either had queued its job
+        with patch.object(type(get_outbox()), "get_by_key", return_value=None):
+            response = _post(posts_client, {"Idempotency-Key": "job-key-2"})
+
+        assert response.status_code == 202
+        assert response.json()["job_id"] == winner["id"]
+        assert list(tmp_path.glob("*_a.png")) == []
+
+    def test_unknown_job_is_404(self, posts_client):
+        """Status of a job that doesn't exist"""
+        assert posts_client.get("/api/post/jobs/nope").status_code == 404
+
+
+class TestOutboxWorkers:
+    """Test job execution"""
+
+    @pytest.mark.asyncio
+    async def test_worker_publishes_and_records_result(self, tmp_path):
+        """A worker publishes the job under its idempotency key and removes the image"""
+        from app.services import publish_service
+        from app.services.idempotency_service import publish_key_var
+        from app.services.outbox_service import get_outbox, OutboxWorkers, DONE
+
+        image = tmp_path / "image.png"
+        image.write_bytes(PNG)
+        job = get_outbox().enqueue(
+            {"image_path": str(image), "caption": "Hello", "platforms": {"facebook": True}}, "client-key"
+        )
+
+        seen_keys = []
+
+        async def facebook(image_path, caption):
+            seen_keys.append(publish_key_var.get())
+            return {"id": "fb-1"}
+
+        workers = OutboxWorkers()
+        with patch.object(publish_service, "post_photo_to_facebook", facebook):
+            workers.start(1, poll_interval=0.05)
+            try:
+                for _ in range(100):
+                    if get_outbox().get(job["id"])["status"] == DONE:
+                        break
+                    await asyncio.sleep(0.02)
+            finally:
+                await workers.stop()
+
+        finished = get_outbox().get(job["id"])
+        assert finished["status"] == DONE
+        assert finished["result"]["results"]["facebook"] == {"success": True, "postId": "fb-1", "postLink": None}
+        assert seen_keys == ["client-key"]
+        assert not image.exists()
+
+    def test_expired_lease_is_claimed_again(self, tmp_path):
+        """A job whose worker died is picked up after its lease"""
+        from app.services.outbox_service import OutboxStore, RUNNING
+
+        store = OutboxStore(tmp_path / "outbox.db", lease_seconds=0.05)
+        job = store.enqueue({"image_path": "x.png", "caption": "", "platforms": {}})
+
+        assert store.claim()["id"] == job["id"]
+        assert store.claim() is None  # still leased
+        time.sleep(0.1)
+
+        reclaimed = store.claim()
+        assert reclaimed["id"] == job["id"]
+        assert reclaimed["status"] == RUNNING
+        assert reclaimed["attempts"] == 2
+
+    @pytest.mark.asyncio
+    async def test_interrupted_job_is_requeued_without_reposting(self, tmp_path):
+        """A job stopped mid-publish goes back to the queue; the interrupted platform isn't posted again"""
+        from app.services import publish_service
+        from app.services.idempotency_service import idempotent, sending, get_store
+        from app.services.outbox_service import get_outbox, run_job, OutboxWorkers, QUEUED, FAILED
+
+        image = tmp_path / "image.png"
+        image.write_bytes(PNG)
+        job = get_outbox().enqueue(
+            {"image_path": str(image), "caption": "Hello", "platforms": {"facebook": True}}, "client-key-2"
+        )
+        sent = asyncio.Event()
+        calls = []
+
+        @idempotent("facebook")
+        async def facebook(image_path, caption):
+            async with sending():
+                calls.append(1)
+                sent.set()
+                await asyncio.sleep(10)
+
+        workers = OutboxWorkers()
+        with patch.object(publish_service, "post_photo_to_facebook", facebook):
+            workers.start(1, poll_interval=0.05)
+            await asyncio.wait_for(sent.wait(), timeout=2)
+            await workers.stop()
+
+            assert get_outbox().get(job["id"])["status"] == QUEUED
+            assert get_store().get("client-key-2", "facebook")["status"] == "unknown"
+            assert image.exists()
+
+            await run_job(get_outbox().claim())
+
+        finished = get_outbox().get(job["id"])
+        assert finished["status"] == FAILED
+        assert "may already have published" in finished["result"]["results"]["facebook"]["error"]
+        assert len(calls) == 1
@@ -0,0 +1,100 @@
+"""
+Unit tests for request profiling (spans, middleware, admin traces endpoint)
+"""
+import asyncio
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+
+class TestSpans:
+    """Test span recording"""
+
+    @pytest.mark.asyncio
+    async def test_nested_spans_recorded(self):
+        """Spans inside a trace are timed with their nesting depth"""
+        from app.utils.profiling import Trace, current_trace, span
+
+        trace = Trace("t1", "POST", "/api/generate-content", "header")
+        token = current_trace.set(trace)
+        try:
+            with span("caption", platform="twitter"):
+                with span("openai.chat"):
+                    await asyncio.sleep(0.01)
+        finally:
+            current_trace.reset(token)
+
+        spans = {s["name"]: s for s in trace.to_dict()["spans"]}
+        assert spans["caption"]["depth"] == 0
+        assert spans["caption"]["attrs"] == {"platform": "twitter"}
+        assert spans["openai.chat"]["depth"] == 1
+        assert spans["openai.chat"]["duration_ms"] >= 10
+
+    def test_span_without_trace_is_noop(self):
+        """Outside a profiled request nothing is recorded"""
+        from app.utils.profiling import span, current_trace
+
+        with span("anything"):
+            pass
+        assert current_trace.get() is None
+
+    @pytest.mark.asyncio
+    async def test_failed_span_keeps_error(self):
+        """A span that raises records the exception type"""
+        from app.utils.profiling import Trace, current_trace, span
+
+        trace = Trace("t2", "POST", "/api/post", "header")
+        token = current_trace.set(trace)
+        try:
+            with pytest.raises(ValueError):
+                with span("publish.facebook"):
+                    raise ValueError("boom")
+        finally:
+            current_trace.reset(token)
+
+        assert trace.spans[0]["error"] == "ValueError"
+
+
+class TestProfilingMiddleware:
+    """Test the opt-in middleware and the admin endpoint"""
+
+    def test_header_profiles_request_and_trace_is_listed(self):
+        """X-Profile: 1 profiles the request; the trace is available to admins"""
+        from app.main import app
+        from app.config import settings
+        from app.utils.profiling import trace_store
+
+        trace_store.clear()
+        client = TestClient(app)
+        with patch.object(settings, "ADMIN_TOKEN", "secret"):
+            response = client.get("/api/health", headers={"X-Profile": "1", "X-Request-ID": "prof-1"})
+            assert response.headers["X-Trace-ID"] == "prof-1"
+
+            listed = client.get("/api/admin/traces", headers={"X-Admin-Token": "secret"})
+            assert listed.status_code == 200
+            assert listed.json()["traces"][0]["trace_id"] == "prof-1"
+
+            detail = client.get("/api/admin/traces/prof-1", headers={"X-Admin-Token": "secret"})
+            assert detail.status_code == 200
+            assert detail.json()["path"] == "/api/health"
+
+    def test_unprofiled_request_has_no_trace(self):
+        """Without the header (and sampling off) requests are not profiled"""
+        from app.main import app
+        from app.config import settings
+
+        client = TestClient(app)
+        with patch.object(settings, "PROFILING_SAMPLE_RATE", 0):
+            response = client.get("/api/health")
+        assert "X-Trace-ID" not in response.headers
+
+    def test_admin_requires_token(self):
+        """Admin endpoints are closed without ADMIN_TOKEN or with a wrong token"""
+        from app.main import app
+        from app.config import settings
+
+        client = TestClient(app)
+        with patch.object(settings, "ADMIN_TOKEN", None):
+            assert client.get("/api/admin/traces").status_code == 403
+        with patch.object(settings, "ADMIN_TOKEN", "secret"):
+            assert client.get("/api/admin/traces", headers={"X-Admin-Token": "wrong"}).status_code == 403
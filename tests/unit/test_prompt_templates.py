@@ -0,0 +1,59 @@
+"""
+Unit tests for the prompt template registry
+"""
+
+
+class TestPromptTemplates:
+    """Test precomputed prompt prefixes"""
+
+    def test_enhancer_prompt_shares_prefix_across_ideas(self):
+        """Only the user's idea differs, at the very end of the prompt"""
+        from app.services.ai.prompts import enhancer_messages, ENHANCER_PREFIXES
+
+        coffee = enhancer_messages("coffee", "casual", "anime")
+        tea = enhancer_messages("tea", "casual", "anime")
+
+        assert coffee[0] == tea[0] and "prompt engineer" in coffee[0]["content"]
+        prefix = ENHANCER_PREFIXES[("casual", "anime")]
+        assert coffee[1]["content"] == f'{prefix}"coffee"'
+        assert tea[1]["content"].startswith(prefix)
+        assert "JAPANESE ANIME style" in prefix and "{tone}" not in prefix
+
+    def test_caption_prompt_ends_with_topic(self):
+        """Caption prompts carry the platform/tone guidance before the topic"""
+        from app.services.ai.prompts import caption_messages, CAPTION_PREFIXES
+
+        messages = caption_messages("Coffee week", "twitter", "corporate")
+
+        assert messages[1]["content"] == CAPTION_PREFIXES[("corporate", "twitter")] + "Coffee week\n\nPost:"
+        assert "Max length: 100 characters" in messages[1]["content"]
+        assert "twitter" in messages[0]["content"]
+
+    def test_regenerate_and_refine_prompts_keep_their_wording(self):
+        """Regenerate and refine prompts lead with the topic or post, as before the registry"""
+        from app.services.ai.prompts import regenerate_messages, refine_messages
+
+        regenerate = regenerate_messages("Coffee week", "twitter", "funny")[1]["content"]
+        refine = refine_messages("Hello", "reddit", "Shorter")[1]["content"]
+
+        assert regenerate.startswith("Create a funny social media post about: Coffee week\n\nPlatform: TWITTER")
+        assert "DIFFERENT version from this previous attempt:\nN/A\n\nMake it engaging" in regenerate
+        assert refine.startswith("Original post for reddit:\nHello\n\nUser wants: Shorter\n\nRewrite the post")
+
+    def test_unknown_tone_and_style_fall_back(self):
+        """Values outside the registry are built on the fly with neutral defaults"""
+        from app.services.ai.prompts import image_style_prompt, enhancer_messages
+
+        assert image_style_prompt("casual", "3d") == "photorealistic, friendly and approachable, warm and inviting atmosphere"
+        assert "TONE REQUIREMENTS: engaging and authentic" in enhancer_messages("coffee", "sarcastic", "realistic")[1]["content"]
+
+    def test_style_config_reads_the_registry(self):
+        """style_config returns copies of the registry tables"""
+        from app.services.ai import prompts
+        from app.services.ai.style_config import get_tone_guidelines, get_style_prompts
+
+        guidelines = get_tone_guidelines()
+        guidelines["casual"] = "changed"
+
+        assert prompts.TONE_GUIDELINES["casual"] != "changed"
+        assert get_style_prompts() == prompts.IMAGE_STYLE_PROMPTS
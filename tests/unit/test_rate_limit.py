@@ -0,0 +1,108 @@
+"""
+Unit tests for the shared rate limiter
+"""
+import time
+import sqlite3
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+
+class TestSQLiteStorage:
+    """Test counters shared through the SQLite file"""
+
+    def test_counts_are_shared_between_storages(self, tmp_path):
+        """Two workers (storages on the same file) see one counter"""
+        from app.utils.rate_limit import SQLiteStorage
+
+        uri = f"sqlite:///{tmp_path / 'limits.db'}"
+        worker_a, worker_b = SQLiteStorage(uri), SQLiteStorage(uri)
+
+        assert worker_a.incr("key", 60) == 1
+        assert worker_b.incr("key", 60) == 2
+        assert worker_a.get("key") == 2
+        assert worker_b.get_expiry("key") > time.time()
+
+    def test_window_restarts_after_expiry(self, tmp_path):
+        """An expired counter starts again from the new hit"""
+        from app.utils.rate_limit import SQLiteStorage
+
+        storage = SQLiteStorage(f"sqlite:///{tmp_path / 'limits.db'}")
+        storage.incr("key", 0.05, amount=3)
+        time.sleep(0.1)
+
+        assert storage.get("key") == 0
+        assert storage.incr("key", 60) == 1
+
+    def test_fixed_window_limit(self, tmp_path):
+        """The limits strategy stops at the limit"""
+        from limits import parse
+        from limits.strategies import FixedWindowRateLimiter
+        from app.utils.rate_limit import SQLiteStorage
+
+        limiter = FixedWindowRateLimiter(SQLiteStorage(f"sqlite:///{tmp_path / 'limits.db'}"))
+        item = parse("2/minute")
+
+        assert [limiter.hit(item, "client") for _ in range(3)] == [True, True, False]
+        assert limiter.hit(item, "other-client") is True
+
+
+class TestRateLimitedEndpoints:
+    """Test limits on the app's endpoints"""
+
+    def test_ai_endpoint_limit(self):
+        """/api/refine-content answers until its limit, then 429"""
+        from app.main import app
+
+        refine = AsyncMock(return_value={"success": True, "content": "Refined"})
+        with patch("app.routes.ai_content.refine_content", refine):
+            client = TestClient(app)
+            statuses = [
+                client.post("/api/refine-content", json={
+                    "original_content": "Hello", "platform": "twitter", "instructions": "Shorter"
+                }).status_code
+                for _ in range(31)
+            ]
+
+        assert statuses[:30] == [200] * 30
+        assert statuses[30] == 429
+
+    def test_post_limit_applies_before_upload(self):
+        """/api/post is limited before the form is parsed"""
+        from app.main import app
+
+        client = TestClient(app)
+        statuses = [client.post("/api/post", data={"caption": "x"}).status_code for _ in range(31)]
+
+        assert statuses[:30] == [422] * 30
+        assert statuses[30] == 429
+        assert "Rate limit exceeded" in client.post("/api/post").json()["error"]
+
+    def test_post_limit_answers_like_the_decorated_endpoints(self):
+        """The /api/post 429 comes from slowapi's handler and says when to retry"""
+        from app.main import app
+
+        client = TestClient(app)
+        for _ in range(30):
+            client.post("/api/post", data={"caption": "x"})
+        response = client.post("/api/post", data={"caption": "x"})
+
+        assert response.status_code == 429
+        assert response.json() == {"error": "Rate limit exceeded: 30 per 1 minute"}
+        assert 0 < int(response.headers["Retry-After"]) <= 61
+
+    def test_post_limit_falls_back_when_storage_fails(self):
+        """A failing shared storage switches /api/post to the in-memory counters"""
+        from limits.storage import MemoryStorage
+        from limits.strategies import FixedWindowRateLimiter
+        from app.main import app
+        from app.utils.rate_limit import limiter
+
+        with patch.object(limiter._storage, "incr", side_effect=sqlite3.OperationalError("database is locked")), \
+             patch.object(limiter, "_fallback_limiter", FixedWindowRateLimiter(MemoryStorage())), \
+             patch.object(limiter, "_storage_dead", False):
+            client = TestClient(app)
+            statuses = [client.post("/api/post", data={"caption": "x"}).status_code for _ in range(31)]
+
+            assert limiter._storage_dead
+        assert statuses[:30] == [422] * 30
+        assert statuses[30] == 429
@@ -0,0 +1,91 @@
+"""
+Unit tests for the readiness endpoint and runtime signals
+"""
+import time
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def health_client():
+    """Test client with only the health routes"""
+    from app.routes import health
+    
+    app = FastAPI()
+    app.include_router(health.router)
+    return TestClient(app)
+
+
+class TestLoopLagMonitor:
+    """Test event-loop lag measurement"""
+    
+    @pytest.mark.asyncio
+    async def test_blocking_call_shows_as_lag(self):
+        """A blocking call on the loop should be reported as lag"""
+        from app.utils.runtime import LoopLagMonitor
+        
+        monitor = LoopLagMonitor(interval=0.05)
+        monitor.start()
+        await asyncio.sleep(0.1)
+        
+        time.sleep(0.3)  # block the loop
+        await asyncio.sleep(0.1)
+        await monitor.stop()
+        
+        assert monitor.max_lag >= 0.2
+
+
+class TestTrackOutbound:
+    """Test outbound call tracking"""
+    
+    @pytest.mark.asyncio
+    async def test_in_flight_and_latency_recorded(self):
+        """Calls should be counted while running and their latency kept"""
+        from app.utils.runtime import track_outbound, outbound_in_flight, last_latency
+        
+        seen_in_flight = []
+        
+        @track_outbound("testplatform", "publish")
+        async def fake_publish():
+            seen_in_flight.append(outbound_in_flight["testplatform"])
+            await asyncio.sleep(0.01)
+            return {"id": "1"}
+        
+        assert await fake_publish() == {"id": "1"}
+        assert seen_in_flight == [1]
+        assert outbound_in_flight["testplatform"] == 0
+        assert last_latency["testplatform"]["publish"] >= 0.01
+
+
+class TestReadinessEndpoint:
+    """Test /api/ready"""
+    
+    def test_not_ready_when_scheduler_stopped(self, health_client):
+        """Stopped scheduler should return 503 with the reason"""
+        fake_scheduler = MagicMock(running=False)
+        
+        with patch('app.scheduler.scheduler.scheduler', fake_scheduler):
+            response = health_client.get("/api/ready")
+        
+        assert response.status_code == 503
+        body = response.json()
+        assert body["status"] == "not_ready"
+        assert "scheduler not running" in body["problems"]
+    
+    def test_ready_reports_saturation(self, health_client):
+        """Running scheduler should report ready with job and executor stats"""
+        fake_scheduler = MagicMock(running=True)
+        fake_scheduler.get_jobs.return_value = [MagicMock(), MagicMock()]
+        
+        with patch('app.scheduler.scheduler.scheduler', fake_scheduler):
+            response = health_client.get("/api/ready")
+        
+        assert response.status_code == 200
+        body = response.json()
+        assert body["status"] == "ready"
+        assert body["scheduler"]["pending_jobs"] == 2
+        assert "event_loop" in body
+        assert "in_flight" in body["outbound"]
@@ -0,0 +1,181 @@
+"""
+Unit tests for the retry/dead-letter queue of scheduled posts
+"""
+import json
+import httpx
+import pytest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+
+
+def _status_error(status_code: int, headers: dict = None) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "https://platform.example/post")
+    response = httpx.Response(status_code, request=request, headers=headers)
+    return httpx.HTTPStatusError(f"HTTP {status_code}", request=request, response=response)
+
+
+@pytest.fixture
+def posts_file(tmp_path):
+    """A scheduled posts file with one post due for Facebook and Twitter"""
+    from app.config import settings
+
+    path = tmp_path / "scheduled_posts.json"
+    path.write_text(json.dumps([{
+        "id": "post-1",
+        "caption": "Hello",
+        "image_path": str(tmp_path / "image.png"),
+        "platforms": {"facebook": True, "twitter": True},
+        "scheduled_time": "2020-01-01T10:00:00",
+        "status": "scheduled"
+    }]))
+    with patch.object(settings, "SCHEDULED_POSTS_FILE", path):
+        yield path
+
+
+def _stored_post(posts_file):
+    return json.loads(posts_file.read_text())[0]
+
+
+class TestRetryQueue:
+    """Test retry planning after a scheduled run"""
+
+    @pytest.mark.asyncio
+    async def test_transient_failure_schedules_retry_of_failed_platform_only(self, posts_file):
+        """Facebook succeeds, Twitter hits a 503: only Twitter is queued for retry"""
+        from app.scheduler import scheduler as scheduler_module
+
+        facebook = AsyncMock(return_value={"id": "fb-1"})
+        twitter = AsyncMock(side_effect=_status_error(503))
+        with patch.object(scheduler_module, "post_photo_to_facebook", facebook), \
+             patch.object(scheduler_module, "post_photo_to_twitter", twitter), \
+             patch.object(scheduler_module.scheduler, "add_job") as add_job:
+            await scheduler_module.execute_scheduled_post_async(
+                "post-1", "image.png", "Hello", {"facebook": True, "twitter": True}
+            )
+
+        post = _stored_post(posts_file)
+        assert post["status"] == "posted"
+        assert post["posted_to"] == 1
+        assert post["failed_platforms"] == ["Twitter"]
+        assert post["retry"]["state"] == "scheduled"
+        assert post["retry"]["pending_platforms"] == ["twitter"]
+        assert add_job.call_args.kwargs["id"] == "post-1:retry"
+
+        # The retry only posts to Twitter
+        facebook.reset_mock()
+        twitter.side_effect = None
+        twitter.return_value = {"id": "tw-1"}
+        with patch.object(scheduler_module, "post_photo_to_facebook", facebook), \
+             patch.object(scheduler_module, "post_photo_to_twitter", twitter):
+            await scheduler_module.retry_scheduled_post_async("post-1")
+
+        post = _stored_post(posts_file)
+        facebook.assert_not_awaited()
+        assert post["posted_to"] == 2
+        assert post["failed_platforms"] == []
+        assert post["retry"]["state"] == "done"
+        assert post["results"]["twitter"] == {"success": True, "postId": "tw-1"}
+
+    @pytest.mark.asyncio
+    async def test_permanent_failure_is_dead_lettered(self, posts_file):
+        """A 401 is not retried"""
+        from app.scheduler import scheduler as scheduler_module
+
+        with patch.object(scheduler_module, "post_photo_to_facebook", AsyncMock(side_effect=_status_error(401))), \
+             patch.object(scheduler_module, "post_photo_to_twitter", AsyncMock(return_value={"id": "tw-1"})), \
+             patch.object(scheduler_module.scheduler, "add_job") as add_job:
+            await scheduler_module.execute_scheduled_post_async(
+                "post-1", "image.png", "Hello", {"facebook": True, "twitter": True}
+            )
+
+        post = _stored_post(posts_file)
+        assert post["retry"]["state"] == "dead_letter"
+        assert post["retry"]["dead_platforms"] == ["facebook"]
+        add_job.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self, posts_file):
+        """Transient failures are dead-lettered once the attempts run out"""
+        from app.config import settings
+        from app.scheduler import scheduler as scheduler_module
+
+        with patch.object(settings, "SCHEDULED_RETRY_MAX_ATTEMPTS", 2), \
+             patch.object(scheduler_module, "post_photo_to_facebook", AsyncMock(return_value={"id": "fb-1"})), \
+             patch.object(scheduler_module, "post_photo_to_twitter", AsyncMock(side_effect=_status_error(503))), \
+             patch.object(scheduler_module.scheduler, "add_job"):
+            await scheduler_module.execute_scheduled_post_async(
+                "post-1", "image.png", "Hello", {"facebook": True, "twitter": True}
+            )
+            await scheduler_module.retry_scheduled_post_async("post-1")
+
+        retry = _stored_post(posts_file)["retry"]
+        assert retry["attempts"] == 2
+        assert retry["state"] == "dead_letter"
+        assert retry["dead_platforms"] == ["twitter"]
+
+    def test_backoff_respects_retry_after_and_open_breakers(self):
+        """The next attempt is never sooner than the platform or breaker allows"""
+        from app.config import settings
+        from app.scheduler.scheduler import _retry_delay
+        from app.utils.circuit_breaker import CircuitOpenError
+
+        with patch.object(settings, "SCHEDULED_RETRY_BASE_DELAY", 60), \
+             patch.object(settings, "SCHEDULED_RETRY_MAX_DELAY", 3600):
+            assert _retry_delay(1, [_status_error(503)]) == 60
+            assert _retry_delay(3, [_status_error(503)]) == 240
+            assert _retry_delay(10, [_status_error(503)]) == 3600
+            assert _retry_delay(1, [_status_error(429, {"Retry-After": "900"})]) == 900
+            assert _retry_delay(1, [CircuitOpenError("twitter", 300)]) == 300
+
+
+class TestRetryEndpoints:
+    """Test retry state in the API"""
+
+    def test_requeue_dead_lettered_post(self, posts_file):
+        """POST /retry moves dead-lettered platforms back into the queue"""
+        from app.main import app
+        from app.scheduler import scheduler as scheduler_module
+
+        post = _stored_post(posts_file)
+        post.update(status="posted", posted_to=1, failed_platforms=["Twitter"], retry={
+            "state": "dead_letter", "attempts": 5, "pending_platforms": [],
+            "dead_platforms": ["twitter"], "errors": {"twitter": "503"}, "next_attempt_at": None
+        })
+        posts_file.write_text(json.dumps([post]))
+
+        client = TestClient(app)
+        with patch.object(scheduler_module.scheduler, "add_job") as add_job:
+            response = client.post("/api/scheduled-posts/post-1/retry")
+
+        assert response.status_code == 200
+        assert response.json()["retry"]["pending_platforms"] == ["twitter"]
+        assert add_job.call_args.kwargs["args"] == ["post-1"]
+
+        listed = client.get("/api/scheduled-posts").json()["scheduled_posts"][0]
+        assert listed["retry"]["state"] == "scheduled"
+        assert listed["retry"]["attempts"] == 0
+
+    def test_requeue_without_failures_conflicts(self, posts_file):
+        """A post with nothing failed can't be retried"""
+        from app.main import app
+
+        response = TestClient(app).post("/api/scheduled-posts/post-1/retry")
+        assert response.status_code == 409
+
+    def test_restart_keeps_retry_queue(self, posts_file):
+        """Posts with pending retries survive the expired-post cleanup"""
+        from app.scheduler import scheduler as scheduler_module
+
+        post = _stored_post(posts_file)
+        post["retry"] = {
+            "state": "scheduled", "attempts": 1, "pending_platforms": ["twitter"],
+            "dead_platforms": [], "errors": {}, "next_attempt_at": datetime(2020, 1, 1).isoformat()
+        }
+        posts_file.write_text(json.dumps([post]))
+
+        with patch.object(scheduler_module.scheduler, "add_job") as add_job:
+            scheduler_module.restore_scheduled_jobs()
+
+        assert [p["id"] for p in json.loads(posts_file.read_text())] == ["post-1"]
+        assert add_job.call_args.kwargs["id"] == "post-1:retry"
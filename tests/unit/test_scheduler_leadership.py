@@ -0,0 +1,191 @@
+"""
+Unit tests for scheduler leadership across processes
+"""
+import json
+import multiprocessing
+import pytest
+from unittest.mock import AsyncMock, patch
+
+
+@pytest.fixture
+def posts_file(tmp_path):
+    """A scheduled posts file with one future post"""
+    from app.config import settings
+
+    path = tmp_path / "scheduled_posts.json"
+    path.write_text(json.dumps([{
+        "id": "post-1",
+        "caption": "Hello",
+        "image_path": str(tmp_path / "image.png"),
+        "platforms": {"facebook": True},
+        "scheduled_time": "2999-01-01T10:00:00",
+        "status": "scheduled"
+    }]))
+    with patch.object(settings, "SCHEDULED_POSTS_FILE", path):
+        yield path
+
+
+def _add_posts(worker: int, count: int):
+    """Add `count` posts from a separate process"""
+    from app.scheduler.storage import add_scheduled_post
+
+    for i in range(count):
+        add_scheduled_post({"id": f"{worker}-{i}", "status": "scheduled"})
+
+
+class TestSchedulerLeadership:
+    """Test the leader lock"""
+
+    def test_only_one_holder_until_released(self, tmp_path):
+        """A second contender stands by until the leader releases the lock"""
+        from app.scheduler.leader import SchedulerLeadership
+
+        lock_path = tmp_path / "scheduler.lock"
+        leader = SchedulerLeadership(lock_path)
+        other = SchedulerLeadership(lock_path)
+
+        assert leader.try_acquire() is True
+        assert other.try_acquire() is False
+        assert other.snapshot()["role"] == "standby"
+
+        leader.release()
+        assert other.try_acquire() is True
+        assert other.snapshot()["role"] == "leader"
+        other.release()
+
+    def test_standby_does_not_restore_jobs(self, posts_file):
+        """Only the leader adds jobs for stored posts"""
+        from app.scheduler import scheduler as scheduler_module
+
+        with patch.object(scheduler_module.leadership, "standby", True), \
+             patch.object(scheduler_module.scheduler, "add_job") as add_job:
+            scheduler_module.restore_scheduled_jobs()
+
+        add_job.assert_not_called()
+
+
+class TestTakeover:
+    """Test what a new leader does with posts the old one left behind"""
+
+    def test_overdue_and_interrupted_posts_are_run(self, posts_file):
+        """Posts that came due without a leader run now; finished ones are cleaned up"""
+        from app.scheduler import scheduler as scheduler_module
+
+        base = json.loads(posts_file.read_text())[0]
+        posts_file.write_text(json.dumps([
+            {**base, "id": "overdue", "scheduled_time": "2020-01-01T10:00:00"},
+            {**base, "id": "interrupted", "scheduled_time": "2020-01-01T10:00:00", "status": "publishing"},
+            {**base, "id": "done", "scheduled_time": "2020-01-01T10:00:00", "status": "posted"}
+        ]))
+
+        with patch.object(scheduler_module.scheduler, "add_job") as add_job:
+            scheduler_module.restore_scheduled_jobs()
+
+        jobs = {call.kwargs["id"]: call.kwargs["func"] for call in add_job.call_args_list}
+        assert jobs == {
+            "overdue": scheduler_module.execute_scheduled_post,
+            "interrupted": scheduler_module.resume_scheduled_post
+        }
+        assert [p["id"] for p in json.loads(posts_file.read_text())] == ["overdue", "interrupted"]
+
+    @pytest.mark.asyncio
+    async def test_resume_posts_only_to_remaining_platforms(self, posts_file):
+        """Platforms that already succeeded are not attempted again"""
+        from app.scheduler import scheduler as scheduler_module
+
+        posts = json.loads(posts_file.read_text())
+        posts[0].update(
+            status="publishing",
+            platforms={"facebook": True, "twitter": True},
+            results={"twitter": {"success": True, "postId": "tw-1"}}
+        )
+        posts_file.write_text(json.dumps(posts))
+
+        facebook = AsyncMock(return_value={"id": "fb-1"})
+        twitter = AsyncMock(return_value={"id": "tw-2"})
+        with patch.object(scheduler_module, "post_photo_to_facebook", facebook), \
+             patch.object(scheduler_module, "post_photo_to_twitter", twitter):
+            await scheduler_module.resume_scheduled_post_async("post-1")
+
+        facebook.assert_awaited_once()
+        twitter.assert_not_awaited()
+        post = json.loads(posts_file.read_text())[0]
+        assert post["status"] == "posted"
+        assert post["posted_to"] == 2
+
+    def test_sync_resumes_orphaned_publishing_post(self, posts_file):
+        """A post stuck in "publishing" that no run in this process owns is resumed"""
+        from app.scheduler import scheduler as scheduler_module
+
+        posts = json.loads(posts_file.read_text())
+        posts[0]["status"] = "publishing"
+        posts_file.write_text(json.dumps(posts))
+
+        with patch.object(scheduler_module.scheduler, "get_jobs", return_value=[]), \
+             patch.object(scheduler_module.scheduler, "add_job") as add_job:
+            scheduler_module.sync_jobs_from_storage()
+            with patch.object(scheduler_module, "_active_posts", {"post-1"}):
+                scheduler_module.sync_jobs_from_storage()
+
+        add_job.assert_called_once()
+        assert add_job.call_args.kwargs["func"] == scheduler_module.resume_scheduled_post
+
+
+class TestStorageSync:
+    """Test the leader picking up posts scheduled by other processes"""
+
+    def test_sync_adds_missing_job(self, posts_file):
+        """A stored post without a job gets one"""
+        from app.scheduler import scheduler as scheduler_module
+
+        with patch.object(scheduler_module.scheduler, "get_jobs", return_value=[]), \
+             patch.object(scheduler_module.scheduler, "add_job") as add_job:
+            scheduler_module.sync_jobs_from_storage()
+
+        add_job.assert_called_once()
+        assert add_job.call_args.kwargs["id"] == "post-1"
+
+    def test_sync_drops_job_of_deleted_post(self, posts_file):
+        """A job whose post was deleted through another process is removed"""
+        from app.scheduler import scheduler as scheduler_module
+
+        jobs = [type("Job", (), {"id": job_id}) for job_id in ("post-1", "gone", scheduler_module.SYNC_JOB_ID)]
+        with patch.object(scheduler_module.scheduler, "get_jobs", return_value=jobs), \
+             patch.object(scheduler_module.scheduler, "remove_job") as remove_job:
+            scheduler_module.sync_jobs_from_storage()
+
+        remove_job.assert_called_once_with("gone")
+
+    @pytest.mark.asyncio
+    async def test_post_already_claimed_is_not_published_again(self, posts_file):
+        """A post another run already picked up is skipped"""
+        from app.scheduler import scheduler as scheduler_module
+
+        posts = json.loads(posts_file.read_text())
+        posts[0]["status"] = "publishing"
+        posts_file.write_text(json.dumps(posts))
+
+        facebook = AsyncMock(return_value={"id": "fb-1"})
+        with patch.object(scheduler_module, "post_photo_to_facebook", facebook):
+            await scheduler_module.execute_scheduled_post_async(
+                "post-1", "image.png", "Hello", {"facebook": True}
+            )
+
+        facebook.assert_not_awaited()
+        assert json.loads(posts_file.read_text())[0]["status"] == "publishing"
+
+
+class TestStorageLock:
+    """Test read-modify-write cycles on the posts file across processes"""
+
+    def test_concurrent_processes_keep_every_post(self, posts_file):
+        """Posts added by several processes at once are all kept"""
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_add_posts, args=(worker, 20)) for worker in range(4)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(timeout=30)
+
+        assert all(process.exitcode == 0 for process in workers)
+        assert len(json.loads(posts_file.read_text())) == 1 + 4 * 20
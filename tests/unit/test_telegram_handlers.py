@@ -140,7 +140,7 @@ class TestManualPostCreation:
         # Mock photo message
         mock_update.message.photo = [MagicMock()]
         mock_update.message.photo[-1].get_file = AsyncMock()
-        mock_update.message.photo[-1].get_file.return_value.download_to_drive = AsyncMock()
+        mock_update.message.photo[-1].get_file.return_value.download_as_bytearray = AsyncMock(return_value=bytearray(b"fake-jpeg"))
         mock_update.effective_user.id = 12345
         mock_update.message.reply_text = AsyncMock()
         
@@ -149,6 +149,35 @@ class TestManualPostCreation:
         # Should ask for caption
         mock_update.message.reply_text.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_image_upload_stays_in_memory(self, tmp_path, monkeypatch):
+        """Uploaded photo should be held in memory and written only when scheduled"""
+        from app.services.telegram_bot_service import TelegramBotService, user_sessions, CREATE_CAPTION
+        from app.utils.media import ImageBuffer
+        
+        monkeypatch.chdir(tmp_path)
+        bot = TelegramBotService()
+        mock_update = MagicMock()
+        mock_update.message.photo = [MagicMock(file_id="TG_FILE")]
+        mock_update.message.photo[-1].get_file = AsyncMock()
+        mock_update.message.photo[-1].get_file.return_value.download_as_bytearray = AsyncMock(return_value=bytearray(b"fake-jpeg"))
+        mock_update.effective_user.id = 12345
+        mock_update.message.reply_text = AsyncMock()
+        
+        with patch('app.services.telegram_auth.telegram_auth.is_logged_in', return_value=True):
+            result = await bot.create_image_handler(mock_update, MagicMock())
+        
+        assert result == CREATE_CAPTION
+        session = user_sessions[12345]
+        assert isinstance(session["image"], ImageBuffer)
+        assert session["image"].data == b"fake-jpeg"
+        assert not (tmp_path / "uploads").exists()
+        
+        path = session["image"].spill_to_disk()
+        with open(path, "rb") as f:
+            assert f.read() == b"fake-jpeg"
+        user_sessions.pop(12345, None)
+    
     @pytest.mark.asyncio
     async def test_caption_input(self, mock_update, mock_context):
         """Test caption input for manual post"""
@@ -244,3 +273,235 @@ class TestScheduling:
         call_args = mock_update.message.reply_text.call_args[0][0]
         assert "future" in call_args.lower() or "past" in call_args.lower()
 
+
+
+class TestUpdateProcessor:
+    """Test per-user update serialization"""
+    
+    @staticmethod
+    def _make_update(update_id, user_id):
+        from telegram import Update
+        return Update.de_json({
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": 1700000000,
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": "User"},
+                "text": "hi"
+            }
+        }, None)
+    
+    @pytest.mark.asyncio
+    async def test_same_user_serialized_other_users_concurrent(self):
+        """One user's slow handler must not block another user"""
+        import asyncio
+        from app.telegram.update_processor import PerUserUpdateProcessor
+        
+        processor = PerUserUpdateProcessor(max_concurrent_updates=8)
+        events = []
+        release_slow = asyncio.Event()
+        
+        async def slow_handler():
+            events.append("slow_start")
+            await release_slow.wait()
+            events.append("slow_end")
+        
+        async def record(name):
+            events.append(name)
+        
+        slow = asyncio.create_task(processor.process_update(self._make_update(1, 111), slow_handler()))
+        await asyncio.sleep(0)
+        same_user = asyncio.create_task(processor.process_update(self._make_update(2, 111), record("same_user")))
+        other_user = asyncio.create_task(processor.process_update(self._make_update(3, 222), record("other_user")))
+        
+        await other_user
+        assert "other_user" in events
+        assert "same_user" not in events
+        
+        release_slow.set()
+        await asyncio.gather(slow, same_user)
+        assert events.index("slow_end") < events.index("same_user")
+        assert processor._tails == {}
+    
+    @pytest.mark.asyncio
+    async def test_queued_updates_do_not_hold_global_slots(self):
+        """A user's backlog waits outside the max_concurrent_updates cap"""
+        import asyncio
+        from app.telegram.update_processor import PerUserUpdateProcessor
+        
+        processor = PerUserUpdateProcessor(max_concurrent_updates=2)
+        events = []
+        release_slow = asyncio.Event()
+        
+        async def slow_handler():
+            await release_slow.wait()
+            events.append("slow_end")
+        
+        async def record(name):
+            events.append(name)
+        
+        backlog = [asyncio.create_task(processor.process_update(self._make_update(1, 111), slow_handler()))]
+        await asyncio.sleep(0)
+        backlog += [
+            asyncio.create_task(processor.process_update(self._make_update(i, 111), record(f"same_user_{i}")))
+            for i in range(2, 5)
+        ]
+        await asyncio.sleep(0)
+        
+        await asyncio.wait_for(processor.process_update(self._make_update(5, 222), record("other_user")), 1)
+        assert events == ["other_user"]
+        
+        release_slow.set()
+        await asyncio.gather(*backlog)
+        assert events == ["other_user", "slow_end", "same_user_2", "same_user_3", "same_user_4"]
+        assert processor._tails == {}
+    
+    @pytest.mark.asyncio
+    async def test_update_cancelled_while_queued_keeps_order(self):
+        """An update arriving after a cancelled queued one still waits for the running one"""
+        import asyncio
+        from app.telegram.update_processor import PerUserUpdateProcessor
+        
+        processor = PerUserUpdateProcessor(max_concurrent_updates=4)
+        events = []
+        release_slow = asyncio.Event()
+        
+        async def slow_handler():
+            await release_slow.wait()
+            events.append("slow_end")
+        
+        async def record(name):
+            events.append(name)
+        
+        slow = asyncio.create_task(processor.process_update(self._make_update(1, 111), slow_handler()))
+        await asyncio.sleep(0)
+        cancelled_handler = record("cancelled")
+        queued = asyncio.create_task(processor.process_update(self._make_update(2, 111), cancelled_handler))
+        await asyncio.sleep(0)
+        queued.cancel()
+        await asyncio.gather(queued, return_exceptions=True)
+        cancelled_handler.close()
+        
+        later = asyncio.create_task(processor.process_update(self._make_update(3, 111), record("later")))
+        await asyncio.sleep(0.05)
+        assert events == []
+        
+        release_slow.set()
+        await asyncio.gather(slow, later)
+        assert events == ["slow_end", "later"]
+        assert processor._tails == {}
+
+
+class TestBackgroundGeneration:
+    """Test background generation jobs with real progress events"""
+    
+    @pytest.mark.asyncio
+    async def test_captions_pushed_as_they_finish(self):
+        """Each caption should reach the chat before generation completes"""
+        from app.services.telegram_bot_service import TelegramBotService
+        
+        bot = TelegramBotService()
+        tg_bot = MagicMock()
+        tg_bot.send_message = AsyncMock()
+        status_message = MagicMock()
+        status_message.edit_text = AsyncMock()
+        session = {"topic": "Coffee", "tone": "casual", "image_style": "minimal", "generating": True}
+        sent_before_return = []
+        
+        async def fake_generate(**kwargs):
+            callback = kwargs["progress_callback"]
+            for platform in ["facebook", "instagram", "twitter", "reddit"]:
+                await callback("caption", {"platform": platform, "content": f"{platform} post", "success": True})
+            sent_before_return.append(tg_bot.send_message.await_count)
+            await callback("image", {"success": False})
+            return {"platforms": {}, "image": {"success": False}}
+        
+        with patch('app.services.telegram_bot_service.generate_platform_content', side_effect=fake_generate):
+            await bot._run_generation_job(tg_bot, 1, 12345, session, "dalle", status_message)
+        
+        # Header + 4 captions were sent while generation was still running
+        assert sent_before_return == [5]
+        assert session["generated"] == {"platforms": {}, "image": {"success": False}}
+        assert session["approved_platforms"] == []
+        texts = [c.kwargs["text"] for c in tg_bot.send_message.await_args_list]
+        assert "Select platforms to approve" in texts[-1]
+
+
+class TestPhotoFileIdReuse:
+    """Test that re-sent images reuse Telegram's file_id"""
+    
+    @pytest.mark.asyncio
+    async def test_second_send_uses_cached_file_id(self, tmp_path):
+        """Only the first send should upload the image bytes"""
+        from app.services.telegram_bot_service import TelegramBotService
+        from app.telegram.utils.photo_cache import photo_cache
+        
+        image_path = tmp_path / "telegram_temp_test.png"
+        image_path.write_bytes(b"fake-png-bytes")
+        
+        sent = MagicMock()
+        sent.photo = [MagicMock(file_id="small"), MagicMock(file_id="FILE_ID_123")]
+        tg_bot = MagicMock()
+        tg_bot.send_photo = AsyncMock(return_value=sent)
+        
+        bot = TelegramBotService()
+        await bot._send_session_photo(tg_bot, 1, str(image_path), "first")
+        await bot._send_session_photo(tg_bot, 1, str(image_path), "again")
+        
+        first_photo = tg_bot.send_photo.await_args_list[0].kwargs["photo"]
+        second_photo = tg_bot.send_photo.await_args_list[1].kwargs["photo"]
+        assert first_photo != "FILE_ID_123"
+        assert second_photo == "FILE_ID_123"
+        
+        photo_cache.discard(str(image_path))
+    
+    def test_cache_evicts_least_recently_used(self):
+        """Cache should stay bounded"""
+        from app.telegram.utils.photo_cache import PhotoCache
+        
+        cache = PhotoCache(max_size=2)
+        cache.put("a.png", "A")
+        cache.put("b.png", "B")
+        cache.get("a.png")
+        cache.put("c.png", "C")
+        
+        assert cache.get("b.png") is None
+        assert cache.get("a.png") == "A"
+        assert len(cache) == 2
+
+
+class TestStreamedCaptionRewrite:
+    """Test "ai: ..." caption edits streamed into one message"""
+    
+    @pytest.mark.asyncio
+    async def test_rewrite_edits_one_message_throttled(self, mock_update, mock_context):
+        """Deltas edit the same message at most once per interval, then the final text is shown"""
+        from app.config import settings
+        from app.services.telegram_bot_service import TelegramBotService, user_sessions
+        from app.telegram.states import EDIT_PLATFORM_SELECT
+        
+        bot = TelegramBotService()
+        status_message = MagicMock()
+        status_message.edit_text = AsyncMock()
+        mock_update.message.text = "ai: shorter"
+        mock_update.message.reply_text = AsyncMock(return_value=status_message)
+        user_sessions[12345] = {
+            "editing_platform": "twitter",
+            "generated": {"platforms": {"twitter": {"content": "A very long tweet about coffee"}}}
+        }
+        
+        async def fake_refine(caption, platform, instructions, progress_callback=None):
+            for delta in ["Coffee", " time", "!"]:
+                await progress_callback("delta", {"delta": delta})
+            return {"success": True, "content": "Coffee time!"}
+        
+        with patch('app.services.telegram_bot_service.refine_content', side_effect=fake_refine), \
+             patch.object(settings, "TELEGRAM_STREAM_EDIT_INTERVAL", 60):
+            result = await bot.edit_caption_handler(mock_update, mock_context)
+        
+        edits = [c.args[0] for c in status_message.edit_text.await_args_list]
+        assert edits == ["Coffee ▌", "Coffee time!"]
+        assert user_sessions[12345]["generated"]["platforms"]["twitter"]["content"] == "Coffee time!"
+        assert result == EDIT_PLATFORM_SELECT
+        user_sessions.pop(12345, None)
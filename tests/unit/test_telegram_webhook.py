@@ -0,0 +1,129 @@
+"""
+Unit tests for Telegram webhook mode
+"""
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+SECRET_HEADER = {"X-Telegram-Bot-Api-Secret-Token": "s3cret"}
+
+SAMPLE_UPDATE = {
+    "update_id": 1001,
+    "message": {
+        "message_id": 1,
+        "date": 1700000000,
+        "chat": {"id": 12345, "type": "private"},
+        "from": {"id": 12345, "is_bot": False, "first_name": "TestUser"},
+        "text": "/start"
+    }
+}
+
+
+@pytest.fixture
+def webhook_bot():
+    """Bot service built in webhook mode (no network calls)"""
+    from app.services.telegram_bot_service import TelegramBotService
+
+    bot = TelegramBotService()
+    with patch('app.services.telegram_bot_service.settings.TELEGRAM_BOT_TOKEN', "123456:TEST-TOKEN"):
+        bot.application = bot.build_application(webhook=True)
+    bot.webhook_active = True
+    bot.webhook_secret = "s3cret"
+    return bot
+
+
+@pytest.fixture
+def webhook_client(webhook_bot):
+    """Test client acting as a local Telegram stand-in"""
+    from app.routes import telegram_webhook
+
+    app = FastAPI()
+    app.include_router(telegram_webhook.router)
+
+    with patch('app.services.telegram_bot_service.telegram_bot', webhook_bot):
+        yield TestClient(app)
+
+
+class TestWebhookMode:
+    """Test webhook application and endpoint"""
+
+    def test_build_application_without_updater(self, webhook_bot):
+        """Webhook mode should not create a polling updater"""
+        assert webhook_bot.application.updater is None
+
+    def test_post_update_is_queued(self, webhook_client, webhook_bot):
+        """Posted updates should be decoded and queued for the bot"""
+        response = webhook_client.post("/api/telegram/webhook", json=SAMPLE_UPDATE, headers=SECRET_HEADER)
+
+        assert response.status_code == 200
+        assert response.json()["update_id"] == 1001
+
+        queued = webhook_bot.application.update_queue.get_nowait()
+        assert queued.update_id == 1001
+        assert queued.message.text == "/start"
+
+    @pytest.mark.parametrize("body", [[1, 2], {"update_id": 1002, "message": "not a message"}])
+    def test_malformed_update_dropped(self, webhook_client, webhook_bot, body):
+        """A body that is not an update is acknowledged (so Telegram won't resend it) and not queued"""
+        response = webhook_client.post("/api/telegram/webhook", json=body, headers=SECRET_HEADER)
+
+        assert response.status_code == 200
+        assert response.json() == {"ok": True, "update_id": None}
+        assert webhook_bot.application.update_queue.empty()
+
+    @pytest.mark.parametrize("headers", [{}, {"X-Telegram-Bot-Api-Secret-Token": "wrong"}])
+    def test_missing_or_wrong_secret_rejected(self, webhook_client, webhook_bot, headers):
+        """Requests without the registered secret token should be rejected"""
+        response = webhook_client.post("/api/telegram/webhook", json=SAMPLE_UPDATE, headers=headers)
+
+        assert response.status_code == 403
+        assert webhook_bot.application.update_queue.empty()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("headers", [{}, {"X-Telegram-Bot-Api-Secret-Token": "wrong"}])
+    async def test_secret_generated_when_not_configured(self, webhook_bot, headers):
+        """With no TELEGRAM_WEBHOOK_SECRET a random secret is registered and required"""
+        from unittest.mock import AsyncMock
+        from app.routes import telegram_webhook
+
+        webhook_bot.build_application = lambda webhook: webhook_bot.application
+        webhook_bot.application.initialize = AsyncMock()
+        webhook_bot.application.start = AsyncMock()
+        set_webhook = AsyncMock()
+        with patch('app.services.telegram_bot_service.settings.TELEGRAM_WEBHOOK_SECRET', None), \
+             patch.object(type(webhook_bot.application.bot), "set_webhook", set_webhook):
+            await webhook_bot.start_webhook("https://example.com/api/telegram/webhook")
+
+        secret = set_webhook.await_args.kwargs["secret_token"]
+        assert secret and webhook_bot.webhook_secret == secret
+
+        app = FastAPI()
+        app.include_router(telegram_webhook.router)
+        with patch('app.services.telegram_bot_service.telegram_bot', webhook_bot):
+            client = TestClient(app)
+            assert client.post("/api/telegram/webhook", json=SAMPLE_UPDATE, headers=headers).status_code == 403
+            accepted = client.post(
+                "/api/telegram/webhook", json=SAMPLE_UPDATE, headers={"X-Telegram-Bot-Api-Secret-Token": secret}
+            )
+        assert accepted.status_code == 200
+
+    def test_second_process_cannot_serve_the_webhook(self, tmp_path):
+        """Only one process may claim webhook mode (conversation state is in memory)"""
+        from app.services.telegram_bot_service import TelegramBotService
+
+        with patch('app.services.telegram_bot_service.settings.TELEGRAM_WEBHOOK_LOCK_FILE', tmp_path / "webhook.lock"):
+            first, second = TelegramBotService(), TelegramBotService()
+            first.claim_webhook()
+            with pytest.raises(RuntimeError, match="single API worker"):
+                second.claim_webhook()
+        first._webhook_lock.close()
+
+    def test_disabled_when_not_in_webhook_mode(self, webhook_client, webhook_bot):
+        """Endpoint should refuse updates when webhook mode is off"""
+        webhook_bot.webhook_active = False
+
+        response = webhook_client.post("/api/telegram/webhook", json=SAMPLE_UPDATE)
+
+        assert response.status_code == 503
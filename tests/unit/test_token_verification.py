@@ -0,0 +1,122 @@
+"""
+Unit tests for platform token verification
+"""
+import time
+import asyncio
+import pytest
+from unittest.mock import patch
+
+
+def slow_check(delay, result):
+    """Fake platform check that takes `delay` seconds"""
+    async def check():
+        await asyncio.sleep(delay)
+        return result
+    return check
+
+
+class TestVerifyAllTokens:
+    """Test concurrent platform checks"""
+    
+    @pytest.mark.asyncio
+    async def test_checks_run_concurrently(self):
+        """Total time should be close to the slowest check, not the sum"""
+        from app.services import token_verification_service as tvs
+        
+        checks = {p: slow_check(0.2, {"valid": True}) for p in tvs.PLATFORMS}
+        with patch.dict(tvs.CHECKS, checks):
+            start = time.perf_counter()
+            result = await tvs.verify_all_tokens(timeout=2)
+            elapsed = time.perf_counter() - start
+        
+        assert set(result) == set(tvs.PLATFORMS)
+        assert all(r["valid"] for r in result.values())
+        assert elapsed < 0.5
+    
+    @pytest.mark.asyncio
+    async def test_slow_check_times_out(self):
+        """A hanging platform should fail on its own without holding up the rest"""
+        from app.services import token_verification_service as tvs
+        
+        checks = {p: slow_check(0, {"valid": True}) for p in tvs.PLATFORMS}
+        checks["reddit"] = slow_check(5, {"valid": True})
+        with patch.dict(tvs.CHECKS, checks):
+            result = await tvs.verify_all_tokens(timeout=0.1)
+        
+        assert result["facebook"]["valid"] is True
+        assert result["reddit"]["valid"] is False
+        assert "timed out" in result["reddit"]["error"]
+
+
+class TestTokenStatusCache:
+    """Test stale-while-revalidate caching"""
+    
+    @pytest.mark.asyncio
+    async def test_fresh_result_served_from_cache(self):
+        """Second call within the TTL should not re-run the checks"""
+        from app.services.token_verification_service import TokenStatusCache
+        
+        calls = []
+        
+        async def fake_verify():
+            calls.append(1)
+            return {"facebook": {"valid": True}}
+        
+        cache = TokenStatusCache()
+        with patch('app.services.token_verification_service.verify_all_tokens', side_effect=fake_verify):
+            await cache.get()
+            result = await cache.get()
+        
+        assert result == {"facebook": {"valid": True}}
+        assert len(calls) == 1
+    
+    @pytest.mark.asyncio
+    async def test_stale_result_returned_while_refreshing(self):
+        """Past the TTL the cached result is returned and refreshed in the background"""
+        from app.services.token_verification_service import TokenStatusCache
+        
+        async def fake_verify():
+            return {"facebook": {"valid": False}}
+        
+        cache = TokenStatusCache()
+        cache.result = {"facebook": {"valid": True}}
+        cache.checked_at = time.time() - 120
+        
+        with patch('app.services.token_verification_service.settings.TOKEN_STATUS_TTL', 60), \
+             patch('app.services.token_verification_service.settings.TOKEN_STATUS_MAX_STALE', 900), \
+             patch('app.services.token_verification_service.verify_all_tokens', side_effect=fake_verify):
+            result = await cache.get()
+            assert result == {"facebook": {"valid": True}}
+            
+            await cache._refresh_task
+        
+        assert cache.result == {"facebook": {"valid": False}}
+        assert cache.age() < 5
+
+    @pytest.mark.asyncio
+    async def test_refresh_started_before_invalidate_is_not_cached(self):
+        """Checks made with the old credentials don't fill the cache after invalidate"""
+        from app.services.token_verification_service import TokenStatusCache
+        
+        release = asyncio.Event()
+        results = iter([{"facebook": {"valid": False}}, {"facebook": {"valid": True}}])
+        
+        async def fake_verify():
+            result = next(results)
+            if not result["facebook"]["valid"]:
+                await release.wait()
+            return result
+        
+        cache = TokenStatusCache()
+        with patch('app.services.token_verification_service.verify_all_tokens', side_effect=fake_verify):
+            old_check = asyncio.create_task(cache.get())
+            await asyncio.sleep(0)
+            cache.invalidate()
+            release.set()
+            await old_check
+            assert cache.result is None
+            
+            result = await cache.get()
+        
+        assert result == {"facebook": {"valid": True}}
+        assert cache.result == {"facebook": {"valid": True}}
@@ -0,0 +1,108 @@
+"""
+Unit tests for AI usage accounting and daily quotas
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+
+
+def _chat_response(prompt_tokens: int, completion_tokens: int):
+    response = MagicMock()
+    response.model = "test-model"
+    response.usage.prompt_tokens = prompt_tokens
+    response.usage.completion_tokens = completion_tokens
+    return response
+
+
+class TestUsageAccounting:
+    """Test counting tokens and images per caller"""
+
+    @pytest.mark.asyncio
+    async def test_openai_tokens_are_charged_to_caller(self):
+        """observe_openai adds the response's tokens to the current caller's day"""
+        from app.utils.metrics import observe_openai
+        from app.services.usage_service import usage_caller, get_usage_store
+
+        async def request():
+            return _chat_response(120, 30)
+
+        with usage_caller("marketing"):
+            await observe_openai("chat", request())
+            await observe_openai("chat", request())
+
+        assert get_usage_store().totals("marketing") == {"prompt_tokens": 240, "completion_tokens": 60}
+        assert get_usage_store().totals("sales") == {}
+
+    def test_rollups_group_metrics_per_caller_and_day(self):
+        """One entry per caller and day with all its metrics"""
+        from app.services.usage_service import get_usage_store
+
+        store = get_usage_store()
+        store.add("marketing", {"prompt_tokens": 10, "images.dalle": 1}, day="2026-01-02")
+        store.add("marketing", {"images.dalle": 2}, day="2026-01-02")
+        store.add("sales", {"images.fal": 1}, day="2026-01-01")
+
+        assert store.rollups("2026-01-01") == [
+            {"caller": "marketing", "day": "2026-01-02", "usage": {"images.dalle": 3, "prompt_tokens": 10}},
+            {"caller": "sales", "day": "2026-01-01", "usage": {"images.fal": 1}},
+        ]
+
+
+class TestQuotas:
+    """Test quota enforcement before expensive calls"""
+
+    @pytest.mark.asyncio
+    async def test_image_quota_blocks_before_provider_call(self):
+        """Out of image quota: no OpenAI call is made and a 429 is raised"""
+        from app.config import settings
+        from app.services import ai_service
+        from app.services.usage_service import usage_caller, get_usage_store, QuotaExceededError
+
+        get_usage_store().add("sales", {"images.dalle": 2})
+        openai_client = MagicMock()
+        openai_client.chat.completions.create = AsyncMock()
+
+        with patch.object(settings, "AI_TEAM_QUOTAS", "sales=0/2"), \
+             patch.object(ai_service, "client", openai_client), \
+             usage_caller("sales"):
+            with pytest.raises(QuotaExceededError) as exc_info:
+                await ai_service.generate_platform_content("Coffee", generate_image=True)
+
+        assert exc_info.value.status_code == 429
+        assert "Retry-After" in exc_info.value.headers
+        openai_client.chat.completions.create.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_quota_error_is_not_retried(self):
+        """A quota error is permanent for the retry/circuit-breaker logic"""
+        from app.utils.errors import is_retryable
+        from app.services.usage_service import QuotaExceededError
+
+        assert is_retryable(QuotaExceededError("sales", "Daily AI token quota of 10 used up", 60)) is False
+
+    def test_token_quota_returns_429_from_endpoint(self):
+        """A caller over its token quota gets 429 from /api/refine-content"""
+        from app.config import settings
+        from app.main import app
+        from app.services import ai_service
+        from app.services.usage_service import get_usage_store
+
+        get_usage_store().add("marketing", {"prompt_tokens": 900, "completion_tokens": 100})
+        with patch.object(settings, "USAGE_API_KEYS", "key-1:marketing"), \
+             patch.object(settings, "AI_DAILY_TOKEN_QUOTA", 1000), \
+             patch.object(ai_service, "client", MagicMock()):
+            client = TestClient(app)
+            response = client.post(
+                "/api/refine-content",
+                json={"original_content": "Hello", "platform": "twitter", "instructions": "Shorter"},
+                headers={"X-API-Key": "key-1"}
+            )
+            usage = client.get("/api/usage", headers={"X-API-Key": "key-1"}).json()
+            unknown = client.get("/api/usage", headers={"X-API-Key": "nope"})
+
+        assert response.status_code == 429
+        assert "quota" in response.json()["detail"]
+        assert usage["caller"] == "marketing"
+        assert usage["used"] == {"tokens": 1000, "images": 0}
+        assert usage["remaining"] == {"tokens": 0, "images": None}
+        assert unknown.status_code == 401